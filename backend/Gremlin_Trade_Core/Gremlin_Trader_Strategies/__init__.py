@@ -4,24 +4,46 @@ Gremlin Trader Strategies Package
 Comprehensive trading strategies for penny stock detection and analysis
 """
 
+from .scan_context import ScanContext
+from .backtest_engine import BacktestEngine, backtest_engine, run_vectorized_backtest, run_event_backtest
 from .recursive_scanner import run_recursive_strategy, get_strategy_config
 from .penny_stock_strategy import scan_penny_stocks, get_penny_strategy_config
 from .strategy_manager import (
     run_all_strategies, 
+    run_all_strategies_with_metadata,
     get_performance_metrics, 
     update_weights, 
     run_backtest,
     strategy_manager
 )
+from .strategy_params import load_strategy_params, save_strategy_params
+from .parameter_optimizer import (
+    ParameterOptimizer,
+    parameter_optimizer,
+    optimize_parameters,
+    export_best_parameters
+)
 
 __all__ = [
+    'ScanContext',
+    'BacktestEngine',
+    'backtest_engine',
+    'run_vectorized_backtest',
+    'run_event_backtest',
     'run_recursive_strategy',
     'get_strategy_config', 
     'scan_penny_stocks',
     'get_penny_strategy_config',
     'run_all_strategies',
+    'run_all_strategies_with_metadata',
     'get_performance_metrics',
     'update_weights',
     'run_backtest',
-    'strategy_manager'
+    'strategy_manager',
+    'load_strategy_params',
+    'save_strategy_params',
+    'ParameterOptimizer',
+    'parameter_optimizer',
+    'optimize_parameters',
+    'export_best_parameters'
 ]
@@ -0,0 +1,878 @@
+#!/usr/bin/env python3
+"""
+Backtest Engine - Replays stored bars through the strategy signal logic
+The fast path evaluates the PennyStockStrategy, RecursiveScannerStrategy and
+StrategyAgent entry rules as vectorized masks over each symbol's bars, one
+symbol per process-pool task. The event path rebuilds a universe snapshot at
+every decision bar and calls the strategy objects themselves. Both paths share
+the fill, exit and portfolio simulation and report the same metrics.
+"""
+
+# Import ALL dependencies through globals.py (required)
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent.parent))
+
+from Gremlin_Trade_Core.globals import (
+    # Core imports
+    os, np, pd, math, heapq, datetime, timezone, time, ProcessPoolExecutor, OrderedDict,
+    # Type imports
+    List, Dict, Any, Optional, Tuple,
+    # Configuration and utilities
+    CFG, setup_module_logger
+)
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.bar_store import BarStore, bar_store
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.replay_market_service import session_frame
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.stock_table import StockTable
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.universe_snapshot import UniverseSnapshot
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.fundamentals_cache import fundamentals_cache
+
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.incremental_state import IncrementalState
+from .penny_stock_strategy import PennyStockStrategy, penny_stock_strategy
+from .recursive_scanner import RecursiveScannerStrategy, recursive_scanner
+from .strategy_params import load_strategy_params
+
+# Set up logging
+backtest_logger = setup_module_logger("strategy", "backtest")
+
+SCANNER_STRATEGIES = ("penny_stock", "recursive_scanner")
+AGENT_STRATEGIES = ("momentum", "mean_reversion", "breakout", "scalping")
+
+# StrategyAgent defaults - used when no agent instance supplies its own parameters
+AGENT_STRATEGY_PARAMETERS = {
+    "momentum": {"rsi_threshold": 70, "volume_multiplier": 2.0, "min_price_change": 0.02},
+    "mean_reversion": {"rsi_oversold": 30, "rsi_overbought": 70},
+    "breakout": {"volume_threshold": 1.5, "price_threshold": 0.05, "consolidation_period": 10},
+    "scalping": {"quick_profit_target": 0.01, "tight_stop_loss": 0.005}
+}
+AGENT_MIN_CONFIDENCE = 0.6
+
+# Bars of history handed to StrategyAgent strategies in the event path
+AGENT_HISTORY_BARS = 50
+
+EXIT_REASONS = ("stop", "target", "max_hold", "session_end")
+
+TRADE_DTYPE = np.dtype([
+    ("symbol", "U12"), ("strategy", "U20"), ("signal_ts", "i8"), ("entry_ts", "i8"), ("exit_ts", "i8"),
+    ("signal_session", "i8"), ("exit_session", "i8"), ("entry_price", "f8"), ("exit_price", "f8"),
+    ("entry_volume", "f8"), ("exit_volume", "f8"), ("exit_reason", "i1")
+])
+
+
+def compute_features(bars: pd.DataFrame) -> pd.DataFrame:
+    """
+    Stock record fields and strategy indicators for every bar
+    Record fields follow the replay provider (session volume, VWAP, rotation,
+    gain vs the previous close); EMAs run over the full history rather than
+    the replay's trailing window.
+    """
+    frame = session_frame(bars)
+    close, high, low, volume = frame["close"], frame["high"], frame["low"], frame["volume"]
+
+    # Stock record fields
+    frame["rotation"] = np.where(frame["avg_volume"] > 0, frame["cum_volume"] / frame["avg_volume"], 0.0)
+    frame["up_pct"] = np.where(frame["prev_close"] > 0, (close / frame["prev_close"] - 1) * 100, 0.0)
+    frame["ema_5"] = close.ewm(span=5).mean()
+    frame["ema_20"] = close.ewm(span=20).mean()
+    frame["sma_5"] = close.rolling(5, min_periods=1).mean()
+    frame["sma_20"] = close.rolling(20, min_periods=1).mean()
+    ema_12 = close.ewm(span=12).mean()
+    ema_26 = close.ewm(span=26).mean()
+    frame["macd"] = ema_12 - ema_26
+    frame["macd_signal"] = frame["macd"].ewm(span=9).mean()
+    std_20 = close.rolling(20, min_periods=1).std().fillna(0.0)
+    frame["bb_upper"] = frame["sma_20"] + 2 * std_20
+    frame["bb_lower"] = frame["sma_20"] - 2 * std_20
+
+    delta = close.diff()
+    gain = delta.clip(lower=0).rolling(14, min_periods=1).mean()
+    loss = (-delta.clip(upper=0)).rolling(14, min_periods=1).mean()
+    rsi = 100 - 100 / (1 + gain / loss.where(loss > 0))
+    frame["rsi"] = np.where(loss > 0, rsi, np.where(gain > 0, 100.0, 50.0))
+
+    # StrategyAgent indicators (its own RSI, population-std Bollinger and ATR)
+    bars_seen = np.arange(1, len(frame) + 1)
+    full_gain = delta.clip(lower=0).rolling(14).mean()
+    full_loss = (-delta.clip(upper=0)).rolling(14).mean()
+    agent_rsi = 100 - 100 / (1 + full_gain / full_loss.where(full_loss > 0))
+    frame["agent_rsi"] = np.where(bars_seen < 15, 50.0, np.where(full_loss > 0, agent_rsi, 100.0))
+    std_20_pop = close.rolling(20, min_periods=1).std(ddof=0)
+    frame["agent_bb_upper"] = frame["sma_20"] + 2 * std_20_pop
+    frame["agent_bb_lower"] = frame["sma_20"] - 2 * std_20_pop
+    frame["volume_ratio"] = volume / volume.rolling(20, min_periods=1).mean().replace(0, np.nan)
+    frame["momentum_10"] = (close / close.shift(9) - 1).fillna(0.0)
+    frame["momentum_3"] = (close / close.shift(2) - 1).fillna(0.0)
+    prev_close = close.shift(1)
+    true_range = pd.concat([high - low, (high - prev_close).abs(), (low - prev_close).abs()], axis=1).max(axis=1)
+    true_range.iloc[0] = np.nan
+    frame["atr"] = true_range.rolling(14).mean().fillna(0.02)
+    return frame
+
+
+# Feature frames kept per process, so repeated runs over the same symbols
+# (parameter sweeps) compute features once per worker
+_FEATURE_CACHE: "OrderedDict[tuple, pd.DataFrame]" = OrderedDict()
+
+
+def load_features(store_root: str, symbol: str, timeframe: str = "1min", cache_size: int = 0) -> Optional[pd.DataFrame]:
+    """Feature frame for a stored symbol, optionally through the per-process LRU cache"""
+    key = (store_root, symbol, timeframe)
+    frame = _FEATURE_CACHE.get(key)
+    if frame is not None:
+        _FEATURE_CACHE.move_to_end(key)
+        return frame
+
+    bars = BarStore(store_root).read(symbol, timeframe)
+    if bars.empty:
+        return None
+    frame = compute_features(bars)
+    if cache_size > 0:
+        _FEATURE_CACHE[key] = frame
+        while len(_FEATURE_CACHE) > cache_size:
+            _FEATURE_CACHE.popitem(last=False)
+    return frame
+
+
+def clear_feature_cache():
+    """Drop cached feature frames in this process"""
+    _FEATURE_CACHE.clear()
+
+
+def rule_parameters(strategy_agent: Optional[Any] = None, market_conditions: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Entry rule thresholds read from the live strategy objects and config
+    The returned dict is plain data, so it can be swept and sent to workers.
+    """
+    scanner_criteria = CFG.get("strategy", {}).get("scanner_criteria", {})
+    base = penny_stock_strategy.base_criteria
+    float_criteria = base.get("float_criteria", {})
+
+    stages = recursive_scanner.refinement_stages
+    initial = stages[0].get("criteria", {}) if stages else recursive_scanner.scanner_criteria
+    final = stages[2].get("criteria", {}) if len(stages) > 2 else {}
+    recursive_criteria = recursive_scanner.scanner_criteria
+    signal_filters = recursive_scanner.signal_filters
+
+    agent_parameters = {name: dict(params) for name, params in AGENT_STRATEGY_PARAMETERS.items()}
+    min_confidence = AGENT_MIN_CONFIDENCE
+    if strategy_agent is not None:
+        for strategy_type, strategy_config in strategy_agent.strategies.items():
+            if strategy_type.value in agent_parameters:
+                agent_parameters[strategy_type.value].update(strategy_config.get("parameters", {}))
+        min_confidence = strategy_agent.min_confidence_threshold
+
+    return {
+        "signal_rules": {
+            "price_under": scanner_criteria.get("price_under", 10.0),
+            "volume_over": scanner_criteria.get("volume_over", 1000000),
+            "rotation_over": scanner_criteria.get("rotation_over", 2.0),
+            "volume_spike": 2000000
+        },
+        "penny_stock": {
+            "min_price": base.get("price_range", {}).get("min", 0.10),
+            "max_price": base.get("price_range", {}).get("max", 10.0),
+            "min_volume": base.get("volume_criteria", {}).get("min_volume", 1000000),
+            "max_float_million": float_criteria.get("max_float_million", 25),
+            "rotation_min": float_criteria.get("rotation_min", 2.0),
+            "intraday_gain_min": penny_stock_strategy.momentum_filters.get("intraday_gain_min", 5.0)
+        },
+        "recursive_scanner": {
+            "rotation_min": initial.get("rotation", recursive_criteria.get("rotation_over", 2.0)),
+            "volume_min": initial.get("volume", recursive_criteria.get("volume_over", 1000000)),
+            "price_under": recursive_criteria.get("price_under", 10.0),
+            "ema_cross": signal_filters.get("ema_cross", True),
+            "vwap_break": signal_filters.get("vwap_break", True),
+            "volume_spike": signal_filters.get("volume_spike", True),
+            # Live filter threshold; the ratio itself comes from each bar's 20-bar average
+            "min_volume_ratio": 2.0,
+            "pattern_confirmation": bool(final) and final.get("pattern_confirmation", True)
+        },
+        **agent_parameters,
+        "min_confidence": min_confidence,
+        "market": {"trend": "neutral", "volatility": 0.2, **(market_conditions or {})}
+    }
+
+
+def _column(frame: pd.DataFrame, name: str) -> np.ndarray:
+    return frame[name].to_numpy(dtype=np.float64)
+
+
+def entry_signals(frame: pd.DataFrame, strategy: str, rules: Dict[str, Any], float_million: float = 0.0,
+                  fundamentals_ok: bool = True) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Vectorized entry mask for one strategy over a feature frame
+    Returns (mask, stop, target); NaN levels fall back to the percentage exits.
+    Only long entries are simulated.
+    """
+    n = len(frame)
+    price, volume = _column(frame, "close"), _column(frame, "cum_volume")
+    rotation = _column(frame, "rotation")
+    stop = np.full(n, np.nan)
+    target = np.full(n, np.nan)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        if strategy in SCANNER_STRATEGIES:
+            signal = rules["signal_rules"]
+            basic = (price <= signal["price_under"]) & (volume >= signal["volume_over"]) & (rotation >= signal["rotation_over"])
+            ema_cross = _column(frame, "ema_5") > _column(frame, "ema_20")
+            vwap_break = price > _column(frame, "vwap")
+            volume_spike = volume > signal["volume_spike"]
+            signal_count = ema_cross.astype(np.int8) + vwap_break + volume_spike
+
+        if strategy == "penny_stock":
+            penny = rules["penny_stock"]
+            mask = (
+                (price >= penny["min_price"]) & (price <= penny["max_price"])
+                & (volume >= penny["min_volume"]) & (_column(frame, "up_pct") >= penny["intraday_gain_min"])
+            )
+            if not fundamentals_ok:
+                mask[:] = False
+            elif float_million > 0:
+                if float_million > penny["max_float_million"]:
+                    mask[:] = False
+                mask &= (volume / 1000000) / float_million >= penny["rotation_min"]
+
+        elif strategy == "recursive_scanner":
+            recursive = rules["recursive_scanner"]
+            mask = basic & (signal_count > 0)
+            mask &= (rotation >= recursive["rotation_min"]) & (volume >= recursive["volume_min"])
+            mask &= price <= recursive["price_under"]
+            if recursive["ema_cross"]:
+                mask &= ema_cross
+            if recursive["vwap_break"]:
+                mask &= vwap_break | volume_spike
+            if recursive["volume_spike"]:
+                mask &= _column(frame, "volume_ratio") >= recursive["min_volume_ratio"]
+            if recursive["pattern_confirmation"]:
+                mask &= signal_count >= 2
+
+        elif strategy in AGENT_STRATEGIES:
+            mask, confidence, stop, target = _agent_signals(frame, strategy, rules)
+            mask &= confidence >= rules["min_confidence"]
+
+        else:
+            raise ValueError(f"Unknown backtest strategy: {strategy}")
+
+    return mask & np.isfinite(price), stop, target
+
+
+def _agent_signals(frame: pd.DataFrame, strategy: str, rules: Dict[str, Any]) -> Tuple[np.ndarray, ...]:
+    """StrategyAgent buy conditions, confidence and stop/target levels"""
+    params, market = rules[strategy], rules["market"]
+    price = _column(frame, "close")
+    rsi = _column(frame, "agent_rsi")
+    volume_ratio = np.nan_to_num(_column(frame, "volume_ratio"))
+
+    if strategy == "momentum":
+        momentum = _column(frame, "momentum_10")
+        mask = (rsi > params["rsi_threshold"]) & (volume_ratio > params["volume_multiplier"]) & (momentum > params["min_price_change"])
+        confidence = (
+            0.5 + np.minimum(0.2, (rsi - 70) / 30) + np.minimum(0.2, (volume_ratio - 2) / 3)
+            + np.minimum(0.1, momentum * 10)
+            + (0.1 if market.get("trend") == "bullish" else 0.0)
+            - (0.1 if market.get("volatility", 0) > 0.3 else 0.0)
+        )
+        atr = _column(frame, "atr")
+        return mask, np.clip(confidence, 0.1, 0.95), price - atr * 2, price + atr * 3
+
+    if strategy == "mean_reversion":
+        lower = _column(frame, "agent_bb_lower")
+        mask = (rsi < params["rsi_oversold"]) & (price < lower)
+        confidence = 0.5 + np.minimum(0.3, (30 - rsi) / 30) + np.minimum(0.2, (lower - price) / lower)
+        return mask, np.clip(confidence, 0.1, 0.95), price * 0.95, _column(frame, "sma_20")
+
+    if strategy == "breakout":
+        lookback = int(params["consolidation_period"])
+        resistance = frame["high"].rolling(lookback, min_periods=1).max().to_numpy(dtype=np.float64)
+        support = frame["low"].rolling(lookback, min_periods=1).min().to_numpy(dtype=np.float64)
+        mask = (price > resistance * (1 + params["price_threshold"])) & (volume_ratio > params["volume_threshold"])
+        confidence = 0.6 + np.minimum(0.2, (price - resistance) / resistance * 10) + np.minimum(0.2, (volume_ratio - 1.5) / 2)
+        return mask, np.clip(confidence, 0.1, 0.95), resistance * 0.98, price + (resistance - support) * 1.5
+
+    # Scalping only trades when the market is volatile enough
+    momentum = _column(frame, "momentum_3")
+    mask = momentum >= 0.005
+    if market.get("volatility", 0) < 0.2:
+        mask[:] = False
+    confidence = 0.7 + np.minimum(0.2, momentum * 100)
+    return (mask, confidence, price * (1 - params["tight_stop_loss"]),
+            price * (1 + params["quick_profit_target"]))
+
+
+def simulate_exits(symbol: str, strategy: str, frame: pd.DataFrame, mask: np.ndarray,
+                   stop: np.ndarray, target: np.ndarray, settings: Dict[str, Any]) -> List[tuple]:
+    """
+    Candidate trades for one symbol: enter at the next bar's open, exit on the
+    first stop/target touch, after max_hold_bars, or at the session's last bar.
+    One position per symbol and strategy at a time.
+    """
+    ts = frame["ts"].to_numpy(dtype=np.int64)
+    session = frame["session"].to_numpy(dtype=np.int64)
+    open_, high, low = _column(frame, "open"), _column(frame, "high"), _column(frame, "low")
+    close, volume = _column(frame, "close"), _column(frame, "volume")
+    n = len(ts)
+    if n < 2:
+        return []
+
+    # Index of the last bar of each bar's session
+    ends = np.append(np.flatnonzero(np.diff(session)), n - 1)
+    session_end = ends[np.searchsorted(ends, np.arange(n))]
+
+    max_hold = max(1, int(settings["max_hold_bars"]))
+    flatten = settings["flatten_eod"]
+    stop_pct, take_pct = settings["stop_loss_pct"], settings["take_profit_pct"]
+
+    trades = []
+    next_free = 0
+    for i in np.flatnonzero(mask):
+        if i < next_free:
+            continue
+        entry_index = i + 1
+        if entry_index >= n or (flatten and session[entry_index] != session[i]):
+            continue
+        entry = open_[entry_index]
+        if not entry > 0:
+            continue
+
+        stop_level = stop[i] if math.isfinite(stop[i]) else entry * (1 - stop_pct)
+        target_level = target[i] if math.isfinite(target[i]) else entry * (1 + take_pct)
+        last = min(entry_index + max_hold - 1, n - 1)
+        if flatten:
+            last = min(last, session_end[entry_index])
+
+        stop_hits = low[entry_index:last + 1] <= stop_level
+        target_hits = high[entry_index:last + 1] >= target_level
+        first_stop = int(stop_hits.argmax()) if stop_hits.any() else None
+        first_target = int(target_hits.argmax()) if target_hits.any() else None
+
+        # A bar touching both levels is assumed to stop out first
+        if first_stop is not None and (first_target is None or first_stop <= first_target):
+            exit_index = entry_index + first_stop
+            exit_price, reason = min(open_[exit_index], stop_level), 0
+        elif first_target is not None:
+            exit_index = entry_index + first_target
+            exit_price, reason = max(open_[exit_index], target_level), 1
+        else:
+            exit_index = last
+            exit_price, reason = close[last], 3 if last == session_end[entry_index] else 2
+
+        trades.append((symbol, strategy, ts[i], ts[entry_index], ts[exit_index], session[i], session[exit_index],
+                       entry, exit_price, volume[entry_index], volume[exit_index], reason))
+        next_free = exit_index
+
+    return trades
+
+
+def signal_window(ts: np.ndarray, start_ts: Optional[int] = None, end_ts: Optional[int] = None,
+                  days: Optional[int] = None) -> Tuple[int, int]:
+    """Bar range [start, end) where signals are taken; earlier bars only warm up indicators"""
+    if start_ts is not None:
+        start = int(np.searchsorted(ts, start_ts, side="left"))
+    elif days is not None and len(ts):
+        start = int(np.searchsorted(ts, ts[-1] - days * 86400, side="left"))
+    else:
+        start = 0
+    end = int(np.searchsorted(ts, end_ts, side="left")) if end_ts is not None else len(ts)
+    return start, end
+
+
+def symbol_trades(symbol: str, frame: pd.DataFrame, strategies: List[str], rules: Dict[str, Any],
+                  settings: Dict[str, Any], start: int, end: int, float_million: float = 0.0,
+                  fundamentals_ok: bool = True) -> Tuple[np.ndarray, Dict[str, int]]:
+    """Candidate trades and signal counts for one symbol's feature frame"""
+    trades, signals = [], {}
+    for strategy in strategies:
+        mask, stop, target = entry_signals(frame, strategy, rules, float_million, fundamentals_ok)
+        mask[:start] = False
+        mask[end:] = False
+        signals[strategy] = int(mask.sum())
+        trades.extend(simulate_exits(symbol, strategy, frame, mask, stop, target, settings))
+    return np.array(trades, dtype=TRADE_DTYPE), signals
+
+
+def backtest_symbol(task: Dict[str, Any]) -> Dict[str, Any]:
+    """Worker: features, entry masks and candidate trades for one symbol (picklable)"""
+    symbol = task["symbol"]
+    result = {"symbol": symbol, "bars": 0, "signals": {}, "sessions": np.empty(0, dtype=np.int64),
+              "trades": np.empty(0, dtype=TRADE_DTYPE)}
+    try:
+        frame = load_features(task["store_root"], symbol, task["timeframe"], task.get("cache_size", 0))
+        if frame is None:
+            return result
+
+        ts = frame["ts"].to_numpy(dtype=np.int64)
+        start, end = signal_window(ts, task.get("start_ts"), task.get("end_ts"), task.get("days"))
+        result["trades"], result["signals"] = symbol_trades(
+            symbol, frame, task["strategies"], task["rules"], task["settings"], start, end,
+            task["float_million"], task["fundamentals_ok"]
+        )
+        result["bars"] = max(0, end - start)
+        result["sessions"] = np.unique(frame["session"].to_numpy(dtype=np.int64)[start:end])
+        return result
+
+    except Exception as e:
+        result["error"] = str(e)
+        return result
+
+
+def _commission(quantity: int, settings: Dict[str, Any]) -> float:
+    return max(settings["commission_min"], quantity * settings["commission_per_share"])
+
+
+def _slippage(quantity: int, bar_volume: float, settings: Dict[str, Any]) -> float:
+    """Fractional slippage: fixed spread cost plus a participation-rate impact"""
+    participation_pct = quantity / bar_volume * 100 if bar_volume > 0 else 100.0
+    return (settings["slippage_bps"] + settings["participation_impact_bps"] * participation_pct) / 10000
+
+
+def simulate_portfolio(trades: np.ndarray, settings: Dict[str, Any]) -> Tuple[pd.DataFrame, List[Tuple[int, int, float]]]:
+    """
+    Size and fill candidate trades in entry order against one capital pool
+    Returns the trade ledger and realized equity points (ts, session, equity).
+    """
+    capital = float(settings["initial_capital"])
+    cash = capital
+    fraction = settings["position_fraction"]
+    max_positions = int(settings["max_positions"])
+    max_participation = settings["max_participation"]
+
+    open_positions: List[tuple] = []
+    ledger = []
+    equity_points = [(0, 0, capital)]
+    skipped = 0
+
+    def settle(until_ts: Optional[int]):
+        nonlocal cash, capital
+        while open_positions and (until_ts is None or open_positions[0][0] <= until_ts):
+            exit_ts, _, session, proceeds, pnl = heapq.heappop(open_positions)
+            cash += proceeds
+            capital += pnl
+            equity_points.append((exit_ts, session, capital))
+
+    for sequence, trade in enumerate(np.sort(trades, order=["entry_ts", "symbol"])):
+        settle(int(trade["entry_ts"]))
+        if len(open_positions) >= max_positions:
+            skipped += 1
+            continue
+
+        entry, exit_price = float(trade["entry_price"]), float(trade["exit_price"])
+        budget = min(capital * fraction, cash)
+        quantity = int(budget / (entry * (1 + settings["slippage_bps"] / 10000)))
+        quantity = min(quantity, int(trade["entry_volume"] * max_participation))
+        if quantity < 1:
+            skipped += 1
+            continue
+
+        entry_fill = entry * (1 + _slippage(quantity, trade["entry_volume"], settings))
+        exit_fill = exit_price * (1 - _slippage(quantity, trade["exit_volume"], settings))
+        commission = _commission(quantity, settings) * 2
+        cost = quantity * entry_fill + commission / 2
+        if cost > cash:
+            skipped += 1
+            continue
+
+        proceeds = quantity * exit_fill - commission / 2
+        pnl = proceeds - cost
+        cash -= cost
+        heapq.heappush(open_positions, (int(trade["exit_ts"]), sequence, int(trade["exit_session"]), proceeds, pnl))
+        ledger.append({
+            "symbol": trade["symbol"], "strategy": trade["strategy"],
+            "entry_ts": int(trade["entry_ts"]), "exit_ts": int(trade["exit_ts"]),
+            "quantity": quantity, "entry_fill": entry_fill, "exit_fill": exit_fill,
+            "notional": quantity * (entry_fill + exit_fill), "commission": commission,
+            "slippage": quantity * ((entry_fill - entry) + (exit_price - exit_fill)),
+            "pnl": pnl, "return": pnl / cost, "exit_reason": EXIT_REASONS[trade["exit_reason"]]
+        })
+
+    settle(None)
+    frame = pd.DataFrame(ledger)
+    frame.attrs["skipped"] = skipped
+    return frame, equity_points
+
+
+def _session_label(session: int) -> str:
+    return f"{session // 10000:04d}-{session // 100 % 100:02d}-{session % 100:02d}"
+
+
+def daily_equity(equity_points: List[Tuple[int, int, float]], sessions: np.ndarray, initial_capital: float) -> pd.Series:
+    """Realized equity at the close of every session in the test window"""
+    points = pd.DataFrame(equity_points[1:], columns=["ts", "session", "equity"])
+    closes = points.groupby("session")["equity"].last() if not points.empty else pd.Series(dtype=float)
+    index = np.union1d(sessions, closes.index.to_numpy(dtype=np.int64))
+    return closes.reindex(index).ffill().fillna(initial_capital)
+
+
+def performance_metrics(ledger: pd.DataFrame, equity: pd.Series, equity_points: List[Tuple[int, int, float]],
+                        initial_capital: float) -> Dict[str, Any]:
+    """Return, drawdown, Sharpe, hit rate and turnover for one equity stream"""
+    returns = equity.pct_change()
+    if len(equity):
+        returns.iloc[0] = equity.iloc[0] / initial_capital - 1
+    std = float(returns.std()) if len(returns) > 1 else 0.0
+    sharpe = float(returns.mean() / std * math.sqrt(252)) if std > 0 else 0.0
+
+    # Drawdown over every realized equity point, not just session closes
+    path = np.array([point[2] for point in equity_points] or [initial_capital], dtype=np.float64)
+    drawdown = 1 - path / np.maximum.accumulate(path)
+
+    trades = len(ledger)
+    wins = int((ledger["pnl"] > 0).sum()) if trades else 0
+    average_equity = float(equity.mean()) if len(equity) else initial_capital
+    turnover = float(ledger["notional"].sum()) / average_equity if trades else 0.0
+    final_equity = float(path[-1])
+
+    return {
+        "trades": trades,
+        "profitable_trades": wins,
+        "win_rate": round(wins / trades, 4) if trades else 0.0,
+        "avg_return": round(float(ledger["return"].mean()), 5) if trades else 0.0,
+        "total_return": round(final_equity / initial_capital - 1, 5),
+        "final_equity": round(final_equity, 2),
+        "max_drawdown": round(float(drawdown.max()), 5),
+        "sharpe_ratio": round(sharpe, 3),
+        "turnover": round(turnover, 3),
+        "annual_turnover": round(turnover * 252 / len(equity), 3) if len(equity) else 0.0,
+        "commission": round(float(ledger["commission"].sum()), 2) if trades else 0.0,
+        "slippage": round(float(ledger["slippage"].sum()), 2) if trades else 0.0,
+        "exit_reasons": ledger["exit_reason"].value_counts().to_dict() if trades else {},
+        "sessions": len(equity)
+    }
+
+
+def combine_returns(daily_returns: Dict[str, pd.Series], weights: Optional[Dict[str, float]],
+                    initial_capital: float) -> Dict[str, Any]:
+    """Blend strategy daily returns by strategy weights"""
+    weights = {name: w for name, w in (weights or {}).items() if name in daily_returns and w > 0}
+    if not weights:
+        return {}
+    total = sum(weights.values())
+    blended = sum(daily_returns[name] * (w / total) for name, w in weights.items())
+    equity = initial_capital * (1 + blended).cumprod()
+    path = np.append(initial_capital, equity.to_numpy())
+    std = float(blended.std()) if len(blended) > 1 else 0.0
+    return {
+        "weights": {name: round(w / total, 4) for name, w in weights.items()},
+        "total_return": round(float(path[-1] / initial_capital - 1), 5),
+        "max_drawdown": round(float((1 - path / np.maximum.accumulate(path)).max()), 5),
+        "sharpe_ratio": round(float(blended.mean() / std * math.sqrt(252)), 3) if std > 0 else 0.0,
+        "final_equity": round(float(path[-1]), 2)
+    }
+
+
+def summarize_trades(trades: np.ndarray, sessions: np.ndarray, strategies: List[str], settings: Dict[str, Any],
+                     weights: Optional[Dict[str, float]] = None, signals: Optional[Dict[str, int]] = None,
+                     equity_curves: bool = True) -> Dict[str, Any]:
+    """Portfolio simulation and metrics per strategy plus the weighted blend"""
+    initial_capital = float(settings["initial_capital"])
+    strategy_results, daily_returns = {}, {}
+    for name in strategies:
+        ledger, equity_points = simulate_portfolio(trades[trades["strategy"] == name], settings)
+        equity = daily_equity(equity_points, sessions, initial_capital)
+        metrics = performance_metrics(ledger, equity, equity_points, initial_capital)
+        strategy_results[name] = {
+            "total_signals": (signals or {}).get(name, metrics["trades"]),
+            "profitable_signals": metrics["profitable_trades"],
+            **metrics,
+            "hit_rate": metrics["win_rate"],
+            "skipped_trades": ledger.attrs.get("skipped", 0)
+        }
+        if equity_curves:
+            strategy_results[name]["equity_curve"] = [
+                {"date": _session_label(s), "equity": round(float(v), 2)} for s, v in equity.items()
+            ]
+        daily_returns[name] = equity.pct_change().fillna(equity.iloc[0] / initial_capital - 1 if len(equity) else 0.0)
+
+    return {
+        "strategies": strategy_results,
+        "combined": combine_returns(daily_returns, weights, initial_capital)
+    }
+
+
+class BacktestEngine:
+    """
+    Historical backtester over the local bar store
+    Settings come from strategy.backtesting; rules come from the live
+    strategy objects unless a parameter set is passed in.
+    """
+
+    def __init__(self, store: Optional[BarStore] = None):
+        strategy_config = CFG.get("strategy", {})
+        backtest_config = strategy_config.get("backtesting", {})
+        stop_config = strategy_config.get("risk_management", {}).get("stop_loss_strategies", {})
+        self.store = store or bar_store
+        self.settings = {
+            "lookback_days": backtest_config.get("lookback_days", 30),
+            "timeframe": backtest_config.get("timeframe", "1min"),
+            "mode": backtest_config.get("mode", "vectorized"),
+            "strategies": backtest_config.get("strategies", list(SCANNER_STRATEGIES + AGENT_STRATEGIES)),
+            "workers": backtest_config.get("workers", 0),
+            "initial_capital": backtest_config.get("initial_capital", 100000.0),
+            "position_fraction": backtest_config.get("position_fraction", 0.1),
+            "max_positions": backtest_config.get("max_positions", 10),
+            "slippage_bps": backtest_config.get("slippage_bps", 5.0),
+            "participation_impact_bps": backtest_config.get("participation_impact_bps", 10.0),
+            "max_participation": backtest_config.get("max_participation", 0.1),
+            "commission_per_share": backtest_config.get("commission_per_share", 0.005),
+            "commission_min": backtest_config.get("commission_min", 1.0),
+            "stop_loss_pct": backtest_config.get("stop_loss_pct", stop_config.get("initial_stop_percent", 15.0) / 100),
+            "take_profit_pct": backtest_config.get("take_profit_pct", 0.10),
+            "max_hold_bars": backtest_config.get("max_hold_bars", 390),
+            "flatten_eod": backtest_config.get("flatten_eod", True),
+            "decision_interval_bars": backtest_config.get("decision_interval_bars", 15),
+            "event_limit": backtest_config.get("event_limit", 50)
+        }
+        self.last_run: Dict[str, Any] = {}
+
+        # Exit and sizing settings from the latest optimized parameter set
+        optimized = load_strategy_params().get("parameters", {}).get("settings", {})
+        self.settings.update({key: value for key, value in optimized.items() if key in self.settings})
+
+    def fundamentals_lookup(self, symbols: List[str], rules: Dict[str, Any]) -> Dict[str, Tuple[float, bool]]:
+        """Cached float and prefilter outcome per symbol, looked up once per run"""
+        mask = fundamentals_cache.passes(symbols, max_float_million=rules["penny_stock"]["max_float_million"])
+        lookup = {}
+        for symbol, keep in zip(symbols, mask):
+            record = fundamentals_cache.get(symbol) or {}
+            lookup[symbol] = (float(record.get("float_million", 0.0) or 0.0), bool(keep))
+        return lookup
+
+    def _map(self, tasks: List[Dict[str, Any]], workers: int) -> List[Dict[str, Any]]:
+        """Run symbol tasks inline or across a process pool"""
+        workers = workers or os.cpu_count() or 1
+        if workers <= 1 or len(tasks) <= 1:
+            return [backtest_symbol(task) for task in tasks]
+        chunksize = max(1, len(tasks) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            return list(pool.map(backtest_symbol, tasks, chunksize=chunksize))
+
+    def run(self, days: Optional[int] = None, symbols: Optional[List[str]] = None,
+            strategies: Optional[List[str]] = None, rules: Optional[Dict[str, Any]] = None,
+            settings: Optional[Dict[str, Any]] = None, weights: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """Vectorized backtest over the last `days` of each symbol's stored bars"""
+        started = time.perf_counter()
+        settings = {**self.settings, **(settings or {})}
+        days = days or settings["lookback_days"]
+        strategies = list(strategies or settings["strategies"])
+        rules = rules or rule_parameters()
+        symbols = symbols or self.store.list_symbols(settings["timeframe"])
+        fundamentals = self.fundamentals_lookup(symbols, rules)
+
+        tasks = [{
+            "symbol": symbol, "store_root": str(self.store.root), "timeframe": settings["timeframe"],
+            "days": days, "strategies": strategies, "rules": rules, "settings": settings,
+            "float_million": fundamentals[symbol][0], "fundamentals_ok": fundamentals[symbol][1]
+        } for symbol in symbols]
+        outcomes = self._map(tasks, settings["workers"])
+
+        for outcome in outcomes:
+            if "error" in outcome:
+                backtest_logger.warning(f"Backtest skipped {outcome['symbol']}: {outcome['error']}")
+
+        results = self._summarize(outcomes, strategies, settings, weights, days, "vectorized")
+        results["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+        backtest_logger.info(
+            f"Backtest complete: {results['symbols']} symbols, {results['bars']} bars, "
+            f"{sum(s['trades'] for s in results['strategies'].values())} trades in {results['elapsed_seconds']}s"
+        )
+        self.last_run = {key: results[key] for key in ("mode", "period_days", "symbols", "bars", "elapsed_seconds", "timestamp")}
+        return results
+
+    async def run_event(self, days: Optional[int] = None, symbols: Optional[List[str]] = None,
+                        strategies: Optional[List[str]] = None, strategy_agent: Optional[Any] = None,
+                        settings: Optional[Dict[str, Any]] = None, weights: Optional[Dict[str, float]] = None,
+                        market_conditions: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Event-driven backtest through the strategy objects themselves
+        Every decision_interval_bars a snapshot of all symbols is rebuilt and
+        handed to the scanners; StrategyAgent strategies run on the trailing
+        bars when an agent instance is supplied. The scanners are private
+        instances with incremental caching and memory writes disabled, so a
+        run neither reuses live results nor feeds replayed candidates back.
+        """
+        started = time.perf_counter()
+        settings = {**self.settings, **(settings or {})}
+        days = days or settings["lookback_days"]
+        strategies = list(strategies or settings["strategies"])
+        rules = rule_parameters(strategy_agent, market_conditions)
+        symbols = symbols or self.store.list_symbols(settings["timeframe"])
+        fundamentals = self.fundamentals_lookup(symbols, rules)
+
+        penny_scanner = PennyStockStrategy(IncrementalState("penny_stock", {"enabled": False}))
+        recursive_strategy = RecursiveScannerStrategy(IncrementalState("recursive_scanner", {"enabled": False}),
+                                                      record_memory=False)
+
+        agent_strategies = [name for name in strategies if name in AGENT_STRATEGIES]
+        if agent_strategies and strategy_agent is None:
+            backtest_logger.warning("No StrategyAgent supplied - agent strategies skipped in event mode")
+            agent_strategies = []
+
+        frames, starts = {}, {}
+        for symbol in symbols:
+            bars = self.store.read(symbol, settings["timeframe"])
+            if bars.empty:
+                continue
+            frame = compute_features(bars)
+            ts = frame["ts"].to_numpy(dtype=np.int64)
+            frames[symbol] = frame
+            starts[symbol] = int(np.searchsorted(ts, ts[-1] - days * 86400, side="left"))
+
+        levels = {
+            name: {symbol: (np.zeros(len(frame), dtype=bool), np.full(len(frame), np.nan), np.full(len(frame), np.nan))
+                   for symbol, frame in frames.items()}
+            for name in strategies
+        }
+        timeline = np.unique(np.concatenate(
+            [frame["ts"].to_numpy(dtype=np.int64)[starts[symbol]:] for symbol, frame in frames.items()]
+        )) if frames else np.array([], dtype=np.int64)
+
+        for version, ts in enumerate(timeline[::max(1, int(settings["decision_interval_bars"]))], start=1):
+            rows, records = {}, []
+            for symbol, frame in frames.items():
+                row = int(np.searchsorted(frame["ts"].to_numpy(), ts, side="right")) - 1
+                if row < starts[symbol]:
+                    continue
+                rows[symbol] = row
+                records.append(self._record(symbol, frame, row, fundamentals[symbol][0]))
+            if not records:
+                continue
+
+            snapshot = UniverseSnapshot(
+                version=version, created_at=datetime.fromtimestamp(int(ts), tz=timezone.utc),
+                table=StockTable.from_records(records), source="backtest"
+            )
+            if "penny_stock" in strategies:
+                for hit in await penny_scanner.scan_penny_stocks(settings["event_limit"], snapshot):
+                    self._mark(levels["penny_stock"], rows, hit.get("symbol"))
+            if "recursive_scanner" in strategies:
+                for hit in await recursive_strategy.run_recursive_scan(list(rows), snapshot=snapshot):
+                    self._mark(levels["recursive_scanner"], rows, hit.get("symbol"))
+
+            for symbol, row in rows.items():
+                if not agent_strategies:
+                    break
+                history = frames[symbol].iloc[max(0, row - AGENT_HISTORY_BARS + 1):row + 1]
+                price_data = history[["open", "high", "low", "close", "volume"]].to_dict("records")
+                for name in agent_strategies:
+                    signal = await getattr(strategy_agent, f"_{name}_strategy")(symbol, price_data, rules["market"])
+                    if signal and signal.confidence >= rules["min_confidence"] and signal.take_profit > signal.entry_price:
+                        self._mark(levels[name], rows, symbol, signal.stop_loss, signal.take_profit)
+
+        outcomes = []
+        for symbol, frame in frames.items():
+            trades = []
+            signals = {}
+            for name in strategies:
+                mask, stop, target = levels[name][symbol]
+                signals[name] = int(mask.sum())
+                trades.extend(simulate_exits(symbol, name, frame, mask, stop, target, settings))
+            outcomes.append({
+                "symbol": symbol, "bars": len(frame) - starts[symbol], "signals": signals,
+                "sessions": np.unique(frame["session"].to_numpy(dtype=np.int64)[starts[symbol]:]),
+                "trades": np.array(trades, dtype=TRADE_DTYPE)
+            })
+
+        results = self._summarize(outcomes, strategies, settings, weights, days, "event")
+        results["decision_points"] = int(len(timeline[::max(1, int(settings["decision_interval_bars"]))]))
+        results["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+        self.last_run = {key: results[key] for key in ("mode", "period_days", "symbols", "bars", "elapsed_seconds", "timestamp")}
+        return results
+
+    @staticmethod
+    def _record(symbol: str, frame: pd.DataFrame, row: int, float_million: float) -> Dict[str, Any]:
+        """Stock record at a bar in the provider record shape"""
+        bar = frame.iloc[row]
+        record = {
+            "symbol": symbol,
+            "price": float(bar["close"]),
+            "volume": int(bar["cum_volume"]),
+            "avg_volume": int(bar["avg_volume"]),
+            "rotation": round(float(bar["rotation"]), 2),
+            "up_pct": round(float(bar["up_pct"]), 2),
+            "vwap": float(bar["vwap"]),
+            "ema": {"5": float(bar["ema_5"]), "20": float(bar["ema_20"])},
+            "sma": {"5": float(bar["sma_5"]), "20": float(bar["sma_20"])},
+            "rsi": float(bar["rsi"]),
+            "macd": {"macd": float(bar["macd"]), "signal": float(bar["macd_signal"]),
+                     "histogram": float(bar["macd"] - bar["macd_signal"])},
+            "bollinger": {"upper": float(bar["bb_upper"]), "lower": float(bar["bb_lower"]), "middle": float(bar["sma_20"])},
+            "timestamp": datetime.fromtimestamp(int(bar["ts"]), tz=timezone.utc).isoformat(),
+            "data_source": "backtest"
+        }
+        if float_million > 0:
+            record["float_million"] = float_million
+        return record
+
+    @staticmethod
+    def _mark(levels: Dict[str, tuple], rows: Dict[str, int], symbol: Optional[str],
+              stop: float = math.nan, target: float = math.nan):
+        """Flag an entry signal at the symbol's current bar"""
+        if symbol not in levels or symbol not in rows:
+            return
+        mask, stops, targets = levels[symbol]
+        row = rows[symbol]
+        mask[row] = True
+        stops[row] = stop
+        targets[row] = target
+
+    def _summarize(self, outcomes: List[Dict[str, Any]], strategies: List[str], settings: Dict[str, Any],
+                   weights: Optional[Dict[str, float]], days: int, mode: str) -> Dict[str, Any]:
+        """Merge worker outcomes and run the portfolio simulation"""
+        sessions = np.unique(np.concatenate([o["sessions"] for o in outcomes])) if outcomes else np.array([], dtype=np.int64)
+        trades = np.concatenate([o["trades"] for o in outcomes]) if outcomes else np.empty(0, dtype=TRADE_DTYPE)
+        signals = {name: sum(o["signals"].get(name, 0) for o in outcomes) for name in strategies}
+        return {
+            "mode": mode,
+            "period_days": days,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "symbols": len(outcomes),
+            "bars": int(sum(o["bars"] for o in outcomes)),
+            **summarize_trades(trades, sessions, strategies, settings, weights, signals)
+        }
+
+    def get_status(self) -> Dict[str, Any]:
+        """Engine settings and last run summary"""
+        return {
+            "store": str(self.store.root),
+            "settings": dict(self.settings),
+            "last_run": dict(self.last_run)
+        }
+
+
+# Global instance
+backtest_engine = BacktestEngine()
+
+# Convenience functions
+def run_vectorized_backtest(days: Optional[int] = None, **kwargs) -> Dict[str, Any]:
+    """Run the vectorized backtest over the local bar store"""
+    return backtest_engine.run(days, **kwargs)
+
+async def run_event_backtest(days: Optional[int] = None, **kwargs) -> Dict[str, Any]:
+    """Run the event-driven backtest through the strategy objects"""
+    return await backtest_engine.run_event(days, **kwargs)
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    def synthetic_bars(seed: int, sessions: int = 10) -> pd.DataFrame:
+        rng = np.random.default_rng(seed)
+        opens = pd.bdate_range("2025-01-06", periods=sessions, tz="America/New_York") + pd.Timedelta(hours=9, minutes=30)
+        ts = np.concatenate([(day.value // 10**9) + np.arange(390) * 60 for day in opens])
+        close = 2.0 * np.exp(np.cumsum(rng.normal(0.0002, 0.004, len(ts))))
+        open_ = np.append(close[0], close[:-1])
+        return pd.DataFrame({
+            "ts": ts, "open": open_, "close": close,
+            "high": np.maximum(open_, close) * 1.001, "low": np.minimum(open_, close) * 0.999,
+            "volume": rng.integers(5000, 50000, len(ts))
+        })
+
+    with tempfile.TemporaryDirectory() as root:
+        store = BarStore(root)
+        for i, symbol in enumerate(["GPRO", "SAVA", "MULN"]):
+            store.write(symbol, synthetic_bars(i))
+        engine = BacktestEngine(store)
+        results = engine.run(days=10, weights={"penny_stock": 0.4, "recursive_scanner": 0.6})
+        for name, stats in results["strategies"].items():
+            print(f"  {name}: {stats['trades']} trades, win {stats['win_rate']:.0%}, "
+                  f"return {stats['total_return']:.2%}, sharpe {stats['sharpe_ratio']}, dd {stats['max_drawdown']:.2%}")
+        print(f"Combined: {results['combined']}")
@@ -0,0 +1,599 @@
+#!/usr/bin/env python3
+"""
+Parameter Optimizer - Walk-forward parameter sweeps over local history
+Candidates come from a grid, random samples or a Gaussian-process (expected
+improvement) sampler. Each symbol's features are computed once per batch in
+a process pool and every candidate's trades are generated from them; the
+trades are then scored on rolling train/test session splits. Results are
+ranked by out-of-sample objective and the best set can be exported as a
+versioned parameter file the strategies load at start-up.
+"""
+
+# Import ALL dependencies through globals.py (required)
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent.parent))
+
+from Gremlin_Trade_Core.globals import (
+    # Core imports
+    os, np, pd, math, itertools, datetime, timezone, time, ProcessPoolExecutor,
+    # Type imports
+    List, Dict, Any, Optional, Tuple,
+    # Configuration and utilities
+    CFG, setup_module_logger
+)
+
+from .backtest_engine import (
+    BacktestEngine, backtest_engine, rule_parameters, load_features, clear_feature_cache,
+    signal_window, symbol_trades, summarize_trades, TRADE_DTYPE
+)
+from .strategy_manager import strategy_manager
+from .strategy_params import save_strategy_params, params_dir
+
+# Set up logging
+optimizer_logger = setup_module_logger("strategy", "optimizer")
+
+METHODS = ("grid", "random", "bayesian")
+
+# Objectives where lower is better
+MINIMIZE_OBJECTIVES = frozenset(("max_drawdown",))
+
+# backtesting.parameter_ranges keys -> parameter paths
+PARAMETER_ALIASES = {
+    "stop_loss": "settings.stop_loss_pct",
+    "take_profit": "settings.take_profit_pct",
+    "volume_threshold": "rules.penny_stock.min_volume"
+}
+
+PATH_ROOTS = ("rules", "settings", "weights")
+
+
+class ParameterSpace:
+    """
+    Search space over dotted parameter paths (rules.*, settings.*, weights.*)
+    A dimension is a dict {low, high, type, log} or {values}; a two-number
+    list is read as a range, any other list as explicit values.
+    """
+
+    def __init__(self, spec: Dict[str, Any]):
+        self.dimensions: List[Dict[str, Any]] = []
+        for path, definition in spec.items():
+            path = PARAMETER_ALIASES.get(path, path)
+            if path.split(".", 1)[0] not in PATH_ROOTS:
+                raise ValueError(f"Parameter path must start with one of {PATH_ROOTS}: {path}")
+
+            if isinstance(definition, dict):
+                dimension = dict(definition)
+            elif isinstance(definition, (list, tuple)) and len(definition) == 2 \
+                    and all(isinstance(v, (int, float)) for v in definition):
+                dimension = {"low": definition[0], "high": definition[1]}
+            else:
+                dimension = {"values": list(definition)}
+
+            if "values" not in dimension:
+                integer = dimension.get("type") == "int" or (
+                    isinstance(dimension["low"], int) and isinstance(dimension["high"], int) and dimension["high"] - dimension["low"] > 10
+                )
+                dimension.update(type="int" if integer else "float", log=bool(dimension.get("log")) and dimension["low"] > 0)
+            dimension["path"] = path
+            self.dimensions.append(dimension)
+
+    @property
+    def paths(self) -> List[str]:
+        return [dimension["path"] for dimension in self.dimensions]
+
+    def _value(self, dimension: Dict[str, Any], unit: float) -> Any:
+        """Map a unit-interval coordinate to a parameter value"""
+        if "values" in dimension:
+            values = dimension["values"]
+            return values[min(int(unit * len(values)), len(values) - 1)]
+        low, high = dimension["low"], dimension["high"]
+        if dimension["log"]:
+            value = math.exp(math.log(low) + unit * (math.log(high) - math.log(low)))
+        else:
+            value = low + unit * (high - low)
+        return int(round(value)) if dimension["type"] == "int" else round(value, 6)
+
+    def _unit(self, dimension: Dict[str, Any], value: Any) -> float:
+        """Inverse of _value"""
+        if "values" in dimension:
+            values = dimension["values"]
+            return (values.index(value) + 0.5) / len(values)
+        low, high = dimension["low"], dimension["high"]
+        if high == low:
+            return 0.0
+        if dimension["log"]:
+            return (math.log(value) - math.log(low)) / (math.log(high) - math.log(low))
+        return (value - low) / (high - low)
+
+    def from_unit(self, point: np.ndarray) -> Dict[str, Any]:
+        return {dimension["path"]: self._value(dimension, float(u)) for dimension, u in zip(self.dimensions, point)}
+
+    def to_unit(self, candidate: Dict[str, Any]) -> np.ndarray:
+        return np.array([self._unit(dimension, candidate[dimension["path"]]) for dimension in self.dimensions])
+
+    def grid(self, points: int = 3) -> List[Dict[str, Any]]:
+        """Full factorial grid; ranges are split into `points` levels"""
+        axes = []
+        for dimension in self.dimensions:
+            if "values" in dimension:
+                axes.append(list(dimension["values"]))
+            else:
+                levels = [self._value(dimension, u) for u in np.linspace(0.0, 1.0, max(2, points))]
+                axes.append(list(dict.fromkeys(levels)))
+        return [dict(zip(self.paths, combination)) for combination in itertools.product(*axes)]
+
+    def sample(self, rng: np.random.Generator, count: int) -> List[Dict[str, Any]]:
+        """Uniform random samples (log-uniform where configured)"""
+        return [self.from_unit(rng.random(len(self.dimensions))) for _ in range(count)]
+
+
+def apply_candidate(base: Dict[str, Dict[str, Any]], candidate: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Copy of {rules, settings, weights} with the candidate's paths set"""
+    applied = {root: {key: dict(value) if isinstance(value, dict) else value for key, value in base[root].items()}
+               for root in PATH_ROOTS}
+    for path, value in candidate.items():
+        keys = path.split(".")
+        target = applied[keys[0]]
+        for key in keys[1:-1]:
+            target = target.setdefault(key, {})
+        target[keys[-1]] = value
+    return applied
+
+
+def nest_candidate(candidate: Dict[str, Any]) -> Dict[str, Any]:
+    """Dotted candidate paths as a nested {rules, settings, weights} document"""
+    nested: Dict[str, Any] = {}
+    for path, value in candidate.items():
+        keys = path.split(".")
+        target = nested
+        for key in keys[:-1]:
+            target = target.setdefault(key, {})
+        target[keys[-1]] = value
+    return nested
+
+
+def walk_forward_folds(sessions: np.ndarray, train: int, test: int, step: int,
+                       max_folds: Optional[int] = None) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """Rolling (train, test) session splits; the most recent folds are kept"""
+    folds = []
+    start = 0
+    while start + train + test <= len(sessions):
+        folds.append((sessions[start:start + train], sessions[start + train:start + train + test]))
+        start += max(1, step)
+    if max_folds:
+        folds = folds[-max_folds:]
+    return folds
+
+
+def sweep_symbol(task: Dict[str, Any]) -> Dict[str, Any]:
+    """Worker: one symbol's features, then trades for every candidate in the batch (picklable)"""
+    symbol = task["symbol"]
+    empty = np.empty(0, dtype=TRADE_DTYPE)
+    result = {"symbol": symbol, "sessions": np.empty(0, dtype=np.int64), "trades": [empty] * len(task["candidates"])}
+    try:
+        frame = load_features(task["store_root"], symbol, task["timeframe"], task.get("cache_size", 0))
+        if frame is None:
+            return result
+
+        ts = frame["ts"].to_numpy(dtype=np.int64)
+        start, end = signal_window(ts, task.get("start_ts"), task.get("end_ts"), task.get("days"))
+        result["sessions"] = np.unique(frame["session"].to_numpy(dtype=np.int64)[start:end])
+        result["trades"] = [
+            symbol_trades(symbol, frame, task["strategies"], candidate["rules"], candidate["settings"],
+                          start, end, task["float_million"], task["fundamentals_ok"])[0]
+            for candidate in task["candidates"]
+        ]
+        return result
+
+    except Exception as e:
+        result["error"] = str(e)
+        return result
+
+
+def _target_metrics(summary: Dict[str, Any], target: str) -> Dict[str, Any]:
+    """Metrics for one strategy, or the weighted blend with pooled trade counts"""
+    if target != "combined":
+        return summary["strategies"].get(target, {})
+    combined = dict(summary["combined"])
+    names = combined.get("weights", {})
+    trades = sum(summary["strategies"][name]["trades"] for name in names)
+    wins = sum(summary["strategies"][name]["profitable_trades"] for name in names)
+    combined.update(trades=trades, win_rate=round(wins / trades, 4) if trades else 0.0)
+    return combined
+
+
+def score_candidate(task: Dict[str, Any]) -> Dict[str, Any]:
+    """Worker: in-sample and out-of-sample metrics of one candidate on every fold (picklable)"""
+    trades, candidate = task["trades"], task["candidate"]
+    folds = []
+    for train_sessions, test_sessions in task["folds"]:
+        fold = {}
+        for phase, sessions in (("train", train_sessions), ("test", test_sessions)):
+            subset = trades[np.isin(trades["signal_session"], sessions)]
+            summary = summarize_trades(subset, sessions, task["strategies"], candidate["settings"],
+                                       candidate["weights"], equity_curves=False)
+            metrics = _target_metrics(summary, task["target"])
+            fold[phase] = {key: metrics.get(key, 0.0) for key in task["metrics"] + ["trades"]}
+        folds.append(fold)
+    return {"id": task["id"], "folds": folds}
+
+
+def _objective_value(metrics: Dict[str, Any], objective: str, min_trades: int) -> float:
+    """Signed objective (higher is better); NaN when too few trades to judge"""
+    if metrics.get("trades", 0) < min_trades:
+        return math.nan
+    value = float(metrics.get(objective, 0.0))
+    return -value if objective in MINIMIZE_OBJECTIVES else value
+
+
+def expected_improvement(x_train: np.ndarray, y_train: np.ndarray, x_candidates: np.ndarray,
+                         length_scale: float = 0.25, noise: float = 1e-4, xi: float = 0.01) -> np.ndarray:
+    """Expected improvement under a Gaussian process with an RBF kernel (NumPy only)"""
+    mean_y, std_y = y_train.mean(), y_train.std() or 1.0
+    y = (y_train - mean_y) / std_y
+
+    def kernel(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        distance = ((a[:, None, :] - b[None, :, :]) ** 2).sum(axis=-1)
+        return np.exp(-0.5 * distance / length_scale ** 2)
+
+    chol = np.linalg.cholesky(kernel(x_train, x_train) + noise * np.eye(len(x_train)))
+    alpha = np.linalg.solve(chol.T, np.linalg.solve(chol, y))
+    cross = kernel(x_candidates, x_train)
+    mean = cross @ alpha
+    v = np.linalg.solve(chol, cross.T)
+    std = np.sqrt(np.clip(1.0 - (v ** 2).sum(axis=0), 1e-12, None))
+
+    improvement = mean - y.max() - xi
+    z = improvement / std
+    cdf = 0.5 * (1 + np.vectorize(math.erf)(z / math.sqrt(2)))
+    pdf = np.exp(-0.5 * z ** 2) / math.sqrt(2 * math.pi)
+    return improvement * cdf + std * pdf
+
+
+class ParameterOptimizer:
+    """
+    Walk-forward optimizer for strategy weights, penny thresholds and the
+    exit/sizing settings behind the RuleSetAgent thresholds
+    """
+
+    def __init__(self, engine: Optional[BacktestEngine] = None):
+        backtest_config = CFG.get("strategy", {}).get("backtesting", {})
+        optimizer_config = backtest_config.get("optimizer", {})
+        targets = backtest_config.get("optimization_targets", ["sharpe_ratio", "max_drawdown", "win_rate"])
+        self.engine = engine or backtest_engine
+        self.config = {
+            "method": optimizer_config.get("method", "random"),
+            "samples": optimizer_config.get("samples", 32),
+            "grid_points": optimizer_config.get("grid_points", 3),
+            "initial_samples": optimizer_config.get("initial_samples", 8),
+            "batch_size": optimizer_config.get("batch_size", 8),
+            "workers": optimizer_config.get("workers", 0),
+            "seed": optimizer_config.get("seed", 42),
+            "days": optimizer_config.get("days", 180),
+            "strategies": optimizer_config.get("strategies", ["penny_stock", "recursive_scanner"]),
+            "target": optimizer_config.get("target", "combined"),
+            "objective": optimizer_config.get("objective", targets[0]),
+            "metrics": list(dict.fromkeys(targets + ["total_return"])),
+            "train_sessions": optimizer_config.get("train_sessions", 60),
+            "test_sessions": optimizer_config.get("test_sessions", 20),
+            "step_sessions": optimizer_config.get("step_sessions", 20),
+            "max_folds": optimizer_config.get("max_folds", 4),
+            "min_trades": optimizer_config.get("min_trades", 5),
+            "cache_symbols": optimizer_config.get("cache_symbols", 0),
+            "space": optimizer_config.get("space") or backtest_config.get("parameter_ranges", {})
+        }
+        self.last_result: Dict[str, Any] = {}
+
+    def _map(self, pool: Optional[ProcessPoolExecutor], function, tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if pool is None or len(tasks) <= 1:
+            return [function(task) for task in tasks]
+        return list(pool.map(function, tasks))
+
+    def _evaluate(self, pool: Optional[ProcessPoolExecutor], batch: List[Dict[str, Any]], base: Dict[str, Dict[str, Any]],
+                  context: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Generate trades for a batch of candidates, then score them on every fold"""
+        applied = [apply_candidate(base, candidate) for candidate in batch]
+        tasks = [{
+            **context["symbol_task"], "symbol": symbol,
+            "float_million": context["fundamentals"][symbol][0], "fundamentals_ok": context["fundamentals"][symbol][1],
+            "candidates": [{"rules": a["rules"], "settings": a["settings"]} for a in applied]
+        } for symbol in context["symbols"]]
+        outcomes = self._map(pool, sweep_symbol, tasks)
+        for outcome in outcomes:
+            if "error" in outcome:
+                optimizer_logger.warning(f"Optimizer skipped {outcome['symbol']}: {outcome['error']}")
+
+        if context.get("folds") is None:
+            sessions = np.unique(np.concatenate([o["sessions"] for o in outcomes])) if outcomes else np.array([], dtype=np.int64)
+            context["sessions"] = sessions
+            context["folds"] = walk_forward_folds(
+                sessions, self.config["train_sessions"], self.config["test_sessions"],
+                self.config["step_sessions"], self.config["max_folds"]
+            )
+
+        score_tasks = [{
+            "id": context["next_id"] + k, "candidate": applied[k], "folds": context["folds"],
+            "trades": np.concatenate([o["trades"][k] for o in outcomes]) if outcomes else np.empty(0, dtype=TRADE_DTYPE),
+            "strategies": context["strategies"], "target": self.config["target"], "metrics": self.config["metrics"]
+        } for k in range(len(batch))]
+        scored = self._map(pool, score_candidate, score_tasks)
+        context["next_id"] += len(batch)
+
+        for candidate, result in zip(batch, scored):
+            result["candidate"] = candidate
+            result["score"] = self._score(result)
+        return scored
+
+    def _score(self, result: Dict[str, Any]) -> float:
+        """Mean out-of-sample objective over the folds with enough trades"""
+        values = [_objective_value(fold["test"], self.config["objective"], self.config["min_trades"]) for fold in result["folds"]]
+        values = [v for v in values if v == v]
+        return float(np.mean(values)) if values else math.nan
+
+    def _propose(self, space: ParameterSpace, evaluated: List[Dict[str, Any]], count: int,
+                 rng: np.random.Generator) -> List[Dict[str, Any]]:
+        """Next Bayesian batch: highest expected improvement among random proposals"""
+        scored = [r for r in evaluated if r["score"] == r["score"]]
+        if len(scored) < 2:
+            return space.sample(rng, count)
+
+        x_train = np.array([space.to_unit(r["candidate"]) for r in scored])
+        y_train = np.array([r["score"] for r in scored])
+        proposals = rng.random((max(256, count * 64), len(space.dimensions)))
+        ei = expected_improvement(x_train, y_train, proposals)
+
+        batch, seen = [], {tuple(sorted(r["candidate"].items())) for r in evaluated}
+        for index in np.argsort(-ei):
+            candidate = space.from_unit(proposals[index])
+            key = tuple(sorted(candidate.items()))
+            if key not in seen:
+                seen.add(key)
+                batch.append(candidate)
+            if len(batch) >= count:
+                break
+        return batch
+
+    def run(self, method: Optional[str] = None, samples: Optional[int] = None, space: Optional[Dict[str, Any]] = None,
+            symbols: Optional[List[str]] = None, days: Optional[int] = None, strategies: Optional[List[str]] = None,
+            seed: Optional[int] = None) -> Dict[str, Any]:
+        """Run a sweep and return the ranked results table plus walk-forward selection"""
+        started = time.perf_counter()
+        method = method or self.config["method"]
+        if method not in METHODS:
+            raise ValueError(f"Unknown optimization method: {method} (expected one of {METHODS})")
+        samples = samples or self.config["samples"]
+        parameter_space = ParameterSpace(space or self.config["space"])
+        rng = np.random.default_rng(seed if seed is not None else self.config["seed"])
+        strategies = list(strategies or self.config["strategies"])
+        symbols = symbols or self.engine.store.list_symbols(self.engine.settings["timeframe"])
+
+        base = {
+            "rules": rule_parameters(),
+            "settings": dict(self.engine.settings),
+            "weights": dict(strategy_manager.strategy_weights)
+        }
+        context = {
+            "symbols": symbols,
+            "strategies": strategies,
+            "fundamentals": self.engine.fundamentals_lookup(symbols, base["rules"]),
+            "symbol_task": {
+                "store_root": str(self.engine.store.root), "timeframe": self.engine.settings["timeframe"],
+                "days": days or self.config["days"], "strategies": strategies,
+                "cache_size": self.config["cache_symbols"]
+            },
+            "folds": None,
+            "next_id": 0
+        }
+
+        workers = self.config["workers"] or os.cpu_count() or 1
+        pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 and len(symbols) > 1 else None
+        clear_feature_cache()
+        evaluated: List[Dict[str, Any]] = []
+        try:
+            if method == "grid":
+                evaluated = self._evaluate(pool, parameter_space.grid(self.config["grid_points"]), base, context)
+            elif method == "random":
+                evaluated = self._evaluate(pool, parameter_space.sample(rng, samples), base, context)
+            else:
+                initial = min(samples, self.config["initial_samples"])
+                evaluated = self._evaluate(pool, parameter_space.sample(rng, initial), base, context)
+                while len(evaluated) < samples:
+                    batch = self._propose(parameter_space, evaluated, min(self.config["batch_size"], samples - len(evaluated)), rng)
+                    if not batch:
+                        break
+                    evaluated.extend(self._evaluate(pool, batch, base, context))
+                    best = max((r["score"] for r in evaluated if r["score"] == r["score"]), default=math.nan)
+                    optimizer_logger.info(f"Bayesian round: {len(evaluated)}/{samples} evaluated, best score {best:.4f}")
+        finally:
+            if pool is not None:
+                pool.shutdown()
+            clear_feature_cache()
+
+        table = self._results_table(evaluated, parameter_space)
+        result = {
+            "run_id": datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ"),
+            "method": method,
+            "objective": self.config["objective"],
+            "target": self.config["target"],
+            "strategies": strategies,
+            "symbols": len(symbols),
+            "base_weights": base["weights"],
+            "candidates": len(evaluated),
+            "folds": [
+                {"train": [int(f[0][0]), int(f[0][-1])], "test": [int(f[1][0]), int(f[1][-1])]}
+                for f in context["folds"] or []
+            ],
+            "table": table,
+            "walk_forward": self._walk_forward(evaluated, context["folds"] or []),
+            "best": self._best(evaluated, table),
+            "elapsed_seconds": round(time.perf_counter() - started, 2)
+        }
+        result["results_path"] = self._write_table(table, result["run_id"])
+        if not result["folds"]:
+            optimizer_logger.warning(
+                f"Not enough sessions for a walk-forward split ({len(context.get('sessions', []))} available, "
+                f"{self.config['train_sessions'] + self.config['test_sessions']} needed)"
+            )
+        optimizer_logger.info(
+            f"Optimization complete: {len(evaluated)} candidates, {len(result['folds'])} folds, "
+            f"{len(symbols)} symbols in {result['elapsed_seconds']}s"
+        )
+        self.last_result = result
+        return result
+
+    def _results_table(self, evaluated: List[Dict[str, Any]], space: ParameterSpace) -> pd.DataFrame:
+        """Candidates ranked by mean out-of-sample objective"""
+        rows = []
+        objective = self.config["objective"]
+        for result in evaluated:
+            row = {"candidate": result["id"], **result["candidate"], "score": result["score"]}
+            folds = result["folds"]
+            for phase, prefix in (("test", "oos"), ("train", "is")):
+                for metric in self.config["metrics"]:
+                    values = [fold[phase].get(metric, 0.0) for fold in folds]
+                    row[f"{prefix}_{metric}"] = round(float(np.mean(values)), 5) if values else math.nan
+                row[f"{prefix}_trades"] = int(sum(fold[phase].get("trades", 0) for fold in folds))
+            oos = [fold["test"].get(objective, 0.0) for fold in folds]
+            row["oos_stability"] = round(float(np.std(oos)), 5) if len(oos) > 1 else 0.0
+            rows.append(row)
+
+        table = pd.DataFrame(rows, columns=["candidate"] + space.paths + ["score"] + [
+            f"{prefix}_{metric}" for prefix in ("oos", "is") for metric in self.config["metrics"] + ["trades"]
+        ] + ["oos_stability"])
+        table = table.sort_values("score", ascending=False, na_position="last").reset_index(drop=True)
+        table.insert(0, "rank", np.arange(1, len(table) + 1))
+        return table
+
+    def _walk_forward(self, evaluated: List[Dict[str, Any]], folds: List[tuple]) -> Dict[str, Any]:
+        """Per fold, the candidate best in-sample and how it did out of sample"""
+        objective, min_trades = self.config["objective"], self.config["min_trades"]
+        selections = []
+        for index in range(len(folds)):
+            ranked = [
+                (_objective_value(r["folds"][index]["train"], objective, min_trades), r) for r in evaluated
+            ]
+            ranked = [(value, r) for value, r in ranked if value == value]
+            if not ranked:
+                continue
+            in_sample, chosen = max(ranked, key=lambda item: item[0])
+            selections.append({
+                "fold": index,
+                "candidate": chosen["id"],
+                "in_sample": round(in_sample, 5),
+                "out_of_sample": round(_objective_value(chosen["folds"][index]["test"], objective, 0), 5)
+            })
+
+        if not selections:
+            return {"folds": [], "oos_mean": None, "efficiency": None}
+        is_mean = float(np.mean([s["in_sample"] for s in selections]))
+        oos_mean = float(np.mean([s["out_of_sample"] for s in selections]))
+        return {
+            "folds": selections,
+            "oos_mean": round(oos_mean, 5),
+            "efficiency": round(oos_mean / is_mean, 4) if is_mean else None
+        }
+
+    def _best(self, evaluated: List[Dict[str, Any]], table: pd.DataFrame) -> Optional[Dict[str, Any]]:
+        if table.empty or table.iloc[0]["score"] != table.iloc[0]["score"]:
+            return None
+        best_id = int(table.iloc[0]["candidate"])
+        best = next(r for r in evaluated if r["id"] == best_id)
+        return {"candidate": best["id"], "parameters": best["candidate"], "score": best["score"]}
+
+    def _write_table(self, table: pd.DataFrame, run_id: str) -> Optional[str]:
+        """Persist the ranked table next to the exported parameter versions"""
+        try:
+            directory = params_dir() / "runs"
+            directory.mkdir(parents=True, exist_ok=True)
+            path = directory / f"optimization_{run_id}.csv"
+            table.to_csv(path, index=False)
+            return str(path)
+        except Exception as e:
+            optimizer_logger.error(f"Error writing optimization results: {e}")
+            return None
+
+    def export_best(self, result: Optional[Dict[str, Any]] = None, rank: int = 1) -> Dict[str, Any]:
+        """Export a ranked candidate (best by default) as a new parameter version"""
+        result = result or self.last_result
+        table = result.get("table")
+        if table is None or table.empty or rank > len(table):
+            raise ValueError("No optimization result to export")
+
+        row = table.iloc[rank - 1]
+        if row["score"] != row["score"]:
+            raise ValueError(f"Candidate at rank {rank} has no out-of-sample score")
+        candidate = {path: row[path].item() if hasattr(row[path], "item") else row[path]
+                     for path in table.columns if path.split(".", 1)[0] in PATH_ROOTS}
+        parameters = nest_candidate(candidate)
+        if "weights" in parameters:
+            # Swept weights only cover part of the set; normalize over all strategies
+            weights = {**(result.get("base_weights") or strategy_manager.strategy_weights), **parameters["weights"]}
+            total = sum(weights.values())
+            if total:
+                parameters["weights"] = {name: round(w / total, 4) for name, w in weights.items()}
+
+        metadata = {
+            "run_id": result["run_id"],
+            "method": result["method"],
+            "objective": result["objective"],
+            "target": result["target"],
+            "rank": rank,
+            "score": float(row["score"]),
+            "out_of_sample": {c[4:]: row[c].item() for c in table.columns if c.startswith("oos_")},
+            "in_sample": {c[3:]: row[c].item() for c in table.columns if c.startswith("is_")},
+            "folds": result["folds"],
+            "symbols": result["symbols"]
+        }
+        return save_strategy_params(parameters, metadata)
+
+    def get_status(self) -> Dict[str, Any]:
+        """Optimizer configuration and last run summary"""
+        last = self.last_result
+        return {
+            "config": {key: value for key, value in self.config.items() if key != "space"},
+            "space": ParameterSpace(self.config["space"]).paths,
+            "last_run": {
+                key: last.get(key) for key in ("run_id", "method", "candidates", "symbols", "elapsed_seconds", "results_path")
+            } if last else {}
+        }
+
+
+# Global instance
+parameter_optimizer = ParameterOptimizer()
+
+# Convenience functions
+def optimize_parameters(method: Optional[str] = None, samples: Optional[int] = None, **kwargs) -> Dict[str, Any]:
+    """Run a walk-forward parameter optimization"""
+    return parameter_optimizer.run(method, samples, **kwargs)
+
+def export_best_parameters(result: Optional[Dict[str, Any]] = None, rank: int = 1) -> Dict[str, Any]:
+    """Export the best parameters of the last (or given) optimization"""
+    return parameter_optimizer.export_best(result, rank)
+
+
+def cli_interface():
+    """Command line interface for the optimizer"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Walk-forward strategy parameter optimization")
+    parser.add_argument("--method", choices=METHODS, help="Candidate generation method")
+    parser.add_argument("--samples", type=int, help="Candidates to evaluate (random/bayesian)")
+    parser.add_argument("--days", type=int, help="Days of stored history to use")
+    parser.add_argument("--symbols", nargs="*", help="Symbols to include (default: all stored)")
+    parser.add_argument("--top", type=int, default=10, help="Rows of the ranked table to print")
+    parser.add_argument("--export", action="store_true", help="Export the best candidate as a new parameter version")
+
+    args = parser.parse_args()
+    result = optimize_parameters(args.method, args.samples, symbols=args.symbols or None, days=args.days)
+
+    print(result["table"].head(args.top).to_string(index=False))
+    print(f"Walk-forward: {result['walk_forward']}")
+    print(f"Results table: {result['results_path']}")
+    if args.export and result["best"]:
+        exported = export_best_parameters(result)
+        print(f"Exported parameters v{exported['version']}: {exported['path']}")
+
+
+if __name__ == "__main__":
+    cli_interface()
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Pattern Memory - Batched similarity against successful stored patterns
+Successful-pattern vectors are loaded from the memory store into one
+normalized matrix. Candidates are embedded in a single batch and scored
+with one matrix multiply; a candidate's score is the mean of its top-k
+cosine similarities. The last scored candidate per symbol is remembered
+so a profitable trade outcome adds its pattern to the matrix.
+"""
+
+# Import ALL dependencies through globals.py (required)
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent.parent))
+
+from Gremlin_Trade_Core.globals import (
+    # Core imports
+    np, time, threading, OrderedDict,
+    # Type imports
+    List, Dict, Any, Optional,
+    # Configuration and utilities
+    CFG, MEM, setup_module_logger, embed_texts, package_embedding
+)
+
+# Set up logging
+pattern_logger = setup_module_logger("strategy", "pattern_memory")
+
+SUCCESS_CONTENT_TYPE = "successful_pattern"
+SUCCESS_OUTCOMES = frozenset(("success", "win", "profit"))
+
+
+def pattern_text(candidate: Dict[str, Any]) -> str:
+    """Text a candidate (or stored pattern) is embedded from"""
+    symbol = candidate.get("symbol", "")
+    signals = candidate.get("signal", [])
+    price = candidate.get("price", 0) or 0
+    return f"{symbol} signals: {', '.join(str(signal) for signal in signals)} at ${price:.2f}"
+
+
+def is_successful(meta: Dict[str, Any]) -> bool:
+    """
+    Whether a stored embedding records a pattern that worked
+    Accepts pattern entries as well as learn_from_outcome memories
+    (success / profit_loss).
+    """
+    if meta.get("content_type") == SUCCESS_CONTENT_TYPE:
+        return True
+    if str(meta.get("outcome", "")).lower() in SUCCESS_OUTCOMES:
+        return True
+    success = meta.get("success")
+    if success is True or str(success).lower() == "true":
+        return True
+    for key in ("pnl", "profit_loss"):
+        value = meta.get(key)
+        if isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0:
+            return True
+    return False
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1.0)
+
+
+class PatternMemory:
+    """
+    Normalized matrix of successful-pattern vectors
+    Reloaded from the memory store at most every refresh_seconds.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        memory_config = config if config is not None else \
+            CFG.get("strategy", {}).get("recursive_features", {}).get("memory_guided_filtering", {})
+        self.top_k = max(1, memory_config.get("top_k", 3))
+        self.max_patterns = memory_config.get("max_patterns", 5000)
+        self.refresh_seconds = memory_config.get("refresh_seconds", 300)
+        self.dimension = MEM.get("embedding", {}).get("dimension", 384)
+        self._matrix = np.zeros((0, self.dimension), dtype=np.float32)
+        self._ids: List[str] = []
+        self._loaded_at: Optional[float] = None
+        self._recent: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.last_score: Dict[str, Any] = {}
+
+    def _stored_embeddings(self) -> List[Dict[str, Any]]:
+        """Embeddings from the memory store - empty when the store is unavailable"""
+        try:
+            from Gremlin_Trade_Memory.embedder import get_embeddings_matching
+            return get_embeddings_matching(is_successful, self.max_patterns)
+        except Exception as e:
+            pattern_logger.warning(f"Memory store unavailable for pattern similarity: {e}")
+            return []
+
+    def load(self, force: bool = False) -> int:
+        """(Re)build the pattern matrix from the memory store"""
+        with self._lock:
+            if not force and self._loaded_at is not None and time.monotonic() - self._loaded_at < self.refresh_seconds:
+                return len(self._ids)
+
+            rows, ids = [], []
+            for embedding in self._stored_embeddings():
+                meta = embedding.get("meta") or embedding.get("metadata") or {}
+                vector = embedding.get("vector")
+                if not is_successful(meta) or vector is None or len(vector) != self.dimension or not np.any(vector):
+                    continue
+                rows.append(np.asarray(vector, dtype=np.float32))
+                ids.append(embedding.get("id", ""))
+
+            self._matrix = _normalize(np.stack(rows)) if rows else np.zeros((0, self.dimension), dtype=np.float32)
+            self._ids = ids
+            self._loaded_at = time.monotonic()
+            pattern_logger.info(f"Loaded {len(ids)} successful patterns for similarity scoring")
+            return len(ids)
+
+    def add_pattern(self, candidate: Dict[str, Any], meta: Optional[Dict[str, Any]] = None,
+                    persist: bool = True) -> Optional[str]:
+        """Add a successful candidate to the matrix (and the memory store)"""
+        text = pattern_text(candidate)
+        vector = embed_texts([text])[0]
+        if not np.any(vector):
+            # No embedding model - a zero vector carries no similarity
+            return None
+        meta = {"content_type": SUCCESS_CONTENT_TYPE, "symbol": candidate.get("symbol"),
+                "signal": candidate.get("signal", []), **(meta or {})}
+
+        embedding_id = None
+        if persist:
+            try:
+                from Gremlin_Trade_Memory.embedder import store_embedding
+                embedding_id = store_embedding(package_embedding(text, vector, meta)).get("id")
+            except Exception as e:
+                pattern_logger.warning(f"Could not persist pattern for {candidate.get('symbol')}: {e}")
+
+        with self._lock:
+            self._matrix = np.vstack([self._matrix, _normalize(vector[None, :])])
+            self._ids.append(embedding_id or "")
+        return embedding_id
+
+    def remember(self, candidates: List[Dict[str, Any]]):
+        """Keep the latest scored candidate per symbol for outcome attribution"""
+        with self._lock:
+            for candidate in candidates:
+                symbol = candidate.get("symbol")
+                if symbol:
+                    self._recent[symbol] = {key: candidate.get(key) for key in ("symbol", "signal", "price")}
+                    self._recent.move_to_end(symbol)
+            while len(self._recent) > self.max_patterns:
+                self._recent.popitem(last=False)
+
+    def record_outcome(self, symbol: str, success: bool, profit_loss: float,
+                       price: Optional[float] = None) -> Optional[str]:
+        """Add the symbol's last scored pattern when its trade made money"""
+        if not success or profit_loss <= 0:
+            return None
+        with self._lock:
+            candidate = self._recent.get(symbol)
+        if candidate is None:
+            candidate = {"symbol": symbol, "signal": [], "price": price}
+        return self.add_pattern(candidate, {"success": True, "profit_loss": profit_loss})
+
+    def score(self, texts: List[str]) -> Optional[np.ndarray]:
+        """
+        Top-k mean cosine similarity of each text to the stored patterns
+        Returns None when there are no patterns to compare against.
+        """
+        self.load()
+        started = time.perf_counter()
+        with self._lock:
+            patterns = self._matrix
+        if not len(patterns) or not texts:
+            return None
+
+        queries = embed_texts(texts)
+        if not np.any(queries):
+            return None
+        queries = _normalize(queries)
+        embed_seconds = time.perf_counter() - started
+        similarities = queries @ patterns.T
+        k = min(self.top_k, similarities.shape[1])
+        top = np.partition(similarities, -k, axis=1)[:, -k:]
+        scores = np.clip(top.mean(axis=1), 0.0, 1.0)
+
+        self.last_score = {
+            "candidates": len(texts),
+            "patterns": len(patterns),
+            "embed_seconds": round(embed_seconds, 4),
+            "score_seconds": round(time.perf_counter() - started - embed_seconds, 4)
+        }
+        return scores
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "patterns": len(self._ids),
+            "top_k": self.top_k,
+            "loaded_age_seconds": round(time.monotonic() - self._loaded_at, 1) if self._loaded_at else None,
+            "last_score": self.last_score
+        }
+
+
+# Global instance
+pattern_memory = PatternMemory()
+
+# Convenience functions
+def score_candidates(candidates: List[Dict[str, Any]], remember: bool = True) -> Optional[np.ndarray]:
+    """
+    Batched pattern similarity for candidates (None without stored patterns)
+    remember=False scores without keeping the candidates for outcome attribution.
+    """
+    if remember:
+        pattern_memory.remember(candidates)
+    return pattern_memory.score([pattern_text(candidate) for candidate in candidates])
+
+def record_pattern_outcome(symbol: str, success: bool, profit_loss: float,
+                           price: Optional[float] = None) -> Optional[str]:
+    """Feed a trade outcome back into the pattern matrix"""
+    try:
+        return pattern_memory.record_outcome(symbol, success, profit_loss, price)
+    except Exception as e:
+        pattern_logger.error(f"Error recording pattern outcome for {symbol}: {e}")
+        return None
+
+
+if __name__ == "__main__":
+    memory = PatternMemory({"top_k": 2})
+    memory._loaded_at = time.monotonic()
+    for signals in (["ema_cross_bullish", "vwap_break"], ["volume_spike", "vwap_break"]):
+        memory.add_pattern({"symbol": "GPRO", "signal": signals, "price": 2.5}, persist=False)
+    candidates = [{"symbol": "GPRO", "signal": ["ema_cross_bullish", "vwap_break"], "price": 2.5},
+                  {"symbol": "SAVA", "signal": ["volume_spike"], "price": 7.1}]
+    print(f"Scores: {memory.score([pattern_text(candidate) for candidate in candidates])}")
+    print(f"Status: {memory.get_status()}")
@@ -11,64 +11,162 @@ sys.path.append(str(Path(__file__).parent.parent.parent.parent))
 
 from Gremlin_Trade_Core.globals import (
     # Core imports
-    asyncio, np, pd, datetime, timezone,
+    asyncio, threading, np, pd, datetime, timezone,
     # Type imports
-    List, Dict, Any, Optional,
+    List, Dict, Any, Optional, Tuple,
     # Configuration and utilities
     CFG, MEM, logger, setup_module_logger,
     get_live_penny_stocks, apply_signal_rules
 )
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.universe_snapshot import (
+    universe_provider, UniverseSnapshot
+)
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.tiered_scanner import analyze_candidates
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.fundamentals_cache import fundamentals_cache
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.incremental_state import IncrementalState, get_incremental_state
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.feature_store import record_features
+from Gremlin_Trade_Core.Gremlin_Trader_Strategies.strategy_params import load_strategy_params
+from Gremlin_Trade_Core.Gremlin_Trader_Strategies.scan_context import run_cancellable
 
 # Set up logging
 strategy_logger = setup_module_logger("strategy", "penny_stock")
 
+# Universe records filtered between checks of the cancel flag
+CANCEL_CHECK_EVERY = 200
+
 class PennyStockStrategy:
     """
     Specialized strategy for penny stock detection and analysis
     Focuses on momentum, volume spikes, and gap patterns
+    The shared incremental state is used unless one is passed (backtests pass
+    a disabled one so replayed snapshots never touch the live cache).
     """
     
-    def __init__(self):
+    def __init__(self, incremental: Optional[IncrementalState] = None):
         self.config = CFG.get("strategy", {}).get("penny_stock_strategies", {})
         self.base_criteria = self.config.get("base_criteria", {})
         self.momentum_filters = self.config.get("momentum_filters", {})
         self.technical_indicators = self.config.get("technical_indicators", {})
         self.spoof_monitoring = CFG.get("strategy", {}).get("spoof_spike_monitoring", {})
+        self._apply_optimized_params()
+        self.incremental = incremental or get_incremental_state("penny_stock")
         
         strategy_logger.info("Penny stock strategy initialized")
     
-    async def scan_penny_stocks(self, limit: int = 50) -> List[Dict[str, Any]]:
+    def _apply_optimized_params(self):
+        """Override thresholds with the latest exported optimizer parameters"""
+        optimized = load_strategy_params()
+        thresholds = optimized.get("parameters", {}).get("rules", {}).get("penny_stock", {})
+        if not thresholds:
+            return
+        
+        # Copy the sections so the shared config stays untouched
+        self.base_criteria = {key: dict(value) if isinstance(value, dict) else value
+                              for key, value in self.base_criteria.items()}
+        self.momentum_filters = dict(self.momentum_filters)
+        targets = {
+            "min_price": (self.base_criteria.setdefault("price_range", {}), "min"),
+            "max_price": (self.base_criteria.setdefault("price_range", {}), "max"),
+            "min_volume": (self.base_criteria.setdefault("volume_criteria", {}), "min_volume"),
+            "max_float_million": (self.base_criteria.setdefault("float_criteria", {}), "max_float_million"),
+            "rotation_min": (self.base_criteria.setdefault("float_criteria", {}), "rotation_min"),
+            "intraday_gain_min": (self.momentum_filters, "intraday_gain_min")
+        }
+        for name, value in thresholds.items():
+            if name in targets:
+                section, key = targets[name]
+                section[key] = value
+        strategy_logger.info(f"Applied optimized penny stock thresholds v{optimized.get('version')}: {thresholds}")
+    
+    async def scan_penny_stocks(self, limit: int = 50, snapshot: Optional[UniverseSnapshot] = None) -> List[Dict[str, Any]]:
         """
         Scan for penny stocks meeting our criteria
         """
         try:
             strategy_logger.info(f"Starting penny stock scan - limit {limit}")
             
-            # Get live penny stocks from scanner
-            penny_stocks = get_live_penny_stocks(limit=limit * 2)  # Get more to filter
+            # Read the shared universe snapshot for this cycle
+            if snapshot is None:
+                snapshot = await universe_provider.get_snapshot()
+            penny_stocks = list(snapshot.stocks) if snapshot else get_live_penny_stocks()
+            
+            # Runs on the caller's loop so a strategy deadline cancels it
+            return await self._filter_and_analyze(penny_stocks, limit)
             
-            # Apply penny stock specific filtering
-            filtered_stocks = []
-            for stock in penny_stocks:
-                if await self._meets_penny_criteria(stock):
-                    # Add penny stock specific analysis
-                    enhanced_stock = await self._enhance_penny_analysis(stock)
-                    filtered_stocks.append(enhanced_stock)
-                    
-                    if len(filtered_stocks) >= limit:
-                        break
+        except Exception as e:
+            strategy_logger.error(f"Error in penny stock scan: {e}")
+            return []
+    
+    async def _filter_and_analyze(self, penny_stocks: List[Dict[str, Any]], limit: int) -> List[Dict[str, Any]]:
+        """Criteria filtering and penny analysis over the universe records"""
+        self.incremental.begin_cycle((self.base_criteria, self.momentum_filters))
+        try:
+            # Criteria filtering is CPU-only - a worker thread that stops between chunks when cancelled
+            cancel = threading.Event()
+            candidates, reused = await run_cancellable(self._select_candidates, penny_stocks, limit, cancel,
+                                                       cancel=cancel)
+            
+            # Add penny stock specific analysis (tier 2 concurrency budget)
+            analyzed = await analyze_candidates(candidates, self._enhance_penny_analysis)
+            analyzed_by_symbol = {enhanced.get("symbol"): enhanced for enhanced in analyzed}
+            for stock in candidates:
+                symbol = stock.get("symbol", "")
+                if symbol in analyzed_by_symbol:
+                    self.incremental.store(symbol, stock, analyzed_by_symbol[symbol])
+            filtered_stocks = analyzed + reused
             
             # Sort by penny stock score
             filtered_stocks.sort(key=lambda x: x.get("penny_score", 0), reverse=True)
             
-            strategy_logger.info(f"Penny stock scan complete: {len(filtered_stocks)} qualified stocks")
+            cycle = self.incremental.end_cycle()
+            strategy_logger.info(
+                f"Penny stock scan complete: {len(filtered_stocks)} qualified stocks "
+                f"(dirty {cycle['dirty']}/{cycle['checked']}, reused {len(reused)})"
+            )
             return filtered_stocks
             
+        except asyncio.CancelledError:
+            # Deadline hit - close the cycle; unfinished symbols stay dirty for the next one
+            self.incremental.end_cycle()
+            raise
         except Exception as e:
-            strategy_logger.error(f"Error in penny stock scan: {e}")
+            self.incremental.end_cycle()
+            strategy_logger.error(f"Error in penny stock analysis: {e}")
             return []
     
-    async def _meets_penny_criteria(self, stock: Dict[str, Any]) -> bool:
+    def _select_candidates(self, penny_stocks: List[Dict[str, Any]], limit: int,
+                           cancel: Optional[threading.Event] = None) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Stocks to analyze and cached results to reuse
+        Only symbols whose inputs moved are re-checked; stops early once cancel is set.
+        """
+        # Cheap fundamentals prefilter (vectorized over the cached lookup array)
+        max_float = self.base_criteria.get("float_criteria", {}).get("max_float_million", 25)
+        fundamentals_mask = fundamentals_cache.passes(
+            [stock.get("symbol", "") for stock in penny_stocks], max_float_million=max_float
+        )
+        penny_stocks = [stock for stock, keep in zip(penny_stocks, fundamentals_mask) if keep]
+        
+        candidates, reused = [], []
+        for position, stock in enumerate(penny_stocks):
+            if cancel is not None and position % CANCEL_CHECK_EVERY == 0 and cancel.is_set():
+                break
+            symbol = stock.get("symbol", "")
+            dirty, cached = self.incremental.check(symbol, stock)
+            if not dirty:
+                if cached is not None:
+                    reused.append(dict(cached))
+            elif self._meets_penny_criteria(stock):
+                candidates.append(stock)
+            else:
+                self.incremental.store(symbol, stock, None)
+            
+            if len(candidates) + len(reused) >= limit:
+                break
+        
+        return candidates, reused
+    
+    def _meets_penny_criteria(self, stock: Dict[str, Any]) -> bool:
         """Check if stock meets penny stock criteria"""
         try:
             # Price criteria
@@ -98,13 +196,11 @@ class PennyStockStrategy:
                     return False
                 
                 # Calculate rotation
-                rotation = (volume / 1000000) / float_mil if float_mil > 0 else 0
+                rotation = self._calculate_rotation(stock)
                 min_rotation = float_criteria.get("rotation_min", 2.0)
                 
                 if rotation < min_rotation:
                     return False
-                
-                stock["rotation"] = rotation
             
             # Momentum criteria
             up_pct = stock.get("up_pct", 0)
@@ -122,10 +218,15 @@ class PennyStockStrategy:
     async def _enhance_penny_analysis(self, stock: Dict[str, Any]) -> Dict[str, Any]:
         """Add penny stock specific analysis"""
         try:
+            # Writable overlay on the snapshot row - the record itself is not copied
             enhanced = stock.copy()
             
+            # Float rotation is derived here - snapshot records are read-only
+            if stock.get("float_million", 0) > 0:
+                enhanced["rotation"] = self._calculate_rotation(stock)
+            
             # Calculate penny stock score
-            penny_score = await self._calculate_penny_score(stock)
+            penny_score = await self._calculate_penny_score(enhanced)
             enhanced["penny_score"] = penny_score
             
             # Add momentum analysis
@@ -153,6 +254,11 @@ class PennyStockStrategy:
             strategy_logger.error(f"Error enhancing penny analysis: {e}")
             return stock
     
+    def _calculate_rotation(self, stock: Dict[str, Any]) -> float:
+        """Calculate float rotation from volume and float size"""
+        float_mil = stock.get("float_million", 0)
+        return (stock.get("volume", 0) / 1000000) / float_mil if float_mil > 0 else 0
+    
     async def _calculate_penny_score(self, stock: Dict[str, Any]) -> float:
         """Calculate comprehensive penny stock score"""
         try:
@@ -210,22 +316,14 @@ class PennyStockStrategy:
         try:
             analysis = {}
             
-            up_pct = stock.get("up_pct", 0)
-            volume = stock.get("volume", 0)
-            avg_volume = stock.get("avg_volume", volume)
+            features = record_features(stock, ("gap_pct", "momentum_type", "volume_ratio"))
+            up_pct = features["gap_pct"]
             
             # Momentum classification
-            if up_pct > 100:
-                analysis["momentum_type"] = "explosive"
-            elif up_pct > 50:
-                analysis["momentum_type"] = "strong"
-            elif up_pct > 20:
-                analysis["momentum_type"] = "moderate"
-            else:
-                analysis["momentum_type"] = "weak"
+            analysis["momentum_type"] = features["momentum_type"]
             
             # Volume acceleration
-            volume_ratio = volume / avg_volume if avg_volume > 0 else 1.0
+            volume_ratio = features["volume_ratio"]
             analysis["volume_acceleration"] = volume_ratio
             
             # Acceleration factor from config
@@ -250,11 +348,8 @@ class PennyStockStrategy:
             spoof_config = self.spoof_monitoring.get("spoof_detection", {})
             
             # Volume-based spoof detection
-            volume = stock.get("volume", 0)
-            avg_volume = stock.get("avg_volume", volume)
-            
             wall_multiplier = spoof_config.get("wall_size_multiplier", 3.0)
-            volume_ratio = volume / avg_volume if avg_volume > 0 else 1.0
+            volume_ratio = record_features(stock, ("volume_ratio",))["volume_ratio"]
             
             # Simple spoof indicators
             analysis["volume_spike_ratio"] = volume_ratio
@@ -293,28 +388,14 @@ class PennyStockStrategy:
         try:
             analysis = {}
             
-            up_pct = stock.get("up_pct", 0)
-            
-            # Gap classification
-            if up_pct > 20:
-                analysis["gap_type"] = "major_gap"
-            elif up_pct > 10:
-                analysis["gap_type"] = "significant_gap"
-            elif up_pct > 5:
-                analysis["gap_type"] = "minor_gap"
-            else:
-                analysis["gap_type"] = "no_gap"
+            features = record_features(stock, ("gap_type", "gap_strength", "volume_ratio"))
             
-            # Gap strength
-            gap_strength = min(1.0, up_pct / 50.0)  # Normalize to 50% max
-            analysis["gap_strength"] = gap_strength
+            # Gap classification and strength (normalized to 50% max)
+            analysis["gap_type"] = features["gap_type"]
+            analysis["gap_strength"] = features["gap_strength"]
             
             # Volume confirmation
-            volume = stock.get("volume", 0)
-            avg_volume = stock.get("avg_volume", volume)
-            volume_ratio = volume / avg_volume if avg_volume > 0 else 1.0
-            
-            analysis["volume_confirmed_gap"] = volume_ratio > 2.0
+            analysis["volume_confirmed_gap"] = features["volume_ratio"] > 2.0
             
             return analysis
             
@@ -338,8 +419,7 @@ class PennyStockStrategy:
             # RSI analysis (mock - would need calculation)
             rsi_config = self.technical_indicators.get("rsi_settings", {})
             # Mock RSI based on momentum
-            up_pct = stock.get("up_pct", 0)
-            mock_rsi = min(90, 50 + (up_pct / 2))  # Rough approximation
+            mock_rsi = record_features(stock, ("rsi_estimate",))["rsi_estimate"]  # Rough approximation
             analysis["rsi_estimate"] = mock_rsi
             analysis["rsi_overbought"] = mock_rsi > rsi_config.get("overbought", 70)
             
@@ -359,9 +439,9 @@ class PennyStockStrategy:
 penny_stock_strategy = PennyStockStrategy()
 
 # Export functions for use by other modules
-async def scan_penny_stocks(limit: int = 50) -> List[Dict[str, Any]]:
+async def scan_penny_stocks(limit: int = 50, snapshot: Optional[UniverseSnapshot] = None) -> List[Dict[str, Any]]:
     """Scan for penny stocks using the penny stock strategy"""
-    return await penny_stock_strategy.scan_penny_stocks(limit)
+    return await penny_stock_strategy.scan_penny_stocks(limit, snapshot)
 
 def get_penny_strategy_config() -> Dict[str, Any]:
     """Get penny stock strategy configuration"""
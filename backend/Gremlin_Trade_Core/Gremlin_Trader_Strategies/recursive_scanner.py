@@ -11,31 +11,49 @@ sys.path.append(str(Path(__file__).parent.parent.parent.parent))
 
 from Gremlin_Trade_Core.globals import (
     # Core imports
-    asyncio, np, pd, datetime, timezone,
+    asyncio, threading, np, pd, datetime, timezone, time,
     # Type imports
     List, Dict, Any, Optional,
     # Configuration and utilities
     CFG, MEM, logger, setup_module_logger,
     recursive_scan, run_scanner, get_live_penny_stocks,
-    embed_text, package_embedding
+    package_embedding
 )
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.universe_snapshot import (
+    universe_provider, UniverseSnapshot
+)
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.stock_table import merge_records
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.incremental_state import IncrementalState, get_incremental_state
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.market_state_index import get_state_index
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.bar_resampler import get_resampled_bars
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.pattern_search import search_patterns
+from .scan_context import ScanContext, run_cancellable
+from .pattern_memory import score_candidates
 
 # Set up logging
 strategy_logger = setup_module_logger("strategy", "recursive_scanner")
 
+# Symbols scanned between checks of the cancel flag
+CANCEL_CHECK_EVERY = 200
+
 class RecursiveScannerStrategy:
     """
     Recursive scanner strategy for penny stock detection
     Implements multi-timeframe analysis with hierarchical refinement
+    Backtests pass a disabled incremental state and record_memory=False so
+    replayed scans leave the live cache and pattern memory untouched.
     """
     
-    def __init__(self):
+    def __init__(self, incremental: Optional[IncrementalState] = None, record_memory: bool = True):
         self.config = CFG.get("strategy", {}).get("gremlin_scanner", {})
         self.recursive_config = self.config.get("recursive_scanning", {})
         self.signal_filters = self.config.get("signal_filters", {})
         self.scanner_criteria = self.config.get("scanner_criteria", {})
         self.active_scans = {}
         self.refinement_stages = []
+        self.last_scan_stats: Dict[str, Any] = {}
+        self.incremental = incremental or get_incremental_state("recursive_scanner")
+        self.record_memory = record_memory
         
         # Initialize refinement stages from config
         recursive_features = CFG.get("strategy", {}).get("recursive_features", {})
@@ -46,10 +64,13 @@ class RecursiveScannerStrategy:
         
         strategy_logger.info("Recursive scanner strategy initialized")
     
-    async def run_recursive_scan(self, symbols: List[str] = None, max_depth: int = None) -> List[Dict[str, Any]]:
+    async def run_recursive_scan(self, symbols: List[str] = None, max_depth: int = None,
+                                 snapshot: Optional[UniverseSnapshot] = None,
+                                 context: Optional[ScanContext] = None) -> List[Dict[str, Any]]:
         """
         Run recursive scanning with multiple timeframes and refinement stages
         """
+        cycle_open = False
         try:
             # Use config defaults if not provided
             if symbols is None:
@@ -63,25 +84,65 @@ class RecursiveScannerStrategy:
             # Get timeframes from config
             timeframes = self.recursive_config.get("timeframe_cascade", ["1min", "5min", "15min", "1h"])
             
+            # All stages, levels and candidates share one scan context per cycle
+            if context is None:
+                if snapshot is None:
+                    snapshot = await universe_provider.get_snapshot()
+                context = ScanContext(snapshot)
+            
+            # Only symbols whose inputs moved since their last scan go through the stages
+            self.incremental.begin_cycle((self.scanner_criteria, self.signal_filters, self.refinement_stages, timeframes, max_depth))
+            cycle_open = True
+            dirty_symbols, reused = self.incremental.partition(symbols, key=lambda symbol: symbol, record=context.get_stock)
+            
+            stage_seconds = {}
+            
             # Stage 1: Initial broad scan
-            stage1_results = await self._run_initial_scan(symbols)
+            started = time.perf_counter()
+            stage1_results = await self._run_initial_scan(dirty_symbols, context) if dirty_symbols else []
+            stage_seconds["initial"] = round(time.perf_counter() - started, 4)
             strategy_logger.info(f"Stage 1 complete: {len(stage1_results)} candidates")
             
             # Stage 2: Recursive refinement
-            stage2_results = await self._run_recursive_refinement(stage1_results, timeframes, max_depth)
+            started = time.perf_counter()
+            stage2_results = await self._run_recursive_refinement(stage1_results, timeframes, max_depth, context)
+            stage_seconds["refinement"] = round(time.perf_counter() - started, 4)
             strategy_logger.info(f"Stage 2 complete: {len(stage2_results)} refined candidates")
             
             # Stage 3: Final filtering with memory guidance
-            final_results = await self._run_final_filtering(stage2_results)
-            strategy_logger.info(f"Final scan complete: {len(final_results)} qualified signals")
+            started = time.perf_counter()
+            final_results = await self._run_final_filtering(stage2_results, stage_seconds)
+            stage_seconds["final"] = round(time.perf_counter() - started, 4)
+            
+            by_symbol = {symbol: [] for symbol in dirty_symbols}
+            for result in final_results:
+                by_symbol.setdefault(result.get("symbol"), []).append(result)
+            for symbol in dirty_symbols:
+                self.incremental.store(symbol, context.get_stock(symbol), by_symbol[symbol])
+            final_results = final_results + [dict(result) for results in reused.values() for result in results]
+            final_results.sort(key=lambda x: x.get("final_confidence", 0), reverse=True)
+            
+            cycle = self.incremental.end_cycle()
+            strategy_logger.info(
+                f"Final scan complete: {len(final_results)} qualified signals "
+                f"(dirty {cycle['dirty']}/{cycle['checked']})"
+            )
+            
+            self.last_scan_stats = {**context.get_stats(), "incremental": cycle, "stage_seconds": stage_seconds}
+            strategy_logger.debug(f"Scan context: {self.last_scan_stats}")
             
             return final_results
             
+        except asyncio.CancelledError:
+            # Deadline hit - close the cycle; unfinished symbols stay dirty for the next one
+            if cycle_open:
+                self.incremental.end_cycle()
+            raise
         except Exception as e:
             strategy_logger.error(f"Error in recursive scan: {e}")
             return []
     
-    async def _run_initial_scan(self, symbols: List[str]) -> List[Dict[str, Any]]:
+    async def _run_initial_scan(self, symbols: List[str], context: Optional[ScanContext] = None) -> List[Dict[str, Any]]:
         """Run initial broad scan to identify candidates"""
         try:
             # Use the first refinement stage criteria if available
@@ -90,8 +151,9 @@ class RecursiveScannerStrategy:
             else:
                 criteria = self.scanner_criteria
             
-            # Run scanner with initial criteria
-            results = run_scanner(symbols)
+            # Run scanner with initial criteria - synchronous, so off the event loop
+            cancel = threading.Event()
+            results = await run_cancellable(self._scan_symbols, symbols, context, cancel, cancel=cancel)
             
             # Filter by initial criteria
             filtered_results = []
@@ -107,37 +169,59 @@ class RecursiveScannerStrategy:
             strategy_logger.error(f"Error in initial scan: {e}")
             return []
     
+    def _scan_symbols(self, symbols: List[str], context: Optional[ScanContext] = None,
+                      cancel: Optional[threading.Event] = None) -> List[Dict[str, Any]]:
+        """run_scanner over the symbols in chunks, stopping early once cancel is set"""
+        results = []
+        for start in range(0, len(symbols), CANCEL_CHECK_EVERY):
+            if cancel is not None and cancel.is_set():
+                break
+            results.extend(run_scanner(symbols[start:start + CANCEL_CHECK_EVERY], context=context))
+        return results
+    
     async def _run_recursive_refinement(self, candidates: List[Dict[str, Any]], 
-                                       timeframes: List[str], max_depth: int) -> List[Dict[str, Any]]:
+                                       timeframes: List[str], max_depth: int,
+                                       context: Optional[ScanContext] = None) -> List[Dict[str, Any]]:
         """Run recursive refinement across multiple timeframes"""
         try:
-            refined_results = []
-            
-            for candidate in candidates:
-                symbol = candidate.get("symbol")
-                if not symbol:
-                    continue
-                
-                # Run recursive scan on single symbol across timeframes
-                recursive_hits = recursive_scan([symbol], timeframes[:max_depth])
-                
-                # Combine with original candidate data
-                for hit in recursive_hits:
-                    combined_result = {**candidate, **hit}
-                    combined_result["stage"] = "recursive"
-                    combined_result["refinement_depth"] = len(timeframes[:max_depth])
-                    
-                    # Apply signal filters
-                    if self._apply_signal_filters(combined_result):
-                        refined_results.append(combined_result)
-            
-            return refined_results
-            
+            # recursive_scan is synchronous - run the whole loop on a worker thread
+            cancel = threading.Event()
+            return await run_cancellable(self._refine_candidates, candidates, timeframes, max_depth, context, cancel,
+                                         cancel=cancel)
         except Exception as e:
             strategy_logger.error(f"Error in recursive refinement: {e}")
             return candidates  # Return original candidates if refinement fails
     
-    async def _run_final_filtering(self, candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _refine_candidates(self, candidates: List[Dict[str, Any]], timeframes: List[str], max_depth: int,
+                           context: Optional[ScanContext] = None,
+                           cancel: Optional[threading.Event] = None) -> List[Dict[str, Any]]:
+        """Refine each candidate across the timeframe cascade, stopping early once cancel is set"""
+        refined_results = []
+        
+        for candidate in candidates:
+            if cancel is not None and cancel.is_set():
+                break
+            symbol = candidate.get("symbol")
+            if not symbol:
+                continue
+            
+            # Run recursive scan on single symbol across timeframes
+            recursive_hits = recursive_scan([symbol], timeframes[:max_depth], context=context)
+            
+            # Combine with original candidate data
+            for hit in recursive_hits:
+                combined_result = merge_records(candidate, hit)
+                combined_result["stage"] = "recursive"
+                combined_result["refinement_depth"] = len(timeframes[:max_depth])
+                
+                # Apply signal filters
+                if self._apply_signal_filters(combined_result):
+                    refined_results.append(combined_result)
+        
+        return refined_results
+    
+    async def _run_final_filtering(self, candidates: List[Dict[str, Any]],
+                                   stage_seconds: Optional[Dict[str, float]] = None) -> List[Dict[str, Any]]:
         """Run final filtering with memory guidance and pattern recognition"""
         try:
             final_results = []
@@ -146,16 +230,22 @@ class RecursiveScannerStrategy:
             memory_features = CFG.get("strategy", {}).get("recursive_features", {}).get("memory_guided_filtering", {})
             memory_enabled = memory_features.get("enabled", True)
             
-            for candidate in candidates:
-                # Apply final stage criteria if available
-                if len(self.refinement_stages) > 2:
-                    final_criteria = self.refinement_stages[2].get("criteria", {})
-                    if not self._meets_final_criteria(candidate, final_criteria):
-                        continue
-                
+            # Apply final stage criteria if available
+            if len(self.refinement_stages) > 2:
+                final_criteria = self.refinement_stages[2].get("criteria", {})
+                candidates = [candidate for candidate in candidates if self._meets_final_criteria(candidate, final_criteria)]
+            
+            # Memory similarity for every survivor in one batch
+            similarities = [None] * len(candidates)
+            if memory_enabled and candidates:
+                started = time.perf_counter()
+                similarities = await self._calculate_memory_similarities(candidates)
+                if stage_seconds is not None:
+                    stage_seconds["memory_similarity"] = round(time.perf_counter() - started, 4)
+            
+            for candidate, similarity_score in zip(candidates, similarities):
                 # Memory-guided filtering
                 if memory_enabled:
-                    similarity_score = await self._calculate_memory_similarity(candidate)
                     candidate["memory_similarity"] = similarity_score
                     
                     similarity_threshold = memory_features.get("similarity_threshold", 0.8)
@@ -168,6 +258,18 @@ class RecursiveScannerStrategy:
                 
                 final_results.append(candidate)
             
+            # Forward outcomes of the most similar historical setups
+            started = time.perf_counter()
+            await run_cancellable(self._attach_similar_setups, final_results)
+            if stage_seconds is not None:
+                stage_seconds["similar_setups"] = round(time.perf_counter() - started, 4)
+            
+            # Where else the recent price shape occurred, as a confidence factor
+            started = time.perf_counter()
+            await run_cancellable(self._attach_pattern_matches, final_results)
+            if stage_seconds is not None:
+                stage_seconds["pattern_search"] = round(time.perf_counter() - started, 4)
+            
             # Sort by confidence
             final_results.sort(key=lambda x: x.get("final_confidence", 0), reverse=True)
             
@@ -252,32 +354,69 @@ class RecursiveScannerStrategy:
             strategy_logger.error(f"Error checking final criteria: {e}")
             return True
     
-    async def _calculate_memory_similarity(self, candidate: Dict[str, Any]) -> float:
-        """Calculate similarity with historical patterns in memory"""
+    async def _calculate_memory_similarities(self, candidates: List[Dict[str, Any]]) -> List[float]:
+        """Similarity of each candidate to successful patterns in memory - one batch, one matrix multiply"""
         try:
-            # Create text summary for similarity comparison
-            symbol = candidate.get("symbol", "")
-            signals = candidate.get("signal", [])
-            price = candidate.get("price", 0)
+            scores = await run_cancellable(score_candidates, candidates, self.record_memory)
+            if scores is not None:
+                return [round(float(score), 4) for score in scores]
             
-            summary = f"{symbol} signals: {', '.join(signals)} at ${price:.2f}"
+            # No successful patterns stored yet - fall back to signal strength
+            return [
+                min(1.0, len(candidate.get("signal", [])) * 0.2 + candidate.get("confidence", 0.5))
+                for candidate in candidates
+            ]
             
-            # Generate embedding
-            vector = embed_text(summary)
-            
-            # TODO: Query memory store for similar patterns
-            # For now, return a mock similarity score based on signal strength
-            signal_count = len(signals)
-            confidence = candidate.get("confidence", 0.5)
-            
-            # Simple heuristic for similarity
-            similarity = min(1.0, (signal_count * 0.2) + confidence)
+        except Exception as e:
+            strategy_logger.error(f"Error calculating memory similarity: {e}")
+            return [0.5] * len(candidates)  # Default similarity
+    
+    async def _calculate_memory_similarity(self, candidate: Dict[str, Any]) -> float:
+        """Calculate similarity with historical patterns in memory"""
+        return (await self._calculate_memory_similarities([candidate]))[0]
+    
+    def _attach_similar_setups(self, candidates: List[Dict[str, Any]]):
+        """Add what happened after the k most similar market states to each candidate"""
+        try:
+            index_config = CFG.get("strategy", {}).get("market_state_index", {})
+            if not index_config.get("enabled", True) or not candidates:
+                return
+            timeframe = index_config.get("scanner_timeframe", "5min")
+            index = get_state_index(timeframe)
+            if not index.get_status()["states"]:
+                return
+            
+            bars = {candidate["symbol"]: get_resampled_bars(candidate["symbol"], timeframe, limit=index.window)
+                    for candidate in candidates if candidate.get("symbol")}
+            setups = index.similar_setups_many(bars)
+            for candidate in candidates:
+                if candidate.get("symbol") in setups:
+                    candidate["similar_setups"] = setups[candidate["symbol"]]
             
-            return similarity
+        except Exception as e:
+            strategy_logger.error(f"Error matching similar setups: {e}")
+    
+    def _attach_pattern_matches(self, candidates: List[Dict[str, Any]]):
+        """
+        Search the bar store for the recent shape of the top candidates and rescore them
+        Off unless pattern_search.scanner_scoring is set - each call scans the whole store.
+        """
+        try:
+            search_config = CFG.get("strategy", {}).get("pattern_search", {})
+            if not search_config.get("enabled", True) or not search_config.get("scanner_scoring", False) or not candidates:
+                return
+            top = sorted(candidates, key=lambda x: x.get("final_confidence", 0), reverse=True)
+            top = [candidate for candidate in top[:search_config.get("scanner_candidates", 3)] if candidate.get("symbol")]
+            
+            results = search_patterns([candidate["symbol"] for candidate in top])
+            for candidate in top:
+                result = results.get(candidate["symbol"].upper())
+                if result and result.get("count"):
+                    candidate["pattern_matches"] = result
+                    candidate["final_confidence"] = self._calculate_final_confidence(candidate)
             
         except Exception as e:
-            strategy_logger.error(f"Error calculating memory similarity: {e}")
-            return 0.5  # Default similarity
+            strategy_logger.error(f"Error searching price patterns: {e}")
     
     def _calculate_final_confidence(self, result: Dict[str, Any]) -> float:
         """Calculate final confidence score for the signal"""
@@ -300,7 +439,13 @@ class RecursiveScannerStrategy:
             memory_similarity = result.get("memory_similarity", 0.5)
             confidence += memory_similarity * 0.1
             
-            return min(1.0, confidence)
+            # Historical pattern factor - win rate of matching shapes around 50%
+            pattern_matches = result.get("pattern_matches")
+            if pattern_matches and pattern_matches.get("count"):
+                weight = CFG.get("strategy", {}).get("pattern_search", {}).get("scanner_weight", 0.1)
+                confidence += (pattern_matches.get("win_rate", 0.5) - 0.5) * 2 * weight
+            
+            return max(0.0, min(1.0, confidence))
             
         except Exception as e:
             strategy_logger.error(f"Error calculating final confidence: {e}")
@@ -310,9 +455,11 @@ class RecursiveScannerStrategy:
 recursive_scanner = RecursiveScannerStrategy()
 
 # Export functions for use by other modules
-async def run_recursive_strategy(symbols: List[str] = None, max_depth: int = None) -> List[Dict[str, Any]]:
+async def run_recursive_strategy(symbols: List[str] = None, max_depth: int = None,
+                                 snapshot: Optional[UniverseSnapshot] = None,
+                                 context: Optional[ScanContext] = None) -> List[Dict[str, Any]]:
     """Run the recursive scanner strategy"""
-    return await recursive_scanner.run_recursive_scan(symbols, max_depth)
+    return await recursive_scanner.run_recursive_scan(symbols, max_depth, snapshot, context)
 
 def get_strategy_config() -> Dict[str, Any]:
     """Get strategy configuration"""
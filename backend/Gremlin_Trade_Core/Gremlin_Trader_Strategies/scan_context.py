@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Scan Context - Per-cycle memoized scan state
+Created once per strategy cycle and handed to every recursion level and
+candidate, so the universe is read once and indicators / rule outcomes are
+computed once per symbol. Hit and miss counters make the reuse visible.
+run_cancellable runs a strategy's synchronous stages on a worker thread
+without letting them outlive the strategy's deadline.
+"""
+
+# Import ALL dependencies through globals.py (required)
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent.parent))
+
+from Gremlin_Trade_Core.globals import (
+    # Core imports
+    asyncio, threading, time,
+    # Type imports
+    List, Dict, Any, Optional, Callable, Tuple,
+    # Configuration and utilities
+    setup_module_logger, get_live_penny_stocks
+)
+
+# Set up logging
+context_logger = setup_module_logger("strategy", "scan_context")
+
+CACHE_KINDS = ("universe", "indicator", "rule")
+
+
+class ScanContext:
+    """
+    Scan state shared across one cycle
+    Holds the universe snapshot, a symbol index, computed indicators and rule
+    outcomes. Without a snapshot the universe is fetched on first use only.
+    """
+
+    def __init__(self, snapshot: Optional[Any] = None, stocks: Optional[List[Dict[str, Any]]] = None):
+        self.snapshot = snapshot
+        if stocks is None and snapshot is not None:
+            stocks = snapshot.stocks
+        self._stocks = list(stocks) if stocks is not None else None
+        self._index: Optional[Dict[str, Any]] = None
+        self._memo: Dict[Tuple[str, str, str], Any] = {}
+        self.hits = {kind: 0 for kind in CACHE_KINDS}
+        self.misses = {kind: 0 for kind in CACHE_KINDS}
+        self.fetches = 0
+        self.created_at = time.monotonic()
+
+    @property
+    def stocks(self) -> List[Dict[str, Any]]:
+        """Universe records - fetched at most once per context"""
+        if self._stocks is None:
+            self.misses["universe"] += 1
+            self.fetches += 1
+            self._stocks = get_live_penny_stocks()
+        else:
+            self.hits["universe"] += 1
+        return self._stocks
+
+    def get_stock(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Record for a symbol via an index built once"""
+        if self._index is None:
+            self._index = {}
+            for stock in self.stocks:
+                self._index.setdefault(stock.get("symbol"), stock)
+        return self._index.get(symbol)
+
+    def _memoize(self, kind: str, symbol: str, name: str, compute: Callable[[], Any]) -> Any:
+        key = (kind, symbol, name)
+        if key in self._memo:
+            self.hits[kind] += 1
+            return self._memo[key]
+        self.misses[kind] += 1
+        value = compute()
+        self._memo[key] = value
+        return value
+
+    def indicator(self, symbol: str, name: str, compute: Callable[[], Any]) -> Any:
+        """Computed indicator for a symbol, evaluated once per cycle"""
+        return self._memoize("indicator", symbol, name, compute)
+
+    def rule(self, symbol: str, name: str, compute: Callable[[], Any]) -> Any:
+        """Rule outcome for a symbol, evaluated once per cycle"""
+        return self._memoize("rule", symbol, name, compute)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache counters for this cycle"""
+        return {
+            "snapshot_version": getattr(self.snapshot, "version", None),
+            "universe_fetches": self.fetches,
+            "symbols": len(self._stocks) if self._stocks is not None else 0,
+            "hits": dict(self.hits),
+            "misses": dict(self.misses),
+            "age_seconds": round(time.monotonic() - self.created_at, 3)
+        }
+
+
+async def run_cancellable(func: Callable[..., Any], *args: Any,
+                          cancel: Optional[threading.Event] = None) -> Any:
+    """
+    Run synchronous scan work on a worker thread, bounded by the caller's lifetime
+    When the caller is cancelled (a strategy deadline) the cancel event is set
+    and the thread is waited for before the cancellation propagates, so nothing
+    keeps mutating strategy state after the run has been abandoned. Long loops
+    take the same event and check it between chunks.
+    """
+    work = asyncio.ensure_future(asyncio.to_thread(func, *args))
+    try:
+        return await asyncio.shield(work)
+    except asyncio.CancelledError:
+        if cancel is not None:
+            cancel.set()
+        await asyncio.wait({work})
+        raise
+
+
+if __name__ == "__main__":
+    from Gremlin_Trade_Core.globals import recursive_scan
+
+    context = ScanContext(stocks=get_live_penny_stocks())
+    for symbol in ["GPRO", "SAVA", "GPRO"]:
+        recursive_scan([symbol], ["1min", "5min", "15min"], context=context)
+    print(f"Scan context stats: {context.get_stats()}")
@@ -11,14 +11,20 @@ sys.path.append(str(Path(__file__).parent.parent.parent.parent))
 
 from Gremlin_Trade_Core.globals import (
     # Core imports
-    asyncio, np, pd, datetime, timezone,
+    asyncio, np, pd, datetime, timezone, time,
     # Type imports
-    List, Dict, Any, Optional,
+    List, Dict, Any, Optional, Callable, Awaitable,
     # Configuration and utilities
     CFG, MEM, logger, setup_module_logger,
     embed_text, package_embedding
 )
 
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.incremental_state import get_incremental_stats
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.feature_store import get_feature_stats
+from .scan_context import ScanContext
+from .backtest_engine import backtest_engine
+from .strategy_params import load_strategy_params
+
 # Set up logging
 strategy_logger = setup_module_logger("strategy", "manager")
 
@@ -32,6 +38,11 @@ class StrategyManager:
         self.active_strategies = []
         self.performance_metrics = {}
         self.strategy_weights = {}
+        self.last_scan_context: Dict[str, Any] = {}
+        self.manager_config = self.config.get("strategy_manager", {})
+        self.latency: Dict[str, Dict[str, Any]] = {}
+        self.last_run_metadata: Dict[str, Any] = {}
+        self.running: Dict[str, float] = {}
         
         # Initialize strategy weights from config
         self.strategy_weights = {
@@ -39,48 +50,134 @@ class StrategyManager:
             "penny_stock": 0.4
         }
         
+        # Weights from the latest exported optimizer parameters
+        optimized = load_strategy_params()
+        optimized_weights = optimized.get("parameters", {}).get("weights", {})
+        optimized_weights = {name: w for name, w in optimized_weights.items() if name in self.strategy_weights}
+        if optimized_weights:
+            self.strategy_weights.update(optimized_weights)
+            strategy_logger.info(f"Applied optimized strategy weights v{optimized.get('version')}: {self.strategy_weights}")
+        
         strategy_logger.info("Strategy manager initialized")
     
+    def _strategy_timeout(self, name: str) -> float:
+        """Deadline for one strategy run in seconds"""
+        timeouts = self.manager_config.get("timeouts", {})
+        if name in timeouts:
+            return timeouts[name]
+        if name == "recursive_scanner":
+            recursive_config = self.config.get("gremlin_scanner", {}).get("recursive_scanning") \
+                or self.config.get("recursive_scanning", {})
+            if "timeout_seconds" in recursive_config:
+                return recursive_config["timeout_seconds"]
+        return self.manager_config.get("default_timeout_seconds", 30)
+    
+    def _record_latency(self, name: str, status: str, elapsed_ms: float):
+        """Track per-strategy latency across runs"""
+        stats = self.latency.setdefault(name, {
+            "runs": 0, "ok": 0, "timeouts": 0, "errors": 0, "skipped": 0,
+            "total_ms": 0.0, "max_ms": 0.0, "last_ms": 0.0, "last_status": None
+        })
+        stats["runs"] += 1
+        stats[{"ok": "ok", "timeout": "timeouts", "skipped": "skipped"}.get(status, "errors")] += 1
+        stats["total_ms"] += elapsed_ms
+        stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+        stats["last_ms"] = elapsed_ms
+        stats["last_status"] = status
+    
+    async def _run_strategy(self, name: str, run: Callable[[], Awaitable[List[Dict[str, Any]]]]) -> Dict[str, Any]:
+        """
+        Run one strategy under its own deadline
+        The deadline cancels the strategy: its coroutine stops at the next await
+        and its worker-thread stages stop at their next cancel check. A strategy
+        still running from an overlapping scan is skipped rather than started twice.
+        """
+        timeout = self._strategy_timeout(name)
+        started = time.perf_counter()
+        outcome = {"strategy": name, "status": "ok", "results": [], "timeout_seconds": timeout}
+        if name in self.running:
+            outcome["status"] = "skipped"
+            strategy_logger.warning(f"Strategy {name} still running from an earlier scan - skipped")
+        else:
+            self.running[name] = time.time()
+            try:
+                outcome["results"] = await asyncio.wait_for(run(), timeout=timeout)
+            except asyncio.TimeoutError:
+                outcome["status"] = "timeout"
+                strategy_logger.warning(f"Strategy {name} timed out after {timeout}s - excluded from this scan")
+            except Exception as e:
+                outcome["status"] = "error"
+                outcome["error"] = str(e)
+                strategy_logger.error(f"Error in {name} strategy: {e}")
+            finally:
+                self.running.pop(name, None)
+        
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        outcome["latency_ms"] = round(elapsed_ms, 1)
+        self._record_latency(name, outcome["status"], elapsed_ms)
+        return outcome
+    
     async def run_comprehensive_scan(self, symbols: List[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
         """
         Run comprehensive scan using all available strategies
         """
+        scan = await self.run_comprehensive_scan_with_metadata(symbols, limit)
+        return scan["results"]
+    
+    async def run_comprehensive_scan_with_metadata(self, symbols: List[str] = None, limit: int = 50) -> Dict[str, Any]:
+        """
+        Run all strategies concurrently and merge whatever finishes in time
+        Returns the ranked results plus per-strategy status and latency.
+        """
+        started = time.perf_counter()
+        metadata = {"strategies": {}, "timed_out": [], "failed": [], "skipped": [], "partial": False}
         try:
             strategy_logger.info(f"Starting comprehensive scan - limit {limit}")
             
-            all_results = []
+            # Take one universe snapshot so every strategy scans the same data
+            from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.universe_snapshot import universe_provider
+            from .recursive_scanner import run_recursive_strategy, recursive_scanner
+            from .penny_stock_strategy import scan_penny_stocks
+            snapshot = await universe_provider.get_snapshot()
+            context = ScanContext(snapshot)
             
-            # Run recursive scanner strategy
-            try:
-                from .recursive_scanner import run_recursive_strategy
-                recursive_results = await run_recursive_strategy(symbols)
-                
-                # Tag results with strategy source
-                for result in recursive_results:
-                    result["strategy_source"] = "recursive_scanner"
-                    result["strategy_weight"] = self.strategy_weights.get("recursive_scanner", 0.6)
-                
-                all_results.extend(recursive_results)
-                strategy_logger.info(f"Recursive scanner: {len(recursive_results)} results")
-                
-            except Exception as e:
-                strategy_logger.error(f"Error in recursive scanner: {e}")
+            strategies = {
+                "recursive_scanner": lambda: run_recursive_strategy(symbols, snapshot=snapshot, context=context),
+                "penny_stock": lambda: scan_penny_stocks(limit, snapshot=snapshot)
+            }
+            outcomes = await asyncio.gather(*[self._run_strategy(name, run) for name, run in strategies.items()])
             
-            # Run penny stock strategy
-            try:
-                from .penny_stock_strategy import scan_penny_stocks
-                penny_results = await scan_penny_stocks(limit)
+            all_results = []
+            for outcome in outcomes:
+                name = outcome["strategy"]
                 
                 # Tag results with strategy source
-                for result in penny_results:
-                    result["strategy_source"] = "penny_stock"
-                    result["strategy_weight"] = self.strategy_weights.get("penny_stock", 0.4)
-                
-                all_results.extend(penny_results)
-                strategy_logger.info(f"Penny stock strategy: {len(penny_results)} results")
+                for result in outcome["results"]:
+                    result["strategy_source"] = name
+                    result["strategy_weight"] = self.strategy_weights.get(name, 0.5)
+                all_results.extend(outcome["results"])
                 
-            except Exception as e:
-                strategy_logger.error(f"Error in penny stock strategy: {e}")
+                metadata["strategies"][name] = {
+                    key: value for key, value in outcome.items() if key not in ("strategy", "results")
+                }
+                metadata["strategies"][name]["result_count"] = len(outcome["results"])
+                if outcome["status"] == "timeout":
+                    metadata["timed_out"].append(name)
+                elif outcome["status"] == "error":
+                    metadata["failed"].append(name)
+                elif outcome["status"] == "skipped":
+                    metadata["skipped"].append(name)
+                strategy_logger.info(f"{name}: {len(outcome['results'])} results ({outcome['status']}, {outcome['latency_ms']}ms)")
+            
+            metadata["partial"] = bool(metadata["timed_out"] or metadata["failed"] or metadata["skipped"])
+            metadata["snapshot_version"] = getattr(snapshot, "version", None)
+            self.last_scan_context = context.get_stats()
+            metadata["scan_context"] = self.last_scan_context
+            metadata["incremental"] = get_incremental_stats()
+            metadata["features"] = get_feature_stats()
+            if "recursive_scanner" in metadata["strategies"]:
+                metadata["strategies"]["recursive_scanner"]["stage_seconds"] = \
+                    recursive_scanner.last_scan_stats.get("stage_seconds", {})
             
             # Combine and rank results
             combined_results = await self._combine_strategy_results(all_results)
@@ -89,11 +186,18 @@ class StrategyManager:
             final_results = combined_results[:limit]
             
             strategy_logger.info(f"Comprehensive scan complete: {len(final_results)} final results")
-            return final_results
+            return {"results": final_results, "metadata": metadata}
             
         except Exception as e:
             strategy_logger.error(f"Error in comprehensive scan: {e}")
-            return []
+            metadata["error"] = str(e)
+            metadata["partial"] = True
+            return {"results": [], "metadata": metadata}
+        
+        finally:
+            metadata["total_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            metadata["timestamp"] = datetime.now(timezone.utc).isoformat()
+            self.last_run_metadata = metadata
     
     async def _combine_strategy_results(self, all_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -248,17 +352,30 @@ class StrategyManager:
             
             # Get individual strategy performance
             for strategy_name in self.strategy_weights.keys():
+                latency = self.latency.get(strategy_name, {})
+                runs = latency.get("runs", 0)
                 performance["strategies"][strategy_name] = {
                     "weight": self.strategy_weights[strategy_name],
                     "active": True,
-                    "last_run": datetime.now(timezone.utc).isoformat()
+                    "timeout_seconds": self._strategy_timeout(strategy_name),
+                    "runs": runs,
+                    "timeouts": latency.get("timeouts", 0),
+                    "errors": latency.get("errors", 0),
+                    "skipped": latency.get("skipped", 0),
+                    "running": strategy_name in self.running,
+                    "avg_latency_ms": round(latency["total_ms"] / runs, 1) if runs else 0.0,
+                    "max_latency_ms": round(latency.get("max_ms", 0.0), 1),
+                    "last_latency_ms": round(latency.get("last_ms", 0.0), 1),
+                    "last_status": latency.get("last_status"),
+                    "backtest": self.performance_metrics.get("backtest", {}).get(strategy_name)
                 }
             
             # Overall performance
             performance["overall"] = {
                 "total_strategies": len(self.strategy_weights),
                 "combined_weight": sum(self.strategy_weights.values()),
-                "status": "active"
+                "status": "active",
+                "last_run": self.last_run_metadata
             }
             
             return performance
@@ -285,43 +402,23 @@ class StrategyManager:
     
     async def backtest_strategies(self, days: int = 30) -> Dict[str, Any]:
         """
-        Run backtesting on strategies (mock implementation)
+        Backtest strategies over local historical bars
+        The combined result blends strategies by the current strategy weights.
         """
         try:
             strategy_logger.info(f"Running strategy backtest for {days} days")
             
-            # Mock backtest results
-            backtest_results = {
-                "period_days": days,
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "strategies": {
-                    "recursive_scanner": {
-                        "total_signals": 1247,
-                        "profitable_signals": 892,
-                        "win_rate": 0.715,
-                        "avg_return": 0.127,
-                        "max_drawdown": 0.089,
-                        "sharpe_ratio": 1.34
-                    },
-                    "penny_stock": {
-                        "total_signals": 834,
-                        "profitable_signals": 567,
-                        "win_rate": 0.680,
-                        "avg_return": 0.156,
-                        "max_drawdown": 0.143,
-                        "sharpe_ratio": 1.18
-                    }
-                },
-                "combined": {
-                    "total_signals": 2081,
-                    "profitable_signals": 1459,
-                    "win_rate": 0.701,
-                    "avg_return": 0.139,
-                    "max_drawdown": 0.098,
-                    "sharpe_ratio": 1.28
-                }
-            }
+            if backtest_engine.settings["mode"] == "event":
+                backtest_results = await backtest_engine.run_event(days, weights=self.strategy_weights)
+            else:
+                backtest_results = await asyncio.to_thread(
+                    backtest_engine.run, days, weights=self.strategy_weights
+                )
             
+            self.performance_metrics["backtest"] = {
+                name: {key: stats[key] for key in ("trades", "win_rate", "total_return", "max_drawdown", "sharpe_ratio")}
+                for name, stats in backtest_results.get("strategies", {}).items()
+            }
             return backtest_results
             
         except Exception as e:
@@ -336,6 +433,10 @@ async def run_all_strategies(symbols: List[str] = None, limit: int = 50) -> List
     """Run all available strategies"""
     return await strategy_manager.run_comprehensive_scan(symbols, limit)
 
+async def run_all_strategies_with_metadata(symbols: List[str] = None, limit: int = 50) -> Dict[str, Any]:
+    """Run all available strategies; includes per-strategy status and latency"""
+    return await strategy_manager.run_comprehensive_scan_with_metadata(symbols, limit)
+
 async def get_performance_metrics() -> Dict[str, Any]:
     """Get strategy performance metrics"""
     return await strategy_manager.get_strategy_performance()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Strategy Params - Versioned optimized parameter sets
+The optimizer exports its best candidate here as strategy_params_vNNN.json;
+the strategy manager, penny stock strategy, backtest engine and RuleSetAgent
+load the latest (or a pinned) version at start-up.
+"""
+
+# Import ALL dependencies through globals.py (required)
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent.parent))
+
+from Gremlin_Trade_Core.globals import (
+    # Core imports
+    json, datetime, timezone,
+    # Type imports
+    List, Dict, Any, Optional,
+    # Configuration and utilities
+    CFG, STRATEGIES_DIR, setup_module_logger
+)
+
+# Set up logging
+params_logger = setup_module_logger("strategy", "strategy_params")
+
+PARAMS_PREFIX = "strategy_params_v"
+
+# Backtest settings that correspond to RuleSetAgent rules: setting -> (rule_id, parameter)
+RULE_SET_THRESHOLDS = {
+    "take_profit_pct": ("profit_exit_1", "profit_target_pct"),
+    "stop_loss_pct": ("stop_loss_exit_1", "stop_loss_pct"),
+    "position_fraction": ("position_size_1", "max_position_size"),
+    "max_positions": ("max_positions_1", "max_positions")
+}
+
+
+def _params_config() -> Dict[str, Any]:
+    return CFG.get("strategy", {}).get("optimized_params", {})
+
+
+def params_dir() -> Path:
+    """Directory holding exported parameter versions"""
+    configured = _params_config().get("dir")
+    return Path(configured) if configured else STRATEGIES_DIR / "Optimized_Params"
+
+
+def list_param_versions() -> List[int]:
+    """Exported versions in ascending order"""
+    directory = params_dir()
+    if not directory.exists():
+        return []
+    versions = []
+    for path in directory.glob(f"{PARAMS_PREFIX}*.json"):
+        try:
+            versions.append(int(path.stem[len(PARAMS_PREFIX):]))
+        except ValueError:
+            continue
+    return sorted(versions)
+
+
+def rule_set_thresholds(settings: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """RuleSetAgent threshold overrides implied by optimized backtest settings"""
+    thresholds = {}
+    for setting, (rule_id, parameter) in RULE_SET_THRESHOLDS.items():
+        if setting in settings:
+            value = settings[setting]
+            thresholds[rule_id] = {"threshold": float(value), "parameters": {parameter: value}}
+    return thresholds
+
+
+def save_strategy_params(parameters: Dict[str, Any], metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Write a new parameter version
+    `parameters` holds "rules", "settings" and "weights" sections.
+    """
+    directory = params_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    versions = list_param_versions()
+    version = versions[-1] + 1 if versions else 1
+
+    document = {
+        "version": version,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "parameters": parameters,
+        "rule_set": rule_set_thresholds(parameters.get("settings", {})),
+        "metadata": metadata or {}
+    }
+    path = directory / f"{PARAMS_PREFIX}{version:03d}.json"
+    tmp_path = path.with_suffix(".json.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(document, f, indent=2, default=str)
+    tmp_path.replace(path)
+
+    params_logger.info(f"Exported strategy parameters v{version} to {path}")
+    return {"version": version, "path": str(path)}
+
+
+def load_strategy_params(version: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Load an exported parameter version (latest unless pinned in config)
+    Returns an empty dict when loading is disabled or nothing was exported.
+    """
+    try:
+        config = _params_config()
+        if version is None:
+            if not config.get("enabled", True):
+                return {}
+            version = config.get("version")
+        if version is None:
+            versions = list_param_versions()
+            if not versions:
+                return {}
+            version = versions[-1]
+
+        path = params_dir() / f"{PARAMS_PREFIX}{int(version):03d}.json"
+        if not path.exists():
+            params_logger.warning(f"Strategy parameters v{version} not found at {path}")
+            return {}
+        with open(path) as f:
+            return json.load(f)
+
+    except Exception as e:
+        params_logger.error(f"Error loading strategy parameters: {e}")
+        return {}
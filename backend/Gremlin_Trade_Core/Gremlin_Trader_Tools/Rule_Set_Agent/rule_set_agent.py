@@ -25,6 +25,9 @@ logger = setup_agent_logging(Path(__file__).stem)
 
 # Import base memory agent
 from Gremlin_Trade_Core.Gremlin_Trader_Tools.Memory_Agent.base_memory_agent import BaseMemoryAgent
+from Gremlin_Trade_Core.Gremlin_Trader_Strategies.strategy_params import load_strategy_params
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.feature_store import record_features
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.correlation_engine import get_position_correlation
 
 class RuleType(Enum):
     ENTRY = "entry"
@@ -128,11 +131,29 @@ class RuleSetAgent(BaseMemoryAgent):
         # Initialize default rules
         self._initialize_default_rules()
         
+        # Apply thresholds from the latest exported optimizer parameters
+        self._apply_optimized_thresholds()
+        
         # Load learned rules from memory
         self._load_rules_from_memory()
         
         self.logger.info("Rule Set Agent initialized with memory integration")
     
+    def _apply_optimized_thresholds(self):
+        """Override default rule thresholds with the optimizer's exported values"""
+        try:
+            optimized = load_strategy_params()
+            for rule_id, override in optimized.get("rule_set", {}).items():
+                rule = self.rules.get(rule_id)
+                if rule is None:
+                    continue
+                rule.threshold = float(override.get("threshold", rule.threshold))
+                rule.parameters.update(override.get("parameters", {}))
+            if optimized.get("rule_set"):
+                self.logger.info(f"Applied optimized rule thresholds v{optimized.get('version')}")
+        except Exception as e:
+            self.logger.error(f"Error applying optimized thresholds: {e}")
+    
     def _initialize_default_rules(self):
         """Initialize default trading rules"""
         
@@ -386,6 +407,10 @@ class RuleSetAgent(BaseMemoryAgent):
         try:
             evaluations = []
             
+            # Correlation with the open positions - a constant-time engine lookup
+            if 'position_correlation' not in market_data:
+                market_data = {**market_data, 'position_correlation': get_position_correlation(symbol)}
+            
             # Filter rules by type if specified
             rules_to_evaluate = [
                 rule for rule in self.rules.values()
@@ -455,22 +480,9 @@ class RuleSetAgent(BaseMemoryAgent):
     def _extract_rule_value(self, rule: TradingRule, market_data: Dict) -> Optional[float]:
         """Extract the relevant value from market data for rule evaluation"""
         try:
-            # Map common rule parameters to market data fields
-            value_map = {
-                'price': market_data.get('price', 0),
-                'volume': market_data.get('volume', 0),
-                'rsi': market_data.get('rsi', 50),
-                'ema_20': market_data.get('ema_20', market_data.get('price', 0)),
-                'sma_20': market_data.get('sma_20', market_data.get('price', 0)),
-                'sma_50': market_data.get('sma_50', market_data.get('price', 0)),
-                'sma_200': market_data.get('sma_200', market_data.get('price', 0)),
-                'vwap': market_data.get('vwap', market_data.get('price', 0)),
-                'atr': market_data.get('atr', 0.02),
-                'vix': market_data.get('vix', 20),
-                'avg_volume': market_data.get('avg_volume', market_data.get('volume', 0)),
-                'support_level': market_data.get('support', market_data.get('price', 0) * 0.95),
-                'resistance_level': market_data.get('resistance', market_data.get('price', 0) * 1.05)
-            }
+            # Common rule parameters mapped to market data fields - shared per
+            # symbol and bar through the feature store instead of rebuilt per rule
+            value_map = record_features(market_data, ('rule_values',))['rule_values']
             
             # Parse condition to extract primary value
             condition = rule.condition.lower()
@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+
+# ─────────────────────────────────────────────────────────────
+# © 2025 StatikFintechLLC
+# Bar Resampler - Higher timeframes derived from one 1-minute source
+# Contact: ascend.gremlin@gmail.com
+# ─────────────────────────────────────────────────────────────
+
+"""
+Bar Resampler
+5min/15min/1h/1d bars are built from stored or streamed 1-minute bars
+instead of separate downloads per timeframe. Intraday buckets are anchored
+to the session open in the market timezone (so 1h bars run 09:30-10:30 for
+the regular session) and the last bucket of a session is cut at the close.
+Daily bars are keyed to the session date at 00:00 UTC like imported daily
+history. A bucket is complete once a minute at or after its end has been
+seen or the minute that closes it arrives; until then it is a partial bar.
+flush() completes buckets whose closing minute never came (thin names, the
+session close) once their end is flush_grace_seconds past, and a minute that
+still turns up later is folded into the completed bar. As each minute closes
+the affected higher-timeframe bars are updated and published on the market
+data bus.
+"""
+
+# Import ALL dependencies through globals.py (required)
+import sys
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from Gremlin_Trade_Core.globals import (
+    # Core imports
+    np, pd, time, threading, deque, OrderedDict,
+    # Type hints
+    List, Dict, Any, Optional, Tuple,
+    # Configuration and utilities
+    CFG, setup_module_logger
+)
+
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.bar_store import (
+    bar_store, normalize_bars, BAR_COLUMNS, TIMEFRAME_SECONDS
+)
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.history_importer import SESSION_WINDOWS
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.market_data_bus import market_data_bus
+
+# Initialize logger
+resampler_logger = setup_module_logger("market_data", "bar_resampler")
+
+SOURCE_TIMEFRAME = "1min"
+RESAMPLED_COLUMNS = BAR_COLUMNS + ["end", "complete"]
+
+# Accepted spellings for timeframes (yfinance style and bar store style)
+TIMEFRAME_ALIASES = {
+    "1m": "1min", "1min": "1min",
+    "5m": "5min", "5min": "5min",
+    "15m": "15min", "15min": "15min",
+    "30m": "30min", "30min": "30min",
+    "60m": "1h", "60min": "1h", "1h": "1h",
+    "1d": "1d", "d": "1d", "day": "1d"
+}
+
+# Minutes whose session context was computed recently (shared by all symbols)
+CONTEXT_CACHE_SIZE = 4096
+
+
+def canonical_timeframe(timeframe: str) -> str:
+    """Bar store spelling of a timeframe"""
+    canonical = TIMEFRAME_ALIASES.get(str(timeframe).lower())
+    if canonical is None:
+        raise ValueError(f"Unsupported timeframe: {timeframe}")
+    return canonical
+
+
+def session_context(ts: np.ndarray, market_tz: str, session: str) -> Dict[str, np.ndarray]:
+    """
+    Local session fields for minute timestamps: UTC epoch of local midnight,
+    minute of the local day, whether the minute is in session, and the
+    session window in minutes
+    """
+    local = pd.to_datetime(ts, unit="s", utc=True).tz_convert(market_tz)
+    midnight = ((local.normalize() - pd.Timestamp("1970-01-01", tz="UTC")) // pd.Timedelta(seconds=1))
+    midnight = np.asarray(midnight, dtype=np.int64)
+    date_key = ((local.normalize().tz_localize(None) - pd.Timestamp("1970-01-01")) // pd.Timedelta(seconds=1))
+    minute = np.asarray(local.hour * 60 + local.minute, dtype=np.int64)
+    window = SESSION_WINDOWS.get(session) or (0, 24 * 60)
+    in_session = (np.asarray(local.dayofweek) < 5) & (minute >= window[0]) & (minute < window[1])
+    return {"midnight": midnight, "date_key": np.asarray(date_key, dtype=np.int64),
+            "minute": minute, "in_session": in_session, "window": window}
+
+
+def bucket_bounds(context: Dict[str, np.ndarray], timeframe: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (start, end) epoch seconds of the bucket each minute falls in
+    Daily buckets start at the session date 00:00 UTC and end at the local close.
+    """
+    open_minute, close_minute = context["window"]
+    if timeframe == "1d":
+        return context["date_key"], context["midnight"] + close_minute * 60
+
+    size = TIMEFRAME_SECONDS[timeframe] // 60
+    bucket = open_minute + ((context["minute"] - open_minute) // size) * size
+    start = context["midnight"] + bucket * 60
+    end = context["midnight"] + np.minimum(bucket + size, close_minute) * 60
+    return start, end
+
+
+def resample(minutes: pd.DataFrame, timeframe: str, market_tz: str = "America/New_York",
+             session: str = "regular") -> pd.DataFrame:
+    """
+    Resample normalized 1-minute bars (ts/open/high/low/close/volume) to a
+    higher timeframe; minutes outside the session are dropped
+    """
+    timeframe = canonical_timeframe(timeframe)
+    if minutes is None or minutes.empty:
+        return pd.DataFrame(columns=RESAMPLED_COLUMNS)
+
+    minutes = minutes.sort_values("ts")
+    ts = minutes["ts"].to_numpy(dtype=np.int64)
+    context = session_context(ts, market_tz, session)
+    keep = context["in_session"]
+    if timeframe == SOURCE_TIMEFRAME:
+        bars = minutes[keep][BAR_COLUMNS].copy()
+        bars["end"] = bars["ts"] + 60
+        bars["complete"] = True
+        return bars.reset_index(drop=True)
+
+    start, end = bucket_bounds(context, timeframe)
+    frame = pd.DataFrame({
+        "ts": start[keep], "end": end[keep], "minute_ts": ts[keep],
+        "open": minutes["open"].to_numpy()[keep], "high": minutes["high"].to_numpy()[keep],
+        "low": minutes["low"].to_numpy()[keep], "close": minutes["close"].to_numpy()[keep],
+        "volume": minutes["volume"].to_numpy()[keep]
+    })
+    if frame.empty:
+        return pd.DataFrame(columns=RESAMPLED_COLUMNS)
+
+    grouped = frame.groupby("ts", sort=True)
+    bars = pd.DataFrame({
+        "open": grouped["open"].first(),
+        "high": grouped["high"].max(),
+        "low": grouped["low"].min(),
+        "close": grouped["close"].last(),
+        "volume": grouped["volume"].sum(),
+        "end": grouped["end"].max(),
+        "last_minute": grouped["minute_ts"].max()
+    }).reset_index()
+
+    # Every bucket but the last has later minutes; the last one is complete
+    # only if its closing minute is in
+    bars["complete"] = True
+    bars.loc[bars.index[-1], "complete"] = bool(bars["last_minute"].iloc[-1] + 60 >= bars["end"].iloc[-1])
+    return bars[RESAMPLED_COLUMNS]
+
+
+class BarResampler:
+    """
+    Incremental multi-timeframe bars per symbol
+    Completed bars are kept in a bounded history; the bar still forming is
+    kept separately as the partial bar and replaced minute by minute.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, store=None, bus=None):
+        resampler_config = config if config is not None else CFG.get("agents", {}).get("resampler", {})
+        self.enabled = resampler_config.get("enabled", True)
+        self.timeframes = [canonical_timeframe(tf) for tf in
+                           resampler_config.get("timeframes", ["5min", "15min", "1h", "1d"])]
+        self.market_tz = resampler_config.get("market_tz", "America/New_York")
+        self.session = resampler_config.get("session", "regular")
+        self.max_bars = resampler_config.get("max_bars", 2000)
+        self.history_days = resampler_config.get("history_days", 90)
+        self.publish = resampler_config.get("publish", True)
+        self.serve_history = resampler_config.get("serve_history", True)
+        self.flush_grace = resampler_config.get("flush_grace_seconds", 120)
+        self.store = store or bar_store
+        self.bus = bus or market_data_bus
+
+        self._history: Dict[Tuple[str, str], deque] = {}
+        self._partial: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._last_minute: Dict[str, int] = {}
+        self._contexts: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.stats = {"minutes": 0, "late_minutes": 0, "out_of_session": 0, "completed": 0, "published": 0, "seeded": 0,
+                      "flushed": 0, "late_folded": 0}
+
+    def _context(self, ts: int) -> Dict[str, Any]:
+        """Session context of one minute - cached, every symbol shares the same minute"""
+        context = self._contexts.get(ts)
+        if context is None:
+            context = session_context(np.array([ts], dtype=np.int64), self.market_tz, self.session)
+            self._contexts[ts] = context
+            if len(self._contexts) > CONTEXT_CACHE_SIZE:
+                self._contexts.popitem(last=False)
+        return context
+
+    def _emit(self, symbol: str, timeframe: str, bar: Dict[str, Any]):
+        if not self.publish:
+            return
+        try:
+            self.bus.publish_bar(symbol, {**bar, "timeframe": timeframe}, provider="resampler", timeframe=timeframe)
+            self.stats["published"] += 1
+        except Exception as e:
+            resampler_logger.error(f"Error publishing {timeframe} bar for {symbol}: {e}")
+
+    def _complete(self, symbol: str, timeframe: str, bar: Dict[str, Any]) -> Dict[str, Any]:
+        bar["complete"] = True
+        key = (symbol, timeframe)
+        if key not in self._history:
+            self._history[key] = deque(maxlen=self.max_bars)
+        self._history[key].append(bar)
+        self.stats["completed"] += 1
+        return bar
+
+    def on_minute(self, symbol: str, minute: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Fold one closed 1-minute bar (ts in epoch seconds) into every timeframe
+        Returns the bars that changed, partial or completed, each with its timeframe.
+        """
+        symbol = symbol.upper()
+        ts = int(minute["ts"])
+        updates = []
+        with self._lock:
+            if ts <= self._last_minute.get(symbol, -1):
+                self.stats["late_minutes"] += 1
+                return updates
+            self._last_minute[symbol] = ts
+            self.stats["minutes"] += 1
+
+            context = self._context(ts)
+            if not context["in_session"][0]:
+                self.stats["out_of_session"] += 1
+                return updates
+
+            for timeframe in self.timeframes:
+                if timeframe == SOURCE_TIMEFRAME:
+                    continue
+                start, end = bucket_bounds(context, timeframe)
+                start, end = int(start[0]), int(end[0])
+                key = (symbol, timeframe)
+                partial = self._partial.get(key)
+
+                # A minute in a new bucket closes the previous one
+                if partial is not None and partial["ts"] != start:
+                    closed = self._complete(symbol, timeframe, self._partial.pop(key))
+                    updates.append({**closed, "timeframe": timeframe})
+                    partial = None
+
+                # A bucket already completed by flush() takes its late minute in place
+                history = self._history.get(key)
+                if partial is None and history and history[-1]["ts"] == start:
+                    bar = history[-1]
+                    bar["high"] = max(bar["high"], float(minute["high"]))
+                    bar["low"] = min(bar["low"], float(minute["low"]))
+                    bar["close"] = float(minute["close"])
+                    bar["volume"] += float(minute.get("volume", 0))
+                    self.stats["late_folded"] += 1
+                    updates.append({**bar, "timeframe": timeframe})
+                    continue
+
+                if partial is None:
+                    partial = {"ts": start, "open": float(minute["open"]), "high": float(minute["high"]),
+                               "low": float(minute["low"]), "close": float(minute["close"]),
+                               "volume": float(minute.get("volume", 0)), "end": end, "complete": False}
+                else:
+                    partial["high"] = max(partial["high"], float(minute["high"]))
+                    partial["low"] = min(partial["low"], float(minute["low"]))
+                    partial["close"] = float(minute["close"])
+                    partial["volume"] += float(minute.get("volume", 0))
+
+                if ts + 60 >= end:
+                    self._partial.pop(key, None)
+                    bar = self._complete(symbol, timeframe, partial)
+                else:
+                    self._partial[key] = partial
+                    bar = dict(partial)
+                updates.append({**bar, "timeframe": timeframe})
+
+        for update in updates:
+            self._emit(symbol, update["timeframe"], update)
+        return updates
+
+    def flush(self, now: Optional[float] = None) -> int:
+        """Complete partial bars whose bucket ended more than flush_grace seconds ago without its closing minute"""
+        now = time.time() if now is None else now
+        flushed = []
+        with self._lock:
+            for key, partial in list(self._partial.items()):
+                if partial["end"] + self.flush_grace <= now:
+                    flushed.append((key, self._complete(key[0], key[1], self._partial.pop(key))))
+            self.stats["flushed"] += len(flushed)
+        for (symbol, timeframe), bar in flushed:
+            self._emit(symbol, timeframe, bar)
+        return len(flushed)
+
+    def seed(self, symbol: str, minutes: pd.DataFrame) -> int:
+        """Replace a symbol's state with bars resampled from a block of 1-minute history"""
+        symbol = symbol.upper()
+        if minutes is None or minutes.empty:
+            return 0
+        minutes = minutes.sort_values("ts")
+        with self._lock:
+            for timeframe in self.timeframes:
+                if timeframe == SOURCE_TIMEFRAME:
+                    continue
+                bars = resample(minutes, timeframe, self.market_tz, self.session)
+                records = bars.to_dict("records")
+                key = (symbol, timeframe)
+                self._partial.pop(key, None)
+                if records and not records[-1]["complete"]:
+                    self._partial[key] = records.pop()
+                self._history[key] = deque(records, maxlen=self.max_bars)
+            self._last_minute[symbol] = int(minutes["ts"].iloc[-1])
+            self.stats["seeded"] += 1
+        return len(minutes)
+
+    def _stored_minutes(self, symbol: str) -> pd.DataFrame:
+        """Recent 1-minute bars from the bar store (empty when there are none)"""
+        if not self.store.has(symbol, SOURCE_TIMEFRAME):
+            return pd.DataFrame(columns=BAR_COLUMNS)
+        start = int(time.time()) - self.history_days * 86400 if self.history_days else None
+        return self.store.read(symbol, SOURCE_TIMEFRAME, start=start)
+
+    def load(self, symbol: str) -> int:
+        """Seed a symbol from the 1-minute bars in the bar store"""
+        try:
+            return self.seed(symbol, self._stored_minutes(symbol.upper()))
+        except Exception as e:
+            resampler_logger.error(f"Error seeding resampler for {symbol}: {e}")
+            return 0
+
+    def ingest(self, symbol: str, minutes: pd.DataFrame, now: Optional[float] = None) -> int:
+        """
+        Feed a fetched block of 1-minute bars (any schema normalize_bars accepts)
+        Unknown symbols are seeded in one pass together with their stored
+        history; known ones take only the new, closed minutes. The minute
+        still forming is left for the next fetch.
+        """
+        if not self.enabled:
+            return 0
+        try:
+            symbol = symbol.upper()
+            bars = normalize_bars(minutes)
+            if bars.empty:
+                return 0
+            now = time.time() if now is None else now
+            bars = bars[bars["ts"] + 60 <= now]
+            if symbol not in self._last_minute:
+                combined = pd.concat([self._stored_minutes(symbol), bars], ignore_index=True)
+                return self.seed(symbol, combined.drop_duplicates("ts", keep="last"))
+
+            fresh = bars[bars["ts"] > self._last_minute[symbol]]
+            for minute in fresh.to_dict("records"):
+                self.on_minute(symbol, minute)
+            return len(fresh)
+
+        except Exception as e:
+            resampler_logger.error(f"Error ingesting minutes for {symbol}: {e}")
+            return 0
+
+    def get_bars(self, symbol: str, timeframe: str, limit: Optional[int] = None,
+                 include_partial: bool = True) -> pd.DataFrame:
+        """Resampled bars for a symbol, oldest first; seeded from the bar store on first use"""
+        symbol = symbol.upper()
+        timeframe = canonical_timeframe(timeframe)
+        if timeframe == SOURCE_TIMEFRAME:
+            return self.store.read(symbol, SOURCE_TIMEFRAME)
+        if symbol not in self._last_minute and self.enabled and self.store.has(symbol, SOURCE_TIMEFRAME):
+            self.load(symbol)
+
+        with self._lock:
+            records = list(self._history.get((symbol, timeframe), ()))
+            partial = self._partial.get((symbol, timeframe))
+            if include_partial and partial is not None:
+                records.append(dict(partial))
+        if limit:
+            records = records[-limit:]
+        return pd.DataFrame(records, columns=RESAMPLED_COLUMNS)
+
+    def get_history(self, symbol: str, timeframe: str = "1d", limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Resampled bars in the market data service's history format (date/open/high/low/close/volume)"""
+        bars = self.get_bars(symbol, timeframe, limit)
+        dates = pd.to_datetime(bars["ts"].astype(np.int64), unit="s", utc=True)
+        return [
+            {"date": date.isoformat(), "ts": int(row.ts), "open": float(row.open), "high": float(row.high),
+             "low": float(row.low), "close": float(row.close), "volume": int(row.volume),
+             "complete": bool(row.complete)}
+            for date, row in zip(dates, bars.itertuples(index=False))
+        ]
+
+    def get_status(self) -> Dict[str, Any]:
+        """Configuration, tracked symbols and counters"""
+        return {
+            "enabled": self.enabled,
+            "timeframes": self.timeframes,
+            "session": self.session,
+            "market_tz": self.market_tz,
+            "symbols": len(self._last_minute),
+            "partial_bars": len(self._partial),
+            "stats": dict(self.stats)
+        }
+
+
+# Global instance
+bar_resampler = BarResampler()
+
+# Convenience functions
+def get_resampled_bars(symbol: str, timeframe: str, limit: Optional[int] = None,
+                       include_partial: bool = True) -> pd.DataFrame:
+    """Bars of any supported timeframe derived from 1-minute bars"""
+    return bar_resampler.get_bars(symbol, timeframe, limit, include_partial)
+
+def ingest_minutes(symbol: str, minutes: pd.DataFrame) -> int:
+    """Feed fetched 1-minute bars into the resampler"""
+    return bar_resampler.ingest(symbol, minutes)
+
+
+if __name__ == "__main__":
+    session_open = int(pd.Timestamp("2025-03-10 09:30", tz="America/New_York").timestamp())
+    closes = 5.0 + np.cumsum(np.random.default_rng(3).normal(0, 0.02, 390))
+    minutes = pd.DataFrame({"ts": session_open + 60 * np.arange(390), "open": closes, "high": closes + 0.01,
+                            "low": closes - 0.01, "close": closes, "volume": 1000.0})
+
+    print(resample(minutes, "1h"))
+    resampler = BarResampler({"timeframes": ["5min", "1h", "1d"], "publish": False})
+    resampler.seed("DEMO", minutes.iloc[:100])
+    for row in minutes.iloc[100:].to_dict("records"):
+        resampler.on_minute("DEMO", row)
+    print(resampler.get_bars("DEMO", "1h"))
+    print(f"Status: {resampler.get_status()}")
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+
+# ─────────────────────────────────────────────────────────────
+# © 2025 StatikFintechLLC
+# Bar Store - Local OHLCV history on disk
+# Contact: ascend.gremlin@gmail.com
+# ─────────────────────────────────────────────────────────────
+
+"""
+Bar Store
+One directory per symbol and timeframe under BAR_STORE_DIR, partitioned by
+UTC date. Parquet is used when pyarrow is installed, CSV otherwise. All bars are normalized to integer UTC
+epoch seconds in a `ts` column plus open/high/low/close/volume.
+"""
+
+# Import ALL dependencies through globals.py (required)
+import sys
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from Gremlin_Trade_Core.globals import (
+    # Core imports
+    np, pd, importlib,
+    # Type hints
+    List, Dict, Any, Optional, Union, Tuple,
+    # Configuration and utilities
+    BAR_STORE_DIR, setup_module_logger
+)
+
+# Initialize logger
+bar_store_logger = setup_module_logger("market_data", "bar_store")
+
+PARQUET_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+BAR_COLUMNS = ["ts", "open", "high", "low", "close", "volume"]
+INVALID_TS = np.iinfo(np.int64).min
+
+# Accepted spellings for incoming columns
+COLUMN_ALIASES = {
+    "timestamp": "ts", "datetime": "ts", "date": "ts", "time": "ts", "ts": "ts",
+    "open": "open", "o": "open",
+    "high": "high", "h": "high",
+    "low": "low", "l": "low",
+    "close": "close", "c": "close", "adj close": "close", "last": "close", "price": "price",
+    "volume": "volume", "v": "volume", "size": "size", "qty": "size",
+    "symbol": "symbol", "ticker": "symbol"
+}
+
+TIMEFRAME_SECONDS = {
+    "1min": 60, "5min": 300, "15min": 900, "30min": 1800, "1h": 3600, "1d": 86400
+}
+
+# Partition period per timeframe (numpy datetime unit); intraday bars default to days
+PARTITION_UNITS = {"1d": "M"}
+
+
+def to_epoch_seconds(values: pd.Series, tz: Optional[str] = None) -> np.ndarray:
+    """Convert timestamps (strings, datetimes or epoch numbers) to UTC epoch seconds"""
+    if pd.api.types.is_numeric_dtype(values):
+        raw = values.to_numpy(dtype=np.float64, na_value=np.nan)
+        # Millisecond / nanosecond epochs are scaled down to seconds
+        scale = np.where(raw > 1e17, 1e9, np.where(raw > 1e11, 1e3, 1.0))
+        epoch = np.where(np.isnan(raw), 0, raw / scale).astype(np.int64)
+        return np.where(np.isnan(raw), INVALID_TS, epoch)
+
+    parsed = pd.to_datetime(values, errors="coerce")
+    if parsed.dt.tz is None:
+        parsed = parsed.dt.tz_localize(tz or "UTC", ambiguous="NaT", nonexistent="shift_forward")
+    parsed = parsed.dt.tz_convert("UTC")
+    # Resolution-independent (ns or us backed) conversion to whole seconds
+    epoch = (parsed - pd.Timestamp("1970-01-01", tz="UTC")) // pd.Timedelta(seconds=1)
+    return epoch.fillna(INVALID_TS).astype(np.int64).to_numpy()
+
+
+def normalize_bars(df: pd.DataFrame, tz: Optional[str] = None) -> pd.DataFrame:
+    """Normalize a raw bar or tick frame to the bar store schema"""
+    if df is None or df.empty:
+        return pd.DataFrame(columns=BAR_COLUMNS)
+
+    frame = df.copy()
+    if not any(str(c).lower() in ("timestamp", "datetime", "date", "time", "ts") for c in frame.columns):
+        frame = frame.reset_index()
+    frame.columns = [COLUMN_ALIASES.get(str(c).strip().lower(), str(c).strip().lower()) for c in frame.columns]
+    frame = frame.loc[:, ~frame.columns.duplicated()]
+
+    if "ts" not in frame.columns:
+        raise ValueError("bar data has no timestamp column")
+
+    frame["ts"] = to_epoch_seconds(frame["ts"], tz)
+    frame = frame[frame["ts"] != INVALID_TS]
+
+    # Tick data (price/size) is aggregated to one-minute bars
+    if "close" not in frame.columns and "price" in frame.columns:
+        frame = ticks_to_bars(frame)
+
+    for column in ("open", "high", "low"):
+        if column not in frame.columns:
+            frame[column] = frame["close"]
+    if "volume" not in frame.columns:
+        frame["volume"] = 0
+
+    frame = frame[BAR_COLUMNS].astype({
+        "ts": np.int64, "open": np.float64, "high": np.float64,
+        "low": np.float64, "close": np.float64, "volume": np.float64
+    })
+    frame = frame.dropna().sort_values("ts").drop_duplicates("ts", keep="last")
+    return frame.reset_index(drop=True)
+
+
+def ticks_to_bars(ticks: pd.DataFrame, seconds: int = 60) -> pd.DataFrame:
+    """Aggregate tick prints (ts, price, size) into OHLCV bars"""
+    size = ticks["size"] if "size" in ticks.columns else ticks.get("volume", pd.Series(0, index=ticks.index))
+    frame = pd.DataFrame({
+        "bucket": (ticks["ts"].to_numpy() // seconds) * seconds,
+        "price": ticks["price"].astype(np.float64),
+        "size": size.astype(np.float64)
+    }).sort_values("bucket", kind="stable")
+    grouped = frame.groupby("bucket", sort=True)
+    bars = pd.DataFrame({
+        "open": grouped["price"].first(),
+        "high": grouped["price"].max(),
+        "low": grouped["price"].min(),
+        "close": grouped["price"].last(),
+        "volume": grouped["size"].sum()
+    })
+    bars.index.name = "ts"
+    return bars.reset_index()
+
+
+def read_bar_file(path: Union[str, Path], tz: Optional[str] = None) -> pd.DataFrame:
+    """Read a CSV or Parquet bar/tick file into the normalized schema"""
+    path = Path(path)
+    if path.suffix == ".parquet":
+        raw = pd.read_parquet(path)
+    else:
+        raw = pd.read_csv(path)
+    return normalize_bars(raw, tz)
+
+
+class BarStore:
+    """
+    Local OHLCV bar store
+    Used by the replay provider, the historical importer and the backtester.
+    Bars live in one directory per symbol and timeframe with a file per
+    partition (UTC day, or month for daily bars). A write merges only the
+    partitions its bars fall in, so appending a session never rewrites the
+    symbol's history. Single-file stores from older versions are still read
+    and are split into partitions on their next write.
+    """
+
+    def __init__(self, root: Optional[Union[str, Path]] = None):
+        self.root = Path(root) if root else BAR_STORE_DIR
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.file_format = "parquet" if PARQUET_AVAILABLE else "csv"
+
+    def path_for(self, symbol: str, timeframe: str = "1min", file_format: Optional[str] = None) -> Path:
+        """Single-file path for a symbol/timeframe (the pre-partition layout)"""
+        return self.root / f"{symbol.upper()}_{timeframe}.{file_format or self.file_format}"
+
+    def partition_dir(self, symbol: str, timeframe: str = "1min") -> Path:
+        """Directory holding a symbol/timeframe's partitions"""
+        return self.root / f"{symbol.upper()}_{timeframe}"
+
+    def _existing_path(self, symbol: str, timeframe: str) -> Optional[Path]:
+        """Find the single stored file for a symbol, whatever its format"""
+        for file_format in ("parquet", "csv"):
+            path = self.path_for(symbol, timeframe, file_format)
+            if path.exists() and (file_format == "csv" or PARQUET_AVAILABLE):
+                return path
+        return None
+
+    def _partitions(self, symbol: str, timeframe: str) -> Dict[str, Path]:
+        """{partition key: file} for a symbol, preferring parquet when readable"""
+        directory = self.partition_dir(symbol, timeframe)
+        if not directory.is_dir():
+            return {}
+        partitions = {}
+        for file_format in ("csv", "parquet"):
+            if file_format == "parquet" and not PARQUET_AVAILABLE:
+                continue
+            for path in directory.glob(f"*.{file_format}"):
+                partitions[path.stem] = path
+        return dict(sorted(partitions.items()))
+
+    @staticmethod
+    def _partition_keys(ts: np.ndarray, timeframe: str) -> np.ndarray:
+        """Partition key (YYYY-MM-DD, or YYYY-MM for daily bars) of each timestamp"""
+        unit = PARTITION_UNITS.get(timeframe, "D")
+        return (np.asarray(ts, dtype=np.int64) // 86400).astype("datetime64[D]").astype(f"datetime64[{unit}]").astype(str)
+
+    @staticmethod
+    def _partition_range(key: str) -> Tuple[int, int]:
+        """[start, end) epoch seconds covered by a partition key"""
+        period = np.datetime64(key)
+        return int(period.astype("datetime64[s]").astype(np.int64)), int((period + 1).astype("datetime64[s]").astype(np.int64))
+
+    @staticmethod
+    def _read_file(path: Path) -> pd.DataFrame:
+        return pd.read_parquet(path) if path.suffix == ".parquet" else pd.read_csv(path)
+
+    def _write_file(self, path: Path, bars: pd.DataFrame):
+        """Atomic replace of one file, dropping a copy in the other format"""
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        if self.file_format == "parquet":
+            bars[BAR_COLUMNS].to_parquet(tmp_path, index=False)
+        else:
+            bars[BAR_COLUMNS].to_csv(tmp_path, index=False)
+        tmp_path.replace(path)
+        other = path.with_suffix(".csv" if path.suffix == ".parquet" else ".parquet")
+        other.unlink(missing_ok=True)
+
+    def list_symbols(self, timeframe: str = "1min") -> List[str]:
+        """Symbols with stored bars for a timeframe"""
+        suffix = f"_{timeframe}"
+        symbols = set()
+        for path in self.root.iterdir():
+            if path.is_dir() and path.name.endswith(suffix):
+                symbols.add(path.name[:-len(suffix)])
+            elif path.suffix in (".parquet", ".csv") and path.stem.endswith(suffix):
+                symbols.add(path.stem[:-len(suffix)])
+        return sorted(symbols)
+
+    def has(self, symbol: str, timeframe: str = "1min") -> bool:
+        """Check if bars exist for a symbol"""
+        return bool(self._partitions(symbol, timeframe)) or self._existing_path(symbol, timeframe) is not None
+
+    def last_modified(self, symbol: str, timeframe: str = "1min") -> float:
+        """Modification time of a symbol's stored bars (0.0 when none), for cache keys"""
+        # Every partition write renames into the directory, which updates its mtime
+        directory = self.partition_dir(symbol, timeframe)
+        path = self._existing_path(symbol, timeframe)
+        return max(directory.stat().st_mtime if directory.is_dir() else 0.0,
+                   path.stat().st_mtime if path is not None else 0.0)
+
+    def read(self, symbol: str, timeframe: str = "1min", start: Optional[int] = None,
+             end: Optional[int] = None) -> pd.DataFrame:
+        """Read bars for a symbol, optionally bounded by epoch seconds [start, end)"""
+        try:
+            frames = []
+            legacy = self._existing_path(symbol, timeframe)
+            if legacy is not None:
+                frames.append(self._read_file(legacy))
+            for key, path in self._partitions(symbol, timeframe).items():
+                first, last = self._partition_range(key)
+                if (start is not None and last <= start) or (end is not None and first >= end):
+                    continue
+                frames.append(self._read_file(path))
+            if not frames:
+                return pd.DataFrame(columns=BAR_COLUMNS)
+
+            bars = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+            if legacy is not None and len(frames) > 1:
+                # Mid-migration: partition rows are newer than the single file
+                bars = bars.drop_duplicates("ts", keep="last").sort_values("ts")
+            if start is not None:
+                bars = bars[bars["ts"] >= start]
+            if end is not None:
+                bars = bars[bars["ts"] < end]
+            return bars.reset_index(drop=True)
+
+        except Exception as e:
+            bar_store_logger.error(f"Error reading bars for {symbol} {timeframe}: {e}")
+            return pd.DataFrame(columns=BAR_COLUMNS)
+
+    @staticmethod
+    def _changed_rows(incoming: pd.DataFrame, existing: Optional[pd.DataFrame]) -> int:
+        """Incoming bars that are new or differ from the stored bar with the same ts"""
+        if existing is None or existing.empty:
+            return len(incoming)
+        stored = existing.drop_duplicates("ts", keep="last").set_index("ts")
+        bars = incoming.set_index("ts")
+        common = bars.index.intersection(stored.index)
+        values = BAR_COLUMNS[1:]
+        # Tolerance for the CSV float round trip
+        same = np.isclose(bars.loc[common, values].to_numpy(dtype=float),
+                          stored.loc[common, values].to_numpy(dtype=float), rtol=1e-9, atol=0.0)
+        return int(len(bars) - len(common) + (~same.all(axis=1)).sum())
+
+    def write(self, symbol: str, bars: pd.DataFrame, timeframe: str = "1min", merge: bool = True) -> int:
+        """
+        Write normalized bars into their partitions; returns the bars that were new or changed
+        With merge each touched partition is merged with (and de-duplicated
+        against) its stored bars, and bars identical to stored ones are not
+        counted; merge=False replaces the symbol's history.
+        """
+        try:
+            if bars is None or bars.empty:
+                return 0
+
+            bars = bars[BAR_COLUMNS].sort_values("ts").drop_duplicates("ts", keep="last")
+            directory = self.partition_dir(symbol, timeframe)
+            partitions = self._partitions(symbol, timeframe)
+            legacy = self._existing_path(symbol, timeframe)
+            legacy_bars = None
+            if not merge:
+                for path in partitions.values():
+                    path.unlink(missing_ok=True)
+                partitions = {}
+            elif legacy is not None:
+                # One-time split of a single-file store
+                legacy_bars = self._read_file(legacy)[BAR_COLUMNS]
+            directory.mkdir(parents=True, exist_ok=True)
+
+            incoming_keys = self._partition_keys(bars["ts"].to_numpy(), timeframe)
+            keys = set(incoming_keys)
+            if legacy_bars is not None:
+                legacy_keys = self._partition_keys(legacy_bars["ts"].to_numpy(), timeframe)
+                keys |= set(legacy_keys)
+
+            written = 0
+            for key in sorted(keys):
+                incoming = bars[incoming_keys == key]
+                existing = []
+                if legacy_bars is not None:
+                    existing.append(legacy_bars[legacy_keys == key])
+                if key in partitions:
+                    existing.append(self._read_file(partitions[key])[BAR_COLUMNS])
+                existing = pd.concat(existing, ignore_index=True) if existing else None
+
+                part = incoming
+                if existing is not None:
+                    part = pd.concat([existing, incoming], ignore_index=True)
+                    part = part.sort_values("ts", kind="stable").drop_duplicates("ts", keep="last")
+                self._write_file(directory / f"{key}.{self.file_format}", part)
+                written += self._changed_rows(incoming, existing)
+
+            if legacy is not None:
+                legacy.unlink(missing_ok=True)
+            return written
+
+        except Exception as e:
+            bar_store_logger.error(f"Error writing bars for {symbol} {timeframe}: {e}")
+            return 0
+
+    def get_status(self) -> Dict[str, Any]:
+        """Bar store summary"""
+        return {
+            "root": str(self.root),
+            "format": self.file_format,
+            "symbols_1min": len(self.list_symbols("1min"))
+        }
+
+
+# Global instance
+bar_store = BarStore()
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+
+# ─────────────────────────────────────────────────────────────
+# © 2025 StatikFintechLLC
+# Coordination Triggers - Event-driven per-symbol coordination passes
+# Contact: ascend.gremlin@gmail.com
+# ─────────────────────────────────────────────────────────────
+
+"""
+Coordination Triggers
+Watches the market data bus for the watchlist and open positions and
+queues a coordination pass for a symbol when one of its triggers fires:
+a completed bar, a bar volume spike against the symbol's own average, a
+price move since its last pass, or price approaching a position's stop or
+reaching its target. Triggers are debounced into batches and each symbol
+has a cooldown that exempt reasons (position risk by default) bypass. A
+full sweep still runs when nothing has swept the watchlist for
+`fallback_sweep_seconds`.
+"""
+
+# Import ALL dependencies through globals.py (required)
+import sys
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from Gremlin_Trade_Core.globals import (
+    # Core imports
+    asyncio, time,
+    # Type hints
+    List, Dict, Any, Optional, Callable, Awaitable, Iterable,
+    # Configuration and utilities
+    CFG, setup_module_logger
+)
+
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.market_data_bus import (
+    market_data_bus, EVENT_BAR, EVENT_SNAPSHOT
+)
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.bar_resampler import canonical_timeframe
+
+# Initialize logger
+trigger_logger = setup_module_logger("market_data", "coordination_triggers")
+
+# Trigger reasons
+TRIGGER_BAR_CLOSE = "bar_close"
+TRIGGER_VOLUME_SPIKE = "volume_spike"
+TRIGGER_PRICE_MOVE = "price_move"
+TRIGGER_POSITION_RISK = "position_risk"
+
+
+class CoordinationTriggers:
+    """
+    Bus-driven scheduler for coordination passes
+    handler(symbols, reasons) runs a pass for the triggered symbols;
+    sweep() runs the full periodic pass. symbols_fn returns the symbols to
+    watch and positions_fn the open positions (objects or dicts carrying
+    stop_loss / take_profit).
+    """
+
+    def __init__(self, handler: Callable[[List[str], Dict[str, List[str]]], Awaitable[Any]],
+                 sweep: Callable[[], Awaitable[Any]],
+                 symbols_fn: Callable[[], Iterable[str]],
+                 positions_fn: Optional[Callable[[], Dict[str, Any]]] = None,
+                 config: Optional[Dict[str, Any]] = None, bus=None):
+        trigger_config = config if config is not None else CFG.get("agents", {}).get("coordination_triggers", {})
+        self.enabled = trigger_config.get("enabled", True)
+        self.bar_timeframe = canonical_timeframe(trigger_config.get("bar_timeframe", "5min"))
+        self.volume_spike_ratio = trigger_config.get("volume_spike_ratio", 3.0)
+        self.volume_halflife = max(1.0, trigger_config.get("volume_halflife_bars", 20))
+        self.price_move_pct = trigger_config.get("price_move_pct", 2.0)
+        self.stop_buffer_pct = trigger_config.get("stop_buffer_pct", 1.0)
+        self.debounce_seconds = trigger_config.get("debounce_seconds", 2.0)
+        self.cooldown_seconds = trigger_config.get("cooldown_seconds", 120)
+        self.cooldown_exempt = set(trigger_config.get("cooldown_exempt", [TRIGGER_POSITION_RISK]))
+        self.fallback_sweep_seconds = trigger_config.get("fallback_sweep_seconds", 1800)
+        self.max_batch = trigger_config.get("max_batch", 16)
+
+        self.handler = handler
+        self.sweep = sweep
+        self.symbols_fn = symbols_fn
+        self.positions_fn = positions_fn or (lambda: {})
+        self.bus = bus or market_data_bus
+
+        self.pending: Dict[str, List[str]] = {}
+        self.last_pass: Dict[str, float] = {}
+        self.reference_price: Dict[str, float] = {}
+        self.avg_bar_volume: Dict[str, float] = {}
+        self.last_sweep = 0.0
+        self.running = False
+        self.stats = {"events": 0, "fired": {}, "suppressed_cooldown": 0, "passes": 0, "symbols_passed": 0,
+                      "sweeps": 0, "errors": 0}
+        self._watched: set = set()
+        self._wake: Optional[asyncio.Event] = None
+        self._subscription = None
+        self._tasks: List[asyncio.Task] = []
+
+    # ─────────────────────────────────────────────
+    # Trigger evaluation
+    # ─────────────────────────────────────────────
+
+    def refresh_watched(self):
+        """Re-read the watchlist and positions"""
+        self._watched = {s.upper() for s in self.symbols_fn()} | {s.upper() for s in self.positions_fn()}
+
+    def evaluate(self, event_type: str, symbol: str, data: Dict[str, Any],
+                 timeframe: Optional[str] = None) -> List[str]:
+        """Reasons this event fires for the symbol (empty when none)"""
+        reasons = []
+        price = data.get("close", data.get("price"))
+
+        if event_type == EVENT_BAR and timeframe == self.bar_timeframe and data.get("complete", True):
+            reasons.append(TRIGGER_BAR_CLOSE)
+            volume = data.get("volume") or 0
+            average = self.avg_bar_volume.get(symbol)
+            if average and volume >= average * self.volume_spike_ratio:
+                reasons.append(TRIGGER_VOLUME_SPIKE)
+            alpha = 1 - 0.5 ** (1 / self.volume_halflife)
+            self.avg_bar_volume[symbol] = volume if average is None else average + alpha * (volume - average)
+
+        if price:
+            reference = self.reference_price.setdefault(symbol, price)
+            if reference and abs(price / reference - 1) * 100 >= self.price_move_pct:
+                reasons.append(TRIGGER_PRICE_MOVE)
+
+            position = self.positions_fn().get(symbol)
+            if position is not None:
+                get = position.get if isinstance(position, dict) else lambda key: getattr(position, key, None)
+                stop_loss, take_profit = get("stop_loss"), get("take_profit")
+                if stop_loss and price <= stop_loss * (1 + self.stop_buffer_pct / 100):
+                    reasons.append(TRIGGER_POSITION_RISK)
+                elif take_profit and price >= take_profit:
+                    reasons.append(TRIGGER_POSITION_RISK)
+        return reasons
+
+    def fire(self, symbol: str, reasons: List[str]) -> bool:
+        """Queue a pass for the symbol unless it is cooling down"""
+        now = time.monotonic()
+        cooling = now - self.last_pass.get(symbol, -float("inf")) < self.cooldown_seconds
+        if cooling and not self.cooldown_exempt.intersection(reasons):
+            self.stats["suppressed_cooldown"] += 1
+            return False
+        queued = self.pending.setdefault(symbol, [])
+        queued.extend(reason for reason in reasons if reason not in queued)
+        for reason in reasons:
+            self.stats["fired"][reason] = self.stats["fired"].get(reason, 0) + 1
+        if self._wake is not None:
+            self._wake.set()
+        return True
+
+    def requeue(self, symbols: Iterable[str], reason: str = "deferred"):
+        """Queue symbols for the next pass regardless of cooldown"""
+        for symbol in symbols:
+            queued = self.pending.setdefault(symbol.upper(), [])
+            if reason not in queued:
+                queued.append(reason)
+        if self._wake is not None and self.pending:
+            self._wake.set()
+
+    def on_event(self, event_type: str, symbol: str, data: Dict[str, Any], timeframe: Optional[str] = None):
+        """Evaluate one bus event"""
+        symbol = symbol.upper()
+        if symbol not in self._watched or not isinstance(data, dict):
+            return
+        self.stats["events"] += 1
+        reasons = self.evaluate(event_type, symbol, data, timeframe)
+        if reasons:
+            self.fire(symbol, reasons)
+
+    # ─────────────────────────────────────────────
+    # Dispatch
+    # ─────────────────────────────────────────────
+
+    async def dispatch(self) -> int:
+        """Run one coordination pass for the pending symbols (at most max_batch)"""
+        if not self.pending:
+            return 0
+        symbols = list(self.pending)[:self.max_batch]
+        reasons = {symbol: self.pending.pop(symbol) for symbol in symbols}
+        now = time.monotonic()
+        for symbol in symbols:
+            self.last_pass[symbol] = now
+        try:
+            trigger_logger.info(f"Triggered coordination for {len(symbols)} symbols: {reasons}")
+            await self.handler(symbols, reasons)
+            self.stats["passes"] += 1
+            self.stats["symbols_passed"] += len(symbols)
+        except Exception as e:
+            self.stats["errors"] += 1
+            trigger_logger.error(f"Error in triggered coordination pass: {e}")
+        finally:
+            self._rebase(symbols)
+        return len(symbols)
+
+    async def run_sweep(self):
+        """Full pass over every watched symbol"""
+        self.last_sweep = time.monotonic()
+        try:
+            await self.sweep()
+            self.stats["sweeps"] += 1
+        except Exception as e:
+            self.stats["errors"] += 1
+            trigger_logger.error(f"Error in fallback sweep: {e}")
+        self.refresh_watched()
+        now = time.monotonic()
+        for symbol in self._watched:
+            self.last_pass[symbol] = now
+        self._rebase(self._watched)
+
+    def _rebase(self, symbols: Iterable[str]):
+        """Price moves are measured from each symbol's latest pass"""
+        for symbol in symbols:
+            for event_type in (EVENT_SNAPSHOT, EVENT_BAR):
+                event = self.bus.get_latest(event_type, symbol, timeframe=self.bar_timeframe if event_type == EVENT_BAR else None)
+                price = event.data.get("close", event.data.get("price")) if event and isinstance(event.data, dict) else None
+                if price:
+                    self.reference_price[symbol] = price
+                    break
+
+    async def _consume(self):
+        while self.running:
+            try:
+                events = await self._subscription.get_batch(timeout=1.0)
+                for event in events:
+                    self.on_event(event.event_type, event.symbol, event.data, event.timeframe)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                trigger_logger.error(f"Error evaluating triggers: {e}")
+
+    async def _dispatch_loop(self):
+        while self.running:
+            try:
+                until_sweep = self.fallback_sweep_seconds - (time.monotonic() - self.last_sweep)
+                if until_sweep <= 0:
+                    await self.run_sweep()
+                    continue
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=until_sweep)
+                except asyncio.TimeoutError:
+                    continue
+                # Debounce - let a burst of triggers collect into one pass
+                await asyncio.sleep(self.debounce_seconds)
+                self._wake.clear()
+                while self.pending and self.running:
+                    await self.dispatch()
+                self.refresh_watched()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                trigger_logger.error(f"Error in trigger dispatch loop: {e}")
+                await asyncio.sleep(1.0)
+
+    async def start(self):
+        """Subscribe to the bus and start the dispatch loop (runs an initial sweep)"""
+        try:
+            if self.running:
+                return
+            self.running = True
+            self._wake = asyncio.Event()
+            self.refresh_watched()
+            if self.enabled:
+                self._subscription = self.bus.subscribe("coordination_triggers", event_types=[EVENT_BAR, EVENT_SNAPSHOT],
+                                                        maxsize=4096)
+                self._tasks.append(asyncio.create_task(self._consume()))
+            self._tasks.append(asyncio.create_task(self._dispatch_loop()))
+            trigger_logger.info(f"CoordinationTriggers started ({'event-driven' if self.enabled else 'sweep only'}, "
+                                f"fallback sweep every {self.fallback_sweep_seconds}s)")
+        except Exception as e:
+            trigger_logger.error(f"Error starting coordination triggers: {e}")
+
+    async def stop(self):
+        try:
+            self.running = False
+            if self._subscription is not None:
+                self.bus.unsubscribe("coordination_triggers")
+                self._subscription = None
+            for task in self._tasks:
+                task.cancel()
+            for task in self._tasks:
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+            self._tasks = []
+            trigger_logger.info("CoordinationTriggers stopped")
+        except Exception as e:
+            trigger_logger.error(f"Error stopping coordination triggers: {e}")
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "running": self.running,
+            "watched": len(self._watched),
+            "pending": dict(self.pending),
+            "seconds_since_sweep": round(time.monotonic() - self.last_sweep, 1) if self.last_sweep else None,
+            "stats": {**self.stats, "fired": dict(self.stats["fired"])}
+        }
+
+
+if __name__ == "__main__":
+    from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.market_data_bus import MarketDataBus
+
+    async def test_triggers():
+        bus = MarketDataBus()
+
+        async def handler(symbols, reasons):
+            print(f"Pass: {reasons}")
+
+        async def sweep():
+            print("Sweep")
+
+        triggers = CoordinationTriggers(handler, sweep, lambda: ["AAA", "BBB"],
+                                        lambda: {"BBB": {"stop_loss": 9.5, "take_profit": 12.0}},
+                                        {"debounce_seconds": 0.1, "cooldown_seconds": 0.5}, bus)
+        await triggers.start()
+        for i in range(5):
+            bus.publish_bar("AAA", {"ts": i * 300, "close": 10.0, "volume": 1000 if i < 4 else 9000}, timeframe="5min")
+            await asyncio.sleep(0.3)
+        bus.publish_bar("BBB", {"ts": 0, "close": 9.55, "volume": 1000}, timeframe="1min")
+        await asyncio.sleep(0.3)
+        print(triggers.get_status())
+        await triggers.stop()
+
+    asyncio.run(test_triggers())
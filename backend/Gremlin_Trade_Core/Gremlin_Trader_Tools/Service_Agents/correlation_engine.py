@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+
+# ─────────────────────────────────────────────────────────────
+# © 2025 StatikFintechLLC
+# Correlation Engine - Streaming EW covariance across the universe
+# Contact: ascend.gremlin@gmail.com
+# ─────────────────────────────────────────────────────────────
+
+"""
+Correlation Engine
+Keeps exponentially weighted means and co-moments of bar log returns for
+every tracked symbol in one N x N matrix. Completed bars from the market
+data bus are grouped by bar time; each bar time is one O(N^2) NumPy update
+of the pairs that traded in it, after which the correlation matrix, the
+maximum correlation of every symbol with the open positions and (every few
+updates) the correlation clusters are refreshed. Lookups are array reads.
+On start the matrix is seeded from stored history so correlations are
+available before the first live bars arrive.
+"""
+
+# Import ALL dependencies through globals.py (required)
+import sys
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from Gremlin_Trade_Core.globals import (
+    # Core imports
+    asyncio, np, pd, threading,
+    # Type hints
+    List, Dict, Any, Optional, Iterable,
+    # Configuration and utilities
+    CFG, setup_module_logger
+)
+
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.market_data_bus import market_data_bus, EVENT_BAR
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.bar_store import bar_store
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.bar_resampler import get_resampled_bars, canonical_timeframe
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.fundamentals_cache import get_fundamentals
+
+# Initialize logger
+correlation_logger = setup_module_logger("market_data", "correlation_engine")
+
+
+class CorrelationEngine:
+    """
+    Rolling EW correlation/covariance matrix for N symbols
+    Symbols get a slot on first sight; the matrices grow by doubling up to
+    max_symbols. A pair's value is only reported once both symbols traded
+    together in min_periods bars.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, bus=None):
+        engine_config = config if config is not None else CFG.get("agents", {}).get("correlation", {})
+        self.enabled = engine_config.get("enabled", True)
+        self.timeframe = canonical_timeframe(engine_config.get("timeframe", "5min"))
+        self.halflife = max(1.0, float(engine_config.get("halflife_bars", 78)))
+        self.alpha = 1 - 0.5 ** (1 / self.halflife)
+        self.min_periods = engine_config.get("min_periods", 20)
+        self.max_symbols = engine_config.get("max_symbols", 2000)
+        self.cluster_threshold = engine_config.get("cluster_threshold", 0.7)
+        self.cluster_interval = engine_config.get("cluster_interval", 10)
+        self.seed_on_start = engine_config.get("seed_on_start", True)
+        self.seed_symbols = engine_config.get("seed_symbols", 500)
+        self.bus = bus or market_data_bus
+
+        self._lock = threading.RLock()
+        self._subscription = None
+        self._consume_task: Optional[asyncio.Task] = None
+        self.running = False
+        self.stats = {"bars": 0, "updates": 0, "late_bars": 0, "dropped_symbols": 0}
+        self._allocate(64)
+
+    def _allocate(self, capacity: int):
+        """(Re)create empty state with room for `capacity` symbols"""
+        self.index: Dict[str, int] = {}
+        self.symbols: List[str] = []
+        self.capacity = capacity
+        self.mean = np.zeros(capacity)
+        self.cov = np.zeros((capacity, capacity))
+        self.pairs = np.zeros((capacity, capacity), dtype=np.int32)
+        self.corr = np.full((capacity, capacity), np.nan)
+        self.last_close = np.full(capacity, np.nan)
+        self.last_update = np.full(capacity, -1, dtype=np.int64)
+        self.cluster_ids = np.arange(capacity)
+        self.position_corr = np.zeros(capacity)
+        self.positions: List[int] = []
+        self.updates = 0
+        self.bar_ts: Optional[int] = None
+        self.pending: Dict[str, float] = {}
+        self.seeded_ts: Optional[int] = None
+        self._clusters_at = -1
+
+    def clear(self):
+        with self._lock:
+            self._allocate(64)
+
+    def _grow(self, capacity: int):
+        n = len(self.symbols)
+        for name, fill in (("mean", 0.0), ("last_close", np.nan), ("last_update", -1), ("position_corr", 0.0)):
+            old = getattr(self, name)
+            new = np.full(capacity, fill, dtype=old.dtype)
+            new[:n] = old[:n]
+            setattr(self, name, new)
+        for name, fill in (("cov", 0.0), ("pairs", 0), ("corr", np.nan)):
+            old = getattr(self, name)
+            new = np.full((capacity, capacity), fill, dtype=old.dtype)
+            new[:n, :n] = old[:n, :n]
+            setattr(self, name, new)
+        self.cluster_ids = np.concatenate([self.cluster_ids[:n], np.arange(n, capacity)])
+        self.capacity = capacity
+
+    def _slot(self, symbol: str) -> Optional[int]:
+        slot = self.index.get(symbol)
+        if slot is not None:
+            return slot
+        if len(self.symbols) >= self.max_symbols:
+            self.stats["dropped_symbols"] += 1
+            return None
+        if len(self.symbols) >= self.capacity:
+            self._grow(min(self.capacity * 2, self.max_symbols))
+        slot = len(self.symbols)
+        self.index[symbol] = slot
+        self.symbols.append(symbol)
+        return slot
+
+    # ─────────────────────────────────────────────
+    # Updates
+    # ─────────────────────────────────────────────
+
+    def update(self, closes: Dict[str, float]) -> int:
+        """
+        One bar time: closes of every symbol that completed a bar
+        A symbol contributes a return only if it also closed the previous bar
+        time; otherwise its close just becomes the new reference.
+        """
+        with self._lock:
+            slots, values = [], []
+            for symbol, close in closes.items():
+                slot = self._slot(symbol.upper())
+                if slot is not None and close and close > 0:
+                    slots.append(slot)
+                    values.append(float(close))
+            if not slots:
+                return 0
+            slots, values = np.asarray(slots), np.asarray(values)
+            n = len(self.symbols)
+
+            contiguous = (self.last_update[slots] == self.updates - 1) & (self.last_close[slots] > 0)
+            present = np.zeros(n, dtype=bool)
+            present[slots[contiguous]] = True
+            returns = np.zeros(n)
+            returns[slots[contiguous]] = np.log(values[contiguous] / self.last_close[slots[contiguous]])
+            self.last_close[slots] = values
+            self.last_update[slots] = self.updates
+            self.updates += 1
+
+            if present.any():
+                alpha = self.alpha
+                first = present & (np.diag(self.pairs[:n, :n]) == 0)
+                self.mean[:n][first] = returns[first]
+                deviation = returns - self.mean[:n]
+                self.mean[:n][present] += alpha * deviation[present]
+                # EW co-moment of the pairs that traded together in this bar -
+                # in place when every symbol traded, on the sub-block otherwise
+                traded = np.flatnonzero(present)
+                if len(traded) == n:
+                    cov, pairs = self.cov[:n, :n], self.pairs[:n, :n]
+                else:
+                    block = np.ix_(traded, traded)
+                    cov, pairs = self.cov[block], self.pairs[block]
+                deviation = deviation[traded]
+                cov += alpha * np.multiply.outer(deviation, deviation)
+                cov *= 1 - alpha
+                pairs += 1
+                if len(traded) != n:
+                    self.cov[block], self.pairs[block] = cov, pairs
+                self._refresh()
+
+            self.stats["updates"] += 1
+            return int(present.sum())
+
+    def _refresh(self):
+        n = len(self.symbols)
+        corr = self.corr[:n, :n]
+        variance = np.diag(self.cov[:n, :n])
+        with np.errstate(invalid="ignore", divide="ignore"):
+            inverse = np.where(variance > 0, 1 / np.sqrt(variance), np.nan)
+        np.multiply(self.cov[:n, :n], inverse[:, None], out=corr)
+        corr *= inverse[None, :]
+        np.copyto(corr, np.nan, where=self.pairs[:n, :n] < self.min_periods)
+        np.clip(corr, -1.0, 1.0, out=corr)
+        np.fill_diagonal(corr, 1.0)
+        self._refresh_positions()
+
+    def _refresh_positions(self):
+        """Max correlation of every symbol with the open positions (itself excluded)"""
+        n = len(self.symbols)
+        if not self.positions:
+            self.position_corr[:n] = 0.0
+            return
+        block = self.corr[:n][:, self.positions].copy()
+        block[self.positions, np.arange(len(self.positions))] = np.nan
+        block = np.where(np.isnan(block), -np.inf, block)
+        self.position_corr[:n] = np.maximum(block.max(axis=1), 0.0)
+
+    def on_bar(self, symbol: str, bar: Dict[str, Any]):
+        """Completed bar from the bus - closes are batched per bar time"""
+        ts, close = bar.get("ts"), bar.get("close")
+        if ts is None or close is None:
+            return
+        ts = int(ts)
+        with self._lock:
+            self.stats["bars"] += 1
+            # Bars already covered by the seeded history count as late
+            if (self.bar_ts is not None and ts < self.bar_ts) or (self.seeded_ts is not None and ts <= self.seeded_ts):
+                self.stats["late_bars"] += 1
+                return
+            if self.bar_ts is not None and ts > self.bar_ts:
+                self.flush()
+            self.bar_ts = ts
+            self.pending[symbol.upper()] = float(close)
+
+    def flush(self) -> int:
+        """Apply the bar time being collected"""
+        with self._lock:
+            pending, self.pending = self.pending, {}
+            return self.update(pending) if pending else 0
+
+    def seed(self, symbols: Iterable[str], limit: Optional[int] = None) -> int:
+        """Warm the matrix from resampled history, one update per bar time"""
+        closes = {}
+        for symbol in symbols:
+            try:
+                bars = get_resampled_bars(symbol, self.timeframe, limit=limit or int(self.halflife * 6))
+                if bars is not None and len(bars):
+                    closes[symbol.upper()] = pd.Series(bars["close"].to_numpy(dtype=float), index=bars["ts"].to_numpy())
+            except Exception as e:
+                correlation_logger.warning(f"No {self.timeframe} history for {symbol}: {e}")
+        if not closes:
+            return 0
+        frame = pd.DataFrame(closes).sort_index()
+        with self._lock:
+            self.flush()
+            for row in frame.itertuples(index=False):
+                self.update({symbol: close for symbol, close in zip(frame.columns, row) if close == close})
+            self.seeded_ts = max(self.seeded_ts or 0, int(frame.index[-1]))
+        correlation_logger.info(f"Correlation engine seeded with {len(closes)} symbols over {len(frame)} bars")
+        return len(frame)
+
+    # ─────────────────────────────────────────────
+    # Lookups
+    # ─────────────────────────────────────────────
+
+    def set_positions(self, symbols: Iterable[str]):
+        """Open positions the per-symbol position correlation is measured against"""
+        with self._lock:
+            self.positions = sorted({self.index[s.upper()] for s in symbols if s.upper() in self.index})
+            self._refresh_positions()
+
+    def correlation(self, a: str, b: str) -> Optional[float]:
+        """Current correlation of two symbols (None while unknown)"""
+        i, j = self.index.get(a.upper()), self.index.get(b.upper())
+        if i is None or j is None:
+            return None
+        value = self.corr[i, j]
+        return None if np.isnan(value) else float(value)
+
+    def covariance(self, a: str, b: str) -> Optional[float]:
+        """EW covariance of bar log returns"""
+        i, j = self.index.get(a.upper()), self.index.get(b.upper())
+        if i is None or j is None or self.pairs[i, j] < self.min_periods:
+            return None
+        return float(self.cov[i, j])
+
+    def volatility(self, symbol: str) -> Optional[float]:
+        """EW standard deviation of the symbol's bar log returns"""
+        slot = self.index.get(symbol.upper())
+        if slot is None or self.pairs[slot, slot] < self.min_periods:
+            return None
+        return float(np.sqrt(self.cov[slot, slot]))
+
+    def median_volatility(self) -> Optional[float]:
+        """Median bar volatility across the tracked symbols"""
+        n = len(self.symbols)
+        known = np.diag(self.pairs[:n, :n]) >= self.min_periods
+        if not known.any():
+            return None
+        return float(np.median(np.sqrt(np.diag(self.cov[:n, :n])[known])))
+
+    def position_correlation(self, symbol: str) -> float:
+        """Highest correlation of a symbol with any open position (0.0 when unknown)"""
+        slot = self.index.get(symbol.upper())
+        return float(self.position_corr[slot]) if slot is not None else 0.0
+
+    def max_correlation(self, symbol: str, others: Iterable[str]) -> float:
+        """Highest correlation of a symbol with an explicit set of symbols"""
+        best = 0.0
+        for other in others:
+            if other.upper() != symbol.upper():
+                value = self.correlation(symbol, other)
+                if value is not None and value > best:
+                    best = value
+        return best
+
+    def _refresh_clusters(self):
+        """Connected components of the |corr| > threshold graph"""
+        n = len(self.symbols)
+        adjacency = np.abs(np.nan_to_num(self.corr[:n, :n])) > self.cluster_threshold
+        labels = np.full(n, -1)
+        for start in range(n):
+            if labels[start] >= 0:
+                continue
+            labels[start] = start
+            frontier = np.zeros(n, dtype=bool)
+            frontier[start] = True
+            while frontier.any():
+                reached = adjacency[frontier].any(axis=0) & (labels < 0)
+                labels[reached] = start
+                frontier = reached
+        self.cluster_ids[:n] = labels
+        self._clusters_at = self.updates
+
+    def cluster_of(self, symbol: str) -> Optional[int]:
+        """Cluster id of a symbol; symbols sharing an id move together"""
+        with self._lock:
+            if self.updates - self._clusters_at >= self.cluster_interval or self._clusters_at < 0:
+                self._refresh_clusters()
+            slot = self.index.get(symbol.upper())
+            return int(self.cluster_ids[slot]) if slot is not None else None
+
+    def groupings(self) -> Dict[str, Dict[str, List[str]]]:
+        """Correlation clusters (two or more members) and sector groups of the tracked symbols"""
+        with self._lock:
+            self._refresh_clusters()
+            clusters: Dict[str, List[str]] = {}
+            for symbol, label in zip(self.symbols, self.cluster_ids[:len(self.symbols)]):
+                clusters.setdefault(self.symbols[label], []).append(symbol)
+            sectors: Dict[str, List[str]] = {}
+            for symbol in self.symbols:
+                sector = (get_fundamentals(symbol) or {}).get("sector")
+                if sector:
+                    sectors.setdefault(sector, []).append(symbol)
+            return {
+                "clusters": {leader: members for leader, members in clusters.items() if len(members) > 1},
+                "sectors": sectors
+            }
+
+    # ─────────────────────────────────────────────
+    # Bus consumer
+    # ─────────────────────────────────────────────
+
+    async def start(self):
+        """Consume completed bars of the engine timeframe from the market data bus"""
+        try:
+            if self.running or not self.enabled:
+                return
+            self.running = True
+            self._subscription = self.bus.subscribe("correlation_engine", event_types=[EVENT_BAR], maxsize=4096)
+            self._consume_task = asyncio.create_task(self._seed_and_consume())
+            correlation_logger.info(f"CorrelationEngine started ({self.timeframe}, halflife {self.halflife} bars)")
+        except Exception as e:
+            correlation_logger.error(f"Error starting correlation engine: {e}")
+
+    async def stop(self):
+        try:
+            self.running = False
+            self.bus.unsubscribe("correlation_engine")
+            if self._consume_task:
+                self._consume_task.cancel()
+                try:
+                    await self._consume_task
+                except asyncio.CancelledError:
+                    pass
+                self._consume_task = None
+            correlation_logger.info("CorrelationEngine stopped")
+        except Exception as e:
+            correlation_logger.error(f"Error stopping correlation engine: {e}")
+
+    async def _seed_and_consume(self):
+        """Seed from the bar store (bus bars queue meanwhile), then consume"""
+        if self.seed_on_start and not self.symbols:
+            try:
+                symbols = bar_store.list_symbols("1min")
+                if self.seed_symbols:
+                    symbols = symbols[:self.seed_symbols]
+                if symbols:
+                    await asyncio.to_thread(self.seed, symbols)
+            except Exception as e:
+                correlation_logger.error(f"Error seeding correlation engine: {e}")
+        await self._consume()
+
+    async def _consume(self):
+        while self.running:
+            try:
+                events = await self._subscription.get_batch(timeout=5.0)
+                for event in events:
+                    if event.timeframe == self.timeframe and event.data.get("complete", True):
+                        self.on_bar(event.symbol, event.data)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                correlation_logger.error(f"Error consuming bars: {e}")
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "running": self.running,
+            "timeframe": self.timeframe,
+            "halflife_bars": self.halflife,
+            "symbols": len(self.symbols),
+            "capacity": self.capacity,
+            "positions": [self.symbols[i] for i in self.positions],
+            "seeded_ts": self.seeded_ts,
+            "stats": dict(self.stats)
+        }
+
+
+# Global instance
+correlation_engine = CorrelationEngine()
+
+# Convenience functions
+def get_position_correlation(symbol: str) -> float:
+    """Highest correlation of a symbol with the open positions"""
+    return correlation_engine.position_correlation(symbol)
+
+def get_correlation(a: str, b: str) -> Optional[float]:
+    """Current correlation of two symbols"""
+    return correlation_engine.correlation(a, b)
+
+def get_correlation_groupings() -> Dict[str, Dict[str, List[str]]]:
+    """Correlation clusters and sector groups of the tracked symbols"""
+    return correlation_engine.groupings()
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(3)
+    engine = CorrelationEngine({"halflife_bars": 50, "min_periods": 10})
+    market, sector = rng.normal(0, 0.01, 500), rng.normal(0, 0.01, 500)
+    prices = {s: 10.0 for s in ["AAA", "AAB", "AAC", "ZZZ"]}
+    for t in range(500):
+        for symbol in prices:
+            shock = sector[t] if symbol.startswith("AA") else rng.normal(0, 0.01)
+            prices[symbol] *= np.exp(0.5 * market[t] + shock + rng.normal(0, 0.003))
+        engine.update(prices)
+    engine.set_positions(["AAA"])
+    print(f"AAB~AAA {engine.correlation('AAB', 'AAA'):.2f}, ZZZ~AAA {engine.correlation('ZZZ', 'AAA'):.2f}")
+    print(f"Position correlation AAC {engine.position_correlation('AAC'):.2f}, groupings {engine.groupings()}")
@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+
+# ─────────────────────────────────────────────────────────────
+# © 2025 StatikFintechLLC
+# Feature Store - Named features computed once per symbol, timeframe and bar
+# Contact: ascend.gremlin@gmail.com
+# ─────────────────────────────────────────────────────────────
+
+"""
+Feature Store
+Features are registered by name with the features they depend on and read
+from one of two sources: a snapshot record (price, volume, up_pct, ema ...)
+or a bar series (close, high, low, volume arrays). Values are cached per
+(symbol, timeframe, bar) in a bounded LRU, so the penny strategy, the signal
+rules, the strategy agent and the rule set agent share one computation
+instead of each re-deriving volume ratios, RSI or gap strength.
+"""
+
+# Import ALL dependencies through globals.py (required)
+import sys
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from Gremlin_Trade_Core.globals import (
+    # Core imports
+    np, pd, threading, OrderedDict,
+    # Type hints
+    List, Dict, Any, Optional, Tuple, Iterable, Callable,
+    # Additional imports
+    dataclass,
+    # Configuration and utilities
+    CFG, setup_module_logger
+)
+
+# Initialize logger
+feature_logger = setup_module_logger("market_data", "feature_store")
+
+RECORD_TIMEFRAME = "snapshot"
+SOURCES = ("record", "bars")
+
+
+@dataclass
+class FeatureSpec:
+    name: str
+    source: str
+    compute: Callable[[Any, Dict[str, Any]], Any]
+    deps: Tuple[str, ...] = ()
+    fields: Tuple[str, ...] = ()
+
+
+# Registry of named features
+_FEATURES: Dict[str, FeatureSpec] = {}
+_record_fields: Tuple[str, ...] = ()
+
+
+def register_feature(name: str, compute: Callable[[Any, Dict[str, Any]], Any], deps: Iterable[str] = (),
+                     source: str = "record", fields: Iterable[str] = ()) -> FeatureSpec:
+    """
+    Register a named feature
+    compute(data, values) receives the record (or bar series arrays) and the
+    already computed values of its deps. Record features list the record
+    fields they read; those fields key the cache for records.
+    """
+    global _record_fields
+    if source not in SOURCES:
+        raise ValueError(f"Unknown feature source: {source}")
+    deps = tuple(deps)
+    for dep in deps:
+        if dep not in _FEATURES:
+            raise ValueError(f"Feature {name} depends on unregistered feature {dep}")
+        if _FEATURES[dep].source != source:
+            raise ValueError(f"Feature {name} ({source}) cannot depend on {dep} ({_FEATURES[dep].source})")
+
+    spec = FeatureSpec(name=name, source=source, compute=compute, deps=deps, fields=tuple(fields))
+    _FEATURES[name] = spec
+    if source == "record":
+        _record_fields = tuple(sorted(set(_record_fields) | set(spec.fields)))
+    return spec
+
+
+def feature(name: str, deps: Iterable[str] = (), source: str = "record", fields: Iterable[str] = ()):
+    """Decorator form of register_feature"""
+    def decorator(compute):
+        register_feature(name, compute, deps, source, fields)
+        return compute
+    return decorator
+
+
+def resolve(names: Iterable[str]) -> List[str]:
+    """Dependency order for a set of features (deps before dependents)"""
+    order, seen = [], set()
+
+    def visit(name: str):
+        if name in seen:
+            return
+        spec = _FEATURES.get(name)
+        if spec is None:
+            raise KeyError(f"Unknown feature: {name}")
+        seen.add(name)
+        for dep in spec.deps:
+            visit(dep)
+        order.append(name)
+
+    for name in names:
+        visit(name)
+    return order
+
+
+def _hashable(value: Any) -> Any:
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), _hashable(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_hashable(v) for v in value)
+    return value
+
+
+def record_key(record: Dict[str, Any], timeframe: str = RECORD_TIMEFRAME,
+               symbol: Optional[str] = None) -> Tuple[Any, ...]:
+    """
+    (symbol, timeframe, bar_ts, inputs) for a snapshot record
+    Live quotes move within a bar, so the record fields features read are
+    part of the key alongside last_bar_ts.
+    """
+    bar_ts = record.get("last_bar_ts", record.get("bar_ts"))
+    inputs = tuple(_hashable(record.get(field)) for field in _record_fields)
+    return (symbol or record.get("symbol", ""), timeframe, bar_ts, inputs)
+
+
+def _last_bar(bars: Any) -> Dict[str, Any]:
+    if isinstance(bars, pd.DataFrame):
+        last = bars.iloc[-1].to_dict()
+        last.setdefault("timestamp", bars.index[-1])
+        return last
+    return bars[-1]
+
+
+def bars_key(symbol: str, timeframe: str, bars: Any) -> Tuple[Any, ...]:
+    """(symbol, timeframe, bar_ts, ...) for a bar series; the last bar may still be forming"""
+    last = _last_bar(bars)
+    bar_ts = last.get("ts", last.get("timestamp", last.get("date")))
+    return (symbol, timeframe, str(bar_ts), len(bars), float(last.get("close", 0)), float(last.get("volume", 0)))
+
+
+def to_series(bars: Any) -> Dict[str, np.ndarray]:
+    """close/high/low/volume arrays from bar dicts or a DataFrame"""
+    columns = ("close", "high", "low", "volume")
+    if isinstance(bars, pd.DataFrame):
+        return {column: bars[column].to_numpy(dtype=float) for column in columns if column in bars.columns}
+    first = bars[0] if len(bars) else {}
+    return {
+        column: np.fromiter((float(bar[column]) for bar in bars), dtype=float, count=len(bars))
+        for column in columns if column in first
+    }
+
+
+class FeatureStore:
+    """
+    Bounded LRU of feature values keyed by (symbol, timeframe, bar)
+    A feature is computed the first time any consumer asks for it on a bar;
+    every later read on that bar is a cache hit.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        store_config = config if config is not None else CFG.get("strategy", {}).get("feature_store", {})
+        self.enabled = store_config.get("enabled", True)
+        self.max_entries = store_config.get("max_entries", 50000)
+        self._entries: "OrderedDict[Tuple[Any, ...], Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "computed": 0, "errors": 0, "evicted": 0}
+        self.computed_by_feature: Dict[str, int] = {}
+
+    def _entry(self, key: Tuple[Any, ...]) -> Dict[str, Any]:
+        if not self.enabled:
+            return {}
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = {}
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evicted"] += 1
+        else:
+            self._entries.move_to_end(key)
+        return entry
+
+    def _compute(self, key: Tuple[Any, ...], names: Iterable[str], data_fn: Callable[[], Any]) -> Dict[str, Any]:
+        order = resolve(names)
+        with self._lock:
+            entry = self._entry(key)
+            data = None
+            for name in order:
+                if name in entry:
+                    self.stats["hits"] += 1
+                    continue
+                if data is None:
+                    data = data_fn()
+                spec = _FEATURES[name]
+                try:
+                    entry[name] = spec.compute(data, entry)
+                except Exception as e:
+                    feature_logger.error(f"Error computing feature {name} for {key[0]}: {e}")
+                    self.stats["errors"] += 1
+                    entry[name] = None
+                self.stats["computed"] += 1
+                self.computed_by_feature[name] = self.computed_by_feature.get(name, 0) + 1
+            return {name: entry[name] for name in names}
+
+    def record_features(self, record: Dict[str, Any], names: Iterable[str],
+                        timeframe: str = RECORD_TIMEFRAME, symbol: Optional[str] = None) -> Dict[str, Any]:
+        """Named features of a snapshot record"""
+        names = tuple(names)
+        return self._compute(record_key(record, timeframe, symbol), names, lambda: record)
+
+    def bar_features(self, symbol: str, timeframe: str, bars: Any, names: Iterable[str]) -> Dict[str, Any]:
+        """Named features of a bar series (list of bar dicts or a DataFrame)"""
+        names = tuple(names)
+        if bars is None or not len(bars):
+            return {name: None for name in names}
+        return self._compute(bars_key(symbol, timeframe, bars), names, lambda: to_series(bars))
+
+    def invalidate(self, symbol: Optional[str] = None):
+        """Drop cached features for a symbol, or all of them"""
+        with self._lock:
+            if symbol is None:
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries if key[0] == symbol]:
+                del self._entries[key]
+
+    def get_status(self) -> Dict[str, Any]:
+        """Cache size, hit rate and per-feature compute counts"""
+        reads = self.stats["hits"] + self.stats["computed"]
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "features": sorted(_FEATURES),
+            "hit_rate": round(self.stats["hits"] / reads, 3) if reads else 0.0,
+            "stats": dict(self.stats),
+            "computed_by_feature": dict(self.computed_by_feature)
+        }
+
+
+# ─────────────────────────────────────────────────────────────
+# Record features (snapshot dicts from the universe / market services)
+# ─────────────────────────────────────────────────────────────
+
+@feature("volume_ratio", fields=("volume", "avg_volume"))
+def _volume_ratio(record, values):
+    volume = record.get("volume", 0)
+    avg_volume = record.get("avg_volume", volume)
+    return volume / avg_volume if avg_volume > 0 else 1.0
+
+@feature("gap_pct", fields=("up_pct",))
+def _gap_pct(record, values):
+    return record.get("up_pct", 0)
+
+@feature("momentum_type", deps=("gap_pct",))
+def _momentum_type(record, values):
+    up_pct = values["gap_pct"]
+    if up_pct > 100:
+        return "explosive"
+    if up_pct > 50:
+        return "strong"
+    if up_pct > 20:
+        return "moderate"
+    return "weak"
+
+@feature("gap_type", deps=("gap_pct",))
+def _gap_type(record, values):
+    up_pct = values["gap_pct"]
+    if up_pct > 20:
+        return "major_gap"
+    if up_pct > 10:
+        return "significant_gap"
+    if up_pct > 5:
+        return "minor_gap"
+    return "no_gap"
+
+@feature("gap_strength", deps=("gap_pct",))
+def _gap_strength(record, values):
+    return min(1.0, values["gap_pct"] / 50.0)  # Normalize to 50% max
+
+@feature("rsi_estimate", deps=("gap_pct",))
+def _rsi_estimate(record, values):
+    return min(90, 50 + (values["gap_pct"] / 2))  # Rough approximation without bars
+
+@feature("ema_cross_bullish", fields=("ema",))
+def _ema_cross_bullish(record, values):
+    ema = record.get("ema", {}) or {}
+    return ema.get("5", 0) > ema.get("20", 0)
+
+@feature("vwap_break", fields=("price", "vwap"))
+def _vwap_break(record, values):
+    return record.get("price", 0) > record.get("vwap", 0)
+
+@feature("volume_spike", fields=("volume",))
+def _volume_spike(record, values):
+    return record.get("volume", 0) > 2000000  # High volume threshold
+
+@feature("rule_values", fields=("price", "volume", "rsi", "ema_20", "sma_20", "sma_50", "sma_200", "vwap",
+                                "atr", "vix", "avg_volume", "support", "resistance", "position_correlation"))
+def _rule_values(record, values):
+    price = record.get("price", 0)
+    return {
+        "price": price,
+        "volume": record.get("volume", 0),
+        "rsi": record.get("rsi", 50),
+        "ema_20": record.get("ema_20", price),
+        "sma_20": record.get("sma_20", price),
+        "sma_50": record.get("sma_50", price),
+        "sma_200": record.get("sma_200", price),
+        "vwap": record.get("vwap", price),
+        "atr": record.get("atr", 0.02),
+        "vix": record.get("vix", 20),
+        "avg_volume": record.get("avg_volume", record.get("volume", 0)),
+        "support_level": record.get("support", price * 0.95),
+        "resistance_level": record.get("resistance", price * 1.05),
+        "position_correlation": record.get("position_correlation", 0.0)
+    }
+
+
+# ─────────────────────────────────────────────────────────────
+# Bar features (close/high/low/volume arrays)
+# ─────────────────────────────────────────────────────────────
+
+@feature("rsi_14", source="bars")
+def _rsi_14(series, values, period: int = 14):
+    prices = series["close"]
+    if len(prices) < period + 1:
+        return 50.0
+    deltas = np.diff(prices)
+    avg_gain = np.mean(np.where(deltas > 0, deltas, 0)[-period:])
+    avg_loss = np.mean(np.where(deltas < 0, -deltas, 0)[-period:])
+    if avg_loss == 0:
+        return 100.0
+    return float(100 - (100 / (1 + avg_gain / avg_loss)))
+
+@feature("sma_20", source="bars")
+def _sma_20(series, values):
+    return float(np.mean(series["close"][-20:]))
+
+@feature("std_20", source="bars")
+def _std_20(series, values):
+    return float(np.std(series["close"][-20:]))
+
+@feature("bollinger_20", deps=("sma_20", "std_20"), source="bars")
+def _bollinger_20(series, values, std_dev: int = 2):
+    return values["sma_20"] + values["std_20"] * std_dev, values["sma_20"] - values["std_20"] * std_dev
+
+@feature("avg_volume_20", source="bars")
+def _avg_volume_20(series, values):
+    return float(np.mean(series["volume"][-20:]))
+
+@feature("volume_ratio_20", deps=("avg_volume_20",), source="bars")
+def _volume_ratio_20(series, values):
+    return float(series["volume"][-1]) / values["avg_volume_20"] if values["avg_volume_20"] > 0 else 1.0
+
+@feature("momentum_10", source="bars")
+def _momentum_10(series, values):
+    prices = series["close"]
+    return float((prices[-1] - prices[-10]) / prices[-10]) if len(prices) >= 10 else 0.0
+
+@feature("momentum_3", source="bars")
+def _momentum_3(series, values):
+    prices = series["close"]
+    return float((prices[-1] - prices[-3]) / prices[-3]) if len(prices) >= 3 else 0.0
+
+@feature("atr_14", source="bars")
+def _atr_14(series, values, period: int = 14):
+    if len(series["close"]) < period:
+        return 0.02  # Default ATR
+    high, low, prev_close = series["high"][1:], series["low"][1:], series["close"][:-1]
+    true_ranges = np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+    return float(np.mean(true_ranges[-period:])) if len(true_ranges) else 0.02
+
+
+# Global instance
+feature_store = FeatureStore()
+
+# Convenience functions
+def record_features(record: Dict[str, Any], names: Iterable[str], timeframe: str = RECORD_TIMEFRAME,
+                    symbol: Optional[str] = None) -> Dict[str, Any]:
+    """Named features of a snapshot record from the shared store"""
+    return feature_store.record_features(record, names, timeframe, symbol)
+
+def bar_features(symbol: str, timeframe: str, bars: Any, names: Iterable[str]) -> Dict[str, Any]:
+    """Named features of a bar series from the shared store"""
+    return feature_store.bar_features(symbol, timeframe, bars, names)
+
+def get_feature_stats() -> Dict[str, Any]:
+    """Feature store status"""
+    return feature_store.get_status()
+
+
+if __name__ == "__main__":
+    stock = {"symbol": "GPRO", "price": 2.5, "volume": 4500000, "avg_volume": 1500000, "up_pct": 32.0,
+             "vwap": 2.3, "ema": {"5": 2.45, "20": 2.2}}
+    for _ in range(3):
+        print(record_features(stock, ["volume_ratio", "gap_strength", "ema_cross_bullish", "rsi_estimate"]))
+
+    closes = 2.0 + np.cumsum(np.random.default_rng(7).normal(0, 0.05, 50))
+    bars = [{"date": f"2025-01-{i % 28 + 1:02d}", "close": c, "high": c * 1.01, "low": c * 0.99,
+             "volume": 1000000 + i * 1000} for i, c in enumerate(closes)]
+    for _ in range(2):
+        print(bar_features("GPRO", "1d", bars, ["rsi_14", "bollinger_20", "volume_ratio_20", "atr_14"]))
+    print(f"Status: {get_feature_stats()}")
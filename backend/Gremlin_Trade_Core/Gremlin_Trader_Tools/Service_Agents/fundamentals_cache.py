@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+
+# ─────────────────────────────────────────────────────────────
+# © 2025 StatikFintechLLC
+# Fundamentals Cache - Daily float, market cap, sector and short interest
+# Contact: ascend.gremlin@gmail.com
+# ─────────────────────────────────────────────────────────────
+
+"""
+Fundamentals Cache
+Slow-moving fundamentals are fetched once per day in a background batch and
+stored in SQLite. Scans read a sorted in-memory lookup array instead, so the
+float / market cap filters run as a vectorized prefilter before any quote or
+intraday request is made. Symbols without cached data pass unless
+require_data is set. A failed fetch is not retried for failure_retry_hours,
+so delisted or unknown symbols do not cost a request on every check.
+"""
+
+# Import ALL dependencies through globals.py (required)
+import sys
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from Gremlin_Trade_Core.globals import (
+    # Core imports
+    asyncio, sqlite3, np, time,
+    # Type hints
+    List, Dict, Any, Optional, Callable, Iterable,
+    # Configuration and utilities
+    CFG, METADATA_DB_PATH, setup_module_logger
+)
+
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.universe_source import load_universe
+
+# Initialize logger
+fundamentals_logger = setup_module_logger("market_data", "fundamentals_cache")
+
+FUNDAMENTALS_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS fundamentals (
+        symbol TEXT PRIMARY KEY,
+        float_shares REAL,
+        market_cap REAL,
+        sector TEXT,
+        short_interest_pct REAL,
+        updated_at INTEGER NOT NULL
+    ) WITHOUT ROWID
+'''
+
+# In-memory lookup row; sector is an index into the sector name list (-1 = unknown)
+LOOKUP_DTYPE = np.dtype([
+    ("symbol", "U12"), ("float_million", "f8"), ("market_cap", "f8"),
+    ("short_interest_pct", "f8"), ("sector", "i2"), ("updated_at", "i8")
+])
+
+
+class FundamentalsCache:
+    """
+    SQLite-backed fundamentals cache with a compact lookup array
+    The array is rebuilt after each batch and swapped in as one tuple, so
+    readers never see a half-updated table.
+    """
+
+    def __init__(self, source: Optional[Callable] = None, db_path: Optional[Path] = None,
+                 config: Optional[Dict[str, Any]] = None):
+        self.config = config if config is not None else CFG.get("agents", {}).get("fundamentals", {})
+        self.source = source
+        self.db_path = Path(db_path or self.config.get("db_path") or METADATA_DB_PATH)
+        self.refresh_hours = self.config.get("refresh_hours", 24)
+        self.failure_retry_hours = self.config.get("failure_retry_hours", 4)
+        self.check_interval = self.config.get("check_interval_minutes", 60) * 60
+        self.filters = self.config.get("filters", {})
+        self._lookup = (np.empty(0, dtype=LOOKUP_DTYPE), ())
+        self.running = False
+        self.last_refresh: Optional[float] = None
+        self.refresh_count = 0
+        self.fetch_errors = 0
+        self._failed: Dict[str, float] = {}
+        self._refresh_lock: Optional[asyncio.Lock] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    def set_source(self, source: Callable):
+        """Bind the async (symbol) -> fundamentals dict callable"""
+        self.source = source
+
+    def _resolve_source(self) -> Optional[Callable]:
+        """Resolve the default fundamentals source lazily to avoid circular imports"""
+        if self.source is None:
+            try:
+                from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.market_data_service import (
+                    real_market_service, YFINANCE_AVAILABLE
+                )
+                if YFINANCE_AVAILABLE:
+                    self.source = real_market_service.get_fundamentals
+            except Exception as e:
+                fundamentals_logger.warning(f"No fundamentals source available: {e}")
+        return self.source
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path)
+        conn.execute(FUNDAMENTALS_SCHEMA)
+        return conn
+
+    def load(self) -> int:
+        """Rebuild the lookup array from SQLite"""
+        try:
+            conn = self._connect()
+            rows = conn.execute('''
+                SELECT symbol, float_shares, market_cap, short_interest_pct, sector, updated_at
+                FROM fundamentals ORDER BY symbol
+            ''').fetchall()
+            conn.close()
+
+            sectors = tuple(sorted({row[4] for row in rows if row[4]}))
+            sector_index = {name: i for i, name in enumerate(sectors)}
+            array = np.empty(len(rows), dtype=LOOKUP_DTYPE)
+            for i, (symbol, float_shares, market_cap, short_pct, sector, updated_at) in enumerate(rows):
+                array[i] = (
+                    symbol,
+                    float_shares / 1e6 if float_shares else np.nan,
+                    market_cap if market_cap else np.nan,
+                    short_pct if short_pct is not None else np.nan,
+                    sector_index.get(sector, -1),
+                    updated_at
+                )
+
+            self._lookup = (array, sectors)
+            return len(array)
+
+        except Exception as e:
+            fundamentals_logger.error(f"Error loading fundamentals cache: {e}")
+            return 0
+
+    def _rows(self, symbols: Iterable[str]) -> tuple:
+        """Lookup rows for symbols: (array, sectors, row indices, found mask)"""
+        array, sectors = self._lookup
+        keys = np.asarray([str(s).upper() for s in symbols], dtype="U12")
+        if not len(array) or not len(keys):
+            return array, sectors, np.zeros(len(keys), dtype=np.int64), np.zeros(len(keys), dtype=bool)
+        rows = np.minimum(np.searchsorted(array["symbol"], keys), len(array) - 1)
+        return array, sectors, rows, array["symbol"][rows] == keys
+
+    def _column(self, array: np.ndarray, rows: np.ndarray, found: np.ndarray, name: str) -> np.ndarray:
+        values = np.full(len(rows), np.nan)
+        values[found] = array[name][rows[found]]
+        return values
+
+    def passes(self, symbols: List[str], max_float_million: Optional[float] = None,
+               min_market_cap: Optional[float] = None, max_market_cap: Optional[float] = None,
+               exclude_sectors: Optional[List[str]] = None, require_data: Optional[bool] = None) -> np.ndarray:
+        """Boolean mask of symbols passing the fundamentals filters"""
+        array, sectors, rows, found = self._rows(symbols)
+        mask = np.ones(len(rows), dtype=bool)
+
+        min_market_cap = min_market_cap if min_market_cap is not None else self.filters.get("min_market_cap")
+        max_market_cap = max_market_cap if max_market_cap is not None else self.filters.get("max_market_cap")
+        exclude_sectors = exclude_sectors if exclude_sectors is not None else self.filters.get("exclude_sectors", [])
+        require_data = require_data if require_data is not None else self.filters.get("require_data", False)
+
+        # Comparisons against NaN are False, so unknown values pass
+        if max_float_million:
+            mask &= ~(self._column(array, rows, found, "float_million") > max_float_million)
+        if min_market_cap:
+            mask &= ~(self._column(array, rows, found, "market_cap") < min_market_cap)
+        if max_market_cap:
+            mask &= ~(self._column(array, rows, found, "market_cap") > max_market_cap)
+        if exclude_sectors:
+            excluded = [i for i, name in enumerate(sectors) if name in exclude_sectors]
+            if excluded:
+                sector_codes = np.full(len(rows), -1, dtype=np.int16)
+                sector_codes[found] = array["sector"][rows[found]]
+                mask &= ~np.isin(sector_codes, excluded)
+        if require_data:
+            mask &= found
+        return mask
+
+    def filter_symbols(self, symbols: List[str], **filters) -> List[str]:
+        """Symbols passing the fundamentals filters, in input order"""
+        mask = self.passes(symbols, **filters)
+        return [symbol for symbol, keep in zip(symbols, mask) if keep]
+
+    def get(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Cached fundamentals for one symbol in stock record field names"""
+        array, sectors, rows, found = self._rows([symbol])
+        if not found.any():
+            return None
+        row = array[rows[0]]
+        record = {}
+        if row["float_million"] == row["float_million"]:
+            record["float_million"] = round(float(row["float_million"]), 3)
+        if row["market_cap"] == row["market_cap"]:
+            record["market_cap"] = float(row["market_cap"])
+        if row["short_interest_pct"] == row["short_interest_pct"]:
+            record["short_interest_pct"] = round(float(row["short_interest_pct"]), 2)
+        if row["sector"] >= 0:
+            record["sector"] = sectors[row["sector"]]
+        return record
+
+    def enrich(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Fill missing fundamentals fields on plain stock records"""
+        enriched = []
+        for record in records:
+            fundamentals = self.get(record.get("symbol", "")) if record.get("symbol") else None
+            if fundamentals:
+                missing = {k: v for k, v in fundamentals.items() if record.get(k) is None}
+                record = {**record, **missing} if missing else record
+            enriched.append(record)
+        return enriched
+
+    def stale_symbols(self, symbols: List[str]) -> List[str]:
+        """Symbols never fetched or older than refresh_hours, minus recent failures"""
+        array, _, rows, found = self._rows(symbols)
+        now = time.time()
+        cutoff = int(now - self.refresh_hours * 3600)
+        updated = np.zeros(len(rows), dtype=np.int64)
+        updated[found] = array["updated_at"][rows[found]]
+        failed = self._failed
+        return [symbol for symbol, ts in zip(symbols, updated)
+                if ts < cutoff and failed.get(symbol.upper(), 0.0) <= now]
+
+    async def refresh(self, symbols: Optional[List[str]] = None, force: bool = False) -> int:
+        """Fetch stale fundamentals in one batch and write them in one transaction"""
+        if self._refresh_lock is None:
+            self._refresh_lock = asyncio.Lock()
+
+        async with self._refresh_lock:
+            try:
+                source = self._resolve_source()
+                if source is None:
+                    return 0
+
+                symbols = [s.upper() for s in (symbols or load_universe())]
+                due = symbols if force else self.stale_symbols(symbols)
+                if not due:
+                    return 0
+
+                started = time.perf_counter()
+                # Requests are paced by the scheduler behind the source
+                results = await asyncio.gather(*[source(symbol) for symbol in due], return_exceptions=True)
+
+                now = int(time.time())
+                retry_at = now + self.failure_retry_hours * 3600
+                rows = []
+                for symbol, result in zip(due, results):
+                    if isinstance(result, Exception) or not result:
+                        self.fetch_errors += 1
+                        self._failed[symbol] = retry_at
+                        continue
+                    self._failed.pop(symbol, None)
+                    rows.append((
+                        symbol, result.get("float_shares"), result.get("market_cap"),
+                        result.get("sector"), result.get("short_interest_pct"), now
+                    ))
+
+                if rows:
+                    conn = self._connect()
+                    with conn:
+                        conn.executemany('''
+                            INSERT OR REPLACE INTO fundamentals
+                            (symbol, float_shares, market_cap, sector, short_interest_pct, updated_at)
+                            VALUES (?, ?, ?, ?, ?, ?)
+                        ''', rows)
+                    conn.close()
+                    self.load()
+
+                self._failed = {symbol: until for symbol, until in self._failed.items() if until > now}
+                self.last_refresh = time.time()
+                self.refresh_count += 1
+                fundamentals_logger.info(
+                    f"Fundamentals refresh: {len(rows)}/{len(due)} symbols in {time.perf_counter() - started:.1f}s"
+                )
+                return len(rows)
+
+            except Exception as e:
+                fundamentals_logger.error(f"Error refreshing fundamentals: {e}")
+                return 0
+
+    async def start(self):
+        """Load the cache and start the daily batch loop"""
+        try:
+            if self.running:
+                return
+            self.running = True
+            self.load()
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+            fundamentals_logger.info(f"FundamentalsCache started ({len(self._lookup[0])} symbols cached)")
+        except Exception as e:
+            fundamentals_logger.error(f"Error starting fundamentals cache: {e}")
+
+    async def stop(self):
+        """Stop the batch loop"""
+        try:
+            self.running = False
+            if self._refresh_task:
+                self._refresh_task.cancel()
+                try:
+                    await self._refresh_task
+                except asyncio.CancelledError:
+                    pass
+                self._refresh_task = None
+            fundamentals_logger.info("FundamentalsCache stopped")
+        except Exception as e:
+            fundamentals_logger.error(f"Error stopping fundamentals cache: {e}")
+
+    async def _refresh_loop(self):
+        """Check periodically; only symbols past refresh_hours are fetched"""
+        while self.running:
+            try:
+                await self.refresh()
+                await asyncio.sleep(self.check_interval)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                fundamentals_logger.error(f"Error in fundamentals refresh loop: {e}")
+                await asyncio.sleep(self.check_interval)
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get cache status"""
+        array, sectors = self._lookup
+        return {
+            "running": self.running,
+            "symbols": len(array),
+            "sectors": len(sectors),
+            "lookup_bytes": int(array.nbytes),
+            "refresh_hours": self.refresh_hours,
+            "last_refresh": self.last_refresh,
+            "refresh_count": self.refresh_count,
+            "fetch_errors": self.fetch_errors,
+            "failed_symbols": len(self._failed)
+        }
+
+
+# Global instance
+fundamentals_cache = FundamentalsCache()
+
+# Convenience functions
+def get_fundamentals(symbol: str) -> Optional[Dict[str, Any]]:
+    """Get cached fundamentals for a symbol"""
+    return fundamentals_cache.get(symbol)
+
+def filter_by_fundamentals(symbols: List[str], **filters) -> List[str]:
+    """Apply the fundamentals prefilter to a symbol list"""
+    return fundamentals_cache.filter_symbols(symbols, **filters)
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    async def test_fundamentals_cache():
+        async def fetch(symbol):
+            return {"float_shares": (len(symbol) * 7 % 40) * 1e6, "market_cap": 5e7,
+                    "sector": "Healthcare", "short_interest_pct": 12.5}
+
+        cache = FundamentalsCache(fetch, Path(tempfile.mkdtemp()) / "fundamentals.db")
+        await cache.refresh()
+        universe = load_universe()
+        print(f"Cached: {cache.get_status()}")
+        print(f"GPRO: {cache.get('GPRO')}")
+        print(f"Float <= 25M: {len(cache.filter_symbols(universe, max_float_million=25))}/{len(universe)}")
+
+    asyncio.run(test_fundamentals_cache())
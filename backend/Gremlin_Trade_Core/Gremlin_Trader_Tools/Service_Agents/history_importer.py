@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+
+# ─────────────────────────────────────────────────────────────
+# © 2025 StatikFintechLLC
+# History Importer - Offline bulk load of local OHLCV files
+# Contact: ascend.gremlin@gmail.com
+# ─────────────────────────────────────────────────────────────
+
+"""
+History Importer
+Loads a directory of CSV or Parquet bar files into the bar store and the
+market_data table. Files are parsed in a process pool; the parent process
+does all writes, one transaction per file, and records each finished file in
+a manifest so an interrupted import resumes where it stopped. Imported rows
+older than the market_data rollup watermarks are rolled up right away, and a
+1-minute import rebuilds the scanner's market state index from the updated store.
+
+Usage:
+    python history_importer.py /data/minute_bars --timeframe 1min --workers 8
+"""
+
+# Import ALL dependencies through globals.py (required)
+import sys
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from Gremlin_Trade_Core.globals import (
+    # Core imports
+    os, json, sqlite3, np, pd, time, datetime, timezone, itertools,
+    ProcessPoolExecutor, FIRST_COMPLETED, wait,
+    # Type hints
+    List, Dict, Any, Optional, Union, Tuple,
+    # Configuration and utilities
+    CFG, METADATA_DB_PATH, setup_module_logger
+)
+
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.bar_store import (
+    BarStore, bar_store, normalize_bars, TIMEFRAME_SECONDS
+)
+
+# Initialize logger
+importer_logger = setup_module_logger("market_data", "history_importer")
+
+SUPPORTED_SUFFIXES = (".csv", ".parquet")
+
+# Session windows in minutes after local midnight, [start, end)
+SESSION_WINDOWS = {
+    "regular": (9 * 60 + 30, 16 * 60),
+    "extended": (4 * 60, 20 * 60),
+    "all": None
+}
+
+
+def symbol_from_path(path: Path) -> str:
+    """Ticker from a file name such as AAPL_1min.csv, aapl-2020.parquet or AAPL.US.csv"""
+    return path.stem.replace("-", "_").replace(".", "_").split("_")[0].upper()
+
+
+def clean_bars(bars: pd.DataFrame, timeframe: str, options: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Validate and align normalized bars
+    Rows with non-positive prices or negative volume are dropped, high/low are
+    widened to contain open/close, end-labelled bars are shifted to their start,
+    intraday bars outside the session are dropped and daily bars are keyed to
+    the session date at 00:00 UTC.
+    """
+    if bars.empty:
+        return bars
+
+    valid = (bars[["open", "high", "low", "close"]] > 0).all(axis=1) & (bars["volume"] >= 0)
+    bars = bars[valid].copy()
+    bars["high"] = bars[["open", "high", "low", "close"]].max(axis=1)
+    bars["low"] = bars[["open", "high", "low", "close"]].min(axis=1)
+
+    seconds = TIMEFRAME_SECONDS.get(timeframe, 60)
+    if options.get("bar_label") == "right":
+        bars["ts"] = bars["ts"] - seconds
+
+    local = pd.to_datetime(bars["ts"], unit="s", utc=True).dt.tz_convert(options.get("market_tz", "America/New_York"))
+    if seconds >= TIMEFRAME_SECONDS["1d"]:
+        session_date = local.dt.normalize().dt.tz_localize(None)
+        bars["ts"] = ((session_date - pd.Timestamp("1970-01-01")) // pd.Timedelta(seconds=1)).astype(np.int64)
+    else:
+        keep = local.dt.dayofweek < 5
+        window = SESSION_WINDOWS.get(options.get("session", "extended"))
+        if window is not None:
+            minute = local.dt.hour * 60 + local.dt.minute
+            keep &= (minute >= window[0]) & (minute < window[1])
+        bars = bars[keep.to_numpy()]
+
+    return bars.sort_values("ts").drop_duplicates("ts", keep="last").reset_index(drop=True)
+
+
+def parse_history_file(path: str, timeframe: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Parse one file into cleaned bars per symbol
+    Runs in a worker process, so it only takes and returns picklable values.
+    """
+    file_path = Path(path)
+    try:
+        raw = pd.read_parquet(file_path) if file_path.suffix == ".parquet" else pd.read_csv(file_path)
+        columns = {str(c).strip().lower(): c for c in raw.columns}
+        symbol_column = columns.get("symbol") or columns.get("ticker")
+
+        if symbol_column is not None:
+            groups = [(str(symbol).upper(), frame.drop(columns=[symbol_column]))
+                      for symbol, frame in raw.groupby(symbol_column, sort=False)]
+        else:
+            groups = [(symbol_from_path(file_path), raw)]
+
+        symbols = {}
+        for symbol, frame in groups:
+            bars = clean_bars(normalize_bars(frame, options.get("source_tz")), timeframe, options)
+            if not bars.empty:
+                symbols[symbol] = bars
+
+        rows_out = sum(len(bars) for bars in symbols.values())
+        return {"path": path, "symbols": symbols, "rows_in": len(raw),
+                "rows": rows_out, "dropped": len(raw) - rows_out, "error": None}
+
+    except Exception as e:
+        return {"path": path, "symbols": {}, "rows_in": 0, "rows": 0, "dropped": 0, "error": str(e)}
+
+
+class HistoryImporter:
+    """
+    Bulk importer for local history files
+    Parsing fans out over processes; bar store and SQLite writes stay in the
+    parent so there is a single writer for each destination.
+    """
+
+    def __init__(self, store: Optional[BarStore] = None, db_path: Optional[Union[str, Path]] = None,
+                 config: Optional[Dict[str, Any]] = None):
+        self.config = config if config is not None else CFG.get("agents", {}).get("history_import", {})
+        self.store = store or bar_store
+        self.db_path = Path(db_path) if db_path else METADATA_DB_PATH
+        self.manifest_path = self.store.root / "import_manifest.json"
+        self.manifest: Dict[str, Dict[str, Any]] = {}
+
+    def discover(self, source: Union[str, Path]) -> List[Path]:
+        """All CSV/Parquet files under a directory (or a single file)"""
+        source = Path(source)
+        if source.is_file():
+            return [source] if source.suffix in SUPPORTED_SUFFIXES else []
+        return sorted(p for p in source.rglob("*") if p.is_file() and p.suffix in SUPPORTED_SUFFIXES)
+
+    def _file_key(self, path: Path) -> Dict[str, Any]:
+        stat = path.stat()
+        return {"size": stat.st_size, "mtime": stat.st_mtime}
+
+    def _load_manifest(self):
+        try:
+            self.manifest = json.loads(self.manifest_path.read_text()) if self.manifest_path.exists() else {}
+        except Exception as e:
+            importer_logger.warning(f"Ignoring unreadable import manifest: {e}")
+            self.manifest = {}
+
+    def _save_manifest(self):
+        try:
+            tmp_path = self.manifest_path.with_suffix(".json.tmp")
+            tmp_path.write_text(json.dumps(self.manifest, indent=2))
+            tmp_path.replace(self.manifest_path)
+        except Exception as e:
+            importer_logger.error(f"Failed to save import manifest: {e}")
+
+    def is_imported(self, path: Path, timeframe: str) -> bool:
+        """Check the manifest for an unchanged, already imported file"""
+        entry = self.manifest.get(str(path.resolve()))
+        return bool(entry) and entry.get("timeframe") == timeframe and \
+            {k: entry.get(k) for k in ("size", "mtime")} == self._file_key(path)
+
+    def _ensure_schema(self) -> bool:
+        """Create or migrate the market_data table before the first write"""
+        try:
+            from Gremlin_Trade_Memory.embedder import init_metadata_database
+            init_metadata_database()
+            return True
+        except Exception as e:
+            importer_logger.error(f"Cannot prepare the market_data table - importing to the bar store only: {e}")
+            return False
+
+    def _write_db(self, conn: sqlite3.Connection, symbols: Dict[str, pd.DataFrame], timeframe: str) -> int:
+        """Upsert one file's bars in a single transaction"""
+        rows = 0
+        with conn:
+            for symbol, bars in symbols.items():
+                conn.executemany('''
+                    INSERT INTO market_data
+                    (symbol, timeframe, ts, open, high, low, close, volume, indicators)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, NULL)
+                    ON CONFLICT(symbol, timeframe, ts) DO UPDATE SET
+                        open = excluded.open,
+                        high = excluded.high,
+                        low = excluded.low,
+                        close = excluded.close,
+                        volume = excluded.volume
+                ''', (
+                    (symbol, timeframe, int(ts), float(o), float(h), float(l), float(c), int(v))
+                    for ts, o, h, l, c, v in bars[["ts", "open", "high", "low", "close", "volume"]].itertuples(index=False)
+                ))
+                rows += len(bars)
+        return rows
+
+    def _rollup_imported(self, conn: sqlite3.Connection, timeframe: str, ts_range: Optional[Tuple[int, int]]) -> Dict[str, int]:
+        """Aggregate imported bars that the scheduled rollups have already moved past"""
+        if not ts_range:
+            return {}
+        try:
+            from Gremlin_Trade_Memory.embedder import rollup_backfilled_market_data
+            with conn:
+                rolled_up = rollup_backfilled_market_data(conn, timeframe, ts_range[0], ts_range[1])
+            if rolled_up:
+                importer_logger.info(f"Rolled up imported history: {rolled_up}")
+            return rolled_up
+        except Exception as e:
+            importer_logger.error(f"Error rolling up imported history: {e}")
+            return {}
+
+    def _build_state_index(self, timeframe: str) -> int:
+        """Re-index the scanner timeframe after new 1-minute history lands"""
+        index_config = CFG.get("strategy", {}).get("market_state_index", {})
+        if timeframe != "1min" or not index_config.get("enabled", True) or \
+                not index_config.get("build_after_import", True):
+            return 0
+        try:
+            # Imported here: the index resamples through bar_resampler, which imports this module
+            from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.market_state_index import build_state_index
+            return build_state_index(index_config.get("scanner_timeframe", "5min"))
+        except Exception as e:
+            importer_logger.error(f"Error building market state index after import: {e}")
+            return 0
+
+    def run(self, source: Union[str, Path], timeframe: str = "1min", workers: Optional[int] = None,
+            resume: bool = True, write_db: bool = True, build_index: bool = True) -> Dict[str, Any]:
+        """Import every file under `source`; returns row counts and throughput"""
+        options = {key: self.config.get(key) for key in ("source_tz", "market_tz", "session", "bar_label")}
+        workers = workers or self.config.get("workers") or os.cpu_count() or 1
+        progress_every = self.config.get("progress_every", 25)
+        stats = {"files": 0, "skipped": 0, "failed": 0, "rows_in": 0, "rows": 0, "rows_changed": 0,
+                 "dropped": 0, "symbols": set(), "errors": [], "rolled_up": {}}
+        ts_range: Optional[Tuple[int, int]] = None
+
+        files = self.discover(source)
+        if resume:
+            self._load_manifest()
+            pending_files = [p for p in files if not self.is_imported(p, timeframe)]
+            stats["skipped"] = len(files) - len(pending_files)
+        else:
+            self.manifest = {}
+            pending_files = files
+
+        importer_logger.info(
+            f"Importing {len(pending_files)} files ({stats['skipped']} already imported) "
+            f"from {source} with {workers} workers"
+        )
+
+        conn = None
+        if write_db and pending_files and self._ensure_schema():
+            conn = sqlite3.connect(self.db_path)
+
+        started = time.perf_counter()
+        last_saved = started
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                queue_iter = iter(pending_files)
+                # Bounded in-flight work keeps parsed frames from piling up in memory
+                in_flight = {
+                    executor.submit(parse_history_file, str(p), timeframe, options): p
+                    for p in itertools.islice(queue_iter, workers * 2)
+                }
+
+                while in_flight:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        path = in_flight.pop(future)
+                        result = future.result()
+
+                        if result["error"]:
+                            stats["failed"] += 1
+                            stats["errors"].append(f"{path}: {result['error']}")
+                            importer_logger.error(f"Failed to parse {path}: {result['error']}")
+                        else:
+                            for symbol, bars in result["symbols"].items():
+                                stats["rows_changed"] += self.store.write(symbol, bars, timeframe)
+                            if conn is not None:
+                                self._write_db(conn, result["symbols"], timeframe)
+                                for bars in result["symbols"].values():
+                                    if len(bars):
+                                        span = (int(bars["ts"].iloc[0]), int(bars["ts"].iloc[-1]))
+                                        ts_range = span if ts_range is None else \
+                                            (min(ts_range[0], span[0]), max(ts_range[1], span[1]))
+
+                            stats["files"] += 1
+                            stats["rows_in"] += result["rows_in"]
+                            stats["rows"] += result["rows"]
+                            stats["dropped"] += result["dropped"]
+                            stats["symbols"].update(result["symbols"])
+                            self.manifest[str(path.resolve())] = {
+                                **self._file_key(path), "timeframe": timeframe, "rows": result["rows"],
+                                "imported_at": datetime.now(timezone.utc).isoformat()
+                            }
+
+                        next_path = next(queue_iter, None)
+                        if next_path is not None:
+                            in_flight[executor.submit(parse_history_file, str(next_path), timeframe, options)] = next_path
+
+                        done_count = stats["files"] + stats["failed"]
+                        if progress_every and done_count % progress_every == 0:
+                            elapsed = time.perf_counter() - started
+                            importer_logger.info(
+                                f"{done_count}/{len(pending_files)} files, {stats['rows']:,} rows, "
+                                f"{stats['rows'] / elapsed if elapsed else 0:,.0f} rows/s"
+                            )
+
+                    if time.perf_counter() - last_saved > 5:
+                        self._save_manifest()
+                        last_saved = time.perf_counter()
+
+        except KeyboardInterrupt:
+            importer_logger.warning("Import interrupted - progress saved, rerun to resume")
+
+        finally:
+            self._save_manifest()
+            if conn is not None:
+                stats["rolled_up"] = self._rollup_imported(conn, timeframe, ts_range)
+                conn.close()
+
+        elapsed = time.perf_counter() - started
+        stats["symbols"] = len(stats["symbols"])
+        stats["seconds"] = round(elapsed, 2)
+        stats["rows_per_second"] = round(stats["rows"] / elapsed, 1) if elapsed else 0.0
+        stats["states_indexed"] = self._build_state_index(timeframe) if build_index and stats["files"] else 0
+        importer_logger.info(
+            f"Import complete: {stats['files']} files, {stats['rows']:,} rows "
+            f"({stats['dropped']:,} dropped, {stats['rows_changed']:,} new or changed), {stats['symbols']} symbols, "
+            f"{stats['rows_per_second']:,.0f} rows/s"
+        )
+        return stats
+
+
+# Global instance
+history_importer = HistoryImporter()
+
+# Convenience functions
+def import_history(source: Union[str, Path], timeframe: str = "1min", workers: Optional[int] = None,
+                   resume: bool = True, write_db: bool = True, build_index: bool = True) -> Dict[str, Any]:
+    """Import a directory of history files with the shared importer"""
+    return history_importer.run(source, timeframe, workers, resume, write_db, build_index)
+
+
+# === CLI Interface ===
+def cli_interface():
+    import argparse
+    parser = argparse.ArgumentParser(description="Gremlin ShadTail Trader historical bar importer")
+    parser.add_argument("source", type=str, help="Directory (or file) of CSV/Parquet OHLCV files")
+    parser.add_argument("--timeframe", type=str, default="1min", choices=sorted(TIMEFRAME_SECONDS))
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--no-resume", action="store_true", help="Re-import files already in the manifest")
+    parser.add_argument("--no-db", action="store_true", help="Only write the bar store")
+    parser.add_argument("--no-index", action="store_true", help="Skip rebuilding the market state index")
+    args = parser.parse_args()
+
+    stats = import_history(args.source, args.timeframe, args.workers,
+                           resume=not args.no_resume, write_db=not args.no_db, build_index=not args.no_index)
+    print(json.dumps({k: v for k, v in stats.items() if k != "errors"}, indent=2))
+    for error in stats["errors"][:20]:
+        print(f"ERROR {error}")
+
+
+if __name__ == "__main__":
+    cli_interface()
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+
+# ─────────────────────────────────────────────────────────────
+# © 2025 StatikFintechLLC
+# Incremental State - Per-symbol dirty tracking between scan cycles
+# Contact: ascend.gremlin@gmail.com
+# ─────────────────────────────────────────────────────────────
+
+"""
+Incremental State
+Each scanner keeps the inputs and result of its last analysis per symbol.
+A symbol is dirty when it is new, its cached result has expired, the
+scanner's thresholds changed, or one of its watched inputs moved beyond an
+epsilon (relative for price and volume, absolute points for up_pct). Only
+the dirty set is re-analyzed; the rest reuse their cached result.
+"""
+
+# Import ALL dependencies through globals.py (required)
+import sys
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from Gremlin_Trade_Core.globals import (
+    # Core imports
+    math, time, threading, OrderedDict,
+    # Type hints
+    List, Dict, Any, Optional, Tuple, Iterable, Callable,
+    # Configuration and utilities
+    CFG, setup_module_logger
+)
+
+# Initialize logger
+incremental_logger = setup_module_logger("market_data", "incremental_state")
+
+DIRTY_REASONS = ("new", "expired", "changed", "params", "unknown")
+
+# Watched input -> (comparison, default epsilon)
+DEFAULT_WATCH = {
+    "price": ("relative", 0.002),
+    "volume": ("relative", 0.05),
+    "up_pct": ("absolute", 0.25),
+    "rotation": ("absolute", 0.05),
+    "last_bar_ts": ("exact", 0.0)
+}
+
+
+class IncrementalState:
+    """
+    Cached per-symbol results for one scanner
+    Usage per cycle: begin_cycle(params), check() each symbol, store() the
+    dirty ones after analysis, end_cycle() for the dirty-set report.
+    """
+
+    def __init__(self, name: str, config: Optional[Dict[str, Any]] = None):
+        incremental_config = config if config is not None else CFG.get("strategy", {}).get("incremental_scan", {})
+        overrides = incremental_config.get("scanners", {}).get(name, {})
+        self.name = name
+        self.enabled = overrides.get("enabled", incremental_config.get("enabled", True))
+        self.ttl_seconds = overrides.get("ttl_seconds", incremental_config.get("ttl_seconds", 60))
+        self.max_symbols = incremental_config.get("max_symbols", 20000)
+
+        epsilons = {**incremental_config.get("epsilon", {}), **overrides.get("epsilon", {})}
+        self.watch = {
+            field: (mode, float(epsilons.get(field, epsilon))) for field, (mode, epsilon) in DEFAULT_WATCH.items()
+        }
+
+        self._entries: "OrderedDict[str, Tuple[Dict[str, float], Any, float]]" = OrderedDict()
+        self._params_key: Optional[str] = None
+        self._dropped: set = set()
+        self._lock = threading.Lock()
+        self._cycle = self._empty_cycle()
+        self.last_cycle: Dict[str, Any] = {}
+        self.totals = {"cycles": 0, "checked": 0, "dirty": 0, "reused": 0}
+
+    @staticmethod
+    def _empty_cycle() -> Dict[str, Any]:
+        return {"checked": 0, "dirty": 0, "reused": 0, "reasons": {reason: 0 for reason in DIRTY_REASONS},
+                "started": time.perf_counter()}
+
+    def fingerprint(self, record: Optional[Dict[str, Any]]) -> Optional[Dict[str, float]]:
+        """Watched numeric inputs of a record; None when there is no record to compare"""
+        if record is None:
+            return None
+        inputs = {}
+        for field in self.watch:
+            value = record.get(field)
+            if isinstance(value, (int, float)) and not isinstance(value, bool) and not math.isnan(value):
+                inputs[field] = float(value)
+        return inputs or None
+
+    def _moved(self, previous: Dict[str, float], current: Dict[str, float]) -> bool:
+        """True when any watched input changed beyond its epsilon"""
+        if previous.keys() != current.keys():
+            return True
+        for field, value in current.items():
+            mode, epsilon = self.watch[field]
+            before = previous[field]
+            if mode == "exact":
+                change = abs(value - before)
+            elif mode == "relative":
+                change = abs(value - before) / abs(before) if before else abs(value)
+            else:
+                change = abs(value - before)
+            if change > epsilon:
+                return True
+        return False
+
+    def begin_cycle(self, params: Any = None):
+        """Start a cycle; a change in scanner thresholds invalidates every cached result"""
+        with self._lock:
+            self._cycle = self._empty_cycle()
+            self._dropped = set()
+            params_key = repr(params) if params is not None else None
+            if params_key != self._params_key:
+                if self._entries:
+                    incremental_logger.info(f"{self.name}: thresholds changed, {len(self._entries)} cached results dropped")
+                self._dropped = set(self._entries)
+                self._entries.clear()
+                self._params_key = params_key
+
+    def check(self, symbol: str, record: Optional[Dict[str, Any]]) -> Tuple[bool, Any]:
+        """
+        (dirty, cached_result) for a symbol
+        A clean symbol returns its cached result, which may be None for a
+        symbol that did not qualify last time.
+        """
+        with self._lock:
+            self._cycle["checked"] += 1
+            reason = None
+            inputs = self.fingerprint(record)
+            entry = self._entries.get(symbol) if self.enabled else None
+            if entry is None:
+                reason = "params" if symbol in self._dropped else "new"
+            elif inputs is None:
+                reason = "unknown"
+            elif time.monotonic() - entry[2] > self.ttl_seconds:
+                reason = "expired"
+            elif self._moved(entry[0], inputs):
+                reason = "changed"
+
+            if reason is None:
+                self._entries.move_to_end(symbol)
+                self._cycle["reused"] += 1
+                return False, entry[1]
+
+            self._cycle["dirty"] += 1
+            self._cycle["reasons"][reason] += 1
+            return True, None
+
+    def store(self, symbol: str, record: Optional[Dict[str, Any]], result: Any):
+        """Remember the inputs a result was computed from"""
+        inputs = self.fingerprint(record)
+        if not self.enabled or inputs is None:
+            return
+        with self._lock:
+            self._entries[symbol] = (inputs, result, time.monotonic())
+            self._entries.move_to_end(symbol)
+            while len(self._entries) > self.max_symbols:
+                self._entries.popitem(last=False)
+
+    def partition(self, items: Iterable[Any], key: Callable[[Any], str],
+                  record: Optional[Callable[[Any], Optional[Dict[str, Any]]]] = None) -> Tuple[List[Any], Dict[str, Any]]:
+        """Split items into the dirty list and {symbol: cached_result} for the clean ones"""
+        dirty, reused = [], {}
+        for item in items:
+            symbol = key(item)
+            is_dirty, cached = self.check(symbol, record(item) if record else item)
+            if is_dirty:
+                dirty.append(item)
+            else:
+                reused[symbol] = cached
+        return dirty, reused
+
+    def end_cycle(self) -> Dict[str, Any]:
+        """Close the cycle and report the dirty-set size"""
+        with self._lock:
+            cycle = self._cycle
+            checked = cycle["checked"]
+            self.last_cycle = {
+                "checked": checked,
+                "dirty": cycle["dirty"],
+                "reused": cycle["reused"],
+                "dirty_ratio": round(cycle["dirty"] / checked, 3) if checked else 0.0,
+                "reasons": {reason: count for reason, count in cycle["reasons"].items() if count},
+                "cached_symbols": len(self._entries),
+                "seconds": round(time.perf_counter() - cycle["started"], 4)
+            }
+            self.totals["cycles"] += 1
+            for key in ("checked", "dirty", "reused"):
+                self.totals[key] += cycle[key]
+
+        incremental_logger.debug(f"{self.name}: dirty {self.last_cycle['dirty']}/{checked} ({self.last_cycle['reasons']})")
+        return self.last_cycle
+
+    def invalidate(self, symbols: Optional[Iterable[str]] = None):
+        """Drop cached results for some symbols, or all of them"""
+        with self._lock:
+            if symbols is None:
+                self._entries.clear()
+            else:
+                for symbol in symbols:
+                    self._entries.pop(symbol, None)
+
+    def get_status(self) -> Dict[str, Any]:
+        """Configuration, last cycle and running totals"""
+        return {
+            "enabled": self.enabled,
+            "ttl_seconds": self.ttl_seconds,
+            "epsilon": {field: epsilon for field, (_, epsilon) in self.watch.items()},
+            "cached_symbols": len(self._entries),
+            "last_cycle": self.last_cycle,
+            "totals": dict(self.totals)
+        }
+
+
+# Registry of scanner states
+_states: Dict[str, IncrementalState] = {}
+_states_lock = threading.Lock()
+
+# Convenience functions
+def get_incremental_state(name: str) -> IncrementalState:
+    """Shared incremental state for a scanner, created on first use"""
+    with _states_lock:
+        if name not in _states:
+            _states[name] = IncrementalState(name)
+        return _states[name]
+
+def get_incremental_stats() -> Dict[str, Dict[str, Any]]:
+    """Last-cycle dirty-set report of every scanner"""
+    return {name: state.last_cycle for name, state in _states.items()}
+
+
+if __name__ == "__main__":
+    state = IncrementalState("demo", {"ttl_seconds": 60})
+    universe = [{"symbol": f"SYM{i}", "price": 1.0 + i, "volume": 1000000} for i in range(10)]
+
+    for cycle in range(3):
+        if cycle == 2:
+            universe[3] = {**universe[3], "price": universe[3]["price"] * 1.05}
+        state.begin_cycle({"min_volume": 1000000})
+        dirty, reused = state.partition(universe, key=lambda r: r["symbol"])
+        for record in dirty:
+            state.store(record["symbol"], record, {"symbol": record["symbol"], "score": record["price"]})
+        print(f"Cycle {cycle}: {state.end_cycle()}")
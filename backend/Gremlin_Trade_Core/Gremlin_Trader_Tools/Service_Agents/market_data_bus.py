@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+
+# ─────────────────────────────────────────────────────────────
+# © 2025 StatikFintechLLC
+# Market Data Bus - In-process pub/sub for market data events
+# Contact: ascend.gremlin@gmail.com
+# ─────────────────────────────────────────────────────────────
+
+"""
+Market Data Bus
+The universe snapshot provider is the single market data refresher: it
+publishes snapshot events, and the bar resampler publishes bar events cut
+from the same 1-minute fetch. Every consumer subscribes through a bounded,
+conflating queue so slow readers only ever see the latest value per symbol
+and never hold up fast ones.
+"""
+
+# Import ALL dependencies through globals.py (required)
+import sys
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from Gremlin_Trade_Core.globals import (
+    # Core imports
+    asyncio, datetime, timezone, time, dataclass, field, OrderedDict,
+    # Type hints
+    List, Dict, Any, Optional,
+    # Configuration and utilities
+    CFG, setup_module_logger
+)
+
+# Initialize logger
+bus_logger = setup_module_logger("market_data", "market_data_bus")
+
+# Event types published on the bus
+EVENT_UNIVERSE = "universe"
+EVENT_SNAPSHOT = "snapshot"
+EVENT_BAR = "bar"
+
+
+@dataclass
+class MarketDataEvent:
+    """Single market data update published on the bus"""
+    event_type: str
+    symbol: str
+    data: Any
+    provider: str = "unknown"
+    version: int = 0
+    published_at: float = field(default_factory=time.monotonic)
+    timestamp: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    timeframe: Optional[str] = None
+
+    @property
+    def key(self) -> tuple:
+        """Conflation key - one pending event per type and symbol (and timeframe for bars)"""
+        if self.timeframe is None:
+            return (self.event_type, self.symbol)
+        return (self.event_type, self.symbol, self.timeframe)
+
+
+class Subscription:
+    """
+    Bounded, conflating subscriber queue
+    A newer event for the same key (type, symbol and bar timeframe) replaces
+    the pending one; when the queue is full the oldest pending symbol is dropped.
+    """
+
+    def __init__(self, name: str, maxsize: int = 256, event_types: Optional[List[str]] = None,
+                 symbols: Optional[List[str]] = None):
+        self.name = name
+        self.maxsize = max(1, maxsize)
+        self.event_types = set(event_types) if event_types else None
+        self.symbols = {s.upper() for s in symbols} if symbols else None
+        self.closed = False
+        self._pending: "OrderedDict[tuple, MarketDataEvent]" = OrderedDict()
+        self._ready = asyncio.Event()
+
+        # Lag and throughput metrics
+        self.received = 0
+        self.delivered = 0
+        self.conflated = 0
+        self.dropped = 0
+        self.last_lag_ms = 0.0
+        self.max_lag_ms = 0.0
+        self.avg_lag_ms = 0.0
+
+    def wants(self, event: MarketDataEvent) -> bool:
+        """Check subscription filters"""
+        if self.event_types is not None and event.event_type not in self.event_types:
+            return False
+        if self.symbols is not None and event.symbol not in self.symbols and event.event_type != EVENT_UNIVERSE:
+            return False
+        return True
+
+    def offer(self, event: MarketDataEvent):
+        """Enqueue without blocking - conflates per key and drops oldest when full"""
+        if self.closed or not self.wants(event):
+            return
+
+        self.received += 1
+        key = event.key
+        if key in self._pending:
+            self.conflated += 1
+            del self._pending[key]
+        elif len(self._pending) >= self.maxsize:
+            self._pending.popitem(last=False)
+            self.dropped += 1
+
+        self._pending[key] = event
+        self._ready.set()
+
+    def _take(self) -> MarketDataEvent:
+        """Pop the oldest pending event and record its lag"""
+        _, event = self._pending.popitem(last=False)
+        if not self._pending:
+            self._ready.clear()
+
+        lag_ms = (time.monotonic() - event.published_at) * 1000
+        self.last_lag_ms = lag_ms
+        self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+        self.avg_lag_ms = lag_ms if self.delivered == 0 else self.avg_lag_ms * 0.9 + lag_ms * 0.1
+        self.delivered += 1
+        return event
+
+    def get_nowait(self) -> Optional[MarketDataEvent]:
+        """Get the next pending event, or None"""
+        return self._take() if self._pending else None
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[MarketDataEvent]:
+        """Wait for the next event; returns None on timeout or close"""
+        try:
+            while not self._pending:
+                if self.closed:
+                    return None
+                if timeout is None:
+                    await self._ready.wait()
+                else:
+                    await asyncio.wait_for(self._ready.wait(), timeout)
+            return self._take()
+        except asyncio.TimeoutError:
+            return None
+
+    async def get_batch(self, max_items: Optional[int] = None, timeout: Optional[float] = None) -> List[MarketDataEvent]:
+        """Wait for at least one event, then drain up to max_items"""
+        first = await self.get(timeout)
+        if first is None:
+            return []
+        events = [first]
+        while self._pending and (max_items is None or len(events) < max_items):
+            events.append(self._take())
+        return events
+
+    def close(self):
+        """Close the subscription and wake any waiter"""
+        self.closed = True
+        self._pending.clear()
+        self._ready.set()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Per-subscriber lag and queue metrics"""
+        return {
+            "pending": len(self._pending),
+            "maxsize": self.maxsize,
+            "received": self.received,
+            "delivered": self.delivered,
+            "conflated": self.conflated,
+            "dropped": self.dropped,
+            "last_lag_ms": round(self.last_lag_ms, 2),
+            "avg_lag_ms": round(self.avg_lag_ms, 2),
+            "max_lag_ms": round(self.max_lag_ms, 2)
+        }
+
+
+class MarketDataBus:
+    """
+    In-process market data pub/sub
+    Providers publish once; consumers read from their own conflating queue.
+    The latest event per (type, symbol) is also kept for sync readers.
+    """
+
+    def __init__(self):
+        bus_config = CFG.get("agents", {}).get("market_data_bus", {})
+        self.default_maxsize = bus_config.get("subscriber_queue_size", 256)
+        self.subscriptions: Dict[str, Subscription] = {}
+        self.latest: Dict[tuple, MarketDataEvent] = {}
+        self.published = 0
+        self.running = False
+
+    def subscribe(self, name: str, event_types: Optional[List[str]] = None,
+                  symbols: Optional[List[str]] = None, maxsize: Optional[int] = None) -> Subscription:
+        """Create a subscription; an existing one with the same name is replaced"""
+        if name in self.subscriptions:
+            self.subscriptions[name].close()
+        subscription = Subscription(name, maxsize or self.default_maxsize, event_types, symbols)
+        self.subscriptions[name] = subscription
+        bus_logger.info(f"Subscriber '{name}' registered ({subscription.maxsize} slots)")
+        return subscription
+
+    def unsubscribe(self, name: str):
+        """Remove a subscription"""
+        subscription = self.subscriptions.pop(name, None)
+        if subscription:
+            subscription.close()
+            bus_logger.info(f"Subscriber '{name}' removed")
+
+    def publish(self, event: MarketDataEvent):
+        """Fan an event out to all subscribers - never blocks"""
+        self.latest[event.key] = event
+        self.published += 1
+        for subscription in list(self.subscriptions.values()):
+            try:
+                subscription.offer(event)
+            except Exception as e:
+                bus_logger.error(f"Error delivering to subscriber '{subscription.name}': {e}")
+
+    def publish_snapshot(self, snapshot, provider: str = "universe"):
+        """Publish a universe snapshot plus one event per symbol"""
+        try:
+            self.publish(MarketDataEvent(EVENT_UNIVERSE, "*", snapshot, provider, snapshot.version))
+            for stock in snapshot.stocks:
+                symbol = stock.get("symbol")
+                if symbol:
+                    self.publish(MarketDataEvent(EVENT_SNAPSHOT, symbol, stock, provider, snapshot.version))
+        except Exception as e:
+            bus_logger.error(f"Error publishing snapshot: {e}")
+
+    def publish_bar(self, symbol: str, bar: Dict[str, Any], provider: str = "bars", version: int = 0,
+                    timeframe: Optional[str] = None):
+        """Publish a bar update for a symbol; bars of different timeframes conflate separately"""
+        self.publish(MarketDataEvent(EVENT_BAR, symbol.upper(), bar, provider, version, timeframe=timeframe))
+
+    def get_latest(self, event_type: str, symbol: str, max_age: Optional[float] = None,
+                   timeframe: Optional[str] = None) -> Optional[MarketDataEvent]:
+        """Latest event for a symbol - safe to call from sync code and threads"""
+        key = (event_type, symbol.upper() if symbol != "*" else symbol)
+        event = self.latest.get(key if timeframe is None else key + (timeframe,))
+        if event is None:
+            return None
+        if max_age is not None and time.monotonic() - event.published_at > max_age:
+            return None
+        return event
+
+    async def start(self):
+        """Mark the bus running"""
+        try:
+            if self.running:
+                return
+            self.running = True
+            bus_logger.info("MarketDataBus started")
+        except Exception as e:
+            bus_logger.error(f"Error starting market data bus: {e}")
+
+    async def stop(self):
+        """Close all subscriptions"""
+        try:
+            self.running = False
+            for subscription in self.subscriptions.values():
+                subscription.close()
+            bus_logger.info("MarketDataBus stopped")
+        except Exception as e:
+            bus_logger.error(f"Error stopping market data bus: {e}")
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Bus-wide and per-subscriber metrics"""
+        return {
+            "running": self.running,
+            "published": self.published,
+            "tracked_keys": len(self.latest),
+            "subscribers": {
+                name: subscription.get_metrics() for name, subscription in self.subscriptions.items()
+            }
+        }
+
+
+# Global instance
+market_data_bus = MarketDataBus()
+
+# Convenience functions
+def subscribe_market_data(name: str, event_types: Optional[List[str]] = None,
+                          symbols: Optional[List[str]] = None, maxsize: Optional[int] = None) -> Subscription:
+    """Subscribe to market data events"""
+    return market_data_bus.subscribe(name, event_types, symbols, maxsize)
+
+def get_bus_metrics() -> Dict[str, Any]:
+    """Get market data bus metrics"""
+    return market_data_bus.get_metrics()
+
+
+if __name__ == "__main__":
+    async def test_bus():
+        fast = subscribe_market_data("fast", maxsize=4)
+        slow = subscribe_market_data("slow", maxsize=8)
+        for i in range(20):
+            market_data_bus.publish_bar(f"SYM{i % 6}", {"close": i})
+        while fast.get_nowait():
+            pass
+        print(f"Fast: {fast.get_metrics()}")
+        print(f"Slow: {slow.get_metrics()}")
+
+    asyncio.run(test_bus())
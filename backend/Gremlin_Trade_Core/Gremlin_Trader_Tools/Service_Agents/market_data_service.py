@@ -24,7 +24,7 @@ sys.path.insert(0, str(project_root))
 
 from Gremlin_Trade_Core.globals import (
     # Core imports
-    asyncio, sys, Path, datetime, timedelta, json, logging,
+    os, asyncio, sys, Path, datetime, timedelta, json, logging,
     # Data libraries
     pd, np, 
     # Trading libraries (with availability check)
@@ -37,6 +37,10 @@ from Gremlin_Trade_Core.globals import (
     setup_module_logger
 )
 
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.request_scheduler import request_scheduler, Priority
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.tiered_scanner import tiered_scanner
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.bar_resampler import bar_resampler
+
 # Check yfinance availability
 YFINANCE_AVAILABLE = TRADING_LIBS_AVAILABLE and yf is not None
 
@@ -70,27 +74,11 @@ class RealMarketDataService:
     async def get_live_penny_stocks(self, limit: int = 50) -> List[Dict[str, Any]]:
         """Get real live penny stock data with technical indicators"""
         try:
-            # Popular penny stock symbols to scan
-            penny_symbols = [
-                "GPRO", "SAVA", "BBIG", "PROG", "ATER", "MULN", "XELA", "IXHL",
-                "BOXL", "GNUS", "INPX", "JAGX", "NAKD", "NVCN", "OBSV", "OZSC",
-                "PASO", "PFLC", "RGBP", "RKDA", "RWLK", "SNPW", "SOLO", "TSNP",
-                "UONE", "VXRT", "WDLF", "XSPA", "YCBD", "ZSAN", "ADXS", "AGTC",
-                "AHPI", "ALPP", "AMPE", "ASRT", "AVGR", "AYTU", "BBRW", "BCDA",
-                "BDGR", "BFCH", "BIOL", "BLSP", "BMIC", "BNGO", "BOXD", "BPTS"
-            ]
-            
-            real_stocks = []
-            
-            # Process symbols in batches to avoid rate limiting
-            batch_size = 10
-            for i in range(0, min(len(penny_symbols), limit), batch_size):
-                batch = penny_symbols[i:i+batch_size]
-                batch_data = await self._process_symbol_batch(batch)
-                real_stocks.extend(batch_data)
-                
-                # Rate limiting
-                await asyncio.sleep(0.5)
+            # Tier 0 quotes the configured universe; only survivors get
+            # intraday bars and indicators. Rate limiting is handled by the
+            # shared request scheduler.
+            quote_fn = self.get_quotes if YFINANCE_AVAILABLE else None
+            real_stocks = await tiered_scanner.scan(quote_fn, self._get_valid_stock_data, limit)
             
             # Filter for actual penny stocks (under $10)
             penny_stocks = [stock for stock in real_stocks if stock.get('price', 0) < 10.0]
@@ -102,6 +90,43 @@ class RealMarketDataService:
             market_logger.error(f"Error getting live penny stocks: {e}")
             return self._get_fallback_data()
     
+    async def _get_valid_stock_data(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Tier 1 detail fetch - only records with a price are kept"""
+        result = await self.get_stock_data(symbol)
+        return result if isinstance(result, dict) and result.get('price') else None
+    
+    async def get_quotes(self, symbols: List[str]) -> List[Dict[str, Any]]:
+        """Quote-only snapshot for a batch of symbols (one provider request)"""
+        try:
+            data = await request_scheduler.run("yfinance", self._download_quotes, symbols)
+            quotes = []
+            for symbol in symbols:
+                try:
+                    daily = data[symbol] if len(symbols) > 1 else data
+                    daily = daily.dropna(subset=['Close'])
+                    if daily.empty:
+                        continue
+                    price = float(daily['Close'].iloc[-1])
+                    prev_close = float(daily['Close'].iloc[-2]) if len(daily) > 1 else price
+                    quotes.append({
+                        "symbol": symbol,
+                        "price": round(price, 4),
+                        "volume": int(daily['Volume'].iloc[-1]),
+                        "up_pct": round((price - prev_close) / prev_close * 100, 2) if prev_close else 0.0
+                    })
+                except (KeyError, IndexError, ValueError):
+                    continue
+            return quotes
+            
+        except Exception as e:
+            market_logger.error(f"Error getting quotes for {len(symbols)} symbols: {e}")
+            return []
+    
+    def _download_quotes(self, symbols: List[str]) -> pd.DataFrame:
+        """Blocking batched daily download - run through the request scheduler"""
+        return yf.download(symbols, period="2d", interval="1d", group_by="ticker",
+                           progress=False, threads=False, auto_adjust=False)
+    
     async def _process_symbol_batch(self, symbols: List[str]) -> List[Dict[str, Any]]:
         """Process a batch of symbols concurrently"""
         tasks = [self.get_stock_data(symbol) for symbol in symbols]
@@ -133,13 +158,15 @@ class RealMarketDataService:
                 market_logger.warning(f"yfinance not available, using fallback data for {symbol}")
                 return self._generate_fallback_stock_data(symbol)
             
-            # Get data from yfinance
-            ticker = yf.Ticker(symbol)
-            
             # Get recent data (last 2 days to ensure we have data)
-            hist = ticker.history(period="2d", interval="1m")
+            hist = await request_scheduler.run(
+                "yfinance", self._fetch_history, symbol, "2d", "1m", symbol=symbol
+            )
             if hist.empty:
                 return None
+            
+            # The same 1-minute fetch advances the 5min/15min/1h/1d bars
+            bar_resampler.ingest(symbol, hist)
                 
             # Get current price
             current_price = float(hist['Close'].iloc[-1])
@@ -189,6 +216,83 @@ class RealMarketDataService:
             market_logger.error(f"Error getting data for {symbol}: {e}")
             return None
     
+    async def get_historical_data(self, symbol: str, days: int = 30,
+                                  priority: Optional[Priority] = None) -> List[Dict[str, Any]]:
+        """Daily OHLCV bars for the last `days` sessions, oldest first"""
+        try:
+            # Daily bars resampled from 1-minute bars come first, so every
+            # timeframe a strategy reads is cut from the same source
+            if bar_resampler.enabled and bar_resampler.serve_history:
+                history = bar_resampler.get_history(symbol, "1d", limit=days)
+                if len(history) >= days:
+                    return history
+            
+            if not YFINANCE_AVAILABLE:
+                return []
+            
+            hist = await request_scheduler.run(
+                "yfinance", self._fetch_history, symbol, f"{days}d", "1d",
+                priority=priority, symbol=symbol
+            )
+            if hist is None or hist.empty:
+                return []
+            
+            return [
+                {
+                    "date": index.isoformat(),
+                    "open": float(row["Open"]),
+                    "high": float(row["High"]),
+                    "low": float(row["Low"]),
+                    "close": float(row["Close"]),
+                    "volume": int(row["Volume"])
+                }
+                for index, row in hist.iterrows()
+            ]
+            
+        except Exception as e:
+            market_logger.error(f"Error getting historical data for {symbol}: {e}")
+            return []
+    
+    async def get_current_price(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Latest daily close for a symbol (indices accept the bare name, e.g. VIX)"""
+        ticker = f"^{symbol}" if symbol in ("VIX", "GSPC", "DJI", "IXIC", "RUT") else symbol
+        history = await self.get_historical_data(ticker, days=2)
+        if not history:
+            return None
+        return {"symbol": symbol, "price": history[-1]["close"], "date": history[-1]["date"]}
+    
+    async def get_fundamentals(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Float, market cap, sector and short interest for the fundamentals cache"""
+        try:
+            if not YFINANCE_AVAILABLE:
+                return None
+            
+            info = await request_scheduler.run(
+                "yfinance", self._fetch_info, symbol, priority=Priority.UNIVERSE
+            )
+            if not info:
+                return None
+            
+            short_pct = info.get("shortPercentOfFloat")
+            return {
+                "float_shares": info.get("floatShares"),
+                "market_cap": info.get("marketCap"),
+                "sector": info.get("sector"),
+                "short_interest_pct": short_pct * 100 if short_pct is not None else None
+            }
+            
+        except Exception as e:
+            market_logger.error(f"Error getting fundamentals for {symbol}: {e}")
+            return None
+    
+    def _fetch_info(self, symbol: str) -> Dict[str, Any]:
+        """Blocking yfinance info call - run through the request scheduler"""
+        return yf.Ticker(symbol).info
+    
+    def _fetch_history(self, symbol: str, period: str, interval: str = "1m") -> pd.DataFrame:
+        """Blocking yfinance history call - run through the request scheduler"""
+        return yf.Ticker(symbol).history(period=period, interval=interval)
+    
     def _calculate_indicators(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Calculate technical indicators from price data"""
         try:
@@ -268,9 +372,16 @@ class RealMarketDataService:
             indices = ["^GSPC", "^DJI", "^IXIC", "^RUT"]  # S&P 500, Dow, NASDAQ, Russell 2000
             index_data = {}
             
-            for index in indices:
-                ticker = yf.Ticker(index)
-                hist = ticker.history(period="2d")
+            histories = await asyncio.gather(*[
+                request_scheduler.run("yfinance", self._fetch_history, index, "2d", "1d",
+                                      priority=Priority.WATCHLIST)
+                for index in indices
+            ], return_exceptions=True)
+            
+            for index, hist in zip(indices, histories):
+                if isinstance(hist, Exception):
+                    market_logger.warning(f"Error fetching {index}: {hist}")
+                    continue
                 if not hist.empty:
                     current = float(hist['Close'].iloc[-1])
                     prev = float(hist['Close'].iloc[-2]) if len(hist) > 1 else current
@@ -283,8 +394,9 @@ class RealMarketDataService:
             
             # VIX (Volatility Index)
             if YFINANCE_AVAILABLE:
-                vix_ticker = yf.Ticker("^VIX")
-                vix_hist = vix_ticker.history(period="1d")
+                vix_hist = await request_scheduler.run(
+                    "yfinance", self._fetch_history, "^VIX", "1d", "1d", priority=Priority.WATCHLIST
+                )
                 vix_value = float(vix_hist['Close'].iloc[-1]) if not vix_hist.empty else 20.0
             else:
                 vix_value = 18.5  # Fallback value
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+
+# ─────────────────────────────────────────────────────────────
+# © 2025 StatikFintechLLC
+# Market Regime Service - Cached index quotes and derived regime
+# Contact: ascend.gremlin@gmail.com
+# ─────────────────────────────────────────────────────────────
+
+"""
+Market Regime Service
+A single background task refreshes index history concurrently and derives
+trend, volatility, breadth and regime from it. Every caller reads the cached
+result; each field carries its own update time so consumers can see exactly
+how fresh a value is when a fetch fails and the previous value is kept.
+"""
+
+# Import ALL dependencies through globals.py (required)
+import sys
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from Gremlin_Trade_Core.globals import (
+    # Core imports
+    asyncio, np, datetime, timezone, time,
+    # Type hints
+    List, Dict, Any, Optional, Callable,
+    # Configuration and utilities
+    CFG, setup_module_logger
+)
+
+# Initialize logger
+regime_logger = setup_module_logger("market_data", "market_regime")
+
+
+def determine_market_regime(volatility: float, price_change: float, trend: str) -> str:
+    """Classify the market regime from annualized volatility and the daily move"""
+    if volatility > 0.25:
+        return "high_volatility"
+    elif volatility < 0.15:
+        if abs(price_change) < 0.005:
+            return "low_volatility_consolidation"
+        else:
+            return "trending"
+    else:
+        return "normal"
+
+
+class MarketRegimeService:
+    """
+    Timer-driven market regime cache
+    Index quotes, trend, volatility, breadth and VIX are refreshed together;
+    reads never trigger provider calls once the first refresh has run.
+    """
+
+    def __init__(self, history_source: Optional[Callable] = None, refresh_interval: Optional[float] = None):
+        regime_config = CFG.get("agents", {}).get("market_regime", {})
+        self.history_source = history_source
+        self.refresh_interval = refresh_interval or regime_config.get("refresh_seconds", 60)
+        self.history_days = regime_config.get("history_days", 100)
+        self.indices = regime_config.get("indices", ["SPY", "QQQ", "IWM", "^VIX"])
+        self.trend_symbol = regime_config.get("trend_symbol", "SPY")
+        self.vix_symbol = regime_config.get("vix_symbol", "^VIX")
+        self.breadth_symbols = regime_config.get("breadth_symbols", ["SPY", "QQQ", "IWM", "DIA"])
+        self.fields: Dict[str, Dict[str, Any]] = {}
+        self.version = 0
+        self.running = False
+        self.last_refresh: Optional[datetime] = None
+        self.refresh_count = 0
+        self.error_count = 0
+        self._refresh_lock: Optional[asyncio.Lock] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    def set_source(self, history_source: Callable):
+        """Bind the async (symbol, days) -> daily bars callable"""
+        self.history_source = history_source
+
+    def _resolve_source(self) -> Optional[Callable]:
+        """Resolve the default history source lazily to avoid circular imports"""
+        if self.history_source is None:
+            try:
+                from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.market_data_service import (
+                    real_market_service, YFINANCE_AVAILABLE
+                )
+                if YFINANCE_AVAILABLE:
+                    self.history_source = real_market_service.get_historical_data
+            except Exception as e:
+                regime_logger.warning(f"No market history source available: {e}")
+        return self.history_source
+
+    async def start(self):
+        """Start the background refresh loop"""
+        try:
+            if self.running:
+                return
+            self.running = True
+            await self.refresh()
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+            regime_logger.info(f"MarketRegimeService started (interval {self.refresh_interval}s)")
+        except Exception as e:
+            regime_logger.error(f"Error starting market regime service: {e}")
+
+    async def stop(self):
+        """Stop the background refresh loop"""
+        try:
+            self.running = False
+            if self._refresh_task:
+                self._refresh_task.cancel()
+                try:
+                    await self._refresh_task
+                except asyncio.CancelledError:
+                    pass
+                self._refresh_task = None
+            regime_logger.info("MarketRegimeService stopped")
+        except Exception as e:
+            regime_logger.error(f"Error stopping market regime service: {e}")
+
+    async def _refresh_loop(self):
+        """Refresh on a fixed interval"""
+        while self.running:
+            try:
+                await asyncio.sleep(self.refresh_interval)
+                await self.refresh()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                regime_logger.error(f"Error in market regime refresh loop: {e}")
+
+    def _set(self, name: str, value: Any, updated_at: datetime):
+        self.fields[name] = {"value": value, "updated_at": updated_at}
+
+    def _value(self, name: str, default: Any = None) -> Any:
+        entry = self.fields.get(name)
+        return entry["value"] if entry else default
+
+    async def refresh(self) -> bool:
+        """Fetch all index histories concurrently and recompute derived fields"""
+        if self._refresh_lock is None:
+            self._refresh_lock = asyncio.Lock()
+
+        async with self._refresh_lock:
+            try:
+                source = self._resolve_source()
+                if source is None:
+                    return False
+
+                symbols = list(dict.fromkeys(self.indices + self.breadth_symbols + [self.trend_symbol, self.vix_symbol]))
+                started = time.perf_counter()
+                results = await asyncio.gather(
+                    *[source(symbol, self.history_days) for symbol in symbols], return_exceptions=True
+                )
+                histories = {
+                    symbol: result for symbol, result in zip(symbols, results)
+                    if isinstance(result, list) and result
+                }
+                now = datetime.now(timezone.utc)
+
+                # Index quotes - a failed symbol keeps its previous quote and timestamp
+                for symbol in self.indices:
+                    closes = [bar["close"] for bar in histories.get(symbol, [])]
+                    if closes:
+                        prev = closes[-2] if len(closes) > 1 else closes[-1]
+                        self._set(f"index:{symbol}", {
+                            "price": round(closes[-1], 2),
+                            "change_pct": round((closes[-1] - prev) / prev * 100, 2) if prev else 0.0
+                        }, now)
+
+                trend_history = histories.get(self.trend_symbol)
+                if trend_history:
+                    self._update_trend(trend_history, now)
+
+                vix_history = histories.get(self.vix_symbol)
+                if vix_history:
+                    vix = vix_history[-1]["close"]
+                    self._set("vix", round(vix, 2), now)
+                    self._set("market_sentiment", "bullish" if vix < 20 else "bearish" if vix > 30 else "neutral", now)
+
+                self._update_breadth(histories, now)
+
+                self.version += 1
+                self.refresh_count += 1
+                self.last_refresh = now
+                regime_logger.info(
+                    f"Market regime v{self.version}: {len(histories)}/{len(symbols)} symbols "
+                    f"in {time.perf_counter() - started:.2f}s"
+                )
+                return True
+
+            except Exception as e:
+                self.error_count += 1
+                regime_logger.error(f"Error refreshing market regime: {e}")
+                return False
+
+    def _update_trend(self, history: List[Dict[str, Any]], now: datetime):
+        """Trend, volatility and regime from the trend symbol's daily bars"""
+        prices = np.array([bar["close"] for bar in history], dtype=float)
+        volumes = np.array([bar["volume"] for bar in history], dtype=float)
+
+        current_price = prices[-1]
+        prev_price = prices[-2] if len(prices) > 1 else current_price
+        price_change = (current_price - prev_price) / prev_price if prev_price else 0.0
+
+        if len(prices) >= 21:
+            returns = np.diff(prices[-21:]) / prices[-21:-1]
+            volatility = float(np.std(returns) * np.sqrt(252))
+        else:
+            volatility = 0.2
+
+        sma_20 = float(prices[-20:].mean()) if len(prices) >= 20 else current_price
+        sma_50 = float(prices[-50:].mean()) if len(prices) >= 50 else current_price
+        trend = "bullish" if sma_20 > sma_50 else "bearish"
+
+        self._set("price_change", float(price_change), now)
+        self._set("volatility", volatility, now)
+        self._set("trend", trend, now)
+        self._set("volume", float(volumes[-10:].mean()) if len(volumes) else 0.0, now)
+        self._set("market_regime", determine_market_regime(volatility, price_change, trend), now)
+
+    def _update_breadth(self, histories: Dict[str, List[Dict[str, Any]]], now: datetime):
+        """Share of breadth symbols trading above their 20-day average"""
+        above, counted = 0, 0
+        for symbol in self.breadth_symbols:
+            closes = [bar["close"] for bar in histories.get(symbol, [])]
+            if len(closes) >= 20:
+                counted += 1
+                above += closes[-1] > sum(closes[-20:]) / 20
+
+        # Only publish breadth when most of the basket was fetched
+        if counted and counted * 2 >= len(self.breadth_symbols):
+            self._set("breadth", round(above / counted, 3), now)
+
+    def get_freshness(self) -> Dict[str, Dict[str, Any]]:
+        """Update time and age for every cached field"""
+        now = datetime.now(timezone.utc)
+        return {
+            name: {
+                "updated_at": entry["updated_at"].isoformat(),
+                "age_seconds": round((now - entry["updated_at"]).total_seconds(), 1)
+            }
+            for name, entry in self.fields.items()
+        }
+
+    async def _ensure_data(self):
+        """Run the first refresh on demand when the timer has not started"""
+        if not self.fields and not self.running:
+            await self.refresh()
+
+    async def get_conditions(self) -> Dict[str, Any]:
+        """Cached market conditions in the StrategyAgent format"""
+        try:
+            await self._ensure_data()
+            if "trend" not in self.fields:
+                return {}
+            return {
+                "price_change": self._value("price_change", 0.0),
+                "volatility": self._value("volatility", 0.2),
+                "trend": self._value("trend", "neutral"),
+                "volume": self._value("volume", 0.0),
+                "vix": self._value("vix", 20),
+                "breadth": self._value("breadth"),
+                "market_regime": self._value("market_regime", "normal"),
+                "version": self.version,
+                "freshness": self.get_freshness()
+            }
+        except Exception as e:
+            regime_logger.error(f"Error getting market conditions: {e}")
+            return {}
+
+    async def get_overview(self) -> Dict[str, Any]:
+        """Cached market overview for the API"""
+        try:
+            await self._ensure_data()
+            if not self.fields:
+                return await self._fallback_overview()
+
+            indices = {
+                name.split(":", 1)[1]: entry["value"]
+                for name, entry in self.fields.items() if name.startswith("index:")
+            }
+            return {
+                "indices": indices,
+                "vix": self._value("vix"),
+                "market_sentiment": self._value("market_sentiment", "neutral"),
+                "trend": self._value("trend"),
+                "volatility": self._value("volatility"),
+                "breadth": self._value("breadth"),
+                "market_regime": self._value("market_regime"),
+                "version": self.version,
+                "freshness": self.get_freshness(),
+                "timestamp": self.last_refresh.isoformat() if self.last_refresh else None,
+                "data_source": "market_regime_service"
+            }
+        except Exception as e:
+            regime_logger.error(f"Error getting market overview: {e}")
+            return {"error": "Unable to fetch market overview"}
+
+    async def _fallback_overview(self) -> Dict[str, Any]:
+        """Simulated overview when no history source is available"""
+        from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.simple_market_service import simple_market_service
+        return await simple_market_service.get_market_overview()
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get service status"""
+        return {
+            "running": self.running,
+            "refresh_interval": self.refresh_interval,
+            "version": self.version,
+            "fields": len(self.fields),
+            "last_refresh": self.last_refresh.isoformat() if self.last_refresh else None,
+            "refresh_count": self.refresh_count,
+            "error_count": self.error_count
+        }
+
+
+# Global instance
+market_regime_service = MarketRegimeService()
+
+# Convenience functions
+async def get_market_conditions() -> Dict[str, Any]:
+    """Get cached market conditions"""
+    return await market_regime_service.get_conditions()
+
+async def get_market_overview_cached() -> Dict[str, Any]:
+    """Get cached market overview"""
+    return await market_regime_service.get_overview()
+
+
+if __name__ == "__main__":
+    async def test_regime_service():
+        async def history(symbol, days):
+            prices = 100 + np.cumsum(np.random.default_rng(len(symbol)).normal(0, 1, days))
+            return [{"close": float(p), "volume": 1000000} for p in prices]
+
+        market_regime_service.set_source(history)
+        print(f"Conditions: {await get_market_conditions()}")
+        print(f"Overview: {await get_market_overview_cached()}")
+
+    asyncio.run(test_regime_service())
@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+
+# ─────────────────────────────────────────────────────────────
+# © 2025 StatikFintechLLC
+# Market State Index - Numeric setup vectors with kNN over history
+# Contact: ascend.gremlin@gmail.com
+# ─────────────────────────────────────────────────────────────
+
+"""
+Market State Index
+A market state is the last `window` bars of a symbol encoded as a fixed
+length vector: the volatility-normalized cumulative return path, the
+standardized log-volume path and a few scale-free indicators (RSI, range
+position, distance from the 20-bar mean, last-bar volume ratio, realized
+volatility). Every historical state is stored with its forward outcome
+over `horizon` bars, and a query returns what happened after the k
+nearest states - a brute-force Euclidean kNN that is one matrix-vector
+product per query.
+"""
+
+# Import ALL dependencies through globals.py (required)
+import sys
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from Gremlin_Trade_Core.globals import (
+    # Core imports
+    np, pd, time, threading,
+    # Type hints
+    List, Dict, Any, Optional, Tuple, Union,
+    # Configuration and utilities
+    CFG, MARKET_STATE_DIR, setup_module_logger
+)
+
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.bar_store import bar_store, TIMEFRAME_SECONDS
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.bar_resampler import bar_resampler, canonical_timeframe
+
+# Initialize logger
+state_logger = setup_module_logger("market_data", "market_state_index")
+
+OUTCOME_FIELDS = ("forward_return", "max_favorable", "max_adverse")
+SCALAR_FEATURES = ("rsi", "range_position", "sma_distance", "volume_ratio", "volatility")
+EPSILON = 1e-9
+
+
+def _windows(values: np.ndarray, window: int) -> np.ndarray:
+    return np.lib.stride_tricks.sliding_window_view(values, window)
+
+
+def encode_states(close: np.ndarray, volume: np.ndarray, window: int = 30) -> np.ndarray:
+    """
+    State vectors for every full window of a bar series
+    Row i encodes bars [i, i + window); the result has len(close) - window + 1
+    rows of (window - 1) + window + len(SCALAR_FEATURES) columns.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    volume = np.asarray(volume, dtype=np.float64)
+    if len(close) < window:
+        return np.zeros((0, 2 * window - 1 + len(SCALAR_FEATURES)), dtype=np.float32)
+
+    log_close = np.log(np.maximum(close, EPSILON))
+    returns = _windows(np.diff(log_close), window - 1)
+    volatility = returns.std(axis=1) + EPSILON
+    path = np.cumsum(returns, axis=1) / (volatility[:, None] * np.sqrt(window - 1))
+
+    log_volume = _windows(np.log1p(np.maximum(volume, 0)), window)
+    volume_path = (log_volume - log_volume.mean(axis=1, keepdims=True)) / (log_volume.std(axis=1, keepdims=True) + EPSILON)
+
+    # RSI over the last 14 moves of each window (simple means, as the feature store computes it)
+    period = min(14, window - 1)
+    moves = _windows(np.diff(close), window - 1)[:, -period:]
+    gains = np.where(moves > 0, moves, 0).mean(axis=1)
+    losses = np.where(moves < 0, -moves, 0).mean(axis=1)
+    rsi = np.where(losses > 0, 100 - 100 / (1 + gains / np.maximum(losses, EPSILON)), 100.0)
+
+    prices = _windows(close, window)
+    low, high = prices.min(axis=1), prices.max(axis=1)
+    last = prices[:, -1]
+    recent = prices[:, -min(20, window):]
+    scalars = np.column_stack([
+        rsi / 100.0 - 0.5,
+        (last - low) / np.maximum(high - low, EPSILON) - 0.5,
+        np.tanh((last - recent.mean(axis=1)) / (recent.std(axis=1) + EPSILON) / 2),
+        np.tanh(log_volume[:, -1] - log_volume[:, :-1].mean(axis=1)),
+        np.tanh(volatility * 100)
+    ])
+
+    # Each block carries equal weight in the distance whatever its length
+    return np.hstack([
+        path / np.sqrt(path.shape[1]),
+        volume_path / np.sqrt(volume_path.shape[1]),
+        scalars / np.sqrt(scalars.shape[1])
+    ]).astype(np.float32)
+
+
+def forward_outcomes(close: np.ndarray, high: np.ndarray, low: np.ndarray, horizon: int = 10) -> np.ndarray:
+    """
+    Forward return, max favorable and max adverse excursion after each bar
+    Rows for the last `horizon` bars are NaN (their future is not known yet).
+    """
+    close = np.asarray(close, dtype=np.float64)
+    outcomes = np.full((len(close), len(OUTCOME_FIELDS)), np.nan)
+    if len(close) <= horizon:
+        return outcomes
+    entry = close[:-horizon]
+    future_high = _windows(np.asarray(high, dtype=np.float64)[1:], horizon).max(axis=1)
+    future_low = _windows(np.asarray(low, dtype=np.float64)[1:], horizon).min(axis=1)
+    outcomes[:-horizon, 0] = close[horizon:] / entry - 1
+    outcomes[:-horizon, 1] = future_high / entry - 1
+    outcomes[:-horizon, 2] = future_low / entry - 1
+    return outcomes
+
+
+def _bar_arrays(bars: Union[pd.DataFrame, List[Dict[str, Any]]]) -> Dict[str, np.ndarray]:
+    """ts/close/high/low/volume arrays from a bar frame or bar dicts"""
+    frame = bars if isinstance(bars, pd.DataFrame) else pd.DataFrame(list(bars))
+    if "ts" not in frame.columns:
+        stamps = frame["date"] if "date" in frame.columns else pd.Series(frame.index, index=frame.index)
+        frame = frame.assign(ts=pd.to_datetime(stamps, utc=True).astype("int64") // 10**9)
+    return {column: frame[column].to_numpy(dtype=np.float64) for column in ("ts", "close", "high", "low", "volume")}
+
+
+class MarketStateIndex:
+    """
+    kNN index of historical market states for one timeframe
+    States are appended per symbol and consolidated into one matrix on the
+    next query; the oldest states are dropped beyond max_states.
+    """
+
+    def __init__(self, timeframe: str = "5min", config: Optional[Dict[str, Any]] = None):
+        index_config = config if config is not None else CFG.get("strategy", {}).get("market_state_index", {})
+        overrides = index_config.get("timeframes", {}).get(timeframe, {})
+        self.timeframe = canonical_timeframe(timeframe)
+        self.window = overrides.get("window", index_config.get("window", 30))
+        self.horizon = overrides.get("horizon", index_config.get("horizon", 10))
+        self.k = index_config.get("k", 50)
+        self.max_states = index_config.get("max_states", 500000)
+        self.dimension = 2 * self.window - 1 + len(SCALAR_FEATURES)
+
+        self._symbol_names: List[str] = []
+        self._symbol_codes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._pending: List[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = []
+        self.clear()
+        self.last_query: Dict[str, Any] = {}
+
+    def _code(self, symbol: str) -> int:
+        if symbol not in self._symbol_codes:
+            self._symbol_codes[symbol] = len(self._symbol_names)
+            self._symbol_names.append(symbol)
+        return self._symbol_codes[symbol]
+
+    def encode(self, bars: Union[pd.DataFrame, List[Dict[str, Any]]]) -> Optional[np.ndarray]:
+        """State vector of the latest window of bars, or None with too little history"""
+        arrays = _bar_arrays(bars)
+        if len(arrays["close"]) < self.window:
+            return None
+        return encode_states(arrays["close"][-self.window:], arrays["volume"][-self.window:], self.window)[0]
+
+    def add_bars(self, symbol: str, bars: Union[pd.DataFrame, List[Dict[str, Any]]]) -> int:
+        """Add every state of a symbol's history whose forward outcome is known"""
+        arrays = _bar_arrays(bars)
+        states = encode_states(arrays["close"], arrays["volume"], self.window)
+        if not len(states):
+            return 0
+        outcomes = forward_outcomes(arrays["close"], arrays["high"], arrays["low"], self.horizon)[self.window - 1:]
+        known = ~np.isnan(outcomes).any(axis=1)
+        if not known.any():
+            return 0
+
+        # A state's outcome is resolved at the bar `horizon` bars after its last bar
+        rows = np.flatnonzero(known) + self.window - 1
+        with self._lock:
+            code = self._code(symbol.upper())
+            self._pending.append((
+                states[known],
+                outcomes[known].astype(np.float32),
+                arrays["ts"][rows].astype(np.int64),
+                arrays["ts"][rows + self.horizon].astype(np.int64),
+                np.full(len(rows), code, dtype=np.int32)
+            ))
+        return len(rows)
+
+    def _consolidate(self):
+        """Fold pending states into the matrix (caller holds the lock)"""
+        if not self._pending:
+            return
+        vectors, outcomes, ts, resolved_ts, symbols = (np.concatenate(parts) for parts in zip(*self._pending))
+        self._pending = []
+        self._vectors = np.vstack([self._vectors, vectors])
+        self._norms = np.concatenate([self._norms, np.einsum("ij,ij->i", vectors, vectors)])
+        self._outcomes = np.vstack([self._outcomes, outcomes])
+        self._ts = np.concatenate([self._ts, ts])
+        self._resolved_ts = np.concatenate([self._resolved_ts, resolved_ts])
+        self._symbols = np.concatenate([self._symbols, symbols])
+
+        excess = len(self._vectors) - self.max_states
+        if excess > 0:
+            keep = np.argsort(self._ts, kind="stable")[excess:]
+            keep.sort()
+            self._vectors, self._norms, self._outcomes = self._vectors[keep], self._norms[keep], self._outcomes[keep]
+            self._ts, self._resolved_ts, self._symbols = self._ts[keep], self._resolved_ts[keep], self._symbols[keep]
+
+    def _exclusion_mask(self, symbol: Optional[str], query_ts: Optional[int],
+                        window_start_ts: Optional[int] = None) -> Optional[np.ndarray]:
+        """
+        States a query must not see: its own overlapping windows and anything after it
+        Both checks use bar timestamps, so session gaps and weekends do not
+        let a neighbour's outcome (or its window) leak past the query bar.
+        """
+        if query_ts is None:
+            return None
+        # A neighbour's outcome must be known at query time
+        mask = self._resolved_ts > query_ts
+        code = self._symbol_codes.get(symbol.upper()) if symbol else None
+        if code is not None:
+            if window_start_ts is None:
+                window_start_ts = query_ts - (self.window - 1) * TIMEFRAME_SECONDS.get(self.timeframe, 60)
+            mask |= (self._symbols == code) & (self._ts >= window_start_ts)
+        return mask
+
+    def query(self, vectors: np.ndarray, k: Optional[int] = None, symbol: Optional[str] = None,
+              query_ts: Optional[int] = None, window_start_ts: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Outcome summary of the k nearest historical states for each query vector
+        query_ts (and window_start_ts, the first bar of the query window) exclude
+        states whose outcome was unknown at the query bar and the symbol's own
+        overlapping windows.
+        """
+        started = time.perf_counter()
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        with self._lock:
+            self._consolidate()
+            matrix, norms, outcomes = self._vectors, self._norms, self._outcomes
+            excluded = self._exclusion_mask(symbol, query_ts, window_start_ts)
+        if not len(matrix):
+            return [{"neighbors": 0} for _ in vectors]
+
+        distances = norms[None, :] - 2.0 * (vectors @ matrix.T) + np.einsum("ij,ij->i", vectors, vectors)[:, None]
+        if excluded is not None:
+            distances[:, excluded] = np.inf
+        k = min(k or self.k, len(matrix))
+        nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+
+        summaries = []
+        for row, neighbors in enumerate(nearest):
+            neighbors = neighbors[np.isfinite(distances[row, neighbors])]
+            summaries.append(self._summarize(outcomes[neighbors], distances[row, neighbors]))
+        self.last_query = {"queries": len(vectors), "states": len(matrix), "k": k,
+                           "ms": round((time.perf_counter() - started) * 1000, 3)}
+        return summaries
+
+    @staticmethod
+    def _summarize(outcomes: np.ndarray, distances: np.ndarray) -> Dict[str, Any]:
+        if not len(outcomes):
+            return {"neighbors": 0}
+        returns = outcomes[:, 0]
+        return {
+            "neighbors": len(outcomes),
+            "mean_return": float(returns.mean()),
+            "median_return": float(np.median(returns)),
+            "win_rate": float((returns > 0).mean()),
+            "mean_max_favorable": float(outcomes[:, 1].mean()),
+            "mean_max_adverse": float(outcomes[:, 2].mean()),
+            "mean_distance": float(np.sqrt(np.maximum(distances, 0)).mean())
+        }
+
+    def similar_setups(self, symbol: str, bars: Union[pd.DataFrame, List[Dict[str, Any]]],
+                       k: Optional[int] = None) -> Dict[str, Any]:
+        """What happened after the k states most similar to a symbol's latest bars"""
+        vector = self.encode(bars)
+        if vector is None:
+            return {"neighbors": 0}
+        ts = _bar_arrays(bars)["ts"]
+        return self.query(vector, k, symbol, int(ts[-1]), int(ts[-self.window]))[0]
+
+    def similar_setups_many(self, bars_by_symbol: Dict[str, Union[pd.DataFrame, List[Dict[str, Any]]]],
+                            k: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        """Live setups of many symbols answered with one batched query"""
+        symbols, vectors = [], []
+        for symbol, bars in bars_by_symbol.items():
+            vector = self.encode(bars) if bars is not None and len(bars) else None
+            if vector is not None:
+                symbols.append(symbol)
+                vectors.append(vector)
+        if not vectors:
+            return {}
+        return dict(zip(symbols, self.query(np.stack(vectors), k)))
+
+    def clear(self):
+        """Drop every indexed state"""
+        with self._lock:
+            self._vectors = np.zeros((0, self.dimension), dtype=np.float32)
+            self._norms = np.zeros(0, dtype=np.float32)
+            self._outcomes = np.zeros((0, len(OUTCOME_FIELDS)), dtype=np.float32)
+            self._ts = np.zeros(0, dtype=np.int64)
+            self._resolved_ts = np.zeros(0, dtype=np.int64)
+            self._symbols = np.zeros(0, dtype=np.int32)
+            self._pending = []
+
+    def build(self, symbols: Optional[List[str]] = None) -> int:
+        """Rebuild the index from every stored symbol's bars (resampled from 1-minute bars)"""
+        symbols = symbols if symbols is not None else bar_store.list_symbols("1min")
+        self.clear()
+        added = 0
+        for symbol in symbols:
+            try:
+                bars = bar_resampler.get_bars(symbol, self.timeframe, include_partial=False)
+                added += self.add_bars(symbol, bars)
+            except Exception as e:
+                state_logger.error(f"Error indexing {symbol} {self.timeframe}: {e}")
+        state_logger.info(f"Indexed {added} {self.timeframe} states from {len(symbols)} symbols")
+        return added
+
+    def save(self, path: Optional[Union[str, Path]] = None) -> Path:
+        """Persist the index to an .npz file"""
+        path = Path(path) if path else MARKET_STATE_DIR / f"states_{self.timeframe}.npz"
+        with self._lock:
+            self._consolidate()
+            np.savez_compressed(path, vectors=self._vectors, outcomes=self._outcomes, ts=self._ts,
+                                resolved_ts=self._resolved_ts, symbols=self._symbols, symbol_names=np.array(self._symbol_names),
+                                window=self.window, horizon=self.horizon)
+        return path
+
+    def load(self, path: Optional[Union[str, Path]] = None) -> int:
+        """Load a persisted index; a file built with another window/horizon is ignored"""
+        path = Path(path) if path else MARKET_STATE_DIR / f"states_{self.timeframe}.npz"
+        try:
+            if not path.exists():
+                return 0
+            data = np.load(path)
+            if int(data["window"]) != self.window or int(data["horizon"]) != self.horizon:
+                state_logger.warning(f"Ignoring {path.name}: built with another window/horizon")
+                return 0
+            with self._lock:
+                self._vectors = data["vectors"]
+                self._norms = np.einsum("ij,ij->i", self._vectors, self._vectors)
+                self._outcomes, self._ts, self._symbols = data["outcomes"], data["ts"], data["symbols"]
+                if "resolved_ts" in data.files:
+                    self._resolved_ts = data["resolved_ts"]
+                else:
+                    # Files saved before resolution times were stored; rebuild for exact exclusion
+                    state_logger.warning(f"{path.name} has no outcome times - estimating from the bar interval")
+                    self._resolved_ts = self._ts + self.horizon * TIMEFRAME_SECONDS.get(self.timeframe, 60)
+                self._symbol_names = [str(name) for name in data["symbol_names"]]
+                self._symbol_codes = {name: code for code, name in enumerate(self._symbol_names)}
+                self._pending = []
+            return len(self._vectors)
+        except Exception as e:
+            state_logger.error(f"Error loading market states from {path}: {e}")
+            return 0
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "timeframe": self.timeframe,
+            "window": self.window,
+            "horizon": self.horizon,
+            "states": len(self._vectors) + sum(len(part[0]) for part in self._pending),
+            "symbols": len(self._symbol_names),
+            "last_query": self.last_query
+        }
+
+
+# Registry of indexes per timeframe
+_indexes: Dict[str, MarketStateIndex] = {}
+_indexes_lock = threading.Lock()
+
+# Convenience functions
+def get_state_index(timeframe: str = "5min") -> MarketStateIndex:
+    """Shared index for a timeframe, loaded from disk on first use"""
+    timeframe = canonical_timeframe(timeframe)
+    with _indexes_lock:
+        if timeframe not in _indexes:
+            index = MarketStateIndex(timeframe)
+            index.load()
+            _indexes[timeframe] = index
+        return _indexes[timeframe]
+
+def build_state_index(timeframe: str = "5min", symbols: Optional[List[str]] = None, save: bool = True) -> int:
+    """Index stored history for a timeframe and persist it"""
+    index = get_state_index(timeframe)
+    added = index.build(symbols)
+    if save and added:
+        index.save()
+    return added
+
+def similar_setups(symbol: str, bars: Union[pd.DataFrame, List[Dict[str, Any]]], timeframe: str = "5min",
+                   k: Optional[int] = None) -> Dict[str, Any]:
+    """Forward outcomes after the k most similar historical setups"""
+    return get_state_index(timeframe).similar_setups(symbol, bars, k)
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(11)
+    index = MarketStateIndex("5min", {"window": 30, "horizon": 10})
+    for n in range(20):
+        close = 3.0 * np.exp(np.cumsum(rng.normal(0, 0.004, 5000)))
+        bars = pd.DataFrame({"ts": 1_700_000_000 + 300 * np.arange(5000), "close": close, "high": close * 1.002,
+                             "low": close * 0.998, "volume": rng.lognormal(10, 0.5, 5000)})
+        index.add_bars(f"SYM{n}", bars)
+    print(index.similar_setups("SYM19", bars.iloc[:2000], k=50))
+    print(f"Status: {index.get_status()}")
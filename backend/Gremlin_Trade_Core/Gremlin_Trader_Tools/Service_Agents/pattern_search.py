@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+
+# ─────────────────────────────────────────────────────────────
+# © 2025 StatikFintechLLC
+# Pattern Search - MASS distance profiles over the local bar store
+# Contact: ascend.gremlin@gmail.com
+# ─────────────────────────────────────────────────────────────
+
+"""
+Pattern Search
+"Where else did a shape like the last 60 minutes of XYZ occur?" A query is
+the last `length` log closes of a symbol. For every stored symbol the
+z-normalized Euclidean distance to every window is computed at once with
+MASS (sliding dot products through one FFT of the series, reused for all
+queries), so a symbol costs O(n log n) instead of O(n*m). Windows that
+span a session gap, overlap the query itself or whose forward return was
+not yet known at query time are skipped; the top-k matches per query are
+returned with their forward returns. Symbols are split across a process
+pool.
+"""
+
+# Import ALL dependencies through globals.py (required)
+import sys
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from Gremlin_Trade_Core.globals import (
+    # Core imports
+    os, np, time, heapq, threading, OrderedDict, ProcessPoolExecutor,
+    # Type hints
+    List, Dict, Any, Optional, Tuple,
+    # Configuration and utilities
+    CFG, setup_module_logger
+)
+
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.bar_store import BarStore, bar_store, TIMEFRAME_SECONDS
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.bar_resampler import resample, canonical_timeframe
+
+# Initialize logger
+search_logger = setup_module_logger("market_data", "pattern_search")
+
+EPSILON = 1e-8
+
+# Windows spanning more than this many bar intervals cross a session gap
+MAX_GAP_FACTOR = 2.0
+
+# Per-process cache of (ts, log close) arrays - workers keep it across searches
+_SERIES_CACHE: "OrderedDict[Tuple[str, str, str, float], Tuple[np.ndarray, np.ndarray]]" = OrderedDict()
+
+
+def sliding_mean_std(series: np.ndarray, m: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Mean and standard deviation of every length-m window (cumulative sums)"""
+    cumsum = np.concatenate([[0.0], np.cumsum(series)])
+    cumsum_sq = np.concatenate([[0.0], np.cumsum(series * series)])
+    mean = (cumsum[m:] - cumsum[:-m]) / m
+    variance = (cumsum_sq[m:] - cumsum_sq[:-m]) / m - mean * mean
+    return mean, np.sqrt(np.maximum(variance, 0.0))
+
+
+def mass(query: np.ndarray, series: np.ndarray, series_fft: Optional[np.ndarray] = None,
+         stats: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> np.ndarray:
+    """
+    z-normalized Euclidean distance from the query to every window of the series
+    series_fft and stats (sliding mean/std) can be passed in to reuse them
+    across queries of the same length.
+    """
+    n, m = len(series), len(query)
+    if n < m:
+        return np.zeros(0)
+    if series_fft is None:
+        series_fft = np.fft.rfft(series, 2 * n)
+    mean, std = stats if stats is not None else sliding_mean_std(series, m)
+
+    query_fft = np.fft.rfft(query[::-1], 2 * n)
+    dot = np.fft.irfft(series_fft * query_fft, 2 * n)[m - 1:n]
+    query_mean, query_std = query.mean(), query.std()
+
+    correlation = (dot - m * query_mean * mean) / (m * np.maximum(query_std, EPSILON) * np.maximum(std, EPSILON))
+    distance = np.sqrt(np.maximum(2 * m * (1 - np.clip(correlation, -1.0, 1.0)), 0.0))
+    # Flat windows (or a flat query) have no shape to compare
+    distance[std < EPSILON] = np.inf
+    if query_std < EPSILON:
+        distance[:] = np.inf
+    return distance
+
+
+def _load_series(store_root: str, symbol: str, timeframe: str, cache_size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """ts and log close for a stored symbol, cached per process"""
+    store = BarStore(store_root)
+    key = (store_root, symbol, timeframe, store.last_modified(symbol, "1min"))
+    cached = _SERIES_CACHE.get(key)
+    if cached is not None:
+        _SERIES_CACHE.move_to_end(key)
+        return cached
+
+    bars = store.read(symbol, "1min")
+    if timeframe != "1min" and not bars.empty:
+        bars = resample(bars, timeframe)
+        bars = bars[bars["complete"].astype(bool)]
+    series = (bars["ts"].to_numpy(dtype=np.int64), np.log(np.maximum(bars["close"].to_numpy(dtype=np.float64), EPSILON)))
+    if cache_size:
+        _SERIES_CACHE[key] = series
+        while len(_SERIES_CACHE) > cache_size:
+            _SERIES_CACHE.popitem(last=False)
+    return series
+
+
+def search_symbols(task: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Worker: top-k matches of every query within a chunk of symbols
+    Module-level so it pickles into the process pool.
+    """
+    timeframe, horizon, k = task["timeframe"], task["horizon"], task["k"]
+    bar_seconds = TIMEFRAME_SECONDS.get(timeframe, 60)
+    queries = [(query["id"], np.asarray(query["values"], dtype=np.float64), query) for query in task["queries"]]
+    found: Dict[str, List[Dict[str, Any]]] = {query_id: [] for query_id, _, _ in queries}
+
+    for symbol in task["symbols"]:
+        try:
+            ts, series = _load_series(task["store_root"], symbol, timeframe, task.get("cache_size", 0))
+        except Exception:
+            continue
+        lengths = {len(values) for _, values, _ in queries}
+        if len(series) < max(lengths) + horizon + 1:
+            continue
+
+        series_fft = np.fft.rfft(series, 2 * len(series))
+        stats = {m: sliding_mean_std(series, m) for m in lengths}
+        for query_id, values, query in queries:
+            m = len(values)
+            distance = mass(values, series, series_fft, stats[m])
+            starts = np.arange(len(distance))
+            ends = starts + m - 1
+
+            # Forward return must exist and be known at query time; no session gaps
+            valid = ends + horizon < len(series)
+            valid &= (ts[ends] - ts[starts]) <= (m - 1) * bar_seconds * MAX_GAP_FACTOR
+            exit_index = np.minimum(ends + horizon, len(series) - 1)
+            if query.get("before_ts") is not None:
+                valid &= ts[exit_index] <= query["before_ts"]
+            if symbol == query.get("symbol") and query.get("start_ts") is not None:
+                valid &= np.abs(ts[starts] - query["start_ts"]) >= m * bar_seconds
+            distance = np.where(valid, distance, np.inf)
+
+            # Best k windows at least m/2 bars apart (no trivial neighbours)
+            zone = max(1, m // 2)
+            for _ in range(k):
+                best = int(np.argmin(distance))
+                if not np.isfinite(distance[best]):
+                    break
+                end = best + m - 1
+                found[query_id].append({
+                    "symbol": symbol,
+                    "distance": float(distance[best]),
+                    "start_ts": int(ts[best]),
+                    "end_ts": int(ts[end]),
+                    "forward_return": float(np.exp(series[end + horizon] - series[end]) - 1)
+                })
+                distance[max(0, best - zone):best + zone + 1] = np.inf
+
+        # Keep only the k best per query as symbols accumulate
+        for query_id in found:
+            if len(found[query_id]) > k:
+                found[query_id] = heapq.nsmallest(k, found[query_id], key=lambda match: match["distance"])
+    return found
+
+
+class PatternSearch:
+    """
+    Multi-symbol MASS search over the bar store
+    The process pool is created on first use and reused between searches so
+    workers keep their series caches.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None, store: Optional[BarStore] = None):
+        search_config = config if config is not None else CFG.get("strategy", {}).get("pattern_search", {})
+        self.config = {
+            "timeframe": canonical_timeframe(search_config.get("timeframe", "1min")),
+            "length": search_config.get("length", 60),
+            "horizon": search_config.get("horizon", 30),
+            "k": search_config.get("k", 10),
+            "workers": search_config.get("workers", 0),
+            "chunk_size": search_config.get("chunk_size", 32),
+            "cache_symbols": search_config.get("cache_symbols", 256),
+            "max_symbols": search_config.get("max_symbols", 0)
+        }
+        self.store = store or bar_store
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self.last_search: Dict[str, Any] = {}
+
+    def _executor(self, chunks: int) -> Optional[ProcessPoolExecutor]:
+        workers = self.config["workers"] or os.cpu_count() or 1
+        if workers <= 1 or chunks <= 1:
+            return None
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=workers)
+            return self._pool
+
+    def close(self):
+        """Shut down the worker pool"""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+    def query_for(self, symbol: str, length: Optional[int] = None, end_ts: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Query built from a stored symbol's last `length` bars (up to end_ts)"""
+        length = length or self.config["length"]
+        ts, series = _load_series(str(self.store.root), symbol.upper(), self.config["timeframe"], 0)
+        if end_ts is not None:
+            cut = np.searchsorted(ts, end_ts, side="right")
+            ts, series = ts[:cut], series[:cut]
+        if len(series) < length:
+            return None
+        return {"id": symbol.upper(), "symbol": symbol.upper(), "values": series[-length:].tolist(),
+                "start_ts": int(ts[-length]), "end_ts": int(ts[-1]), "before_ts": int(ts[-1])}
+
+    def search(self, queries: List[Dict[str, Any]], symbols: Optional[List[str]] = None,
+               k: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Top-k matches for each query across the stored symbols
+        A query is {"id", "values"} plus optional "symbol"/"start_ts" (its own
+        window is excluded) and "before_ts" (no match whose outcome was unknown then).
+        """
+        started = time.perf_counter()
+        k = k or self.config["k"]
+        queries = [query for query in queries if query and len(query.get("values", ())) >= 3]
+        if not queries:
+            return {}
+        symbols = symbols if symbols is not None else self.store.list_symbols("1min")
+        if self.config["max_symbols"]:
+            symbols = symbols[:self.config["max_symbols"]]
+
+        size = self.config["chunk_size"]
+        tasks = [{
+            "store_root": str(self.store.root), "symbols": symbols[i:i + size], "queries": queries,
+            "timeframe": self.config["timeframe"], "horizon": self.config["horizon"], "k": k,
+            "cache_size": self.config["cache_symbols"]
+        } for i in range(0, len(symbols), size)]
+
+        pool = self._executor(len(tasks))
+        try:
+            partials = list(pool.map(search_symbols, tasks)) if pool else [search_symbols(task) for task in tasks]
+        except Exception as e:
+            search_logger.error(f"Pattern search pool failed, searching in process: {e}")
+            self.close()
+            partials = [search_symbols(task) for task in tasks]
+
+        results = {}
+        for query in queries:
+            matches = heapq.nsmallest(k, (match for partial in partials for match in partial.get(query["id"], [])),
+                                      key=lambda match: match["distance"])
+            results[query["id"]] = {**summarize_matches(matches), "matches": matches,
+                                    "query": {key: query.get(key) for key in ("symbol", "start_ts", "end_ts")}}
+
+        self.last_search = {"queries": len(queries), "symbols": len(symbols), "chunks": len(tasks),
+                            "workers": pool._max_workers if pool else 1,
+                            "seconds": round(time.perf_counter() - started, 4)}
+        search_logger.debug(f"Pattern search: {self.last_search}")
+        return results
+
+    def search_symbol(self, symbol: str, symbols: Optional[List[str]] = None, k: Optional[int] = None) -> Dict[str, Any]:
+        """Where else did the shape of a symbol's latest bars occur"""
+        query = self.query_for(symbol)
+        if query is None:
+            return {"matches": [], "count": 0}
+        return self.search([query], symbols, k)[query["id"]]
+
+    def get_status(self) -> Dict[str, Any]:
+        return {"config": dict(self.config), "pool": self._pool is not None, "last_search": self.last_search}
+
+
+def summarize_matches(matches: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Forward-return statistics of a match list"""
+    if not matches:
+        return {"count": 0}
+    returns = np.array([match["forward_return"] for match in matches])
+    return {
+        "count": len(matches),
+        "mean_forward_return": float(returns.mean()),
+        "median_forward_return": float(np.median(returns)),
+        "win_rate": float((returns > 0).mean()),
+        "best_distance": float(matches[0]["distance"])
+    }
+
+
+# Global instance
+pattern_search = PatternSearch()
+
+# Convenience functions
+def search_patterns(symbols: List[str], universe: Optional[List[str]] = None,
+                    k: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+    """Top-k historical matches for the latest shape of each symbol, in one pass over the store"""
+    queries = []
+    for symbol in symbols:
+        try:
+            queries.append(pattern_search.query_for(symbol))
+        except Exception as e:
+            search_logger.warning(f"No pattern query for {symbol}: {e}")
+    return pattern_search.search([query for query in queries if query], universe, k)
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(5)
+    series = np.cumsum(rng.normal(0, 1, 20000))
+    query = series[12000:12060] * 3 + 7  # Same shape, other scale and offset
+    naive = np.array([np.linalg.norm((series[i:i + 60] - series[i:i + 60].mean()) / series[i:i + 60].std()
+                                     - (query - query.mean()) / query.std()) for i in range(len(series) - 59)])
+    profile = mass(query, series)
+    print(f"Best match at {int(np.argmin(profile))}, max error vs naive {np.max(np.abs(profile - naive)):.2e}")
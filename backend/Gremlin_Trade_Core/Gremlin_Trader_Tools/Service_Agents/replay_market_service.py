@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+
+# ─────────────────────────────────────────────────────────────
+# © 2025 StatikFintechLLC
+# Replay Market Data Service - Recorded tape playback
+# Contact: ascend.gremlin@gmail.com
+# ─────────────────────────────────────────────────────────────
+
+"""
+Replay Market Data Service
+Plays recorded bar (or tick) files from the bar store back through the same
+interface as the live market data services. Playback speed is configurable:
+1.0 is real time, 100.0 is 100x, and "max" advances one bar per request.
+Symbols missing a bar at the replay time get a synthetic bar drawn from a
+generator seeded by (seed, symbol, timestamp), so runs are reproducible.
+"""
+
+# Import ALL dependencies through globals.py (required)
+import sys
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from Gremlin_Trade_Core.globals import (
+    # Core imports
+    os, np, pd, asyncio, datetime, timezone, time, zlib,
+    # Type hints
+    List, Dict, Any, Optional, Union,
+    # Configuration and utilities
+    CFG, setup_module_logger
+)
+
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.bar_store import (
+    BarStore, bar_store, TIMEFRAME_SECONDS
+)
+
+# Initialize logger
+replay_logger = setup_module_logger("market_data", "replay_market_service")
+
+# Bars of history used for indicators on each replayed record
+INDICATOR_LOOKBACK = 60
+
+# Sessions used for average daily volume
+AVG_VOLUME_SESSIONS = 20
+
+
+def session_frame(bars: pd.DataFrame) -> pd.DataFrame:
+    """
+    Per-bar session fields for one symbol: session date, cumulative volume,
+    VWAP, previous session close and trailing average daily volume
+    """
+    frame = bars.sort_values("ts").reset_index(drop=True)
+    local = pd.to_datetime(frame["ts"], unit="s", utc=True).dt.tz_convert("America/New_York")
+    frame["session"] = (local.dt.year * 10000 + local.dt.month * 100 + local.dt.day).astype(np.int64)
+    frame["pv"] = frame["close"] * frame["volume"]
+    grouped = frame.groupby("session", sort=False)
+    frame["cum_volume"] = grouped["volume"].cumsum()
+    cum_pv = grouped["pv"].cumsum()
+    frame["vwap"] = np.where(frame["cum_volume"] > 0, cum_pv / frame["cum_volume"].replace(0, np.nan), frame["close"])
+
+    # Previous session close and trailing average daily volume
+    daily = grouped.agg(last_close=("close", "last"), total_volume=("volume", "sum"))
+    daily["prev_close"] = daily["last_close"].shift(1)
+    daily["avg_volume"] = daily["total_volume"].shift(1).rolling(AVG_VOLUME_SESSIONS, min_periods=1).mean()
+    frame = frame.join(daily[["prev_close", "avg_volume"]], on="session")
+    frame["prev_close"] = frame["prev_close"].fillna(frame.groupby("session")["open"].transform("first"))
+    frame["avg_volume"] = frame["avg_volume"].fillna(frame["cum_volume"])
+    return frame
+
+
+class ReplayMarketDataService:
+    """Market data service backed by recorded bars instead of a live feed"""
+
+    def __init__(self, data_dir: Optional[str] = None, speed: Optional[Union[float, str]] = None,
+                 seed: Optional[int] = None, symbols: Optional[List[str]] = None,
+                 timeframe: Optional[str] = None, loop: Optional[bool] = None):
+        replay_config = CFG.get("agents", {}).get("replay", {})
+        scanner_config = CFG.get("agents", {}).get("scanner", {})
+
+        self.data_dir = data_dir or os.getenv("GREMLIN_REPLAY_DIR") or replay_config.get("data_dir")
+        self.store = BarStore(self.data_dir) if self.data_dir else bar_store
+        self.timeframe = timeframe or replay_config.get("timeframe", "1min")
+        self.bar_seconds = TIMEFRAME_SECONDS.get(self.timeframe, 60)
+        self.speed = self._parse_speed(
+            speed if speed is not None else os.getenv("GREMLIN_REPLAY_SPEED", replay_config.get("speed", 1.0))
+        )
+        self.seed = int(seed if seed is not None else os.getenv("GREMLIN_REPLAY_SEED", replay_config.get("seed", 42)))
+        self.loop = replay_config.get("loop", True) if loop is None else loop
+        self.symbols = [s.upper() for s in symbols] if symbols else None
+        self.max_price = scanner_config.get("max_price", 10.0)
+
+        self.tapes: Dict[str, Dict[str, np.ndarray]] = {}
+        self.timeline = np.array([], dtype=np.int64)
+        self.cursor = 0
+        self.loops_completed = 0
+        self._wall_start = 0.0
+        self._cursor_start = 0
+        self.running = False
+
+    @staticmethod
+    def _parse_speed(speed: Union[float, str, None]) -> float:
+        """Speed multiplier; 0 means as fast as possible"""
+        if speed is None:
+            return 1.0
+        if isinstance(speed, str):
+            if speed.strip().lower() in ("max", "fast", "asap"):
+                return 0.0
+            speed = float(speed)
+        return max(0.0, float(speed))
+
+    async def start(self):
+        """Load the tape and start the replay clock"""
+        try:
+            await asyncio.to_thread(self.load)
+            self._reset_clock(0)
+            self.running = True
+            speed = "max" if self.speed == 0 else f"{self.speed:g}x"
+            replay_logger.info(
+                f"ReplayMarketDataService started: {len(self.tapes)} symbols, "
+                f"{len(self.timeline)} steps at {speed}, seed {self.seed}"
+            )
+        except Exception as e:
+            replay_logger.error(f"Error starting replay service: {e}")
+
+    async def stop(self):
+        """Stop the replay"""
+        try:
+            self.running = False
+            replay_logger.info("ReplayMarketDataService stopped")
+        except Exception as e:
+            replay_logger.error(f"Error stopping replay service: {e}")
+
+    def load(self):
+        """Load recorded bars and precompute per-session fields"""
+        symbols = self.symbols or self.store.list_symbols(self.timeframe)
+        tapes = {}
+        for symbol in symbols:
+            bars = self.store.read(symbol, self.timeframe)
+            if bars.empty:
+                continue
+            tapes[symbol] = self._prepare_tape(bars)
+
+        self.tapes = tapes
+        if tapes:
+            self.timeline = np.unique(np.concatenate([tape["ts"] for tape in tapes.values()]))
+        else:
+            self.timeline = np.array([], dtype=np.int64)
+            replay_logger.warning(f"No recorded bars found in {self.store.root}")
+
+    def _prepare_tape(self, bars: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Vectorized session bookkeeping for one symbol"""
+        frame = session_frame(bars)
+        return {
+            column: frame[column].to_numpy()
+            for column in ("ts", "open", "high", "low", "close", "volume",
+                           "session", "cum_volume", "vwap", "prev_close", "avg_volume")
+        }
+
+    def _reset_clock(self, cursor: int):
+        """Anchor the wall clock to a timeline position"""
+        self.cursor = cursor
+        self._cursor_start = cursor
+        self._wall_start = time.monotonic()
+
+    def current_ts(self) -> Optional[int]:
+        """Replay timestamp for the current wall-clock time"""
+        if len(self.timeline) == 0:
+            return None
+
+        if self.speed > 0:
+            elapsed = (time.monotonic() - self._wall_start) * self.speed
+            target = self.timeline[self._cursor_start] + elapsed
+            index = int(np.searchsorted(self.timeline, target, side="right")) - 1
+            if index >= len(self.timeline) - 1 and target > self.timeline[-1] + self.bar_seconds:
+                if self.loop:
+                    self.loops_completed += 1
+                    self._reset_clock(0)
+                    index = 0
+                else:
+                    index = len(self.timeline) - 1
+            self.cursor = max(0, index)
+
+        return int(self.timeline[self.cursor])
+
+    def advance(self, steps: int = 1):
+        """Step the tape forward - used when replaying as fast as possible"""
+        if len(self.timeline) == 0:
+            return
+        next_cursor = self.cursor + steps
+        if next_cursor >= len(self.timeline):
+            if self.loop:
+                self.loops_completed += 1
+                next_cursor = 0
+            else:
+                next_cursor = len(self.timeline) - 1
+        self.cursor = next_cursor
+
+    def _synthetic_move(self, symbol: str, ts: int, closes: np.ndarray, gap_bars: int) -> tuple:
+        """Deterministic price/volume fill for a bar missing from the tape"""
+        rng = np.random.default_rng([self.seed, zlib.crc32(symbol.encode()), int(ts)])
+        if len(closes) > 2:
+            sigma = float(np.std(np.diff(np.log(closes))))
+        else:
+            sigma = 0.002
+        sigma = sigma if sigma > 0 else 0.002
+        drift = rng.normal(0.0, sigma * np.sqrt(min(gap_bars, 390)))
+        volume_factor = rng.uniform(0.5, 1.5)
+        return float(np.exp(drift)), float(volume_factor)
+
+    def _record_at(self, symbol: str, ts: int) -> Optional[Dict[str, Any]]:
+        """Build a stock record for a symbol as of the replay timestamp"""
+        tape = self.tapes.get(symbol)
+        if tape is None:
+            return None
+
+        index = int(np.searchsorted(tape["ts"], ts, side="right")) - 1
+        if index < 0:
+            return None
+
+        start = max(0, index - INDICATOR_LOOKBACK + 1)
+        closes = tape["close"][start:index + 1]
+        volumes = tape["volume"][start:index + 1]
+        price = float(closes[-1])
+        cum_volume = float(tape["cum_volume"][index])
+
+        synthetic = int(tape["ts"][index]) < ts
+        if synthetic:
+            gap_bars = max(1, (ts - int(tape["ts"][index])) // self.bar_seconds)
+            price_factor, volume_factor = self._synthetic_move(symbol, ts, closes, gap_bars)
+            price = price * price_factor
+            bar_volume = float(np.mean(volumes)) * volume_factor if len(volumes) else 0.0
+            closes = np.append(closes, price)
+            volumes = np.append(volumes, bar_volume)
+            cum_volume += bar_volume
+
+        prev_close = float(tape["prev_close"][index]) or price
+        avg_volume = float(tape["avg_volume"][index]) or cum_volume
+        indicators = self._window_indicators(closes, volumes)
+
+        return {
+            "symbol": symbol,
+            "price": round(price, 4),
+            "volume": int(cum_volume),
+            "avg_volume": int(avg_volume),
+            "rotation": round(cum_volume / avg_volume, 2) if avg_volume > 0 else 0.0,
+            "up_pct": round((price / prev_close - 1) * 100, 2) if prev_close > 0 else 0.0,
+            "vwap": round(float(tape["vwap"][index]), 4),
+            **indicators,
+            "timestamp": datetime.fromtimestamp(ts, tz=timezone.utc).isoformat(),
+            "replay_ts": ts,
+            "synthetic": synthetic,
+            "data_source": "replay"
+        }
+
+    def _window_indicators(self, closes: np.ndarray, volumes: np.ndarray) -> Dict[str, Any]:
+        """Indicators over the trailing window, same shapes as the live services"""
+        close = pd.Series(closes, dtype=np.float64)
+
+        def tail_mean(n: int) -> float:
+            return float(close.iloc[-n:].mean())
+
+        delta = close.diff()
+        gain = delta.clip(lower=0).iloc[-14:].mean()
+        loss = (-delta.clip(upper=0)).iloc[-14:].mean()
+        rsi = 100 - (100 / (1 + gain / loss)) if loss and loss > 0 else 100.0 if gain and gain > 0 else 50.0
+
+        ema_12 = close.ewm(span=12).mean()
+        ema_26 = close.ewm(span=26).mean()
+        macd_line = ema_12 - ema_26
+        signal_line = macd_line.ewm(span=9).mean()
+
+        std_20 = float(close.iloc[-20:].std()) if len(close) > 1 else 0.0
+        sma_20 = tail_mean(20)
+
+        return {
+            "ema": {
+                "5": round(float(close.ewm(span=5).mean().iloc[-1]), 4),
+                "20": round(float(close.ewm(span=20).mean().iloc[-1]), 4)
+            },
+            "sma": {"5": round(tail_mean(5), 4), "20": round(sma_20, 4)},
+            "rsi": round(float(rsi), 1),
+            "macd": {
+                "macd": round(float(macd_line.iloc[-1]), 4),
+                "signal": round(float(signal_line.iloc[-1]), 4),
+                "histogram": round(float(macd_line.iloc[-1] - signal_line.iloc[-1]), 4)
+            },
+            "bollinger": {
+                "upper": round(sma_20 + 2 * std_20, 4),
+                "lower": round(sma_20 - 2 * std_20, 4),
+                "middle": round(sma_20, 4)
+            },
+            "last_bar_volume": int(volumes[-1]) if len(volumes) else 0
+        }
+
+    async def get_live_penny_stocks(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Replayed penny stock universe at the current replay time"""
+        try:
+            ts = self.current_ts()
+            if ts is None:
+                return []
+
+            stocks = []
+            for symbol in self.tapes:
+                record = self._record_at(symbol, ts)
+                if record and 0 < record["price"] < self.max_price:
+                    stocks.append(record)
+
+            stocks.sort(key=lambda s: s.get("up_pct", 0), reverse=True)
+
+            if self.speed == 0:
+                self.advance()
+
+            return stocks[:limit]
+
+        except Exception as e:
+            replay_logger.error(f"Error replaying penny stocks: {e}")
+            return []
+
+    async def get_stock_data(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Replayed data for one symbol"""
+        try:
+            ts = self.current_ts()
+            return self._record_at(symbol.upper(), ts) if ts is not None else None
+        except Exception as e:
+            replay_logger.error(f"Error replaying {symbol}: {e}")
+            return None
+
+    async def get_market_overview(self) -> Dict[str, Any]:
+        """Market overview from index symbols on the tape, or the replayed universe"""
+        try:
+            ts = self.current_ts()
+            if ts is None:
+                return {"error": "No replay data loaded"}
+
+            indices = {}
+            for symbol in ("SPY", "QQQ", "IWM", "DIA", "^GSPC", "^IXIC", "^RUT", "^DJI"):
+                record = self._record_at(symbol, ts)
+                if record:
+                    indices[symbol] = {"price": record["price"], "change_pct": record["up_pct"]}
+
+            changes = [r["up_pct"] for r in (self._record_at(s, ts) for s in self.tapes) if r]
+            avg_change = float(np.mean(changes)) if changes else 0.0
+            vix = self._record_at("^VIX", ts)
+
+            return {
+                "indices": indices,
+                "vix": vix["price"] if vix else None,
+                "market_sentiment": "bullish" if avg_change > 0.5 else "bearish" if avg_change < -0.5 else "neutral",
+                "breadth": round(sum(1 for c in changes if c > 0) / len(changes), 3) if changes else None,
+                "timestamp": datetime.fromtimestamp(ts, tz=timezone.utc).isoformat(),
+                "data_source": "replay"
+            }
+
+        except Exception as e:
+            replay_logger.error(f"Error replaying market overview: {e}")
+            return {"error": "Unable to replay market overview"}
+
+    def get_status(self) -> Dict[str, Any]:
+        """Replay position and settings"""
+        ts = int(self.timeline[self.cursor]) if len(self.timeline) else None
+        return {
+            "running": self.running,
+            "source": str(self.store.root),
+            "symbols": len(self.tapes),
+            "steps": len(self.timeline),
+            "cursor": self.cursor,
+            "replay_time": datetime.fromtimestamp(ts, tz=timezone.utc).isoformat() if ts else None,
+            "speed": "max" if self.speed == 0 else self.speed,
+            "seed": self.seed,
+            "loops_completed": self.loops_completed
+        }
+
+
+# Global instance
+replay_market_service = ReplayMarketDataService()
+
+# Alias for consistency with the other services
+ReplayMarketService = ReplayMarketDataService
+
+# Convenience functions
+async def get_live_penny_stocks_replay(limit: int = 50) -> List[Dict[str, Any]]:
+    """Get replayed penny stocks, loading the tape on first use"""
+    if not replay_market_service.running:
+        await replay_market_service.start()
+    return await replay_market_service.get_live_penny_stocks(limit)
+
+async def get_stock_data_replay(symbol: str) -> Optional[Dict[str, Any]]:
+    """Get replayed data for a symbol"""
+    return await replay_market_service.get_stock_data(symbol)
+
+async def get_market_overview_replay() -> Dict[str, Any]:
+    """Get replayed market overview"""
+    return await replay_market_service.get_market_overview()
+
+
+if __name__ == "__main__":
+    async def test_replay():
+        service = ReplayMarketDataService(speed="max")
+        await service.start()
+        for _ in range(3):
+            stocks = await service.get_live_penny_stocks(5)
+            print(f"{service.get_status()['replay_time']}: {[(s['symbol'], s['price']) for s in stocks]}")
+        await service.stop()
+
+    asyncio.run(test_replay())
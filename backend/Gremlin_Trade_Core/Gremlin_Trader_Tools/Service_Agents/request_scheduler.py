@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+
+# ─────────────────────────────────────────────────────────────
+# © 2025 StatikFintechLLC
+# Request Scheduler - Rate-limit-aware access to market data providers
+# Contact: ascend.gremlin@gmail.com
+# ─────────────────────────────────────────────────────────────
+
+"""
+Request Scheduler
+Every provider call goes through a per-provider token bucket. Waiting callers
+are served by priority lane - open-position marks first, then the watchlist,
+then the broad universe - and throttling errors halve the provider's rate
+until successful calls earn it back.
+"""
+
+# Import ALL dependencies through globals.py (required)
+import sys
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from Gremlin_Trade_Core.globals import (
+    # Core imports
+    asyncio, time, heapq, itertools, IntEnum,
+    # Type hints
+    List, Dict, Any, Optional, Callable, Tuple,
+    # Configuration and utilities
+    CFG, setup_module_logger
+)
+
+# Initialize logger
+scheduler_logger = setup_module_logger("market_data", "request_scheduler")
+
+# Error text that marks a provider-side throttle
+THROTTLE_MARKERS = ("429", "too many requests", "rate limit", "ratelimit", "throttl")
+
+
+class Priority(IntEnum):
+    """Scheduling lanes - lower value is served first"""
+    POSITION = 0
+    WATCHLIST = 1
+    UNIVERSE = 2
+
+
+def is_throttle_error(error: Exception) -> bool:
+    """Check whether an exception is a provider throttling response"""
+    status = getattr(getattr(error, "response", None), "status_code", None)
+    if status == 429:
+        return True
+    message = f"{type(error).__name__} {error}".lower()
+    return any(marker in message for marker in THROTTLE_MARKERS)
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at `rate` tokens per second"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def time_until_token(self) -> float:
+        """Seconds until one token is available"""
+        self._refill()
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate if self.rate > 0 else 1.0
+
+    def consume(self):
+        """Take one token - caller checked availability"""
+        self._refill()
+        self.tokens -= 1
+
+
+class ProviderLane:
+    """Token bucket, waiting callers and adaptive rate for one provider"""
+
+    def __init__(self, name: str, rate: float, burst: int):
+        self.name = name
+        self.base_rate = rate
+        self.bucket = TokenBucket(rate, burst)
+        self.waiters: List[tuple] = []
+        self.dispatcher: Optional[asyncio.Task] = None
+        self.backoff_until = 0.0
+        self.backoff_seconds = 0.0
+
+        # Metrics
+        self.requests = 0
+        self.throttles = 0
+        self.errors = 0
+        self.wait_total = {priority: 0.0 for priority in Priority}
+        self.wait_count = {priority: 0 for priority in Priority}
+        self.wait_max = {priority: 0.0 for priority in Priority}
+
+    def queue_depth(self) -> Dict[str, int]:
+        """Waiting callers per lane"""
+        depth = {priority.name.lower(): 0 for priority in Priority}
+        for priority, _, _, future in self.waiters:
+            if not future.done():
+                depth[Priority(priority).name.lower()] += 1
+        return depth
+
+    def record_wait(self, priority: Priority, waited: float):
+        self.wait_total[priority] += waited
+        self.wait_count[priority] += 1
+        self.wait_max[priority] = max(self.wait_max[priority], waited)
+
+
+class RequestScheduler:
+    """
+    Central scheduler for market data provider requests
+    Replaces per-call sleeps: callers acquire a token for their provider and
+    the scheduler paces them at the provider's current allowed rate.
+    """
+
+    def __init__(self):
+        limits = CFG.get("agents", {}).get("rate_limits", {})
+        self.provider_limits = limits.get("providers", {})
+        self.backoff_factor = limits.get("backoff_factor", 0.5)
+        self.recovery_step = limits.get("recovery_step", 0.1)
+        self.min_rate = limits.get("min_rate", 0.1)
+        self.initial_backoff = limits.get("backoff_seconds", 1.0)
+        self.max_backoff = limits.get("max_backoff_seconds", 60.0)
+        self.lanes: Dict[str, ProviderLane] = {}
+        self.positions: set = set()
+        self.watchlist: set = set()
+        self._sequence = itertools.count()
+        self.rate_share = 1.0
+
+    def _limits(self, provider: str) -> Tuple[float, int]:
+        """This process's (rate, burst) for a provider"""
+        limits = self.provider_limits.get(provider) or self.provider_limits.get("default", {})
+        return limits.get("rate", 2.0) * self.rate_share, max(1, int(limits.get("burst", 5) * self.rate_share))
+
+    def _lane(self, provider: str) -> ProviderLane:
+        """Get or create the lane for a provider"""
+        lane = self.lanes.get(provider)
+        if lane is None:
+            lane = ProviderLane(provider, *self._limits(provider))
+            self.lanes[provider] = lane
+        return lane
+
+    def set_rate_share(self, share: float):
+        """
+        Limit this process to a fraction of every provider's rate
+        Used when several processes (coordination shards) call the same
+        providers, so together they stay within the configured limits.
+        """
+        share = min(1.0, max(1e-3, share))
+        if share == self.rate_share:
+            return
+        self.rate_share = share
+        for provider, lane in self.lanes.items():
+            rate, burst = self._limits(provider)
+            throttled = lane.bucket.rate / lane.base_rate if lane.base_rate else 1.0
+            lane.base_rate = rate
+            lane.bucket.rate = max(self.min_rate, rate * min(1.0, throttled))
+            lane.bucket.capacity = burst
+            lane.bucket.tokens = min(lane.bucket.tokens, burst)
+        scheduler_logger.info(f"Provider rate share set to {share:.3f}")
+
+    def register_positions(self, symbols: List[str]):
+        """Symbols with open positions - served in the first lane"""
+        self.positions = {s.upper() for s in symbols}
+
+    def register_watchlist(self, symbols: List[str]):
+        """Watchlist symbols - served ahead of the broad universe"""
+        self.watchlist = {s.upper() for s in symbols}
+
+    def priority_for(self, symbol: Optional[str]) -> Priority:
+        """Lane for a symbol based on positions and watchlist"""
+        if symbol:
+            symbol = symbol.upper()
+            if symbol in self.positions:
+                return Priority.POSITION
+            if symbol in self.watchlist:
+                return Priority.WATCHLIST
+        return Priority.UNIVERSE
+
+    async def acquire(self, provider: str, priority: Priority = Priority.UNIVERSE) -> float:
+        """Wait for a provider token; returns seconds waited"""
+        lane = self._lane(provider)
+        started = time.monotonic()
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(lane.waiters, (int(priority), next(self._sequence), started, future))
+
+        if lane.dispatcher is None or lane.dispatcher.done():
+            lane.dispatcher = asyncio.create_task(self._dispatch(lane))
+
+        await future
+        waited = time.monotonic() - started
+        lane.record_wait(Priority(priority), waited)
+        return waited
+
+    async def _dispatch(self, lane: ProviderLane):
+        """Hand out tokens to waiting callers in priority order"""
+        while lane.waiters:
+            delay = max(lane.bucket.time_until_token(), lane.backoff_until - time.monotonic())
+            if delay > 0:
+                # Re-check after sleeping so a higher-priority arrival goes first
+                await asyncio.sleep(delay)
+                continue
+
+            _, _, _, future = heapq.heappop(lane.waiters)
+            if future.done():
+                continue
+            lane.bucket.consume()
+            future.set_result(True)
+
+    def report_throttle(self, provider: str):
+        """Provider pushed back - cut the rate and pause the lane"""
+        lane = self._lane(provider)
+        lane.throttles += 1
+        lane.bucket.rate = max(self.min_rate, lane.bucket.rate * self.backoff_factor)
+        lane.bucket.tokens = min(lane.bucket.tokens, 0.0)
+        lane.backoff_seconds = min(self.max_backoff, max(self.initial_backoff, lane.backoff_seconds * 2))
+        lane.backoff_until = time.monotonic() + lane.backoff_seconds
+        scheduler_logger.warning(
+            f"Provider '{provider}' throttled - rate {lane.bucket.rate:.2f}/s, "
+            f"pausing {lane.backoff_seconds:.1f}s"
+        )
+
+    def report_success(self, provider: str):
+        """Successful call - recover the rate towards its configured value"""
+        lane = self._lane(provider)
+        if lane.bucket.rate < lane.base_rate:
+            lane.bucket.rate = min(lane.base_rate, lane.bucket.rate + self.recovery_step)
+        lane.backoff_seconds = 0.0
+
+    async def run(self, provider: str, fn: Callable, *args, priority: Optional[Priority] = None,
+                  symbol: Optional[str] = None, **kwargs) -> Any:
+        """
+        Run a provider call once a token is available
+        Coroutine functions are awaited; blocking functions run in a worker
+        thread. Exceptions propagate to the caller after being classified.
+        """
+        if priority is None:
+            priority = self.priority_for(symbol)
+
+        await self.acquire(provider, priority)
+        lane = self._lane(provider)
+        lane.requests += 1
+        try:
+            if asyncio.iscoroutinefunction(fn):
+                result = await fn(*args, **kwargs)
+            else:
+                result = await asyncio.to_thread(fn, *args, **kwargs)
+            self.report_success(provider)
+            return result
+        except Exception as e:
+            if is_throttle_error(e):
+                self.report_throttle(provider)
+            else:
+                lane.errors += 1
+            raise
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Per-provider rate, queue depth and wait-time metrics"""
+        metrics = {}
+        for name, lane in self.lanes.items():
+            metrics[name] = {
+                "rate": round(lane.bucket.rate, 3),
+                "base_rate": lane.base_rate,
+                "tokens": round(lane.bucket.tokens, 2),
+                "backoff_remaining": round(max(0.0, lane.backoff_until - time.monotonic()), 2),
+                "queue_depth": lane.queue_depth(),
+                "requests": lane.requests,
+                "throttles": lane.throttles,
+                "errors": lane.errors,
+                "wait_ms": {
+                    priority.name.lower(): {
+                        "avg": round(lane.wait_total[priority] / lane.wait_count[priority] * 1000, 2)
+                        if lane.wait_count[priority] else 0.0,
+                        "max": round(lane.wait_max[priority] * 1000, 2),
+                        "count": lane.wait_count[priority]
+                    }
+                    for priority in Priority
+                }
+            }
+        return {
+            "providers": metrics,
+            "rate_share": self.rate_share,
+            "positions": len(self.positions),
+            "watchlist": len(self.watchlist)
+        }
+
+
+# Global instance
+request_scheduler = RequestScheduler()
+
+# Convenience functions
+async def schedule_request(provider: str, fn: Callable, *args, priority: Optional[Priority] = None,
+                           symbol: Optional[str] = None, **kwargs) -> Any:
+    """Run a provider call through the shared scheduler"""
+    return await request_scheduler.run(provider, fn, *args, priority=priority, symbol=symbol, **kwargs)
+
+def get_scheduler_metrics() -> Dict[str, Any]:
+    """Get request scheduler metrics"""
+    return request_scheduler.get_metrics()
+
+
+if __name__ == "__main__":
+    async def test_scheduler():
+        request_scheduler.register_positions(["GPRO"])
+        request_scheduler.register_watchlist(["SAVA"])
+        served = []
+
+        async def fetch(symbol):
+            served.append(symbol)
+            return symbol
+
+        symbols = ["UNIV1", "UNIV2", "SAVA", "UNIV3", "GPRO"] * 3
+        await asyncio.gather(*[schedule_request("test", fetch, s, symbol=s) for s in symbols])
+        print(f"Served order: {served}")
+        print(f"Metrics: {get_scheduler_metrics()}")
+
+    asyncio.run(test_scheduler())
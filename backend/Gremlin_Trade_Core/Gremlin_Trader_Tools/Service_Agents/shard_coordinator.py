@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+
+# ─────────────────────────────────────────────────────────────
+# © 2025 StatikFintechLLC
+# Shard Coordinator - multi-process coordination for large watchlists
+# Contact: ascend.gremlin@gmail.com
+# ─────────────────────────────────────────────────────────────
+
+"""
+Shard Coordinator
+Strategies, indicator math and the coordination pipeline are Python and
+share one GIL, which caps how many symbols a single process can evaluate
+per cycle. Large watchlists are split into shards, each pinned to its own
+single-worker process that keeps a full coordination pipeline (and its
+caches) alive between cycles. The universe table is published once per
+snapshot version into shared memory and workers map it read-only instead
+of receiving a pickled copy.
+
+Shards are balanced on measured cost: every symbol's evaluation time is
+tracked as an exponentially weighted average and shards are re-planned
+with longest-processing-time-first when the heaviest shard drifts too far
+from the mean. Assignments are otherwise sticky so workers keep their
+per-symbol state. Workers only return decisions - ranking and the global
+portfolio limits stay with the parent coordinator.
+
+Each process has its own request scheduler, so while shards are active the
+parent and every worker get an equal share of each provider's rate limit.
+A shard that overruns its deadline has its worker killed and restarted;
+otherwise the stale task would hold the single-worker pool and the next
+cycle's shard would queue behind it.
+"""
+
+# Import ALL dependencies through globals.py (required)
+import sys
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from Gremlin_Trade_Core.globals import (
+    # Core imports
+    asyncio, os, np, time, heapq, threading, multiprocessing, shared_memory, ProcessPoolExecutor,
+    # Type hints
+    List, Dict, Any, Optional, Iterable,
+    # Configuration and utilities
+    CFG, setup_module_logger
+)
+
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.stock_table import StockTable, STOCK_DTYPE
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.universe_snapshot import universe_provider
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.request_scheduler import request_scheduler
+
+# Initialize logger
+shard_logger = setup_module_logger("market_data", "shard_coordinator")
+
+# Per-process worker state - the pipeline, its event loop and the attached snapshot
+_WORKER: Dict[str, Any] = {"coordinator": None, "loop": None, "segment": None, "table": None,
+                           "version": None, "retired": []}
+
+
+def lpt_partition(costs: Dict[str, float], shards: int) -> Dict[str, int]:
+    """Longest-processing-time-first: heaviest symbol to the lightest shard"""
+    heap = [(0.0, shard) for shard in range(max(1, shards))]
+    assignments = {}
+    for symbol in sorted(costs, key=costs.get, reverse=True):
+        load, shard = heapq.heappop(heap)
+        assignments[symbol] = shard
+        heapq.heappush(heap, (load + costs[symbol], shard))
+    return assignments
+
+
+def shard_loads(assignments: Dict[str, int], costs: Dict[str, float], shards: int) -> List[float]:
+    """Estimated seconds of work per shard"""
+    loads = [0.0] * shards
+    for symbol, cost in costs.items():
+        loads[assignments[symbol]] += cost
+    return loads
+
+
+def imbalance(loads: List[float]) -> float:
+    """Heaviest shard relative to the mean (0.0 when perfectly balanced)"""
+    mean = sum(loads) / len(loads) if loads else 0.0
+    return max(loads) / mean - 1.0 if mean > 0 else 0.0
+
+
+class SharedSnapshot:
+    """
+    Universe table published into a shared memory segment
+    A new segment is created per snapshot version; the previous one is
+    unlinked and disappears once the last worker detaches.
+    """
+
+    def __init__(self):
+        self._segment: Optional[shared_memory.SharedMemory] = None
+        self.handle: Optional[Dict[str, Any]] = None
+
+    def publish(self, snapshot: Any) -> Optional[Dict[str, Any]]:
+        """Handle workers attach with; republishes only when the version changed"""
+        if snapshot is None:
+            return self.handle
+        if self.handle is not None and self.handle["version"] == snapshot.version:
+            return self.handle
+        try:
+            array = snapshot.table.array
+            segment = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+            np.ndarray(array.shape, dtype=STOCK_DTYPE, buffer=segment.buf)[:] = array
+            self._release()
+            self._segment = segment
+            self.handle = {"name": segment.name, "rows": len(array), "version": snapshot.version}
+            shard_logger.debug(f"Published snapshot v{snapshot.version}: {len(array)} rows, {array.nbytes} bytes")
+        except Exception as e:
+            shard_logger.error(f"Error publishing snapshot to shared memory: {e}")
+        return self.handle
+
+    def _release(self):
+        if self._segment is not None:
+            try:
+                self._segment.close()
+                self._segment.unlink()
+            except Exception as e:
+                shard_logger.warning(f"Error releasing snapshot segment: {e}")
+            self._segment = None
+
+    def close(self):
+        self._release()
+        self.handle = None
+
+
+def attach_snapshot(handle: Optional[Dict[str, Any]]) -> Optional[StockTable]:
+    """Read-only table over the parent's segment, re-attached only on a new version"""
+    if handle is None:
+        return None
+    if _WORKER["version"] == handle["version"]:
+        return _WORKER["table"]
+
+    # Detach from the previous version; a segment still referenced by a
+    # lingering view is retried on the next attach
+    _WORKER["table"] = None
+    if _WORKER["segment"] is not None:
+        _WORKER["retired"].append(_WORKER["segment"])
+        _WORKER["segment"] = None
+    for segment in list(_WORKER["retired"]):
+        try:
+            segment.close()
+            _WORKER["retired"].remove(segment)
+        except BufferError:
+            pass
+
+    try:
+        segment = shared_memory.SharedMemory(name=handle["name"])
+        array = np.ndarray((handle["rows"],), dtype=STOCK_DTYPE, buffer=segment.buf)
+        array.flags.writeable = False
+        _WORKER.update(segment=segment, table=StockTable(array), version=handle["version"])
+    except FileNotFoundError:
+        # Parent moved on to a newer version while this task was queued
+        shard_logger.warning(f"Snapshot v{handle['version']} no longer available")
+        _WORKER["version"] = None
+    return _WORKER["table"]
+
+
+def _worker_coordinator(loop: asyncio.AbstractEventLoop) -> Any:
+    """The worker's coordination pipeline, created on first use"""
+    if _WORKER["coordinator"] is None:
+        # Deferred import - agent_coordinator imports this module
+        from Gremlin_Trade_Core.agent_coordinator import AgentCoordinator
+        coordinator = AgentCoordinator()
+        coordinator.record_decisions = False
+        loop.run_until_complete(coordinator.initialize_pipeline())
+        _WORKER["coordinator"] = coordinator
+        shard_logger.info(f"Shard worker {os.getpid()} pipeline ready")
+    return _WORKER["coordinator"]
+
+
+def coordinate_shard(task: Dict[str, Any]) -> Dict[str, Any]:
+    """Worker: run the coordination pipeline over one shard"""
+    started = time.perf_counter()
+    metrics = {"timeouts": {}, "errors": {}, "symbol_seconds": {}, "deferred": []}
+    try:
+        if _WORKER["loop"] is None:
+            _WORKER["loop"] = asyncio.new_event_loop()
+            asyncio.set_event_loop(_WORKER["loop"])
+        loop = _WORKER["loop"]
+        request_scheduler.set_rate_share(task.get("rate_share", 1.0))
+        coordinator = _worker_coordinator(loop)
+        coordinator.market_snapshot = attach_snapshot(task.get("snapshot"))
+
+        deadline = time.perf_counter() + task["budget_seconds"]
+        decisions = loop.run_until_complete(coordinator.coordinate_symbols(
+            task["symbols"], task["market_conditions"], metrics, set(task["must_run"]), deadline
+        ))
+        return {"shard": task["shard"], "pid": os.getpid(), "metrics": metrics,
+                "decisions": [coordinator.decision_fields(decision) for decision in decisions],
+                "seconds": round(time.perf_counter() - started, 3)}
+    except Exception as e:
+        shard_logger.error(f"Shard {task.get('shard')} failed in worker {os.getpid()}: {e}")
+        return {"shard": task.get("shard"), "pid": os.getpid(), "metrics": metrics, "decisions": [],
+                "error": str(e), "seconds": round(time.perf_counter() - started, 3)}
+
+
+class ShardCoordinator:
+    """
+    Splits coordination passes across pinned worker processes
+    Shard i always runs on process i; pools are created on first use.
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        shard_config = config if config is not None else CFG.get("agents", {}).get("sharding", {})
+        self.config = {
+            "enabled": shard_config.get("enabled", False),
+            "workers": shard_config.get("workers", 0),
+            "start_method": shard_config.get("start_method", "spawn"),
+            "min_symbols": shard_config.get("min_symbols", 64),
+            "min_symbols_per_shard": max(1, shard_config.get("min_symbols_per_shard", 16)),
+            "cost_halflife_cycles": shard_config.get("cost_halflife_cycles", 5),
+            "default_cost_seconds": shard_config.get("default_cost_seconds", 0.5),
+            "rebalance_interval": shard_config.get("rebalance_interval", 10),
+            "rebalance_threshold": shard_config.get("rebalance_threshold", 0.25),
+            "shard_grace_seconds": shard_config.get("shard_grace_seconds", 15.0)
+        }
+        self.costs: Dict[str, float] = {}
+        self.assignments: Dict[str, int] = {}
+        self.shards = 0
+        self.snapshot = SharedSnapshot()
+        self._pools: List[Optional[ProcessPoolExecutor]] = []
+        self._pool_lock = threading.Lock()
+        self.cycles = 0
+        self.rebalances = 0
+        self._last_rebalance = 0
+        self.last_run: Dict[str, Any] = {}
+
+    @property
+    def workers(self) -> int:
+        return self.config["workers"] or max(1, (os.cpu_count() or 1) - 1)
+
+    def should_shard(self, count: int) -> bool:
+        """Only watchlists large enough to amortize the process hop are sharded"""
+        return self.config["enabled"] and self.workers > 1 and count >= self.config["min_symbols"]
+
+    def shard_count(self, count: int) -> int:
+        return max(1, min(self.workers, count // self.config["min_symbols_per_shard"]))
+
+    def cost(self, symbol: str) -> float:
+        """Expected seconds to evaluate a symbol; unmeasured symbols get the median"""
+        cost = self.costs.get(symbol)
+        if cost is not None:
+            return cost
+        return float(np.median(list(self.costs.values()))) if self.costs else self.config["default_cost_seconds"]
+
+    def record_costs(self, symbol_seconds: Dict[str, float]):
+        """Fold measured per-symbol times into the EW cost estimates"""
+        alpha = 1.0 - 0.5 ** (1.0 / max(1e-6, self.config["cost_halflife_cycles"]))
+        for symbol, seconds in symbol_seconds.items():
+            previous = self.costs.get(symbol)
+            self.costs[symbol] = seconds if previous is None else previous + alpha * (seconds - previous)
+
+    def plan(self, symbols: List[str]) -> List[List[str]]:
+        """
+        Assign symbols to shards; each shard keeps the caller's priority order
+        Assignments stick between cycles. New symbols go to the lightest shard
+        and a full LPT re-plan runs when the shard count changes or, at most
+        every rebalance_interval cycles, when the imbalance passes the threshold.
+        """
+        shards = self.shard_count(len(symbols))
+        costs = {symbol: self.cost(symbol) for symbol in symbols}
+
+        if shards != self.shards:
+            self.shards = shards
+            self.assignments = {}
+        known = {symbol: cost for symbol, cost in costs.items() if symbol in self.assignments}
+        loads = shard_loads(self.assignments, known, shards)
+        for symbol in sorted(set(costs) - set(known), key=costs.get, reverse=True):
+            shard = loads.index(min(loads))
+            self.assignments[symbol] = shard
+            loads[shard] += costs[symbol]
+
+        drift = imbalance(loads)
+        due = self.cycles - self._last_rebalance >= self.config["rebalance_interval"]
+        if not known or (due and drift > self.config["rebalance_threshold"]):
+            self.assignments.update(lpt_partition(costs, shards))
+            self._last_rebalance = self.cycles
+            if known:
+                self.rebalances += 1
+                balanced = imbalance(shard_loads(self.assignments, costs, shards))
+                shard_logger.info(f"Rebalanced {len(symbols)} symbols over {shards} shards: "
+                                  f"imbalance {drift:.2f} -> {balanced:.2f}")
+
+        planned: List[List[str]] = [[] for _ in range(shards)]
+        for symbol in symbols:
+            planned[self.assignments[symbol]].append(symbol)
+        return planned
+
+    def _pool(self, shard: int) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            while len(self._pools) <= shard:
+                self._pools.append(None)
+            if self._pools[shard] is None:
+                if not any(self._pools):
+                    # Workers must share the parent's resource tracker so an
+                    # attached segment is not unlinked when a worker exits
+                    from multiprocessing import resource_tracker
+                    resource_tracker.ensure_running()
+                context = multiprocessing.get_context(self.config["start_method"])
+                self._pools[shard] = ProcessPoolExecutor(max_workers=1, mp_context=context)
+            return self._pools[shard]
+
+    def _reset_pool(self, shard: int, terminate: bool = False):
+        """Drop a shard's pool; terminate kills a worker still busy with a stale task"""
+        with self._pool_lock:
+            if shard < len(self._pools) and self._pools[shard] is not None:
+                pool = self._pools[shard]
+                self._pools[shard] = None
+                if terminate:
+                    # shutdown() never interrupts a running task
+                    for process in list((pool._processes or {}).values()):
+                        if process.is_alive():
+                            process.terminate()
+                pool.shutdown(wait=False, cancel_futures=True)
+
+    def _trim_pools(self, shards: int):
+        """Shut down workers beyond the current shard count"""
+        for shard in range(shards, len(self._pools)):
+            self._reset_pool(shard)
+
+    async def run(self, symbols: List[str], market_conditions: Dict[str, Any], must_run: Iterable[str],
+                  budget_seconds: float, metrics: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        One coordination pass over the shards
+        Fills metrics (symbol_seconds, timeouts, errors, deferred, shards) and
+        returns the decision fields from every worker. Symbols of a shard that
+        failed or timed out are reported as deferred.
+        """
+        started = time.perf_counter()
+        self.cycles += 1
+        planned = self.plan(symbols)
+        self._trim_pools(len(planned))
+        must_run = set(must_run)
+        snapshot = self.snapshot.publish(universe_provider.get_snapshot_nowait())
+        timeout = budget_seconds + self.config["shard_grace_seconds"]
+        rate_share = 1.0 / (len(planned) + 1)
+        request_scheduler.set_rate_share(rate_share)
+        loop = asyncio.get_running_loop()
+
+        async def run_shard(shard: int, shard_symbols: List[str]) -> Dict[str, Any]:
+            task = {"shard": shard, "symbols": shard_symbols, "must_run": [s for s in shard_symbols if s in must_run],
+                    "market_conditions": market_conditions, "budget_seconds": budget_seconds, "snapshot": snapshot,
+                    "rate_share": rate_share}
+            try:
+                return await asyncio.wait_for(loop.run_in_executor(self._pool(shard), coordinate_shard, task), timeout)
+            except asyncio.TimeoutError:
+                shard_logger.warning(f"Shard {shard} ({len(shard_symbols)} symbols) over {timeout:.1f}s - restarting its worker")
+                self._reset_pool(shard, terminate=True)
+                return {"shard": shard, "decisions": [], "error": "timeout"}
+            except Exception as e:
+                # A dead worker breaks its pool - replace it for the next cycle
+                shard_logger.error(f"Shard {shard} worker failed: {e}")
+                self._reset_pool(shard)
+                return {"shard": shard, "decisions": [], "error": str(e)}
+
+        results = await asyncio.gather(*[run_shard(shard, shard_symbols)
+                                         for shard, shard_symbols in enumerate(planned) if shard_symbols])
+
+        decisions = []
+        shard_stats = []
+        for result in results:
+            shard_symbols = planned[result["shard"]]
+            worker_metrics = result.get("metrics")
+            if worker_metrics is None:
+                metrics["deferred"].extend(shard_symbols)
+            else:
+                metrics["symbol_seconds"].update(worker_metrics["symbol_seconds"])
+                metrics["deferred"].extend(worker_metrics["deferred"])
+                for key in ("timeouts", "errors"):
+                    for phase, count in worker_metrics[key].items():
+                        metrics[key][phase] = metrics[key].get(phase, 0) + count
+            decisions.extend(result["decisions"])
+            shard_stats.append({
+                "shard": result["shard"], "symbols": len(shard_symbols), "pid": result.get("pid"),
+                "estimated_seconds": round(sum(self.cost(s) for s in shard_symbols), 3),
+                "seconds": result.get("seconds"), "error": result.get("error")
+            })
+
+        self.record_costs(metrics["symbol_seconds"])
+        metrics["shards"] = shard_stats
+        self.last_run = {
+            "shards": len(planned), "symbols": len(symbols), "decisions": len(decisions),
+            "snapshot_version": snapshot["version"] if snapshot else None,
+            "imbalance": round(imbalance([stat["estimated_seconds"] for stat in shard_stats]), 3),
+            "seconds": round(time.perf_counter() - started, 3)
+        }
+        shard_logger.debug(f"Sharded pass: {self.last_run}")
+        return decisions
+
+    def close(self):
+        """Shut down the workers and release the shared snapshot"""
+        self._trim_pools(0)
+        self.snapshot.close()
+        request_scheduler.set_rate_share(1.0)
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "config": dict(self.config),
+            "workers": self.workers,
+            "active_shards": sum(1 for pool in self._pools if pool is not None),
+            "tracked_symbols": len(self.costs),
+            "cycles": self.cycles,
+            "rebalances": self.rebalances,
+            "last_run": self.last_run
+        }
+
+
+# Global instance
+shard_coordinator = ShardCoordinator()
+
+# Convenience functions
+def get_shard_plan(symbols: List[str]) -> Dict[str, int]:
+    """Shard each symbol would run on in the next pass"""
+    planned = shard_coordinator.plan(symbols)
+    return {symbol: shard for shard, shard_symbols in enumerate(planned) for symbol in shard_symbols}
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(7)
+    symbols = [f"SYM{i:04d}" for i in range(400)]
+    demo = ShardCoordinator({"enabled": True, "workers": 4, "min_symbols_per_shard": 16})
+    demo.record_costs({symbol: float(rng.lognormal(-1.0, 0.8)) for symbol in symbols})
+    planned = demo.plan(symbols)
+    loads = [sum(demo.cost(s) for s in shard) for shard in planned]
+    print(f"{len(planned)} shards, loads {[round(load, 2) for load in loads]}, imbalance {imbalance(loads):.3f}")
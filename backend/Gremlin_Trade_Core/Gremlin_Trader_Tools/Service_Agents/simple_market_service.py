@@ -23,6 +23,8 @@ from Gremlin_Trade_Core.globals import (
     setup_module_logger
 )
 
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.request_scheduler import request_scheduler
+
 # Initialize logger
 market_logger = setup_module_logger("market_data", "simple_market_service")
 
@@ -76,20 +78,19 @@ class SimpleMarketDataService:
                 "BOXL", "GNUS", "INPX", "JAGX", "NAKD", "NVCN", "OBSV", "OZSC"
             ]
             
-            for symbol in symbols[:min(limit, 10)]:  # Limit to avoid rate limits
-                try:
-                    # Use a simple HTTP request to get basic data
-                    # This is a placeholder - in real implementation you'd use a working API
-                    stock_data = await self._fetch_symbol_data(symbol)
-                    if stock_data:
-                        stocks.append(stock_data)
-                        
-                    # Rate limiting
-                    await asyncio.sleep(0.1)
-                    
-                except Exception as e:
-                    market_logger.warning(f"Failed to get data for {symbol}: {e}")
+            # Requests are paced by the shared request scheduler
+            batch = symbols[:min(limit, 10)]
+            results = await asyncio.gather(*[
+                request_scheduler.run("simple", self._fetch_symbol_data, symbol, symbol=symbol)
+                for symbol in batch
+            ], return_exceptions=True)
+            
+            for symbol, stock_data in zip(batch, results):
+                if isinstance(stock_data, Exception):
+                    market_logger.warning(f"Failed to get data for {symbol}: {stock_data}")
                     continue
+                if stock_data:
+                    stocks.append(stock_data)
             
             return stocks if stocks else None
             
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+
+# ─────────────────────────────────────────────────────────────
+# © 2025 StatikFintechLLC
+# Stock Table - Compact columnar stock snapshot records
+# Contact: ascend.gremlin@gmail.com
+# ─────────────────────────────────────────────────────────────
+
+"""
+Stock Table
+Snapshot records are stored once in a NumPy structured array. StockView is a
+slotted, dict-compatible row adapter: reads go straight to the columns,
+writes land in a small per-view overlay so pipelines can annotate a record
+without copying it, and to_dict() rebuilds the original nested shape for
+the JSON layer.
+"""
+
+# Import ALL dependencies through globals.py (required)
+import sys
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from Gremlin_Trade_Core.globals import (
+    # Core imports
+    np, math, MappingProxyType, Mapping, MutableMapping,
+    # Type hints
+    List, Dict, Any, Optional, Iterable, Iterator,
+    # Configuration and utilities
+    setup_module_logger
+)
+
+# Initialize logger
+table_logger = setup_module_logger("market_data", "stock_table")
+
+# Flat numeric fields stored as columns
+FLAT_FIELDS = ("price", "volume", "avg_volume", "rotation", "up_pct", "vwap", "rsi", "float_million")
+INT_FIELDS = frozenset(("volume", "avg_volume"))
+
+# Nested groups flattened into columns: key -> ((sub_key, column), ...)
+NESTED_FIELDS = {
+    "ema": (("5", "ema_5"), ("20", "ema_20")),
+    "sma": (("5", "sma_5"), ("20", "sma_20")),
+    "macd": (("macd", "macd"), ("signal", "macd_signal"), ("histogram", "macd_histogram")),
+    "bollinger": (("upper", "bb_upper"), ("lower", "bb_lower"), ("middle", "bb_middle"))
+}
+
+STOCK_DTYPE = np.dtype(
+    [("symbol", "U12")]
+    + [(name, "f8") for name in FLAT_FIELDS]
+    + [(column, "f8") for group in NESTED_FIELDS.values() for _, column in group]
+)
+
+SCHEMA_KEYS = ("symbol",) + FLAT_FIELDS + tuple(NESTED_FIELDS)
+
+_DELETED = object()
+
+
+def _to_float(value: Any) -> float:
+    """Numeric column value; anything missing or non-numeric is NaN"""
+    try:
+        return float(value) if value is not None else math.nan
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _nested_overflow(value: Any, group: tuple) -> Any:
+    """Part of a nested field the columns cannot hold: unknown or non-numeric sub-keys, or a non-dict value"""
+    if value is None:
+        return None
+    if not isinstance(value, Mapping):
+        return value
+    columns = dict(group)
+    overflow = {sub_key: sub_value for sub_key, sub_value in value.items()
+                if sub_key not in columns or (sub_value is not None and _to_float(sub_value) != _to_float(sub_value))}
+    return MappingProxyType(overflow) if overflow else None
+
+
+class StockView(MutableMapping):
+    """
+    Dict-compatible view of one StockTable row
+    Frozen views (the ones handed out by a snapshot) reject writes; copy()
+    returns a writable view that shares the row and keeps its own overlay.
+    """
+
+    __slots__ = ("_table", "_row", "_overlay", "_frozen")
+
+    def __init__(self, table: "StockTable", row: int, overlay: Optional[Dict[str, Any]] = None,
+                 frozen: bool = False):
+        self._table = table
+        self._row = row
+        self._overlay = overlay
+        self._frozen = frozen
+
+    def _base_value(self, key: str) -> Any:
+        """Read a key from the columns/extras; raises KeyError when absent"""
+        table, row = self._table, self._row
+        if key == "symbol":
+            return str(table.array["symbol"][row])
+        if key in INT_FIELDS or key in FLAT_FIELDS:
+            value = table.array[key][row]
+            if value != value:
+                raise KeyError(key)
+            return int(value) if key in INT_FIELDS else float(value)
+        extras = table.extras[row]
+        group = NESTED_FIELDS.get(key)
+        if group is not None:
+            # Sub-keys outside the columns (or a non-dict value) are kept in extras
+            overflow = extras.get(key) if extras is not None else None
+            if overflow is not None and not isinstance(overflow, Mapping):
+                return overflow
+            nested = {}
+            for sub_key, column in group:
+                value = table.array[column][row]
+                if value == value:
+                    nested[sub_key] = float(value)
+            if overflow:
+                nested.update(overflow)
+            if not nested:
+                raise KeyError(key)
+            return nested
+        if extras is not None and key in extras:
+            return extras[key]
+        raise KeyError(key)
+
+    def _base_keys(self) -> tuple:
+        """Keys present in the row's columns and extras, in record order"""
+        keys = []
+        for key in SCHEMA_KEYS:
+            try:
+                self._base_value(key)
+                keys.append(key)
+            except KeyError:
+                continue
+        extras = self._table.extras[self._row]
+        if extras is not None:
+            keys.extend(key for key in extras if key not in NESTED_FIELDS)
+        return tuple(keys)
+
+    def __getitem__(self, key: str) -> Any:
+        overlay = self._overlay
+        if overlay is not None and key in overlay:
+            value = overlay[key]
+            if value is _DELETED:
+                raise KeyError(key)
+            return value
+        return self._base_value(key)
+
+    def __setitem__(self, key: str, value: Any):
+        if self._frozen:
+            raise TypeError("snapshot records are read-only - use copy() to annotate")
+        if self._overlay is None:
+            self._overlay = {}
+        self._overlay[key] = value
+
+    def __delitem__(self, key: str):
+        if self._frozen:
+            raise TypeError("snapshot records are read-only - use copy() to annotate")
+        self[key]
+        self[key] = _DELETED
+
+    def __iter__(self) -> Iterator[str]:
+        overlay = self._overlay or {}
+        base_keys = self._table.row_keys(self._row)
+        for key in base_keys:
+            if overlay.get(key) is not _DELETED:
+                yield key
+        for key, value in overlay.items():
+            if value is not _DELETED and key not in base_keys:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"StockView({self.to_dict()!r})"
+
+    @property
+    def row(self) -> int:
+        """Row index in the backing table"""
+        return self._row
+
+    @property
+    def overlay(self) -> Dict[str, Any]:
+        """Keys written on top of the row"""
+        return {k: v for k, v in (self._overlay or {}).items() if v is not _DELETED}
+
+    def shares_row(self, other: "StockView") -> bool:
+        """Check whether two views read the same table row"""
+        return self._table is other._table and self._row == other._row
+
+    def copy(self) -> "StockView":
+        """Writable view of the same row - the overlay is copied, the row is not"""
+        return StockView(self._table, self._row, dict(self._overlay) if self._overlay else None)
+
+    def evolve(self, updates: Optional[Dict[str, Any]] = None) -> "StockView":
+        """Writable view with updates applied on top of this one"""
+        view = self.copy()
+        if updates:
+            if view._overlay is None:
+                view._overlay = {}
+            view._overlay.update(updates)
+        return view
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict in the original nested record shape"""
+        return {key: self[key] for key in self}
+
+
+class StockTable:
+    """
+    Columnar storage for a universe of stock records
+    Fields outside the schema are kept per row in read-only extras.
+    """
+
+    __slots__ = ("array", "extras", "_index", "_views", "_keys")
+
+    def __init__(self, array: np.ndarray, extras: Optional[List[Optional[MappingProxyType]]] = None):
+        self.array = array
+        self.extras = extras if extras is not None else [None] * len(array)
+        self._index: Optional[Dict[str, int]] = None
+        self._views: Optional[tuple] = None
+        self._keys: Dict[int, tuple] = {}
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> "StockTable":
+        """Build a table from dict-like stock records"""
+        records = list(records)
+        array = np.empty(len(records), dtype=STOCK_DTYPE)
+        extras: List[Optional[MappingProxyType]] = []
+
+        array["symbol"] = [str(r.get("symbol") or "").upper() for r in records]
+        for name in FLAT_FIELDS:
+            array[name] = [_to_float(r.get(name)) for r in records]
+        for key, group in NESTED_FIELDS.items():
+            nested = [r.get(key) if isinstance(r.get(key), dict) else {} for r in records]
+            for sub_key, column in group:
+                array[column] = [_to_float(n.get(sub_key)) for n in nested]
+
+        for record in records:
+            extra = {k: v for k, v in record.items() if k not in SCHEMA_KEYS}
+            for key, group in NESTED_FIELDS.items():
+                overflow = _nested_overflow(record.get(key), group)
+                if overflow is not None:
+                    extra[key] = overflow
+            extras.append(MappingProxyType(extra) if extra else None)
+
+        return cls(array, extras)
+
+    def __len__(self) -> int:
+        return len(self.array)
+
+    def __getitem__(self, row: int) -> StockView:
+        return self.views()[row]
+
+    def __iter__(self) -> Iterator[StockView]:
+        return iter(self.views())
+
+    def views(self) -> tuple:
+        """Read-only row views, created once per table"""
+        if self._views is None:
+            self._views = tuple(StockView(self, row, frozen=True) for row in range(len(self.array)))
+        return self._views
+
+    def row_keys(self, row: int) -> tuple:
+        """Keys present in a row's base data (cached)"""
+        keys = self._keys.get(row)
+        if keys is None:
+            keys = StockView(self, row)._base_keys()
+            self._keys[row] = keys
+        return keys
+
+    def column(self, name: str) -> np.ndarray:
+        """Zero-copy column view"""
+        return self.array[name]
+
+    @property
+    def symbols(self) -> List[str]:
+        return self.array["symbol"].tolist()
+
+    def index_of(self, symbol: str) -> Optional[int]:
+        """Row for a symbol, or None"""
+        if self._index is None:
+            self._index = {s: i for i, s in enumerate(self.array["symbol"].tolist())}
+        return self._index.get(symbol.upper())
+
+    def get(self, symbol: str) -> Optional[StockView]:
+        """View for a symbol, or None"""
+        row = self.index_of(symbol)
+        return self.views()[row] if row is not None else None
+
+    def take(self, rows: Any) -> "StockTable":
+        """New table with the selected rows (index array or boolean mask)"""
+        rows = np.flatnonzero(rows) if getattr(rows, "dtype", None) == bool else np.asarray(rows, dtype=np.int64)
+        return StockTable(self.array[rows], [self.extras[i] for i in rows])
+
+    def to_list(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Plain dicts for API responses"""
+        views = self.views() if limit is None else self.views()[:limit]
+        return [view.to_dict() for view in views]
+
+
+# Convenience functions
+def to_record_dict(stock: Any) -> Dict[str, Any]:
+    """Plain dict for any record (StockView, mapping proxy or dict)"""
+    return stock.to_dict() if isinstance(stock, StockView) else dict(stock)
+
+def overlay_record(stock: Any, updates: Dict[str, Any]) -> Any:
+    """Record with updates applied, without copying StockView rows"""
+    if isinstance(stock, StockView):
+        return stock.evolve(updates)
+    return {**stock, **updates}
+
+def merge_records(base: Any, other: Any) -> Any:
+    """Equivalent of {**base, **other}; views of the same row only merge overlays"""
+    if isinstance(base, StockView) and isinstance(other, StockView) and base.shares_row(other):
+        return base.evolve(other.overlay)
+    return overlay_record(base, dict(other))
+
+
+if __name__ == "__main__":
+    table = StockTable.from_records([
+        {"symbol": "GPRO", "price": 2.15, "volume": 1500000, "ema": {"5": 2.1, "20": 2.05},
+         "rsi": 65.0, "timestamp": "2025-01-01T00:00:00", "data_source": "sample"},
+        {"symbol": "SAVA", "price": 3.45, "volume": 2100000, "up_pct": -5.2}
+    ])
+    view = table.get("GPRO")
+    enhanced = overlay_record(view, {"penny_score": 0.8})
+    print(f"Row bytes: {table.array.itemsize}, rows: {len(table)}")
+    print(f"View: {view.to_dict()}")
+    print(f"Enhanced: {enhanced.to_dict()}")
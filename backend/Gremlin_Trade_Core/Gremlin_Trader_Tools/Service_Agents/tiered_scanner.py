@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+
+# ─────────────────────────────────────────────────────────────
+# © 2025 StatikFintechLLC
+# Tiered Scanner - Cheap prefilter first, expensive analysis on survivors
+# Contact: ascend.gremlin@gmail.com
+# ─────────────────────────────────────────────────────────────
+
+"""
+Tiered Scanner
+Tier 0 drops symbols that fail the cached fundamentals filters, then pulls
+quote-only snapshots for the rest in batches and filters on price, volume
+and change. Tier 1 fetches intraday bars and
+indicators for the survivors. Tier 2 runs strategy analyzers on the tier 1
+records. Each tier has its own concurrency budget.
+"""
+
+# Import ALL dependencies through globals.py (required)
+import sys
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from Gremlin_Trade_Core.globals import (
+    # Core imports
+    asyncio, time,
+    # Type hints
+    List, Dict, Any, Optional, Callable,
+    # Configuration and utilities
+    CFG, setup_module_logger
+)
+
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.universe_source import load_universe
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.fundamentals_cache import fundamentals_cache
+
+# Initialize logger
+tier_logger = setup_module_logger("market_data", "tiered_scanner")
+
+
+class TieredScanner:
+    """
+    Multi-tier universe scan pipeline
+    Providers plug in a batch quote function (tier 0) and a per-symbol
+    detail function (tier 1); strategies plug in analyzers (tier 2).
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        scanner_config = CFG.get("agents", {}).get("scanner", {})
+        self.config = config if config is not None else scanner_config.get("tiers", {})
+        self.quote_batch_size = self.config.get("quote_batch_size", 100)
+        self.tier_config = {
+            tier: self.config.get(tier, {}) for tier in ("tier0", "tier1", "tier2")
+        }
+        self.max_float_million = self.tier_config["tier0"].get(
+            "max_float_million", scanner_config.get("criteria", {}).get("float_range", {}).get("max_million")
+        )
+        self.last_scan: Dict[str, Any] = {}
+
+    def _concurrency(self, tier: str) -> int:
+        return max(1, self.tier_config[tier].get("concurrency", 4))
+
+    async def run_tier(self, tier: str, items: List[Any], fn: Callable) -> List[Any]:
+        """Apply an async function to items under the tier's concurrency budget"""
+        semaphore = asyncio.Semaphore(self._concurrency(tier))
+
+        async def bounded(item):
+            async with semaphore:
+                return await fn(item)
+
+        results = await asyncio.gather(*[bounded(item) for item in items], return_exceptions=True)
+        output = []
+        for result in results:
+            if isinstance(result, Exception):
+                tier_logger.warning(f"{tier} item failed: {result}")
+            elif result:
+                output.append(result)
+        return output
+
+    def passes_prefilter(self, quote: Dict[str, Any]) -> bool:
+        """Tier 0 filter on quote-only fields"""
+        criteria = self.tier_config["tier0"]
+        price = quote.get("price") or 0
+        if not (criteria.get("min_price", 0.10) <= price < criteria.get("max_price", 10.0)):
+            return False
+        if (quote.get("volume") or 0) < criteria.get("min_volume", 0):
+            return False
+        if abs(quote.get("up_pct") or 0) < criteria.get("min_abs_change_pct", 0.0):
+            return False
+        return True
+
+    async def prefilter(self, symbols: List[str], quote_fn: Callable,
+                        stats: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        Tier 0 - batched quote snapshots, filtered and ranked by move size
+        The number of quotes returned (before filtering) goes in stats["quoted"].
+        """
+        batches = [symbols[i:i + self.quote_batch_size] for i in range(0, len(symbols), self.quote_batch_size)]
+        quote_batches = await self.run_tier("tier0", batches, quote_fn)
+        quotes = [quote for batch in quote_batches for quote in batch]
+        if stats is not None:
+            stats["quoted"] = len(quotes)
+        survivors = [quote for quote in quotes if self.passes_prefilter(quote)]
+        survivors.sort(key=lambda q: abs(q.get("up_pct") or 0), reverse=True)
+        max_symbols = self.tier_config["tier1"].get("max_symbols")
+        return survivors[:max_symbols] if max_symbols else survivors
+
+    async def scan(self, quote_fn: Optional[Callable], detail_fn: Callable, limit: int = 50,
+                   symbols: Optional[List[str]] = None, analyzer: Optional[Callable] = None) -> List[Dict[str, Any]]:
+        """
+        Run the scan pipeline over the universe
+        Without quote data (no quote function, or it returned nothing) tier 1
+        runs directly on the first `limit` symbols.
+        """
+        stats = {"universe": 0, "fundamentals": 0, "quoted": 0, "tier0": 0, "tier1": 0, "tier2": 0, "seconds": {}}
+        try:
+            universe = symbols or load_universe()
+            stats["universe"] = len(universe)
+
+            started = time.perf_counter()
+            # Cached fundamentals cost nothing to check - apply before any quote request
+            if self.tier_config["tier0"].get("use_fundamentals", True):
+                universe = fundamentals_cache.filter_symbols(universe, max_float_million=self.max_float_million)
+            stats["fundamentals"] = len(universe)
+            survivors = await self.prefilter(universe, quote_fn, stats) if quote_fn else []
+            stats["seconds"]["tier0"] = round(time.perf_counter() - started, 3)
+            stats["tier0"] = len(survivors)
+            # Only the strongest movers up to the result limit get tier 1 fetches; when
+            # quotes came back and nothing passed, tier 1 has nothing to do
+            if stats["quoted"]:
+                tier1_symbols = [q["symbol"] for q in survivors[:limit]]
+            else:
+                tier1_symbols = universe[:limit]
+
+            started = time.perf_counter()
+            records = await self.run_tier("tier1", tier1_symbols, detail_fn)
+            stats["seconds"]["tier1"] = round(time.perf_counter() - started, 3)
+            stats["tier1"] = len(records)
+
+            if analyzer is not None:
+                started = time.perf_counter()
+                records = await self.run_tier("tier2", records, analyzer)
+                stats["seconds"]["tier2"] = round(time.perf_counter() - started, 3)
+                stats["tier2"] = len(records)
+
+            tier_logger.info(
+                f"Tiered scan: {stats['universe']} -> {stats['fundamentals']} (fundamentals) -> "
+                f"{stats['quoted']} quoted -> {stats['tier0']} (tier0) -> "
+                f"{stats['tier1']} (tier1) -> {stats['tier2']} (tier2)"
+            )
+            return records
+
+        except Exception as e:
+            tier_logger.error(f"Error in tiered scan: {e}")
+            return []
+
+        finally:
+            self.last_scan = stats
+
+    def get_status(self) -> Dict[str, Any]:
+        """Tier budgets and the last scan funnel"""
+        return {
+            "quote_batch_size": self.quote_batch_size,
+            "concurrency": {tier: self._concurrency(tier) for tier in self.tier_config},
+            "last_scan": self.last_scan
+        }
+
+
+# Global instance
+tiered_scanner = TieredScanner()
+
+# Convenience functions
+async def run_tiered_scan(quote_fn: Optional[Callable], detail_fn: Callable, limit: int = 50,
+                          analyzer: Optional[Callable] = None) -> List[Dict[str, Any]]:
+    """Run the tiered scan with the shared scanner"""
+    return await tiered_scanner.scan(quote_fn, detail_fn, limit, analyzer=analyzer)
+
+async def analyze_candidates(candidates: List[Dict[str, Any]], analyzer: Callable) -> List[Dict[str, Any]]:
+    """Run a strategy analyzer over candidates with the tier 2 budget"""
+    return await tiered_scanner.run_tier("tier2", candidates, analyzer)
+
+
+if __name__ == "__main__":
+    async def test_tiered_scan():
+        async def quotes(batch):
+            return [{"symbol": s, "price": 1.0 + i % 12, "volume": 1000000, "up_pct": i % 7}
+                    for i, s in enumerate(batch)]
+
+        async def details(symbol):
+            return {"symbol": symbol, "price": 2.0}
+
+        results = await run_tiered_scan(quotes, details, limit=20)
+        print(f"Results: {len(results)}")
+        print(f"Status: {tiered_scanner.get_status()}")
+
+    asyncio.run(test_tiered_scan())
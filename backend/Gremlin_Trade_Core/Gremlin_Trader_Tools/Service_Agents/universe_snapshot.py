@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+
+# ─────────────────────────────────────────────────────────────
+# © 2025 StatikFintechLLC
+# Universe Snapshot Provider - Shared, versioned scan universe
+# Contact: ascend.gremlin@gmail.com
+# ─────────────────────────────────────────────────────────────
+
+"""
+Universe Snapshot Provider
+Owns a periodically refreshed, immutable snapshot of the penny stock universe.
+Async callers await get_snapshot(); sync callers read the latest snapshot
+without ever creating an event loop of their own.
+Each refresh also completes resampled bars whose closing minute never came.
+"""
+
+# Import ALL dependencies through globals.py (required)
+import sys
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from Gremlin_Trade_Core.globals import (
+    # Core imports
+    os, asyncio, datetime, timezone, time, dataclass, field,
+    # Type hints
+    List, Dict, Any, Optional, Callable,
+    # Configuration and utilities
+    CFG, setup_module_logger
+)
+
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.market_data_bus import market_data_bus
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.stock_table import StockTable, StockView
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.fundamentals_cache import fundamentals_cache
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.bar_resampler import bar_resampler
+
+# Initialize logger
+snapshot_logger = setup_module_logger("market_data", "universe_snapshot")
+
+
+@dataclass(frozen=True)
+class UniverseSnapshot:
+    """Immutable view of the scan universe at a single point in time"""
+    version: int
+    created_at: datetime
+    table: StockTable = field(default_factory=lambda: StockTable.from_records([]))
+    source: str = "unknown"
+    fetch_seconds: float = 0.0
+
+    @property
+    def stocks(self) -> tuple:
+        """Read-only, dict-compatible record views over the table"""
+        return self.table.views()
+
+    @property
+    def age_seconds(self) -> float:
+        """Seconds since the snapshot was taken"""
+        return (datetime.now(timezone.utc) - self.created_at).total_seconds()
+
+    @property
+    def symbols(self) -> List[str]:
+        """Symbols contained in the snapshot"""
+        return self.table.symbols
+
+    def get(self, symbol: str) -> Optional[StockView]:
+        """Look up a single symbol in the snapshot"""
+        return self.table.get(symbol)
+
+    def to_list(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return plain dicts for API responses"""
+        return self.table.to_list(limit)
+
+
+class UniverseSnapshotProvider:
+    """
+    Async-native provider for the shared universe snapshot
+    A single background task refreshes the universe; every scanner in a
+    cycle reads the same snapshot instead of fetching its own copy.
+    """
+
+    def __init__(self, source: Optional[Callable] = None, refresh_interval: Optional[float] = None,
+                 limit: Optional[int] = None):
+        scanner_config = CFG.get("agents", {}).get("scanner", {})
+        self.source = source
+        self.source_name = getattr(source, "__qualname__", "default") if source else "default"
+        self.refresh_interval = refresh_interval or scanner_config.get("snapshot_refresh_seconds", 60)
+        self.limit = limit or scanner_config.get("max_results", 50)
+        self.running = False
+        self._snapshot: Optional[UniverseSnapshot] = None
+        self._version = 0
+        self._refresh_lock: Optional[asyncio.Lock] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._pending_refresh: Optional[asyncio.Task] = None
+        self.refresh_count = 0
+        self.error_count = 0
+
+    def set_source(self, source: Callable, name: Optional[str] = None):
+        """Bind the async callable used to fetch the universe"""
+        self.source = source
+        self.source_name = name or getattr(source, "__qualname__", "custom")
+        snapshot_logger.info(f"Universe source set to {self.source_name}")
+
+    async def start(self):
+        """Start the background refresh loop"""
+        try:
+            if self.running:
+                return
+            self.running = True
+            await self.refresh()
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+            snapshot_logger.info(f"UniverseSnapshotProvider started (interval {self.refresh_interval}s)")
+        except Exception as e:
+            snapshot_logger.error(f"Error starting snapshot provider: {e}")
+
+    async def stop(self):
+        """Stop the background refresh loop"""
+        try:
+            self.running = False
+            if self._refresh_task:
+                self._refresh_task.cancel()
+                try:
+                    await self._refresh_task
+                except asyncio.CancelledError:
+                    pass
+                self._refresh_task = None
+            snapshot_logger.info("UniverseSnapshotProvider stopped")
+        except Exception as e:
+            snapshot_logger.error(f"Error stopping snapshot provider: {e}")
+
+    async def _refresh_loop(self):
+        """Refresh the snapshot on a fixed interval"""
+        while self.running:
+            try:
+                await asyncio.sleep(self.refresh_interval)
+                await self.refresh()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                snapshot_logger.error(f"Error in snapshot refresh loop: {e}")
+
+    def _resolve_source(self) -> Optional[Callable]:
+        """Resolve the default universe source lazily to avoid circular imports"""
+        if self.source is None:
+            try:
+                if os.getenv("GREMLIN_MARKET_PROVIDER", "simple") == "replay":
+                    from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.replay_market_service import get_live_penny_stocks_replay
+                    self.source = get_live_penny_stocks_replay
+                    self.source_name = "replay_market_service"
+                else:
+                    from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.simple_market_service import simple_market_service
+                    self.source = simple_market_service.get_live_penny_stocks
+                    self.source_name = "simple_market_service"
+            except Exception as e:
+                snapshot_logger.error(f"No universe source available: {e}")
+        return self.source
+
+    async def refresh(self) -> Optional[UniverseSnapshot]:
+        """Fetch a new universe and publish it as the current snapshot"""
+        if self._refresh_lock is None:
+            self._refresh_lock = asyncio.Lock()
+
+        version_before = self._version
+        async with self._refresh_lock:
+            # Another caller refreshed while we waited - reuse its result
+            if self._version != version_before and self._snapshot is not None:
+                return self._snapshot
+
+            try:
+                source = self._resolve_source()
+                if source is None:
+                    return self._snapshot
+
+                started = time.perf_counter()
+                stocks = await source(self.limit)
+                fetch_seconds = time.perf_counter() - started
+                
+                # Close the bars whose final minute this fetch did not bring
+                self._flush_bars()
+
+                if not stocks:
+                    snapshot_logger.warning("Universe source returned no data - keeping previous snapshot")
+                    return self._snapshot
+
+                self._version += 1
+                self._snapshot = UniverseSnapshot(
+                    version=self._version,
+                    created_at=datetime.now(timezone.utc),
+                    table=StockTable.from_records(fundamentals_cache.enrich(stocks)),
+                    source=self.source_name,
+                    fetch_seconds=fetch_seconds
+                )
+                self.refresh_count += 1
+                
+                # Fan the new snapshot out to bus subscribers
+                market_data_bus.publish_snapshot(self._snapshot, self.source_name)
+                snapshot_logger.info(
+                    f"Universe snapshot v{self._version}: {len(stocks)} symbols in {fetch_seconds:.2f}s"
+                )
+                return self._snapshot
+
+            except Exception as e:
+                self.error_count += 1
+                snapshot_logger.error(f"Error refreshing universe snapshot: {e}")
+                return self._snapshot
+
+    def _flush_bars(self):
+        """Complete resampled buckets that ended without their closing minute"""
+        try:
+            flushed = bar_resampler.flush()
+            if flushed:
+                snapshot_logger.debug(f"Completed {flushed} partial bars")
+        except Exception as e:
+            snapshot_logger.error(f"Error flushing partial bars: {e}")
+
+    async def get_snapshot(self, max_age: Optional[float] = None) -> Optional[UniverseSnapshot]:
+        """Get the current snapshot, refreshing first if missing or stale"""
+        try:
+            snapshot = self._snapshot
+            if snapshot is None or (max_age is not None and snapshot.age_seconds > max_age):
+                snapshot = await self.refresh()
+            return snapshot
+        except Exception as e:
+            snapshot_logger.error(f"Error getting universe snapshot: {e}")
+            return self._snapshot
+
+    def get_snapshot_nowait(self) -> Optional[UniverseSnapshot]:
+        """Get the latest snapshot from sync code - never blocks or creates a loop"""
+        if self._snapshot is None:
+            self.request_refresh()
+        return self._snapshot
+
+    def request_refresh(self):
+        """Schedule a refresh on the running loop, if there is one"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._pending_refresh is None or self._pending_refresh.done():
+            self._pending_refresh = loop.create_task(self.refresh())
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get provider status"""
+        snapshot = self._snapshot
+        return {
+            "running": self.running,
+            "source": self.source_name,
+            "refresh_interval": self.refresh_interval,
+            "version": snapshot.version if snapshot else 0,
+            "symbols": len(snapshot.stocks) if snapshot else 0,
+            "age_seconds": round(snapshot.age_seconds, 1) if snapshot else None,
+            "refresh_count": self.refresh_count,
+            "error_count": self.error_count
+        }
+
+
+# Global instance
+universe_provider = UniverseSnapshotProvider()
+
+# Convenience functions
+async def get_universe_snapshot(max_age: Optional[float] = None) -> Optional[UniverseSnapshot]:
+    """Get the shared universe snapshot"""
+    return await universe_provider.get_snapshot(max_age)
+
+def get_universe_snapshot_nowait() -> Optional[UniverseSnapshot]:
+    """Get the latest universe snapshot without awaiting"""
+    return universe_provider.get_snapshot_nowait()
+
+
+if __name__ == "__main__":
+    async def test_snapshot_provider():
+        snapshot = await get_universe_snapshot()
+        if snapshot:
+            print(f"Snapshot v{snapshot.version}: {len(snapshot.stocks)} symbols from {snapshot.source}")
+            print(f"Status: {universe_provider.get_status()}")
+        else:
+            print("No snapshot available")
+
+    asyncio.run(test_snapshot_provider())
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+
+# ─────────────────────────────────────────────────────────────
+# © 2025 StatikFintechLLC
+# Universe Source - Configurable list of symbols to scan
+# Contact: ascend.gremlin@gmail.com
+# ─────────────────────────────────────────────────────────────
+
+"""
+Universe Source
+Loads the scan universe from a file (.txt, .csv or .json) or an SQLite query,
+as configured under agents.scanner.universe. The built-in list is used when
+nothing is configured or the configured source cannot be read.
+"""
+
+# Import ALL dependencies through globals.py (required)
+import sys
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from Gremlin_Trade_Core.globals import (
+    # Core imports
+    json, sqlite3, closing, pd,
+    # Type hints
+    List, Dict, Any, Optional,
+    # Configuration and utilities
+    CFG, BASE_DIR, setup_module_logger
+)
+
+# Initialize logger
+universe_logger = setup_module_logger("market_data", "universe_source")
+
+# Built-in universe used when no source is configured
+DEFAULT_UNIVERSE = [
+    "GPRO", "SAVA", "BBIG", "PROG", "ATER", "MULN", "XELA", "IXHL",
+    "BOXL", "GNUS", "INPX", "JAGX", "NAKD", "NVCN", "OBSV", "OZSC",
+    "PASO", "PFLC", "RGBP", "RKDA", "RWLK", "SNPW", "SOLO", "TSNP",
+    "UONE", "VXRT", "WDLF", "XSPA", "YCBD", "ZSAN", "ADXS", "AGTC",
+    "AHPI", "ALPP", "AMPE", "ASRT", "AVGR", "AYTU", "BBRW", "BCDA",
+    "BDGR", "BFCH", "BIOL", "BLSP", "BMIC", "BNGO", "BOXD", "BPTS"
+]
+
+
+class UniverseSource:
+    """Symbol universe loader with mtime-based caching for file sources"""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        self.config = config if config is not None else CFG.get("agents", {}).get("scanner", {}).get("universe", {})
+        self.source = self.config.get("source", "default")
+        self._cache: Optional[List[str]] = None
+        self._cache_key: Optional[tuple] = None
+
+    def _resolve_path(self, value: Optional[str]) -> Optional[Path]:
+        """Resolve a configured path relative to the project base directory"""
+        if not value:
+            return None
+        path = Path(value)
+        return path if path.is_absolute() else BASE_DIR / path
+
+    def _load_file(self, path: Path) -> List[str]:
+        """Read symbols from a text, CSV or JSON file"""
+        if path.suffix == ".json":
+            data = json.loads(path.read_text())
+            if isinstance(data, dict):
+                data = data.get("symbols", [])
+            return [str(s) for s in data]
+
+        if path.suffix == ".csv":
+            frame = pd.read_csv(path)
+            columns = {str(c).strip().lower(): c for c in frame.columns}
+            column = columns.get("symbol") or columns.get("ticker") or frame.columns[0]
+            return frame[column].dropna().astype(str).tolist()
+
+        symbols = []
+        for line in path.read_text().splitlines():
+            line = line.split("#", 1)[0].strip()
+            if line:
+                symbols.extend(part.strip() for part in line.split(",") if part.strip())
+        return symbols
+
+    def _load_db(self, path: Path, query: str) -> List[str]:
+        """Read symbols from the first column of an SQLite query"""
+        # sqlite3's own context manager only commits; closing() releases the handle
+        with closing(sqlite3.connect(path)) as conn:
+            return [str(row[0]) for row in conn.execute(query) if row and row[0]]
+
+    def load(self) -> List[str]:
+        """Load the universe - unique, upper-cased, in source order"""
+        try:
+            if self.source == "file":
+                path = self._resolve_path(self.config.get("path"))
+                if path is None or not path.exists():
+                    raise FileNotFoundError(f"universe file not found: {path}")
+                cache_key = ("file", str(path), path.stat().st_mtime)
+                if cache_key == self._cache_key and self._cache is not None:
+                    return list(self._cache)
+                symbols = self._load_file(path)
+
+            elif self.source == "db":
+                path = self._resolve_path(self.config.get("db_path"))
+                if path is None or not path.exists():
+                    raise FileNotFoundError(f"universe database not found: {path}")
+                cache_key = None
+                symbols = self._load_db(path, self.config.get("query", "SELECT symbol FROM universe"))
+
+            else:
+                return list(DEFAULT_UNIVERSE)
+
+            symbols = list(dict.fromkeys(s.strip().upper() for s in symbols if s and s.strip()))
+            if not symbols:
+                raise ValueError(f"{self.source} universe source is empty")
+
+            self._cache, self._cache_key = symbols, cache_key
+            universe_logger.info(f"Loaded {len(symbols)} symbols from {self.source} universe source")
+            return list(symbols)
+
+        except Exception as e:
+            universe_logger.error(f"Error loading universe ({self.source}): {e} - using built-in list")
+            return list(DEFAULT_UNIVERSE)
+
+
+# Global instance
+universe_source = UniverseSource()
+
+# Convenience functions
+def load_universe() -> List[str]:
+    """Load the configured scan universe"""
+    return universe_source.load()
+
+
+if __name__ == "__main__":
+    symbols = load_universe()
+    print(f"Universe ({universe_source.source}): {len(symbols)} symbols - {symbols[:10]}")
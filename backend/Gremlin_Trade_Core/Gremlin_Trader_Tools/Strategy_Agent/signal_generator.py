@@ -26,6 +26,9 @@ from Gremlin_Trade_Core.globals import (
     setup_module_logger,
     CFG, MEM, recursive_scan
 )
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.stock_table import overlay_record
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.universe_snapshot import get_universe_snapshot_nowait
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.incremental_state import get_incremental_state
 
 # Initialize module-specific logger
 logger = setup_module_logger("trading_core", "signal_generator")
@@ -46,38 +49,64 @@ def generate_signals(limit=50, embed=True):
         # Get strategy configuration
         strategy_config = CFG.get("strategy", {})
         scanner_config = CFG.get("agents", {}).get("scanner", {})
+        incremental = get_incremental_state("signal_generator")
         
         # Use recursive scanning if enabled
         if strategy_config.get("recursive_scanning", {}).get("enabled", True):
             symbols = ["GPRO", "IXHL", "SAVA", "BBIG", "PROG", "ATER"]  # Example symbols
             timeframes = scanner_config.get("timeframes", ["1min", "5min", "15min"])
             
+            # Rescan only symbols whose snapshot inputs moved; without a snapshot all are dirty
+            snapshot = get_universe_snapshot_nowait()
+            incremental.begin_cycle(("recursive", timeframes))
+            dirty_symbols, reused = incremental.partition(
+                symbols, key=lambda symbol: symbol, record=lambda symbol: snapshot.get(symbol) if snapshot else None
+            )
+            
             # Run recursive scan
-            raw_signals = recursive_scan(symbols, timeframes)
+            raw_signals = recursive_scan(dirty_symbols, timeframes) if dirty_symbols else []
             
-            # Process recursive signals
+            # Process every recursive signal - the cache is shared by callers with
+            # different limits, so the limit only applies to what is returned
             signals = []
+            processed_by_symbol = {symbol: [] for symbol in dirty_symbols}
             for signal in raw_signals:
                 processed_signal = process_recursive_signal(signal)
                 if processed_signal:
                     signals.append(processed_signal)
+                    processed_by_symbol.setdefault(processed_signal["symbol"], []).append(processed_signal)
                     
                     if embed:
                         store_signal_embedding(processed_signal)
-                    
-                    if len(signals) >= limit:
-                        break
+            
+            for symbol in dirty_symbols:
+                incremental.store(symbol, snapshot.get(symbol) if snapshot else None, processed_by_symbol[symbol])
+            # Reused signals were embedded when they were first generated
+            signals.extend(dict(signal) for cached in reused.values() for signal in cached)
+            signals = signals[:limit]
         else:
             # Use traditional scanning
             stocks = get_live_penny_stocks()
             signals = []
             n = 0
+            incremental.begin_cycle(("rules", strategy_config.get("scanner_criteria")))
 
             for stock in stocks:
-                signal = apply_signal_rules(stock)
+                dirty, signal = incremental.check(stock.get("symbol", ""), stock)
+                if dirty:
+                    signal = apply_signal_rules(stock)
+                    incremental.store(stock.get("symbol", ""), stock, signal)
+                elif signal:
+                    # Unchanged since it was signalled and embedded last cycle
+                    signals.append(overlay_record(stock, signal))
+                    n += 1
+                    if n >= limit:
+                        break
+                    continue
+                
                 if signal:
                     n += 1
-                    result = {**stock, **signal}
+                    result = overlay_record(stock, signal)
                     signals.append(result)
 
                     summary = (
@@ -110,7 +139,11 @@ def generate_signals(limit=50, embed=True):
                     if n >= limit:
                         break
 
-        logger.info(f"[SIGNAL_GENERATOR] Generated {len(signals)} signals.")
+        cycle = incremental.end_cycle()
+        logger.info(
+            f"[SIGNAL_GENERATOR] Generated {len(signals)} signals "
+            f"(dirty {cycle['dirty']}/{cycle['checked']} symbols)."
+        )
         return signals
 
     except Exception as e:
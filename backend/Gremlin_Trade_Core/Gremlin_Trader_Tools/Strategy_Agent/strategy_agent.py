@@ -11,9 +11,9 @@ sys.path.append(str(Path(__file__).parent.parent.parent.parent))
 
 from Gremlin_Trade_Core.globals import (
     # Core imports
-    logging, datetime, asyncio, json, os, sys, Path, time, timedelta, timezone, np,
+    logging, datetime, asyncio, json, os, sys, Path, time, timedelta, timezone,
     # Type imports
-    Dict, List, Any, Optional, Tuple,
+    Dict, List, Any, Optional,
     # Additional imports
     dataclass, Enum,
     # Configuration and utilities
@@ -26,6 +26,12 @@ logger = setup_agent_logging(Path(__file__).stem)
 # Import base memory agent and services
 from Gremlin_Trade_Core.Gremlin_Trader_Tools.Memory_Agent.base_memory_agent import BaseMemoryAgent
 from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.market_data_service import MarketDataService
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.market_regime_service import market_regime_service
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.feature_store import bar_features
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.market_state_index import similar_setups
+
+# Timeframe of the daily history the strategies read (feature store key)
+HISTORY_TIMEFRAME = "1d"
 
 class StrategyType(Enum):
     MOMENTUM = "momentum"
@@ -60,7 +66,7 @@ class TradingSignal:
     risk_level: RiskLevel
     position_size: float
     reasoning: str
-    indicators: Dict[str, float]
+    indicators: Dict[str, Any]
     timestamp: datetime
     expected_duration: timedelta
 
@@ -88,6 +94,7 @@ class StrategyAgent(BaseMemoryAgent):
         
         # Market data service
         self.market_service = MarketDataService()
+        self._last_regime_version: Optional[int] = None
         
         # Strategy configurations
         self.strategies = {
@@ -198,52 +205,20 @@ class StrategyAgent(BaseMemoryAgent):
     async def analyze_market_conditions(self) -> Dict[str, Any]:
         """Analyze current market conditions for strategy selection"""
         try:
-            # Get market data for major indices
-            spy_data = await self.market_service.get_historical_data("SPY", days=30)
-            vix_data = await self.market_service.get_current_price("VIX")
+            # Shared, timer-refreshed regime - no per-call index fetches
+            market_conditions = await market_regime_service.get_conditions()
             
-            if not spy_data:
+            if not market_conditions:
                 return {"error": "Unable to get market data"}
             
-            # Calculate market metrics
-            prices = [float(d['close']) for d in spy_data]
-            volumes = [float(d['volume']) for d in spy_data]
-            
-            current_price = prices[-1]
-            prev_price = prices[-2] if len(prices) > 1 else current_price
-            price_change = (current_price - prev_price) / prev_price
-            
-            # Calculate volatility (20-day)
-            if len(prices) >= 20:
-                returns = [(prices[i] - prices[i-1]) / prices[i-1] for i in range(1, len(prices))]
-                volatility = np.std(returns[-20:]) * np.sqrt(252)  # Annualized
-            else:
-                volatility = 0.2  # Default
-            
-            # Average volume
-            avg_volume = np.mean(volumes[-10:]) if len(volumes) >= 10 else volumes[-1]
-            
-            # Market trend
-            sma_20 = np.mean(prices[-20:]) if len(prices) >= 20 else current_price
-            sma_50 = np.mean(prices[-50:]) if len(prices) >= 50 else current_price
-            
-            trend = "bullish" if sma_20 > sma_50 else "bearish"
-            
-            market_conditions = {
-                'price_change': price_change,
-                'volatility': volatility,
-                'trend': trend,
-                'volume': avg_volume,
-                'vix': vix_data.get('price', 20) if vix_data else 20,
-                'market_regime': self._determine_market_regime(volatility, price_change, trend)
-            }
-            
-            # Store market analysis in memory
-            self.store_memory(
-                content=f"Market analysis: {trend} trend with {volatility:.2%} volatility, VIX {market_conditions['vix']:.1f}",
-                memory_type="market_analysis",
-                metadata=market_conditions
-            )
+            # Store market analysis in memory once per regime refresh
+            if market_conditions.get('version') != self._last_regime_version:
+                self._last_regime_version = market_conditions.get('version')
+                self.store_memory(
+                    content=f"Market analysis: {market_conditions['trend']} trend with {market_conditions['volatility']:.2%} volatility, VIX {market_conditions['vix']:.1f}",
+                    memory_type="market_analysis",
+                    metadata={k: v for k, v in market_conditions.items() if k != 'freshness'}
+                )
             
             return market_conditions
             
@@ -251,22 +226,12 @@ class StrategyAgent(BaseMemoryAgent):
             self.logger.error(f"Error analyzing market conditions: {e}")
             return {}
     
-    def _determine_market_regime(self, volatility: float, price_change: float, trend: str) -> str:
-        """Determine current market regime"""
-        if volatility > 0.25:
-            return "high_volatility"
-        elif volatility < 0.15:
-            if abs(price_change) < 0.005:
-                return "low_volatility_consolidation"
-            else:
-                return "trending"
-        else:
-            return "normal"
-    
-    async def generate_signals(self, symbols: List[str]) -> List[TradingSignal]:
-        """Generate trading signals for given symbols"""
+    async def generate_signals(self, symbols: List[str],
+                               market_conditions: Optional[Dict[str, Any]] = None) -> List[TradingSignal]:
+        """Generate trading signals for given symbols (reusing the caller's market conditions if given)"""
         signals = []
-        market_conditions = await self.analyze_market_conditions()
+        if market_conditions is None:
+            market_conditions = await self.analyze_market_conditions()
         
         for symbol in symbols:
             try:
@@ -274,6 +239,7 @@ class StrategyAgent(BaseMemoryAgent):
                 price_data = await self.market_service.get_historical_data(symbol, days=50)
                 if not price_data or len(price_data) < 20:
                     continue
+                setups = None
                 
                 # Try each enabled strategy
                 for strategy_type, config in self.strategies.items():
@@ -288,6 +254,11 @@ class StrategyAgent(BaseMemoryAgent):
                         # Adjust signal based on strategy performance
                         signal = self._adjust_signal_for_performance(signal)
                         
+                        # Outcomes after the most similar daily setups (once per symbol)
+                        if setups is None:
+                            setups = self.similar_setups(symbol, price_data)
+                        signal.indicators['similar_setups'] = setups
+                        
                         # Get similar past experiences
                         situation = f"strategy:{strategy_type.value} symbol:{symbol} confidence:{signal.confidence:.2f}"
                         similar_experiences = self.get_similar_experiences(situation, limit=5)
@@ -344,22 +315,13 @@ class StrategyAgent(BaseMemoryAgent):
         try:
             params = self.strategies[StrategyType.MOMENTUM]['parameters']
             
-            # Calculate indicators
-            prices = [float(d['close']) for d in price_data]
-            volumes = [float(d['volume']) for d in price_data]
-            
-            current_price = prices[-1]
-            
-            # RSI calculation
-            rsi = self._calculate_rsi(prices, 14)
-            
-            # Volume analysis
-            avg_volume = np.mean(volumes[-20:])
-            current_volume = volumes[-1]
-            volume_ratio = current_volume / avg_volume
-            
-            # Price momentum
-            price_momentum = (current_price - prices[-10]) / prices[-10] if len(prices) >= 10 else 0
+            # Indicators from the shared feature store (RSI, 20-bar volume ratio, 10-bar momentum, ATR)
+            features = bar_features(symbol, HISTORY_TIMEFRAME, price_data,
+                                    ('rsi_14', 'volume_ratio_20', 'momentum_10', 'atr_14'))
+            current_price = float(price_data[-1]['close'])
+            rsi = features['rsi_14']
+            volume_ratio = features['volume_ratio_20']
+            price_momentum = features['momentum_10']
             
             # Signal conditions
             momentum_signal = (
@@ -386,7 +348,7 @@ class StrategyAgent(BaseMemoryAgent):
             confidence = max(0.1, min(0.95, confidence))
             
             # Calculate stops and targets
-            atr = self._calculate_atr(price_data)
+            atr = features['atr_14']
             stop_loss = current_price - (atr * 2)
             take_profit = current_price + (atr * 3)
             
@@ -416,13 +378,13 @@ class StrategyAgent(BaseMemoryAgent):
         try:
             params = self.strategies[StrategyType.MEAN_REVERSION]['parameters']
             
-            prices = [float(d['close']) for d in price_data]
-            current_price = prices[-1]
+            current_price = float(price_data[-1]['close'])
             
             # Calculate indicators
-            rsi = self._calculate_rsi(prices, 14)
-            bollinger_upper, bollinger_lower = self._calculate_bollinger_bands(prices)
-            sma_20 = np.mean(prices[-20:])
+            features = bar_features(symbol, HISTORY_TIMEFRAME, price_data, ('rsi_14', 'bollinger_20', 'sma_20'))
+            rsi = features['rsi_14']
+            bollinger_upper, bollinger_lower = features['bollinger_20']
+            sma_20 = features['sma_20']
             
             # Mean reversion signals
             oversold_signal = (
@@ -486,13 +448,10 @@ class StrategyAgent(BaseMemoryAgent):
         try:
             params = self.strategies[StrategyType.BREAKOUT]['parameters']
             
-            prices = [float(d['close']) for d in price_data]
-            volumes = [float(d['volume']) for d in price_data]
             highs = [float(d['high']) for d in price_data]
             lows = [float(d['low']) for d in price_data]
             
-            current_price = prices[-1]
-            current_volume = volumes[-1]
+            current_price = float(price_data[-1]['close'])
             
             # Calculate resistance and support levels
             lookback = params['consolidation_period']
@@ -500,8 +459,7 @@ class StrategyAgent(BaseMemoryAgent):
             support = min(lows[-lookback:])
             
             # Volume confirmation
-            avg_volume = np.mean(volumes[-20:])
-            volume_ratio = current_volume / avg_volume
+            volume_ratio = bar_features(symbol, HISTORY_TIMEFRAME, price_data, ('volume_ratio_20',))['volume_ratio_20']
             
             # Breakout conditions
             upward_breakout = (
@@ -568,11 +526,10 @@ class StrategyAgent(BaseMemoryAgent):
             if market_conditions.get('volatility', 0) < 0.2:
                 return None
             
-            prices = [float(d['close']) for d in price_data]
-            current_price = prices[-1]
+            current_price = float(price_data[-1]['close'])
             
             # Quick momentum check
-            short_momentum = (prices[-1] - prices[-3]) / prices[-3] if len(prices) >= 3 else 0
+            short_momentum = bar_features(symbol, HISTORY_TIMEFRAME, price_data, ('momentum_3',))['momentum_3']
             
             if abs(short_momentum) < 0.005:  # Minimum movement for scalping
                 return None
@@ -612,58 +569,13 @@ class StrategyAgent(BaseMemoryAgent):
             self.logger.error(f"Error in scalping strategy: {e}")
             return None
     
-    def _calculate_rsi(self, prices: List[float], period: int = 14) -> float:
-        """Calculate RSI"""
-        if len(prices) < period + 1:
-            return 50.0
-        
-        deltas = np.diff(prices)
-        gains = np.where(deltas > 0, deltas, 0)
-        losses = np.where(deltas < 0, -deltas, 0)
-        
-        avg_gain = np.mean(gains[-period:])
-        avg_loss = np.mean(losses[-period:])
-        
-        if avg_loss == 0:
-            return 100.0
-        
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
-    
-    def _calculate_bollinger_bands(self, prices: List[float], period: int = 20, std_dev: int = 2) -> Tuple[float, float]:
-        """Calculate Bollinger Bands"""
-        if len(prices) < period:
-            sma = np.mean(prices)
-            std = np.std(prices)
-        else:
-            sma = np.mean(prices[-period:])
-            std = np.std(prices[-period:])
-        
-        upper_band = sma + (std * std_dev)
-        lower_band = sma - (std * std_dev)
-        
-        return upper_band, lower_band
-    
-    def _calculate_atr(self, price_data: List[Dict], period: int = 14) -> float:
-        """Calculate Average True Range"""
-        if len(price_data) < period:
-            return 0.02  # Default ATR
-        
-        true_ranges = []
-        for i in range(1, len(price_data)):
-            high = float(price_data[i]['high'])
-            low = float(price_data[i]['low'])
-            prev_close = float(price_data[i-1]['close'])
-            
-            tr = max(
-                high - low,
-                abs(high - prev_close),
-                abs(low - prev_close)
-            )
-            true_ranges.append(tr)
-        
-        return np.mean(true_ranges[-period:]) if true_ranges else 0.02
+    def similar_setups(self, symbol: str, price_data: List[Dict], k: Optional[int] = None) -> Dict[str, Any]:
+        """What happened after the k historical daily setups most similar to this one"""
+        try:
+            return similar_setups(symbol, price_data, HISTORY_TIMEFRAME, k)
+        except Exception as e:
+            self.logger.error(f"Error matching similar setups for {symbol}: {e}")
+            return {'neighbors': 0}
     
     def _determine_signal_strength(self, confidence: float) -> SignalStrength:
         """Determine signal strength based on confidence"""
@@ -860,7 +772,7 @@ class StrategyAgent(BaseMemoryAgent):
                 watchlist = ["AAPL", "MSFT", "TSLA", "NVDA", "SPY", "QQQ", "IWM"]
                 
                 # Generate signals
-                signals = await self.generate_signals(watchlist)
+                signals = await self.generate_signals(watchlist, market_conditions)
                 
                 if signals:
                     self.update_status(f"Generated {len(signals)} signals")
@@ -11,11 +11,11 @@ sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from Gremlin_Trade_Core.globals import (
     # Core imports
-    asyncio, json, logging, datetime, timedelta, timezone,
+    asyncio, json, logging, datetime, timedelta, timezone, time,
     # Type hints and data structures
     Dict, List, Any, Optional, dataclass, Enum,
     # Memory and utilities
-    logger as globals_logger, MEM, embed_text
+    logger as globals_logger, MEM, CFG, embed_text
 )
 
 # Import all agents
@@ -29,23 +29,29 @@ from Gremlin_Trade_Memory.embedder import store_embedding, package_embedding, ge
 from Gremlin_Trade_Core.globals import logger as globals_logger, MEM, embed_text
 
 # Import all available agents
-from Gremlin_Trader_Tools.Memory_Agent.base_memory_agent import BaseMemoryAgent
-from Gremlin_Trader_Tools.Timing_Agent.market_timing import MarketTimingAgent
-from Gremlin_Trader_Tools.Strategy_Agent.strategy_agent import StrategyAgent
-from Gremlin_Trader_Tools.Rule_Set_Agent.rule_set_agent import RuleSetAgent
-from Gremlin_Trader_Tools.Run_Time_Agent.runtime_agent import RuntimeAgent
-from Gremlin_Trader_Tools.Service_Agents.market_data_service import MarketDataService
-from Gremlin_Trader_Tools.Service_Agents.simple_market_service import SimpleMarketService
-from Gremlin_Trader_Tools.Tool_Control_Agent.portfolio_tracker import PortfolioTracker
-from Gremlin_Trader_Tools.Tool_Control_Agent.tool_control_agent import ToolControlAgent
-from Gremlin_Trader_Tools.Strategy_Agent.signal_generator import SignalGenerator
-from Gremlin_Trader_Tools.Rule_Set_Agent.rules_engine import RulesEngine
-from Gremlin_Trader_Tools.Financial_Agent.tax_estimator import TaxEstimator
-from Gremlin_Trader_Tools.Run_Time_Agent.stock_scraper import StockScraper
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Memory_Agent.base_memory_agent import BaseMemoryAgent
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Timing_Agent.market_timing import MarketTimingAgent
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Strategy_Agent.strategy_agent import StrategyAgent
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Rule_Set_Agent.rule_set_agent import RuleSetAgent
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Run_Time_Agent.runtime_agent import RuntimeAgent
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.market_data_service import MarketDataService
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.simple_market_service import SimpleMarketService
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.request_scheduler import request_scheduler
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.correlation_engine import correlation_engine
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.coordination_triggers import CoordinationTriggers
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.shard_coordinator import shard_coordinator
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.universe_snapshot import universe_provider
+from Gremlin_Trade_Core.Gremlin_Trader_Strategies.pattern_memory import record_pattern_outcome
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Tool_Control_Agent.portfolio_tracker import PortfolioTracker
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Tool_Control_Agent.tool_control_agent import ToolControlAgent
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Strategy_Agent.signal_generator import SignalGenerator
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Rule_Set_Agent.rules_engine import RulesEngine
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Financial_Agent.tax_estimator import TaxEstimator
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Run_Time_Agent.stock_scraper import StockScraper
 
 # Import trade agents (optional due to external dependencies)
 try:
-    from Gremlin_Trader_Tools.Trade_Agents.IBKR_API_trader import IBKRTrader
+    from Gremlin_Trade_Core.Gremlin_Trader_Tools.Trade_Agents.IBKR_API_trader import IBKRTrader
     IBKR_AVAILABLE = True
 except ImportError:
     globals_logger.warning("IBKR trader not available - check ib_insync installation")
@@ -53,7 +59,7 @@ except ImportError:
     IBKR_AVAILABLE = False
 
 try:
-    from Gremlin_Trader_Tools.Trade_Agents.Kalshi_API_trader import KalshiTrader
+    from Gremlin_Trade_Core.Gremlin_Trader_Tools.Trade_Agents.Kalshi_API_trader import KalshiTrader
     KALSHI_AVAILABLE = True
 except ImportError:
     globals_logger.warning("Kalshi trader not available - check dependencies")
@@ -118,6 +124,36 @@ class AgentCoordinator(BaseMemoryAgent):
         self.trading_phase = TradingPhase.MARKET_ANALYSIS
         self.consensus_threshold = 0.7
         self.max_position_risk = 0.05  # 5% of portfolio per position
+        correlation_config = CFG.get("agents", {}).get("correlation", {})
+        self.max_position_correlation = correlation_config.get("max_position_correlation", 0.7)
+        self.correlation_size_floor = correlation_config.get("size_floor", 0.25)
+        
+        # Cycle concurrency and per-phase deadlines
+        coordinator_config = CFG.get("agents", {}).get("coordinator", {})
+        self.max_concurrent_symbols = max(1, coordinator_config.get("max_concurrent_symbols", 8))
+        self.phase_timeouts = {
+            "market_analysis": 10.0, "signal_generation": 20.0, "timing": 10.0,
+            "rule_validation": 10.0, "synthesis": 5.0,
+            **coordinator_config.get("phase_timeouts", {})
+        }
+        self.last_cycle: Dict[str, Any] = {}
+        
+        # Priority scheduling - the top symbols always run, the rest only before the deadline
+        self.cycle_deadline_seconds = coordinator_config.get("cycle_deadline_seconds", 45.0)
+        self.always_run = coordinator_config.get("always_run", 3)
+        self.priority_weights = {
+            "exposure": 0.4, "volatility": 0.2, "signal": 0.2, "staleness": 0.2,
+            **coordinator_config.get("priority_weights", {})
+        }
+        self.staleness_seconds = coordinator_config.get("staleness_seconds", 1800)
+        self.last_evaluated: Dict[str, float] = {}
+        self.max_total_exposure = coordinator_config.get("max_total_exposure", 0.5)
+        
+        # Large watchlists run on shard worker processes; a worker's own coordinator
+        # leaves memory storage to the parent and reads the shared universe table
+        self.shards = shard_coordinator
+        self.record_decisions = True
+        self.market_snapshot = None
         
         # Decision tracking
         self.pending_decisions: Dict[str, TradingDecision] = {}
@@ -147,7 +183,15 @@ class AgentCoordinator(BaseMemoryAgent):
         
         # Watchlist management
         self.active_watchlist = ["AAPL", "MSFT", "TSLA", "NVDA", "SPY", "QQQ"]
-        self.symbol_priorities = {}
+        self.symbol_priorities: Dict[str, Dict[str, float]] = {}
+        
+        # Event-driven passes; the full watchlist sweep is only the fallback
+        self.triggers = CoordinationTriggers(
+            handler=self._run_triggered_pass,
+            sweep=self.execute_coordinated_trading,
+            symbols_fn=lambda: self.active_watchlist,
+            positions_fn=lambda: self.executed_decisions
+        )
         
         self.logger.info("Agent Coordinator initialized with enhanced agent orchestration")
     
@@ -341,10 +385,25 @@ class AgentCoordinator(BaseMemoryAgent):
             self.logger.error(f"Critical error during agent initialization: {e}")
             raise
     
+    async def initialize_pipeline(self):
+        """Start only the agents a coordination pass needs (shard workers)"""
+        for name, attribute, agent_class in (("strategy", "strategy_agent", StrategyAgent),
+                                             ("rules", "rule_agent", RuleSetAgent),
+                                             ("timing", "timing_agent", MarketTimingAgent)):
+            try:
+                agent = agent_class()
+                await agent.start()
+                setattr(self, attribute, agent)
+                self.agent_status[name] = {'initialized': True, 'active': True}
+            except Exception as e:
+                self.logger.error(f"✗ Failed to initialize {name} agent in pipeline: {e}")
+                self.agent_status[name] = {'initialized': False, 'error': str(e)}
+    
     async def shutdown_agents(self):
         """Shutdown all trading agents with comprehensive logging"""
         try:
             self.logger.info("Shutting down all trading agents...")
+            self.shards.close()
             
             # Create list of all agents to shutdown
             agents_to_shutdown = [
@@ -414,24 +473,50 @@ class AgentCoordinator(BaseMemoryAgent):
         except Exception as e:
             self.logger.error(f"Error storing shutdown event: {e}")
     
-    async def coordinate_trading_decision(self, symbol: str) -> Optional[TradingDecision]:
-        """Coordinate trading decision for a symbol across all agents"""
+    async def _run_phase(self, phase: str, call, symbol: str = "*", metrics: Optional[Dict] = None):
+        """
+        Await one coordination phase under its deadline; a timeout or error yields None
+        call is a zero-argument callable returning the awaitable, so a failure while
+        building the call (missing agent, bad method) is isolated like any other
+        """
+        timeout = self.phase_timeouts.get(phase, 10.0)
+        try:
+            return await asyncio.wait_for(call(), timeout=timeout)
+        except asyncio.TimeoutError:
+            self.logger.warning(f"{phase} timed out after {timeout}s for {symbol}")
+            if metrics is not None:
+                metrics["timeouts"][phase] = metrics["timeouts"].get(phase, 0) + 1
+        except Exception as e:
+            self.logger.error(f"Error in {phase} for {symbol}: {e}")
+            if metrics is not None:
+                metrics["errors"][phase] = metrics["errors"].get(phase, 0) + 1
+        return None
+    
+    async def coordinate_trading_decision(self, symbol: str, market_conditions: Optional[Dict] = None,
+                                          metrics: Optional[Dict] = None) -> Optional[TradingDecision]:
+        """
+        Coordinate trading decision for a symbol across all agents
+        market_conditions is computed once per cycle by execute_coordinated_trading;
+        it is only fetched here for a standalone call.
+        """
         try:
             self.logger.info(f"Coordinating trading decision for {symbol}")
             
             # Phase 1: Market Analysis
-            self.trading_phase = TradingPhase.MARKET_ANALYSIS
-            market_conditions = await self.strategy_agent.analyze_market_conditions()
-            
-            # Phase 2: Signal Generation
-            self.trading_phase = TradingPhase.SIGNAL_GENERATION
-            strategy_signals = await self.strategy_agent.generate_signals([symbol])
-            
-            # Phase 3: Timing Analysis
-            timing_analysis = await self.timing_agent.analyze_symbol(symbol)
+            if market_conditions is None:
+                market_conditions = await self._run_phase(
+                    "market_analysis", lambda: self.strategy_agent.analyze_market_conditions(), symbol, metrics
+                ) or {}
+            
+            # Phases 2-3: Signal Generation and Timing Analysis are independent
+            strategy_signals, timing_analysis = await asyncio.gather(
+                self._run_phase("signal_generation",
+                                lambda: self.strategy_agent.generate_signals([symbol], market_conditions), symbol, metrics),
+                self._run_phase("timing", lambda: self.timing_agent.analyze_optimal_entry(symbol), symbol, metrics)
+            )
+            strategy_signals = strategy_signals or []
             
             # Phase 4: Rule Validation
-            self.trading_phase = TradingPhase.RULE_VALIDATION
             
             # Prepare market data for rule evaluation
             market_data = {
@@ -442,6 +527,9 @@ class AgentCoordinator(BaseMemoryAgent):
                 'ema_20': 0.0,
                 'volatility': market_conditions.get('volatility', 0.2)
             }
+            stock = self._snapshot_stock(symbol)
+            if stock is not None:
+                market_data.update({key: stock[key] for key in ('price', 'volume', 'rsi') if stock.get(key) is not None})
             
             # Get latest strategy signal for this symbol
             strategy_signal = None
@@ -455,19 +543,22 @@ class AgentCoordinator(BaseMemoryAgent):
                     break
             
             # Evaluate rules
-            rule_evaluations = await self.rule_agent.evaluate_rules(symbol, market_data)
+            rule_evaluations = await self._run_phase(
+                "rule_validation", lambda: self.rule_agent.evaluate_rules(symbol, market_data), symbol, metrics
+            ) or []
             
             # Phase 5: Decision Synthesis
-            decision = await self._synthesize_decision(
+            decision = await self._run_phase("synthesis", lambda: self._synthesize_decision(
                 symbol, strategy_signal, timing_analysis, rule_evaluations, market_conditions
-            )
+            ), symbol, metrics)
             
             if decision:
                 # Store decision for tracking
                 self.pending_decisions[symbol] = decision
                 
                 # Store coordination decision in memory
-                await self._store_coordination_decision(decision)
+                if self.record_decisions:
+                    await self._store_coordination_decision(decision)
                 
                 self.logger.info(f"Trading decision for {symbol}: {decision.action} with {decision.confidence:.2%} confidence")
             
@@ -504,7 +595,9 @@ class AgentCoordinator(BaseMemoryAgent):
             if timing_analysis:
                 confidence_scores['timing'] = timing_analysis.confidence
                 contributing_agents.append('timing')
-                reasoning_parts.append(f"Timing: {timing_analysis.signal.value} ({timing_analysis.confidence:.1%})")
+                reasoning_parts.append(
+                    f"Timing: {timing_analysis.session.value}, {timing_analysis.risk_level} risk ({timing_analysis.confidence:.1%})"
+                )
             
             # Rule Agent Input
             triggered_rules = [eval for eval in rule_evaluations if eval.triggered]
@@ -516,7 +609,7 @@ class AgentCoordinator(BaseMemoryAgent):
             
             # Market Conditions
             market_confidence = self._assess_market_confidence(market_conditions)
-            confidence_scores['market'] = market_confidence
+            confidence_scores['market_data'] = market_confidence
             reasoning_parts.append(f"Market: {market_conditions.get('trend', 'unknown')} ({market_confidence:.1%})")
             
             # Calculate weighted overall confidence
@@ -553,9 +646,11 @@ class AgentCoordinator(BaseMemoryAgent):
             
             # Adjust based on timing
             if timing_analysis and action == "buy":
-                if timing_analysis.signal.value in ['sell', 'strong_sell']:
-                    action = "hold"  # Timing conflicts with strategy
-                elif timing_analysis.signal.value in ['buy', 'strong_buy']:
+                entry_delay = (timing_analysis.optimal_entry - datetime.now()).total_seconds()
+                if entry_delay > 1800:
+                    action = "hold"  # Entry window is not open yet
+                    reasoning_parts.append("Timing: entry window not open")
+                elif timing_analysis.risk_level == "low":
                     # Timing confirms strategy
                     overall_confidence *= 1.1
             
@@ -570,7 +665,7 @@ class AgentCoordinator(BaseMemoryAgent):
                 reasoning_parts.append("Entry blocked by rules")
             
             # Calculate position size
-            position_size = self._calculate_position_size(overall_confidence, stop_loss, entry_price)
+            position_size = self._calculate_position_size(overall_confidence, stop_loss, entry_price, symbol)
             
             # Calculate risk score
             risk_score = self._calculate_risk_score(market_conditions, overall_confidence, position_size)
@@ -632,8 +727,9 @@ class AgentCoordinator(BaseMemoryAgent):
         except Exception:
             return 0.5
     
-    def _calculate_position_size(self, confidence: float, stop_loss: float, entry_price: float) -> float:
-        """Calculate position size based on confidence and risk"""
+    def _calculate_position_size(self, confidence: float, stop_loss: float, entry_price: float,
+                                 symbol: Optional[str] = None) -> float:
+        """Calculate position size based on confidence, risk and correlation with open positions"""
         try:
             if entry_price == 0 or stop_loss == 0:
                 return 0.01  # Minimum size
@@ -648,6 +744,12 @@ class AgentCoordinator(BaseMemoryAgent):
                 size_adjustment = min(1.0, 0.02 / stop_distance)
                 base_size *= size_adjustment
             
+            # Shrink positions that mostly duplicate an open one
+            if symbol:
+                correlation = correlation_engine.position_correlation(symbol)
+                if correlation > 0:
+                    base_size *= max(self.correlation_size_floor, 1 - correlation)
+            
             # Apply maximum position risk
             final_size = min(base_size, self.max_position_risk)
             
@@ -798,22 +900,180 @@ class AgentCoordinator(BaseMemoryAgent):
         except Exception as e:
             self.logger.error(f"Error storing coordination decision: {e}")
     
-    async def execute_coordinated_trading(self):
-        """Execute coordinated trading across all symbols"""
+    def _snapshot_stock(self, symbol: str):
+        """Universe record for a symbol - the shared table in a shard worker, else the latest snapshot"""
+        try:
+            table = self.market_snapshot
+            if table is not None:
+                return table.get(symbol)
+            snapshot = universe_provider.get_snapshot_nowait()
+            return snapshot.get(symbol) if snapshot is not None else None
+        except Exception as e:
+            self.logger.error(f"Error reading snapshot record for {symbol}: {e}")
+            return None
+    
+    @staticmethod
+    def decision_fields(decision: TradingDecision) -> Dict[str, Any]:
+        """Plain fields of a decision, for returning it from a shard worker"""
+        return dict(vars(decision))
+    
+    def _update_symbol_priorities(self, symbols: List[str]) -> List[str]:
+        """
+        Score symbols from open exposure, recent volatility, last signal strength
+        and time since last evaluation; returns them highest priority first
+        """
+        now = time.monotonic()
+        median_volatility = correlation_engine.median_volatility()
+        weights = self.priority_weights
+        for symbol in symbols:
+            try:
+                position = self.executed_decisions.get(symbol)
+                exposure = min(1.0, 0.5 + position.position_size * 10) if position else 0.0
+                
+                volatility = correlation_engine.volatility(symbol)
+                relative_volatility = volatility / (volatility + median_volatility) if volatility and median_volatility else 0.5
+                
+                decision = self.pending_decisions.get(symbol)
+                signal = decision.confidence if decision else 0.0
+                
+                last = self.last_evaluated.get(symbol)
+                staleness = 1.0 if last is None else min(1.0, (now - last) / self.staleness_seconds)
+                
+                self.symbol_priorities[symbol] = {
+                    "score": round(weights["exposure"] * exposure + weights["volatility"] * relative_volatility
+                                   + weights["signal"] * signal + weights["staleness"] * staleness, 4),
+                    "exposure": exposure,
+                    "volatility": round(relative_volatility, 4),
+                    "signal": round(signal, 4),
+                    "staleness": round(staleness, 4)
+                }
+            except Exception as e:
+                self.logger.error(f"Error scoring priority for {symbol}: {e}")
+                self.symbol_priorities[symbol] = {"score": 0.0}
+        
+        # Open positions first, then by score
+        return sorted(symbols, key=lambda s: (s in self.executed_decisions, self.symbol_priorities[s]["score"]),
+                      reverse=True)
+    
+    async def _run_triggered_pass(self, symbols: List[str], reasons: Dict[str, List[str]]):
+        """Coordination pass for the symbols whose triggers fired"""
+        self.logger.info(f"Triggered pass for {len(symbols)} symbols: {reasons}")
+        await self.execute_coordinated_trading(symbols)
+    
+    async def start_triggers(self):
+        """Start event-driven coordination (idempotent)"""
+        await self.triggers.start()
+    
+    async def stop_triggers(self):
+        await self.triggers.stop()
+    
+    async def coordinate_symbols(self, symbols: List[str], market_conditions: Dict, metrics: Dict,
+                                 must_run: set, deadline: float) -> List[TradingDecision]:
+        """
+        Per-symbol decisions in the given order under a bounded semaphore
+        Symbols outside must_run that have not started by the deadline are
+        recorded in metrics["deferred"].
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrent_symbols)
+        
+        async def coordinate(symbol: str):
+            async with semaphore:
+                if symbol not in must_run and time.perf_counter() > deadline:
+                    metrics["deferred"].append(symbol)
+                    return None
+                symbol_started = time.perf_counter()
+                try:
+                    return await self.coordinate_trading_decision(symbol, market_conditions, metrics)
+                finally:
+                    self.last_evaluated[symbol] = time.monotonic()
+                    metrics["symbol_seconds"][symbol] = round(time.perf_counter() - symbol_started, 3)
+        
+        results = await asyncio.gather(*[coordinate(symbol) for symbol in symbols], return_exceptions=True)
+        decisions = []
+        for symbol, decision in zip(symbols, results):
+            if isinstance(decision, Exception):
+                self.logger.error(f"Error processing {symbol}: {decision}")
+            elif decision:
+                decisions.append(decision)
+        return decisions
+    
+    async def _coordinate_sharded(self, symbols: List[str], market_conditions: Dict, metrics: Dict,
+                                  must_run: set, deadline: float) -> List[TradingDecision]:
+        """
+        Run the pass on the shard workers and merge their decisions
+        Workers have no view of the open positions, so sizing against them
+        is applied here before the global limits.
+        """
+        results = await self.shards.run(symbols, market_conditions, must_run,
+                                        max(0.0, deadline - time.perf_counter()), metrics)
+        decisions = []
+        for fields in results:
+            try:
+                decision = TradingDecision(**fields)
+                correlation = correlation_engine.position_correlation(decision.symbol)
+                decision.position_size *= max(self.correlation_size_floor, 1.0 - max(0.0, correlation))
+                self.pending_decisions[decision.symbol] = decision
+                await self._store_coordination_decision(decision)
+                decisions.append(decision)
+            except Exception as e:
+                self.logger.error(f"Error merging shard decision {fields.get('symbol')}: {e}")
+        
+        now = time.monotonic()
+        for symbol in metrics["symbol_seconds"]:
+            self.last_evaluated[symbol] = now
+        return decisions
+    
+    async def execute_coordinated_trading(self, symbols: Optional[List[str]] = None):
+        """Execute coordinated trading across the watchlist, or only the given symbols"""
         try:
-            self.logger.info("Starting coordinated trading cycle")
+            symbols = list(symbols) if symbols is not None else list(self.active_watchlist)
+            self.logger.info(f"Starting coordinated trading cycle ({len(symbols)} symbols)")
             
-            decisions = []
+            # Open positions and the watchlist get priority provider lanes
+            request_scheduler.register_positions(list(self.executed_decisions.keys()))
+            request_scheduler.register_watchlist(self.active_watchlist)
             
-            # Process each symbol in watchlist
-            for symbol in self.active_watchlist:
-                try:
-                    decision = await self.coordinate_trading_decision(symbol)
-                    if decision and decision.action != "hold":
-                        decisions.append(decision)
-                        
-                except Exception as e:
-                    self.logger.error(f"Error processing {symbol}: {e}")
+            # Correlations are measured against what is already held
+            correlation_engine.set_positions(self.executed_decisions.keys())
+            
+            started = time.perf_counter()
+            metrics = {"symbols": len(symbols), "timeouts": {}, "errors": {}, "symbol_seconds": {}}
+            
+            # Market context once per cycle, shared by every symbol
+            self.trading_phase = TradingPhase.MARKET_ANALYSIS
+            market_conditions = await self._run_phase(
+                "market_analysis", lambda: self.strategy_agent.analyze_market_conditions(), metrics=metrics
+            ) or {}
+            
+            # Priority order; once the deadline passes only the must-run symbols still start
+            self.trading_phase = TradingPhase.SIGNAL_GENERATION
+            symbols = self._update_symbol_priorities(symbols)
+            must_run = set(symbols[:self.always_run]) | (set(symbols) & set(self.executed_decisions))
+            deadline = started + self.cycle_deadline_seconds
+            metrics["deferred"] = []
+            
+            if self.shards.should_shard(len(symbols)):
+                results = await self._coordinate_sharded(symbols, market_conditions, metrics, must_run, deadline)
+            else:
+                results = await self.coordinate_symbols(symbols, market_conditions, metrics, must_run, deadline)
+            decisions = [decision for decision in results if decision.action != "hold"]
+            
+            # Deferred symbols go first in line for the next pass
+            if metrics["deferred"]:
+                self.logger.info(f"Cycle over its {self.cycle_deadline_seconds}s deadline - deferred {metrics['deferred']}")
+                self.triggers.requeue(metrics["deferred"])
+            
+            self.trading_phase = TradingPhase.EXECUTION_PLANNING
+            symbol_seconds = metrics["symbol_seconds"]
+            self.last_cycle = {
+                **metrics,
+                "decisions": len(decisions),
+                "wall_seconds": round(time.perf_counter() - started, 3),
+                "sum_symbol_seconds": round(sum(symbol_seconds.values()), 3),
+                "slowest_symbol": max(symbol_seconds, key=symbol_seconds.get) if symbol_seconds else None,
+                "max_concurrency": self.max_concurrent_symbols,
+                "completed_at": datetime.now(timezone.utc).isoformat()
+            }
             
             # Sort decisions by confidence and risk
             decisions.sort(key=lambda d: d.confidence - d.risk_score, reverse=True)
@@ -821,14 +1081,38 @@ class AgentCoordinator(BaseMemoryAgent):
             # Execute top decisions (limit to avoid overexposure)
             max_positions = 3 if self.coordination_mode == CoordinationMode.CONSERVATIVE else 5
             
-            for i, decision in enumerate(decisions[:max_positions]):
-                self.logger.info(f"Decision {i+1}: {decision.action} {decision.symbol} - Confidence: {decision.confidence:.2%}, Risk: {decision.risk_score:.2f}")
+            exposure = sum(held.position_size for held in self.executed_decisions.values())
+            executed = []
+            for decision in decisions:
+                if len(executed) >= max_positions:
+                    break
+                
+                # Portfolio-wide exposure cap across everything held and opened this cycle
+                if decision.symbol not in self.executed_decisions and \
+                        exposure + decision.position_size > self.max_total_exposure:
+                    self.logger.info(f"Skipping {decision.symbol}: exposure {exposure:.2f} at the {self.max_total_exposure:.2f} cap")
+                    continue
+                
+                # Skip near-duplicates of positions held or opened this cycle
+                correlation = correlation_engine.max_correlation(
+                    decision.symbol, list(self.executed_decisions.keys())
+                )
+                if correlation > self.max_position_correlation:
+                    self.logger.info(f"Skipping {decision.symbol}: correlation {correlation:.2f} with open positions")
+                    continue
+                
+                executed.append(decision)
+                self.logger.info(f"Decision {len(executed)}: {decision.action} {decision.symbol} - Confidence: {decision.confidence:.2%}, Risk: {decision.risk_score:.2f}")
                 
                 # Here would integrate with actual trading execution
                 # For now, just track the decision
+                if decision.symbol not in self.executed_decisions:
+                    exposure += decision.position_size
                 self.executed_decisions[decision.symbol] = decision
             
-            self.logger.info(f"Coordinated trading cycle completed: {len(decisions)} decisions, {min(len(decisions), max_positions)} executed")
+            correlation_engine.set_positions(self.executed_decisions.keys())
+            
+            self.logger.info(f"Coordinated trading cycle completed: {len(decisions)} decisions, {len(executed)} executed")
             
         except Exception as e:
             self.logger.error(f"Error in coordinated trading: {e}")
@@ -864,6 +1148,9 @@ class AgentCoordinator(BaseMemoryAgent):
                 profit_loss=profit_loss
             )
             
+            # Profitable setups become reference patterns for scanner similarity
+            await asyncio.to_thread(record_pattern_outcome, symbol, success, profit_loss, decision.entry_price)
+            
             # Update individual agent outcomes
             for agent_name in decision.contributing_agents:
                 if agent_name == 'strategy' and self.strategy_agent:
@@ -1000,6 +1287,10 @@ class AgentCoordinator(BaseMemoryAgent):
                 'performance': self.coordination_performance,
                 'active_watchlist': self.active_watchlist,
                 'pending_decisions': len(self.pending_decisions),
+                'last_cycle': self.last_cycle,
+                'sharding': self.shards.get_status(),
+                'symbol_priorities': self.symbol_priorities,
+                'triggers': self.triggers.get_status(),
                 'executed_decisions': len(self.executed_decisions),
                 'agent_weights': self.agent_weights,
                 'consensus_threshold': self.consensus_threshold,
@@ -1058,7 +1349,8 @@ class AgentCoordinator(BaseMemoryAgent):
             self.logger.error(f"Error updating coordination mode: {e}")
     
     async def process(self):
-        """Main coordination processing loop"""
+        """Main coordination processing loop - passes are driven by the triggers"""
+        await self.start_triggers()
         while self.is_active:
             try:
                 # Update status
@@ -1071,9 +1363,6 @@ class AgentCoordinator(BaseMemoryAgent):
                     f"{accuracy:.1%} accuracy"
                 )
                 
-                # Execute coordinated trading
-                await self.execute_coordinated_trading()
-                
                 # Clean up old decisions (older than 24 hours)
                 cutoff_time = datetime.now(timezone.utc) - timedelta(hours=24)
                 expired_decisions = [
@@ -1085,12 +1374,13 @@ class AgentCoordinator(BaseMemoryAgent):
                     self.logger.info(f"Cleaning up expired decision for {symbol}")
                     del self.executed_decisions[symbol]
                 
-                # Wait before next cycle
-                await asyncio.sleep(1800)  # 30 minutes
+                # Housekeeping only - trading passes run on trigger events
+                await asyncio.sleep(60)
                 
             except Exception as e:
                 self.logger.error(f"Error in coordination main loop: {e}")
                 await asyncio.sleep(300)  # 5 minutes on error
+        await self.stop_triggers()
 
 # Example usage
 if __name__ == "__main__":
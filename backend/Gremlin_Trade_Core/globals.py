@@ -16,7 +16,7 @@ import pandas as pd
 import math
 from pathlib import Path
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Optional, Any, Union, Callable
+from typing import Dict, List, Optional, Any, Union, Callable, Tuple, Iterable, Iterator, Awaitable
 from dataclasses import dataclass, field
 import shutil
 import asyncio
@@ -26,8 +26,20 @@ import subprocess
 import shlex
 import importlib
 import time
+import zlib
+import heapq
+import itertools
+import threading
+import queue
 from random import choice, uniform, randint
-from enum import Enum
+from enum import Enum, IntEnum
+from collections import OrderedDict, deque
+from collections.abc import Mapping, MutableMapping
+from types import MappingProxyType
+from contextlib import closing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+import multiprocessing
+from multiprocessing import shared_memory
 
 # Web and networking
 try:
@@ -86,8 +98,6 @@ try:
     import psutil
     from cryptography.fernet import Fernet
     from python_dotenv import load_dotenv
-    import queue
-    import threading
     import weakref
     import random
     import aiohttp
@@ -104,9 +114,11 @@ MEMORY_DIR = BACKEND_DIR / "Gremlin_Trade_Memory"
 VECTOR_STORE_DIR = MEMORY_DIR / "vector_store"
 LOGS_DIR = CONFIG_DIR / "Gremlin_Trade_Logs"
 STRATEGIES_DIR = BACKEND_DIR / "Gremlin_Trade_Core" / "Gremlin_Trader_Strategies"
+BAR_STORE_DIR = MEMORY_DIR / "bar_store"
+MARKET_STATE_DIR = MEMORY_DIR / "market_states"
 
 # Ensure directories exist
-for directory in [CONFIG_DIR, MEMORY_DIR, VECTOR_STORE_DIR, LOGS_DIR, STRATEGIES_DIR]:
+for directory in [CONFIG_DIR, MEMORY_DIR, VECTOR_STORE_DIR, LOGS_DIR, STRATEGIES_DIR, BAR_STORE_DIR, MARKET_STATE_DIR]:
     directory.mkdir(parents=True, exist_ok=True)
 
 # Load environment variables
@@ -263,7 +275,17 @@ def get_default_memory_config():
         "dashboard_selected_backend": "chromadb",
         "retention": {
             "max_embeddings": 10000,
-            "cleanup_interval_hours": 24
+            "cleanup_interval_hours": 24,
+            "market_data": {
+                "write_batch_size": 500,
+                "maintenance_interval_minutes": 60,
+                "rollups": [
+                    {"from": "1min", "to": "5min", "after_hours": 24},
+                    {"from": "5min", "to": "1h", "after_hours": 168},
+                    {"from": "1h", "to": "1d", "after_hours": 720}
+                ],
+                "keep_hours": {"1min": 48, "5min": 336, "1h": 2160, "1d": None}
+            }
         }
     }
 
@@ -285,7 +307,139 @@ def get_default_agents_config():
             "timeframes": ["1min", "5min", "15min"],
             "min_volume": 1000000,
             "max_price": 10.0,
-            "min_rotation": 2.0
+            "min_rotation": 2.0,
+            "snapshot_refresh_seconds": 60,
+            "universe": {
+                "source": "default",
+                "path": None,
+                "db_path": None,
+                "query": "SELECT symbol FROM universe"
+            },
+            "tiers": {
+                "quote_batch_size": 100,
+                "tier0": {"concurrency": 4, "min_price": 0.10, "max_price": 10.0, "min_volume": 500000, "min_abs_change_pct": 2.0, "use_fundamentals": True, "max_float_million": 25},
+                "tier1": {"concurrency": 8, "max_symbols": 200},
+                "tier2": {"concurrency": 8}
+            }
+        },
+        "market_data_bus": {
+            "subscriber_queue_size": 256
+        },
+        "rate_limits": {
+            "backoff_factor": 0.5,
+            "recovery_step": 0.1,
+            "min_rate": 0.1,
+            "backoff_seconds": 1.0,
+            "max_backoff_seconds": 60.0,
+            "providers": {
+                "default": {"rate": 2.0, "burst": 5},
+                "yfinance": {"rate": 2.0, "burst": 5},
+                "simple": {"rate": 10.0, "burst": 10}
+            }
+        },
+        "market_regime": {
+            "refresh_seconds": 60,
+            "history_days": 100,
+            "indices": ["SPY", "QQQ", "IWM", "^VIX"],
+            "trend_symbol": "SPY",
+            "vix_symbol": "^VIX",
+            "breadth_symbols": ["SPY", "QQQ", "IWM", "DIA", "XLK", "XLF", "XLE", "XLV", "XLY", "XLI"]
+        },
+        "fundamentals": {
+            "db_path": None,
+            "refresh_hours": 24,
+            "failure_retry_hours": 4,
+            "check_interval_minutes": 60,
+            "filters": {
+                "min_market_cap": None,
+                "max_market_cap": None,
+                "exclude_sectors": [],
+                "require_data": False
+            }
+        },
+        "history_import": {
+            "workers": 0,
+            "source_tz": "America/New_York",
+            "market_tz": "America/New_York",
+            "session": "extended",
+            "bar_label": "left",
+            "progress_every": 25
+        },
+        "replay": {
+            "data_dir": None,
+            "timeframe": "1min",
+            "speed": 1.0,
+            "seed": 42,
+            "loop": True
+        },
+        "resampler": {
+            "enabled": True,
+            "timeframes": ["5min", "15min", "1h", "1d"],
+            "market_tz": "America/New_York",
+            "session": "regular",
+            "max_bars": 2000,
+            "history_days": 90,
+            "publish": True,
+            "serve_history": True,
+            "flush_grace_seconds": 120
+        },
+        "correlation": {
+            "enabled": True,
+            "timeframe": "5min",
+            "halflife_bars": 78,
+            "min_periods": 20,
+            "max_symbols": 2000,
+            "cluster_threshold": 0.7,
+            "cluster_interval": 10,
+            "seed_on_start": True,
+            "seed_symbols": 500,
+            "max_position_correlation": 0.7,
+            "size_floor": 0.25
+        },
+        "coordination_triggers": {
+            "enabled": True,
+            "bar_timeframe": "5min",
+            "volume_spike_ratio": 3.0,
+            "volume_halflife_bars": 20,
+            "price_move_pct": 2.0,
+            "stop_buffer_pct": 1.0,
+            "debounce_seconds": 2.0,
+            "cooldown_seconds": 120,
+            "cooldown_exempt": ["position_risk"],
+            "fallback_sweep_seconds": 1800,
+            "max_batch": 16
+        },
+        "coordinator": {
+            "max_concurrent_symbols": 8,
+            "cycle_deadline_seconds": 45.0,
+            "always_run": 3,
+            "staleness_seconds": 1800,
+            "priority_weights": {
+                "exposure": 0.4,
+                "volatility": 0.2,
+                "signal": 0.2,
+                "staleness": 0.2
+            },
+            "phase_timeouts": {
+                "market_analysis": 10.0,
+                "signal_generation": 20.0,
+                "timing": 10.0,
+                "rule_validation": 10.0,
+                "synthesis": 5.0
+            },
+            "max_total_exposure": 0.5
+        },
+        "sharding": {
+            "enabled": False,
+            "workers": 0,
+            "start_method": "spawn",
+            "min_symbols": 64,
+            "min_symbols_per_shard": 16,
+            "cost_halflife_cycles": 5,
+            "default_cost_seconds": 0.5,
+            "rebalance_interval": 10,
+            "rebalance_threshold": 0.25,
+            "shard_grace_seconds": 15.0
         },
         "risk_management": {
             "max_risk_per_trade": 0.10,
@@ -315,6 +469,106 @@ def get_default_strategy_config():
             "enabled": True,
             "max_depth": 3,
             "timeout_seconds": 30
+        },
+        "incremental_scan": {
+            "enabled": True,
+            "ttl_seconds": 60,
+            "max_symbols": 20000,
+            "epsilon": {
+                "price": 0.002,
+                "volume": 0.05,
+                "up_pct": 0.25,
+                "rotation": 0.05
+            },
+            "scanners": {}
+        },
+        "feature_store": {
+            "enabled": True,
+            "max_entries": 50000
+        },
+        "market_state_index": {
+            "enabled": True,
+            "window": 30,
+            "horizon": 10,
+            "k": 50,
+            "max_states": 500000,
+            "scanner_timeframe": "5min",
+            "build_after_import": True,
+            "timeframes": {}
+        },
+        "pattern_search": {
+            "enabled": True,
+            "timeframe": "1min",
+            "length": 60,
+            "horizon": 30,
+            "k": 10,
+            "workers": 0,
+            "chunk_size": 32,
+            "cache_symbols": 256,
+            "max_symbols": 0,
+            "scanner_scoring": False,
+            "scanner_candidates": 3,
+            "scanner_weight": 0.1
+        },
+        "strategy_manager": {
+            "default_timeout_seconds": 30,
+            "timeouts": {
+                "penny_stock": 20
+            }
+        },
+        "backtesting": {
+            "enabled": True,
+            "lookback_days": 30,
+            "mode": "vectorized",
+            "timeframe": "1min",
+            "strategies": ["penny_stock", "recursive_scanner", "momentum", "mean_reversion", "breakout", "scalping"],
+            "workers": 0,
+            "initial_capital": 100000.0,
+            "position_fraction": 0.1,
+            "max_positions": 10,
+            "slippage_bps": 5.0,
+            "participation_impact_bps": 10.0,
+            "max_participation": 0.1,
+            "commission_per_share": 0.005,
+            "commission_min": 1.0,
+            "stop_loss_pct": 0.15,
+            "take_profit_pct": 0.10,
+            "max_hold_bars": 390,
+            "flatten_eod": True,
+            "decision_interval_bars": 15,
+            "event_limit": 50,
+            "optimizer": {
+                "method": "random",
+                "samples": 32,
+                "grid_points": 3,
+                "initial_samples": 8,
+                "batch_size": 8,
+                "workers": 0,
+                "seed": 42,
+                "days": 180,
+                "strategies": ["penny_stock", "recursive_scanner"],
+                "target": "combined",
+                "objective": "sharpe_ratio",
+                "train_sessions": 60,
+                "test_sessions": 20,
+                "step_sessions": 20,
+                "max_folds": 4,
+                "min_trades": 5,
+                "cache_symbols": 0,
+                "space": {
+                    "settings.stop_loss_pct": {"low": 0.10, "high": 0.20},
+                    "settings.take_profit_pct": {"low": 0.05, "high": 1.0, "log": True},
+                    "rules.penny_stock.min_volume": {"low": 500000, "high": 2000000, "type": "int"},
+                    "rules.penny_stock.intraday_gain_min": {"low": 2.0, "high": 10.0},
+                    "weights.penny_stock": {"low": 0.1, "high": 0.9},
+                    "weights.recursive_scanner": {"low": 0.1, "high": 0.9}
+                }
+            }
+        },
+        "optimized_params": {
+            "enabled": True,
+            "version": None,
+            "dir": None
         }
     }
 
@@ -412,6 +666,31 @@ def embed_text(text: str) -> np.ndarray:
         dimension = MEM.get("embedding", {}).get("dimension", 384)
         return np.zeros(dimension, dtype=np.float32)
 
+_embedding_model = None
+
+def embed_texts(texts: List[str], batch_size: Optional[int] = None) -> np.ndarray:
+    """
+    Embed many texts in one batched call - returns a (len(texts), dimension) float32 matrix
+    The model is loaded once; without it every text gets the zero vector, like embed_text on failure.
+    """
+    global _embedding_model
+    embedding_config = MEM.get("embedding", {})
+    dimension = embedding_config.get("dimension", 384)
+    if not texts:
+        return np.zeros((0, dimension), dtype=np.float32)
+    try:
+        if ML_AVAILABLE:
+            if _embedding_model is None:
+                _embedding_model = SentenceTransformer(embedding_config.get("model", "all-MiniLM-L6-v2"))
+            vectors = _embedding_model.encode(
+                list(texts), batch_size=batch_size or embedding_config.get("batch_size", 32), show_progress_bar=False
+            )
+            return np.asarray(vectors, dtype=np.float32)
+        return np.zeros((len(texts), dimension), dtype=np.float32)
+    except Exception as e:
+        logger.error(f"Error embedding {len(texts)} texts: {e}")
+        return np.zeros((len(texts), dimension), dtype=np.float32)
+
 def package_embedding(text: str, vector: np.ndarray, meta: Dict[str, Any]) -> Dict[str, Any]:
     """Package embedding with metadata"""
     embedding_id = str(uuid.uuid4())
@@ -428,21 +707,19 @@ def package_embedding(text: str, vector: np.ndarray, meta: Dict[str, Any]) -> Di
     return embedding
 
 # Trading utility functions
-def get_live_penny_stocks() -> List[Dict[str, Any]]:
-    """Get live penny stock data - now uses working simple market service"""
+def get_live_penny_stocks(limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Get live penny stock data from the shared universe snapshot"""
     try:
         # Import here to avoid circular imports
-        import asyncio
-        from Gremlin_Trade_Core.simple_market_service import get_live_penny_stocks_real
+        from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.universe_snapshot import universe_provider
         
-        # Get real data asynchronously
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            real_data = loop.run_until_complete(get_live_penny_stocks_real(limit=50))
-            return real_data
-        finally:
-            loop.close()
+        # Read the latest snapshot - never spins up an event loop from sync code
+        snapshot = universe_provider.get_snapshot_nowait()
+        if snapshot is None or not snapshot.stocks:
+            raise RuntimeError("universe snapshot not ready")
+        
+        stocks = snapshot.stocks if limit is None else snapshot.stocks[:limit]
+        return list(stocks)
             
     except Exception as e:
         logger.error(f"Error getting penny stocks, falling back to sample data: {e}")
@@ -476,22 +753,14 @@ def apply_signal_rules(stock: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         if stock.get("rotation", 0) < strategy_config.get("rotation_over", 2.0):
             return None
         
-        # Generate signals based on criteria
-        signals = []
-        
-        # EMA cross signal
-        ema_5 = stock.get("ema", {}).get("5", 0)
-        ema_20 = stock.get("ema", {}).get("20", 0)
-        if ema_5 > ema_20:
-            signals.append("ema_cross_bullish")
-        
-        # VWAP break signal
-        if stock["price"] > stock.get("vwap", 0):
-            signals.append("vwap_break")
+        # Import here to avoid circular imports
+        from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.feature_store import record_features
         
-        # Volume spike signal
-        if stock["volume"] > 2000000:  # High volume threshold
-            signals.append("volume_spike")
+        # Generate signals based on criteria - ema_cross_bullish (EMA 5 over 20),
+        # vwap_break (price over VWAP) and volume_spike (over 2M) from the shared feature store
+        signal_names = ("ema_cross_bullish", "vwap_break", "volume_spike")
+        features = record_features(stock, signal_names)
+        signals = [name for name in signal_names if features[name]]
         
         if signals:
             return {
@@ -507,14 +776,20 @@ def apply_signal_rules(stock: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         return None
 
 # Recursive scanning functions
-def recursive_scan(symbols: List[str], timeframes: List[str], level: int = 0, parent_hits: Optional[List[Dict]] = None) -> List[Dict]:
+def recursive_scan(symbols: List[str], timeframes: List[str], level: int = 0, parent_hits: Optional[List[Dict]] = None,
+                   stocks: Optional[List[Dict]] = None, context: Optional[Any] = None) -> List[Dict]:
     """Multi-timeframe recursive scanning"""
     if level >= len(timeframes) or level >= CFG.get("strategy", {}).get("recursive_scanning", {}).get("max_depth", 3):
         return parent_hits or []
     
     try:
+        # Every level of the recursion shares one scan context (universe, rule outcomes)
+        if context is None:
+            from Gremlin_Trade_Core.Gremlin_Trader_Strategies.scan_context import ScanContext
+            context = ScanContext(stocks=stocks)
+        
         tf = timeframes[level]
-        hits = run_scanner(symbols, timeframe=tf)
+        hits = run_scanner(symbols, timeframe=tf, context=context)
         
         # If there were parent hits, intersect by symbol
         if parent_hits is not None:
@@ -522,26 +797,33 @@ def recursive_scan(symbols: List[str], timeframes: List[str], level: int = 0, pa
             hits = [h for h in hits if h["symbol"] in parent_symbols]
         
         # Recurse to next timeframe
-        return recursive_scan(symbols, timeframes, level + 1, hits)
+        return recursive_scan(symbols, timeframes, level + 1, hits, context=context)
         
     except Exception as e:
         logger.error(f"Error in recursive scan: {e}")
         return parent_hits or []
 
-def run_scanner(symbols: List[str], timeframe: str = "1min") -> List[Dict]:
+def run_scanner(symbols: List[str], timeframe: str = "1min", stocks: Optional[List[Dict]] = None,
+                context: Optional[Any] = None) -> List[Dict]:
     """Run scanner for given symbols and timeframe"""
     try:
-        # This would integrate with real scanning logic
-        scanner_config = CFG.get("agents", {}).get("scanner", {})
-        stocks = get_live_penny_stocks()
+        from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.stock_table import overlay_record
+        
+        if context is None:
+            from Gremlin_Trade_Core.Gremlin_Trader_Strategies.scan_context import ScanContext
+            context = ScanContext(stocks=stocks)
         
         hits = []
-        for stock in stocks:
-            if stock["symbol"] in symbols:
-                signal = apply_signal_rules(stock)
-                if signal:
-                    result = {**stock, **signal, "timeframe": timeframe}
-                    hits.append(result)
+        for symbol in dict.fromkeys(symbols):
+            stock = context.get_stock(symbol)
+            if stock is None:
+                continue
+            # Rule outcomes depend only on the snapshot row - evaluated once per cycle
+            signal = context.rule(symbol, "signal_rules", lambda: apply_signal_rules(stock))
+            if signal:
+                # Snapshot rows are annotated in place of copying the record
+                result = overlay_record(stock, {**signal, "timeframe": timeframe})
+                hits.append(result)
         
         return hits
         
@@ -574,7 +856,7 @@ def inject_watermark(origin="unknown"):
 # Central system initialization functions
 def initialize_backend_paths():
     """Initialize all backend paths and ensure they exist"""
-    for directory in [CONFIG_DIR, MEMORY_DIR, VECTOR_STORE_DIR, LOGS_DIR, STRATEGIES_DIR]:
+    for directory in [CONFIG_DIR, MEMORY_DIR, VECTOR_STORE_DIR, LOGS_DIR, STRATEGIES_DIR, BAR_STORE_DIR, MARKET_STATE_DIR]:
         directory.mkdir(parents=True, exist_ok=True)
     logger.info("All backend paths initialized")
 
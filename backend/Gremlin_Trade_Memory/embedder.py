@@ -17,7 +17,7 @@ from Gremlin_Trade_Core.globals import (
     # Core imports
     os, json, sqlite3, np, datetime, timezone, shutil, asyncio, threading, time, uuid,
     # Type imports
-    Dict, List, Any, Optional, Tuple,
+    Dict, List, Any, Optional, Tuple, Callable,
     # Trading imports
     yf, ta, TRADING_LIBS_AVAILABLE,
     # Configuration and utilities
@@ -26,6 +26,7 @@ from Gremlin_Trade_Core.globals import (
     # ML imports
     chromadb, SentenceTransformer, CHROMA_AVAILABLE, ML_AVAILABLE
 )
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.bar_store import TIMEFRAME_SECONDS
 
 # Module logger
 embedder_logger = setup_module_logger("memory", "embedder")
@@ -53,6 +54,90 @@ autonomous_mode = False
 trading_thread = None
 monitoring_thread = None
 
+# Market data time-series schema - integer epoch bar timestamps, no rowid
+MARKET_DATA_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS market_data (
+        symbol TEXT NOT NULL,
+        timeframe TEXT NOT NULL DEFAULT '1min',
+        ts INTEGER NOT NULL,
+        open REAL,
+        high REAL,
+        low REAL,
+        close REAL NOT NULL,
+        volume INTEGER,
+        indicators TEXT,
+        PRIMARY KEY (symbol, timeframe, ts)
+    ) WITHOUT ROWID
+'''
+
+MARKET_DATA_RETENTION = MEM.get("retention", {}).get("market_data", {})
+
+class MarketDataWriter:
+    """
+    Buffered market_data writer
+    Rows are collected per refresh cycle (repeat polls of the same bar
+    collapse to one row) and written with a single executemany upsert.
+    """
+    
+    def __init__(self, batch_size: int = 500):
+        self.batch_size = batch_size
+        self._buffer: Dict[Tuple[str, str, int], tuple] = {}
+        self._lock = threading.Lock()
+        self.rows_written = 0
+        self.flushes = 0
+    
+    def add(self, symbol: str, timeframe: str, ts: int, open_: float, high: float, low: float,
+            close: float, volume: int, indicators: Optional[Dict[str, Any]] = None):
+        """Buffer one bar; flushes automatically once the batch is full"""
+        row = (symbol, timeframe, int(ts), open_, high, low, close, volume,
+               json.dumps(indicators) if indicators else None)
+        with self._lock:
+            previous = self._buffer.get(row[:3])
+            if previous is not None:
+                # Same bar polled again - keep its open and widen the range
+                row = row[:3] + (previous[3], max(previous[4], high), min(previous[5], low)) + row[6:]
+            self._buffer[row[:3]] = row
+            full = len(self._buffer) >= self.batch_size
+        if full:
+            self.flush()
+    
+    def flush(self) -> int:
+        """Write all buffered rows in one transaction"""
+        with self._lock:
+            rows = list(self._buffer.values())
+            self._buffer.clear()
+        if not rows:
+            return 0
+        
+        try:
+            conn = sqlite3.connect(METADATA_DB_PATH)
+            with conn:
+                conn.executemany('''
+                    INSERT INTO market_data
+                    (symbol, timeframe, ts, open, high, low, close, volume, indicators)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(symbol, timeframe, ts) DO UPDATE SET
+                        high = MAX(high, excluded.high),
+                        low = MIN(low, excluded.low),
+                        close = excluded.close,
+                        volume = excluded.volume,
+                        indicators = COALESCE(excluded.indicators, indicators)
+                ''', rows)
+            conn.close()
+            self.rows_written += len(rows)
+            self.flushes += 1
+            return len(rows)
+            
+        except Exception as e:
+            embedder_logger.error(f"Failed to flush {len(rows)} market data rows: {e}")
+            return 0
+    
+    def pending(self) -> int:
+        return len(self._buffer)
+
+market_data_writer = MarketDataWriter(MARKET_DATA_RETENTION.get("write_batch_size", 500))
+_last_market_data_maintenance = 0.0
+
 # Initialize transformer model
 _model = None
 
@@ -253,17 +338,17 @@ def init_metadata_database():
             )
         ''')
         
-        # Market data cache table
+        # Market data time-series table - one row per symbol, timeframe and bar
+        _migrate_market_data_table(cursor)
+        cursor.execute(MARKET_DATA_SCHEMA)
+        
+        # Rollup progress per source/target timeframe
         cursor.execute('''
-            CREATE TABLE IF NOT EXISTS market_data (
-                id TEXT PRIMARY KEY,
-                symbol TEXT NOT NULL,
-                price REAL NOT NULL,
-                volume INTEGER,
-                timestamp TEXT NOT NULL,
-                timeframe TEXT DEFAULT '1min',
-                ohlcv TEXT,
-                indicators TEXT
+            CREATE TABLE IF NOT EXISTS market_data_rollups (
+                source_timeframe TEXT NOT NULL,
+                target_timeframe TEXT NOT NULL,
+                watermark INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (source_timeframe, target_timeframe)
             )
         ''')
         
@@ -344,15 +429,10 @@ def init_metadata_database():
                 ON positions(timestamp)
             ''')
         
-        # Create indexes for market_data table
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_market_data_symbol_timestamp 
-            ON market_data(symbol, timestamp)
-        ''')
-        
+        # Create indexes for market_data table (symbol lookups use the primary key)
         cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_market_data_timeframe_timestamp 
-            ON market_data(timeframe, timestamp)
+            CREATE INDEX IF NOT EXISTS idx_market_data_timeframe_ts 
+            ON market_data(timeframe, ts)
         ''')
         
         # Create indexes for strategy_performance table
@@ -402,6 +482,36 @@ def _migrate_database_schema(cursor):
     except Exception as e:
         embedder_logger.warning(f"Error during schema migration: {e}")
 
+def _migrate_market_data_table(cursor):
+    """Move the legacy market_data table (TEXT timestamps, uuid ids) to the time-series schema"""
+    try:
+        if not _column_exists(cursor, 'market_data', 'id'):
+            return
+        
+        cursor.execute('ALTER TABLE market_data RENAME TO market_data_legacy')
+        cursor.execute('DROP INDEX IF EXISTS idx_market_data_symbol_timestamp')
+        cursor.execute('DROP INDEX IF EXISTS idx_market_data_timeframe_timestamp')
+        cursor.execute(MARKET_DATA_SCHEMA)
+        
+        # Legacy ticks are bucketed to their bar; the last tick in a bar wins
+        for timeframe, seconds in TIMEFRAME_SECONDS.items():
+            cursor.execute('''
+                INSERT OR REPLACE INTO market_data
+                (symbol, timeframe, ts, open, high, low, close, volume, indicators)
+                SELECT symbol, COALESCE(timeframe, '1min'), (CAST(strftime('%s', timestamp) AS INTEGER) / ?) * ?,
+                       price, price, price, price, volume, indicators
+                FROM market_data_legacy
+                WHERE COALESCE(timeframe, '1min') = ? AND strftime('%s', timestamp) IS NOT NULL
+                ORDER BY timestamp
+            ''', (seconds, seconds, timeframe))
+        
+        migrated = cursor.execute('SELECT COUNT(*) FROM market_data').fetchone()[0]
+        cursor.execute('DROP TABLE market_data_legacy')
+        embedder_logger.info(f"Migrated market_data to time-series schema ({migrated} rows)")
+        
+    except Exception as e:
+        embedder_logger.error(f"Error migrating market_data table: {e}")
+
 def store_embedding(embedding: Dict[str, Any]) -> Dict[str, Any]:
     """Store embedding in both ChromaDB and metadata database"""
     try:
@@ -556,30 +666,12 @@ def get_live_market_data(symbol: str, timeframe: str = "1min") -> Optional[Dict[
         # Cache the data
         market_data_cache[f"{symbol}_{timeframe}"] = market_data
         
-        # Store in database
-        try:
-            conn = sqlite3.connect(METADATA_DB_PATH)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO market_data 
-                (id, symbol, price, volume, timestamp, timeframe, indicators)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                str(uuid.uuid4()),
-                symbol,
-                market_data["price"],
-                market_data["volume"],
-                market_data["timestamp"],
-                timeframe,
-                json.dumps(indicators)
-            ))
-            
-            conn.commit()
-            conn.close()
-            
-        except Exception as e:
-            embedder_logger.error(f"Failed to store market data: {e}")
+        # Buffer for the batched write at the end of the refresh cycle
+        market_data_writer.add(
+            symbol, timeframe, int(data.index[-1].timestamp()),
+            market_data["open"], market_data["high"], market_data["low"],
+            market_data["price"], market_data["volume"], indicators
+        )
         
         return market_data
         
@@ -587,6 +679,139 @@ def get_live_market_data(symbol: str, timeframe: str = "1min") -> Optional[Dict[
         embedder_logger.error(f"Error getting market data for {symbol}: {e}")
         return None
 
+def _rollup_watermark(conn, source: str, target: str) -> int:
+    """Source bars before this ts have been rolled up into target"""
+    row = conn.execute(
+        'SELECT watermark FROM market_data_rollups WHERE source_timeframe = ? AND target_timeframe = ?',
+        (source, target)
+    ).fetchone()
+    return row[0] if row else 0
+
+def _aggregate_market_data(conn, source: str, target: str, start: int, end: int) -> int:
+    """Upsert target buckets from the source bars in [start, end)"""
+    bucket = TIMEFRAME_SECONDS[target]
+    
+    # Open/close come from the first/last source bar via primary key lookups
+    cursor = conn.execute('''
+        INSERT INTO market_data (symbol, timeframe, ts, open, high, low, close, volume)
+        SELECT g.symbol, ?, g.bucket, o.open, g.high, g.low, c.close, g.volume
+        FROM (
+            SELECT symbol, (ts / ?) * ? AS bucket, MIN(ts) AS first_ts, MAX(ts) AS last_ts,
+                   MAX(high) AS high, MIN(low) AS low, SUM(volume) AS volume
+            FROM market_data
+            WHERE timeframe = ? AND ts >= ? AND ts < ?
+            GROUP BY symbol, bucket
+        ) g
+        JOIN market_data o ON o.symbol = g.symbol AND o.timeframe = ? AND o.ts = g.first_ts
+        JOIN market_data c ON c.symbol = g.symbol AND c.timeframe = ? AND c.ts = g.last_ts
+        WHERE true
+        ON CONFLICT(symbol, timeframe, ts) DO UPDATE SET
+            open = excluded.open, high = excluded.high, low = excluded.low,
+            close = excluded.close, volume = excluded.volume
+    ''', (target, bucket, bucket, source, start, end, source, source))
+    return cursor.rowcount
+
+def _rollup_market_data(conn, source: str, target: str, after_hours: float, now: int) -> int:
+    """Aggregate source bars older than after_hours into target buckets (UTC aligned)"""
+    bucket = TIMEFRAME_SECONDS[target]
+    cutoff = ((now - int(after_hours * 3600)) // bucket) * bucket
+    watermark = _rollup_watermark(conn, source, target)
+    if cutoff <= watermark:
+        return 0
+    
+    rows = _aggregate_market_data(conn, source, target, watermark, cutoff)
+    conn.execute('''
+        INSERT INTO market_data_rollups (source_timeframe, target_timeframe, watermark)
+        VALUES (?, ?, ?)
+        ON CONFLICT(source_timeframe, target_timeframe) DO UPDATE SET watermark = excluded.watermark
+    ''', (source, target, cutoff))
+    return rows
+
+def rollup_backfilled_market_data(conn, timeframe: str, start: int, end: int) -> Dict[str, int]:
+    """
+    Roll up bars written behind the rollup watermarks (bulk history imports)
+    Scheduled rollups only read source bars past their watermark, so older
+    rows would never be aggregated and would be pruned under keep_hours. The
+    buckets covering [start, end] that a watermark has already passed are
+    aggregated here, down the rollup chain; later buckets are left to
+    maintain_market_data.
+    """
+    stats = {}
+    ranges = {timeframe: (int(start), int(end))}
+    for rollup in MARKET_DATA_RETENTION.get("rollups", []):
+        source, target = rollup.get("from"), rollup.get("to")
+        if source not in ranges or target not in TIMEFRAME_SECONDS:
+            continue
+        bucket = TIMEFRAME_SECONDS[target]
+        low = (ranges[source][0] // bucket) * bucket
+        high = min((ranges[source][1] // bucket + 1) * bucket, _rollup_watermark(conn, source, target))
+        if low >= high:
+            continue
+        stats[f"{source}->{target}"] = _aggregate_market_data(conn, source, target, low, high)
+        previous = ranges.get(target)
+        ranges[target] = (min(low, previous[0]), max(high - 1, previous[1])) if previous else (low, high - 1)
+    return stats
+
+def maintain_market_data(force: bool = False) -> Dict[str, Any]:
+    """Flush buffered rows, roll up aged bars and prune expired ones"""
+    global _last_market_data_maintenance
+    
+    interval = MARKET_DATA_RETENTION.get("maintenance_interval_minutes", 60) * 60
+    if not force and time.time() - _last_market_data_maintenance < interval:
+        return {"skipped": True}
+    _last_market_data_maintenance = time.time()
+    
+    stats = {"flushed": market_data_writer.flush(), "rolled_up": {}, "pruned": {}}
+    try:
+        now = int(time.time())
+        conn = sqlite3.connect(METADATA_DB_PATH)
+        with conn:
+            # Rollups run in order so 5min rows exist before they feed 1h
+            for rollup in MARKET_DATA_RETENTION.get("rollups", []):
+                source, target = rollup.get("from"), rollup.get("to")
+                if source not in TIMEFRAME_SECONDS or target not in TIMEFRAME_SECONDS:
+                    continue
+                stats["rolled_up"][f"{source}->{target}"] = _rollup_market_data(
+                    conn, source, target, rollup.get("after_hours", 24), now
+                )
+            
+            for timeframe, keep_hours in MARKET_DATA_RETENTION.get("keep_hours", {}).items():
+                if keep_hours is None:
+                    continue
+                cursor = conn.execute(
+                    'DELETE FROM market_data WHERE timeframe = ? AND ts < ?',
+                    (timeframe, now - int(keep_hours * 3600))
+                )
+                stats["pruned"][timeframe] = cursor.rowcount
+        conn.close()
+        
+        embedder_logger.info(f"Market data maintenance: {stats}")
+        
+    except Exception as e:
+        embedder_logger.error(f"Error maintaining market data: {e}")
+        stats["error"] = str(e)
+    
+    return stats
+
+def get_market_data_history(symbol: str, timeframe: str = "1min", start: Optional[int] = None,
+                            end: Optional[int] = None, limit: int = 1000) -> List[Dict[str, Any]]:
+    """Read stored bars for a symbol between epoch seconds [start, end)"""
+    try:
+        conn = sqlite3.connect(METADATA_DB_PATH)
+        rows = conn.execute('''
+            SELECT ts, open, high, low, close, volume FROM market_data
+            WHERE symbol = ? AND timeframe = ? AND ts >= ? AND ts < ?
+            ORDER BY ts DESC LIMIT ?
+        ''', (symbol, timeframe, start or 0, end or 2**62, limit)).fetchall()
+        conn.close()
+        
+        columns = ("ts", "open", "high", "low", "close", "volume")
+        return [dict(zip(columns, row)) for row in reversed(rows)]
+        
+    except Exception as e:
+        embedder_logger.error(f"Error reading market data history for {symbol}: {e}")
+        return []
+
 def analyze_signal(market_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """Analyze market data and generate trading signals"""
     try:
@@ -924,6 +1149,47 @@ def monitor_positions():
     except Exception as e:
         embedder_logger.error(f"Error monitoring positions: {e}")
 
+def _market_data_from_bus(symbol: str, max_age: float = 60) -> Optional[Dict[str, Any]]:
+    """Build market data from the latest bus snapshot event instead of refetching"""
+    try:
+        from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.market_data_bus import market_data_bus, EVENT_SNAPSHOT
+        
+        event = market_data_bus.get_latest(EVENT_SNAPSHOT, symbol, max_age=max_age)
+        if event is None:
+            return None
+        
+        stock = event.data
+        sma = stock.get("sma", {}) or {}
+        macd = stock.get("macd", {}) or {}
+        bollinger = stock.get("bollinger", {}) or {}
+        indicators = {
+            "sma_5": sma.get("5"),
+            "sma_20": sma.get("20"),
+            "rsi": stock.get("rsi"),
+            "macd": macd.get("macd"),
+            "macd_signal": macd.get("signal"),
+            "macd_histogram": macd.get("histogram"),
+            "bb_upper": bollinger.get("upper"),
+            "bb_middle": bollinger.get("middle"),
+            "bb_lower": bollinger.get("lower")
+        }
+        
+        market_data = {
+            "symbol": symbol,
+            "price": float(stock.get("price", 0)),
+            "volume": int(stock.get("volume", 0)),
+            "timestamp": event.timestamp,
+            "timeframe": "1min",
+            "indicators": {k: v for k, v in indicators.items() if v is not None},
+            "data_source": f"bus:{event.provider}"
+        }
+        market_data_cache[f"{symbol}_1min"] = market_data
+        return market_data
+        
+    except Exception as e:
+        embedder_logger.error(f"Error reading bus market data for {symbol}: {e}")
+        return None
+
 def autonomous_trading_loop():
     """Main autonomous trading loop"""
     embedder_logger.info("Starting autonomous trading loop...")
@@ -937,8 +1203,8 @@ def autonomous_trading_loop():
                 if not autonomous_mode:
                     break
                 
-                # Get market data
-                market_data = get_live_market_data(symbol)
+                # Prefer the shared bus snapshot, only fetch symbols it doesn't cover
+                market_data = _market_data_from_bus(symbol) or get_live_market_data(symbol)
                 if market_data:
                     # Analyze for signals
                     signal = analyze_signal(market_data)
@@ -954,6 +1220,10 @@ def autonomous_trading_loop():
                 # Brief pause between symbols
                 time.sleep(1)
             
+            # One batched write per refresh cycle, rollup/prune when due
+            market_data_writer.flush()
+            maintain_market_data()
+            
             # Longer pause between complete cycles
             time.sleep(60)  # 1 minute between cycles
             
@@ -997,6 +1267,8 @@ def stop_autonomous_trading():
     if trading_thread and trading_thread.is_alive():
         trading_thread.join(timeout=5)
     
+    market_data_writer.flush()
+    
     embedder_logger.info("Autonomous trading system stopped")
 
 def get_trading_status():
@@ -1006,6 +1278,7 @@ def get_trading_status():
         "active_positions": len([p for p in active_positions.values() if p.get("status") == "open"]),
         "pending_signals": len([s for s in trade_signals.values() if not s.get("processed", False)]),
         "market_data_cache_size": len(market_data_cache),
+        "market_data_pending_rows": market_data_writer.pending(),
         "memory_vectors_count": len(memory_vectors),
         "chroma_available": CHROMA_AVAILABLE,
         "trading_libs_available": TRADING_LIBS_AVAILABLE
@@ -1090,6 +1363,48 @@ def get_all_embeddings(limit=50):
     
     return embeddings[:limit]
 
+def get_embeddings_matching(predicate: Callable[[Dict[str, Any]], bool], limit: int = 5000,
+                            batch_size: int = 1000) -> List[Dict[str, Any]]:
+    """Embeddings with their vectors whose metadata passes predicate - filtered before the limit"""
+    embeddings = []
+    seen = set()
+    
+    # Page through ChromaDB asking for the vectors explicitly
+    try:
+        client, collection = get_chroma_client()
+        if collection is not None:
+            offset = 0
+            while len(embeddings) < limit:
+                results = collection.get(limit=batch_size, offset=offset,
+                                         include=["embeddings", "metadatas", "documents"])
+                ids = results.get("ids") or []
+                if not ids:
+                    break
+                for i, emb_id in enumerate(ids):
+                    meta = results["metadatas"][i] or {}
+                    if predicate(meta) and len(embeddings) < limit:
+                        embeddings.append({
+                            "id": emb_id,
+                            "text": results["documents"][i] if results.get("documents") else "",
+                            "metadata": meta,
+                            "vector": list(results["embeddings"][i])
+                        })
+                    seen.add(emb_id)
+                offset += len(ids)
+    except Exception as e:
+        embedder_logger.error(f"Error getting matching embeddings from ChromaDB: {e}")
+    
+    # Local index for anything ChromaDB does not hold
+    if not memory_vectors:
+        _load_from_disk()
+    for emb_id, embedding in list(memory_vectors.items()):
+        if len(embeddings) >= limit:
+            break
+        if emb_id not in seen and predicate(embedding.get("meta") or {}):
+            embeddings.append(embedding)
+    
+    return embeddings
+
 def get_backend_status():
     """Get comprehensive status of all backends and systems"""
     chroma_count = 0
@@ -1180,5 +1495,6 @@ except Exception as e:
 __all__ = [
     'store_embedding', 'package_embedding', 'query_embeddings', 'get_all_embeddings',
     'get_backend_status', 'get_trading_status', 'start_autonomous_trading', 'stop_autonomous_trading',
-    'get_live_market_data', 'analyze_signal', 'execute_trade', 'monitor_positions'
+    'get_live_market_data', 'analyze_signal', 'execute_trade', 'monitor_positions',
+    'maintain_market_data', 'get_market_data_history', 'market_data_writer'
 ]
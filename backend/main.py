@@ -21,12 +21,18 @@ from Gremlin_Trade_Core.globals import (
 
 # Use centralized logging
 logger = setup_agent_logging(Path(__file__).stem)
-    asyncio, signal, logging, Path, datetime, json,
+
 # Import system components
 from Gremlin_Trade_Core.agent_coordinator import AgentCoordinator
 from Gremlin_Trade_Core.Gremlin_Trader_Tools.Tool_Control_Agent.tool_control_agent import ToolControlAgent
 from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.market_data_service import MarketDataService
 from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.simple_market_service import SimpleMarketService
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.replay_market_service import ReplayMarketService
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.universe_snapshot import universe_provider
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.market_data_bus import market_data_bus
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.market_regime_service import market_regime_service
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.fundamentals_cache import fundamentals_cache
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.correlation_engine import correlation_engine
 
 class GremlinTradingSystem:
     """
@@ -55,7 +61,7 @@ class GremlinTradingSystem:
             'auto_start_agents': True,
             'enable_web_interface': True,
             'log_level': 'INFO',
-            'market_data_provider': 'simple'  # or 'yahoo', 'alpaca', etc.
+            'market_data_provider': os.getenv("GREMLIN_MARKET_PROVIDER", "simple")  # 'simple', 'replay', 'yahoo', etc.
         }
         
         self.logger.info("Gremlin ShadTail Trader System initialized")
@@ -76,6 +82,7 @@ class GremlinTradingSystem:
             "ToolControlAgent": "Gremlin_Trade_Core.Gremlin_Trader_Tools.Tool_Control_Agent.tool_control_agent.ToolControlAgent",
             "MarketDataService": "Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.market_data_service.MarketDataService",
             "SimpleMarketService": "Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.simple_market_service.SimpleMarketService",
+            "ReplayMarketService": "Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.replay_market_service.ReplayMarketService",
             "BaseMemoryAgent": "Gremlin_Trade_Core.Gremlin_Trader_Tools.Memory_Agent.base_memory_agent.BaseMemoryAgent",
             "MarketTimingAgent": "Gremlin_Trade_Core.Gremlin_Trader_Tools.Timing_Agent.market_timing.MarketTimingAgent",
             "StrategyAgent": "Gremlin_Trade_Core.Gremlin_Trader_Tools.Strategy_Agent.strategy_agent.StrategyAgent",
@@ -140,11 +147,22 @@ class GremlinTradingSystem:
             self.logger.info("Starting market data service...")
             if self.config['market_data_provider'] == 'simple':
                 self.market_data_service = SimpleMarketService()
+            elif self.config['market_data_provider'] == 'replay':
+                self.market_data_service = ReplayMarketService()
             else:
                 self.market_data_service = MarketDataService()
             
             await self.market_data_service.start()
             
+            # Share one universe snapshot across all scanners via the bus
+            await fundamentals_cache.start()
+            await market_data_bus.start()
+            universe_provider.set_source(self.market_data_service.get_live_penny_stocks,
+                                         self.config['market_data_provider'])
+            await universe_provider.start()
+            await market_regime_service.start()
+            await correlation_engine.start()
+            
             # Initialize tool control agent
             self.logger.info("Starting tool control agent...")
             self.tool_control_agent = ToolControlAgent()
@@ -251,24 +269,11 @@ class GremlinTradingSystem:
         try:
             self.logger.info("Starting main trading cycle...")
             
-            while self.is_running and not self.shutdown_event.is_set():
-                try:
-                    # Execute coordinated trading
-                    if self.agent_coordinator:
-                        await self.agent_coordinator.execute_coordinated_trading()
-                    
-                    # Wait before next cycle (30 minutes)
-                    await asyncio.wait_for(
-                        self.shutdown_event.wait(), 
-                        timeout=1800
-                    )
-                    
-                except asyncio.TimeoutError:
-                    # Normal timeout, continue trading cycle
-                    continue
-                except Exception as e:
-                    self.logger.error(f"Error in trading cycle: {e}")
-                    await asyncio.sleep(300)  # 5 minutes on error
+            # Passes run when triggers fire; the periodic sweep is the fallback
+            if self.agent_coordinator:
+                await self.agent_coordinator.start_triggers()
+            
+            await self.shutdown_event.wait()
             
             self.logger.info("Trading cycle stopped")
             
@@ -286,6 +291,7 @@ class GremlinTradingSystem:
             # Shutdown in reverse order of initialization
             if self.agent_coordinator:
                 self.logger.info("Shutting down agent coordinator...")
+                await self.agent_coordinator.stop_triggers()
                 await self.agent_coordinator.shutdown_agents()
                 await self.agent_coordinator.stop()
             
@@ -293,6 +299,12 @@ class GremlinTradingSystem:
                 self.logger.info("Shutting down tool control agent...")
                 await self.tool_control_agent.stop()
             
+            await correlation_engine.stop()
+            await market_regime_service.stop()
+            await universe_provider.stop()
+            await fundamentals_cache.stop()
+            await market_data_bus.stop()
+            
             if self.market_data_service:
                 self.logger.info("Shutting down market data service...")
                 await self.market_data_service.stop()
@@ -263,10 +263,16 @@ async def get_feed():
         server_logger.info("Feed data requested")
         
         # Use the new strategy manager for comprehensive scanning
-        from Gremlin_Trade_Core.Gremlin_Trader_Strategies import run_all_strategies
+        from Gremlin_Trade_Core.Gremlin_Trader_Strategies import run_all_strategies_with_metadata
         
-        # Run all strategies to generate signals
-        signals = await run_all_strategies(limit=20)
+        # Run all strategies to generate signals - slow strategies are cut at their deadline
+        scan = await run_all_strategies_with_metadata(limit=20)
+        signals = scan["results"]
+        if scan["metadata"].get("partial"):
+            server_logger.warning(
+                f"Partial feed - timed out: {scan['metadata']['timed_out']}, failed: {scan['metadata']['failed']}, "
+                f"skipped: {scan['metadata']['skipped']}"
+            )
         
         # Format for frontend
         feed_data = []
@@ -306,20 +312,26 @@ async def run_scan(request: ScanRequest):
         
         symbols = request.symbols or ["GPRO", "IXHL", "SAVA", "BBIG", "PROG"]
         
+        strategy_metadata = None
         if request.recursive:
             # Use the integrated strategy system
-            from Gremlin_Trade_Core.Gremlin_Trader_Strategies import run_all_strategies
-            results = await run_all_strategies(symbols, limit=50)
+            from Gremlin_Trade_Core.Gremlin_Trader_Strategies import run_all_strategies_with_metadata
+            scan = await run_all_strategies_with_metadata(symbols, limit=50)
+            results = scan["results"]
+            strategy_metadata = scan["metadata"]
         else:
             # Run simple scan
             from Gremlin_Trade_Core.globals import run_scanner
             results = run_scanner(symbols)
         
+        from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.stock_table import to_record_dict
+        
         server_logger.info(f"Scan complete - {len(results)} results")
         return {
             "scan_id": f"scan_{datetime.now().isoformat()}",
             "parameters": request.dict(),
-            "results": results,
+            "results": [to_record_dict(result) for result in results],
+            "strategy_metadata": strategy_metadata,
             "timestamp": datetime.now().isoformat()
         }
         
@@ -599,6 +611,18 @@ async def get_performance_metrics():
         server_logger.error(f"Error getting performance metrics: {e}")
         return {"error": str(e), "timestamp": datetime.now().isoformat()}
 
+@app.get("/api/strategies/performance")
+async def get_strategy_performance():
+    """Get per-strategy weights, latency, timeouts and the last run's metadata"""
+    try:
+        from Gremlin_Trade_Core.Gremlin_Trader_Strategies import get_performance_metrics as get_strategy_metrics
+        
+        return await get_strategy_metrics()
+        
+    except Exception as e:
+        server_logger.error(f"Error getting strategy performance: {e}")
+        return {"error": str(e), "timestamp": datetime.now().isoformat()}
+
 # Source editor endpoints
 @app.get("/api/source/files")
 async def get_file_tree():
@@ -1230,9 +1254,17 @@ async def websocket_updates(websocket: WebSocket):
     active_connections.append(websocket)
     server_logger.info(f"WebSocket connection established. Total: {len(active_connections)}")
     
+    # Each connection gets its own conflating bus subscription - a slow
+    # client only ever sees the latest universe and never delays others
+    from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.market_data_bus import (
+        market_data_bus, EVENT_UNIVERSE
+    )
+    subscription_name = f"websocket-{id(websocket)}"
+    subscription = market_data_bus.subscribe(subscription_name, event_types=[EVENT_UNIVERSE], maxsize=1)
+    
     try:
         while True:
-            # Send periodic updates
+            # Send updates as new snapshots arrive, scanInterval is the fallback
             update_data = {
                 "type": "feed_update",
                 "timestamp": datetime.now().isoformat(),
@@ -1241,11 +1273,12 @@ async def websocket_updates(websocket: WebSocket):
             
             await websocket.send_json(update_data)
             server_logger.debug("WebSocket update sent")
-            await asyncio.sleep(live_settings["scanInterval"])
+            await subscription.get(timeout=live_settings["scanInterval"])
             
     except Exception as e:
         server_logger.error(f"WebSocket error: {e}")
     finally:
+        market_data_bus.unsubscribe(subscription_name)
         if websocket in active_connections:
             active_connections.remove(websocket)
         server_logger.info(f"WebSocket connection closed. Remaining: {len(active_connections)}")
@@ -1254,9 +1287,11 @@ async def get_live_update_data():
     """Get live data for WebSocket updates"""
     try:
         from Gremlin_Trade_Core.Gremlin_Trader_Tools.Strategy_Agent.signal_generator import generate_signals
+        from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.stock_table import to_record_dict
         
-        # Generate fresh signals
+        # Generate fresh signals - records become plain dicts at the JSON boundary
         signals = generate_signals(limit=5, embed=False)  # Don't embed for live updates
+        signals = [to_record_dict(signal) for signal in signals]
         
         return {
             "signals": signals,
@@ -1293,6 +1328,18 @@ async def startup_event():
     
     # Initialize system components
     try:
+        # Start the market data bus and shared universe snapshot before anything scans
+        from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.market_data_bus import market_data_bus
+        from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.universe_snapshot import universe_provider
+        from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.market_regime_service import market_regime_service
+        from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.fundamentals_cache import fundamentals_cache
+        from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.correlation_engine import correlation_engine
+        await fundamentals_cache.start()
+        await market_data_bus.start()
+        await universe_provider.start()
+        await market_regime_service.start()
+        await correlation_engine.start()
+        
         from Gremlin_Trade_Core.config.Agent_in import coordinator
         server_logger.info("Agent coordinator initialized")
         
@@ -1312,6 +1359,20 @@ async def startup_event():
 async def shutdown_event():
     server_logger.info("Gremlin ShadTail Trader API shutting down")
     
+    try:
+        from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.market_data_bus import market_data_bus
+        from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.universe_snapshot import universe_provider
+        from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.market_regime_service import market_regime_service
+        from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.fundamentals_cache import fundamentals_cache
+        from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.correlation_engine import correlation_engine
+        await correlation_engine.stop()
+        await market_regime_service.stop()
+        await universe_provider.stop()
+        await fundamentals_cache.stop()
+        await market_data_bus.stop()
+    except Exception as e:
+        server_logger.error(f"Error stopping market data services: {e}")
+    
     # Close all WebSocket connections
     for connection in active_connections:
         try:
@@ -1327,17 +1388,19 @@ async def shutdown_event():
 async def get_real_market_stocks(limit: int = 50):
     """Get real live penny stock data with technical indicators"""
     try:
-        from Gremlin_Trade_Core.simple_market_service import get_live_penny_stocks_real
+        from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.universe_snapshot import get_universe_snapshot
         
         server_logger.info(f"Real market stocks requested (limit: {limit})")
-        stocks = await get_live_penny_stocks_real(limit)
+        snapshot = await get_universe_snapshot()
+        stocks = snapshot.to_list(limit) if snapshot else []
         
         server_logger.info(f"Returning {len(stocks)} real market stocks")
         return {
             "stocks": stocks,
             "count": len(stocks),
             "timestamp": datetime.now().isoformat(),
-            "data_source": "simple_market_service"
+            "snapshot_version": snapshot.version if snapshot else 0,
+            "data_source": snapshot.source if snapshot else "unavailable"
         }
         
     except Exception as e:
@@ -1352,13 +1415,14 @@ async def get_real_market_stocks(limit: int = 50):
 async def get_stock_details(symbol: str):
     """Get detailed data for a specific stock symbol"""
     try:
-        from Gremlin_Trade_Core.simple_market_service import get_stock_data_real
+        from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.universe_snapshot import get_universe_snapshot
         
         server_logger.info(f"Stock details requested for: {symbol}")
-        stock_data = await get_stock_data_real(symbol.upper())
+        snapshot = await get_universe_snapshot()
+        stock_data = snapshot.get(symbol) if snapshot else None
         
         if stock_data:
-            return stock_data
+            return stock_data.to_dict()
         else:
             raise HTTPException(status_code=404, detail=f"Stock data not found for {symbol}")
             
@@ -1368,12 +1432,12 @@ async def get_stock_details(symbol: str):
 
 @app.get("/api/market/overview")
 async def get_market_overview():
-    """Get general market overview with indices and sentiment"""
+    """Get general market overview with indices, regime and per-field freshness"""
     try:
-        from Gremlin_Trade_Core.simple_market_service import get_market_overview_real
+        from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.market_regime_service import get_market_overview_cached
         
         server_logger.info("Market overview requested")
-        overview = await get_market_overview_real()
+        overview = await get_market_overview_cached()
         
         return overview
         
@@ -1385,12 +1449,13 @@ async def get_market_overview():
 async def get_real_feed():
     """Get trading feed with REAL market data - returns exactly what backend provides"""
     try:
-        from Gremlin_Trade_Core.simple_market_service import get_live_penny_stocks_real
+        from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.universe_snapshot import get_universe_snapshot
         
         server_logger.info("Real feed data requested")
         
         # Get real market data - return exactly what we get, no filtering, no fake data
-        stocks = await get_live_penny_stocks_real(limit=20)
+        snapshot = await get_universe_snapshot()
+        stocks = snapshot.to_list(20) if snapshot else []
         
         server_logger.info(f"Returning {len(stocks)} raw market data entries")
         return stocks  # Return exactly what the backend provides
@@ -1399,6 +1464,56 @@ async def get_real_feed():
         server_logger.error(f"Error getting real feed data: {e}")
         return []  # Return empty list on error, no fake data
 
+@app.get("/api/market/bus")
+async def get_market_bus_metrics():
+    """Get market data bus metrics including per-subscriber lag"""
+    try:
+        from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.market_data_bus import get_bus_metrics
+        from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.universe_snapshot import universe_provider
+        from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.market_regime_service import market_regime_service
+
+        return {
+            "bus": get_bus_metrics(),
+            "universe": universe_provider.get_status(),
+            "regime": market_regime_service.get_status(),
+            "timestamp": datetime.now().isoformat()
+        }
+
+    except Exception as e:
+        server_logger.error(f"Error getting market bus metrics: {e}")
+        return {"error": "Failed to fetch market bus metrics"}
+
+@app.get("/api/market/scheduler")
+async def get_request_scheduler_metrics():
+    """Get provider rate limits, queue depth and wait times"""
+    try:
+        from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.request_scheduler import get_scheduler_metrics
+
+        return {
+            "scheduler": get_scheduler_metrics(),
+            "timestamp": datetime.now().isoformat()
+        }
+
+    except Exception as e:
+        server_logger.error(f"Error getting request scheduler metrics: {e}")
+        return {"error": "Failed to fetch request scheduler metrics"}
+
+@app.get("/api/market/correlations")
+async def get_correlation_groupings():
+    """Get correlation clusters and sector groups of the tracked symbols"""
+    try:
+        from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.correlation_engine import correlation_engine
+
+        return {
+            "engine": correlation_engine.get_status(),
+            "groupings": await asyncio.to_thread(correlation_engine.groupings),
+            "timestamp": datetime.now().isoformat()
+        }
+
+    except Exception as e:
+        server_logger.error(f"Error getting correlation groupings: {e}")
+        return {"error": "Failed to fetch correlation groupings"}
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000, log_level="info")
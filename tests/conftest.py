@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Backend root on the path so tests import Gremlin_Trade_Core like the services do
+sys.path.insert(0, str(Path(__file__).parent.parent / "backend"))
@@ -0,0 +1,64 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+try:
+    from Gremlin_Trade_Core import agent_coordinator as coordinator_module
+except ImportError as exc:  # trading/web dependency groups not installed
+    pytest.skip(f"agent_coordinator unavailable: {exc}", allow_module_level=True)
+
+
+class StubStrategyAgent:
+    async def analyze_market_conditions(self):
+        return {"trend": "bullish", "volatility": 0.2}
+
+    async def generate_signals(self, symbols, market_conditions):
+        return [SimpleNamespace(symbol=symbol, confidence=0.9, entry_price=5.0, stop_loss=4.5,
+                                take_profit=6.0, indicators={"rsi": 55},
+                                strategy_type=SimpleNamespace(value="momentum"),
+                                signal_strength=SimpleNamespace(value="strong"))
+                for symbol in symbols]
+
+
+class StubTimingAgent:
+    async def analyze_optimal_entry(self, symbol, strategy_type="momentum"):
+        return SimpleNamespace(symbol=symbol, session=SimpleNamespace(value="regular"), confidence=0.85,
+                               risk_level="low", optimal_entry=datetime.now())
+
+
+class StubRuleAgent:
+    async def evaluate_rules(self, symbol, market_data):
+        return [SimpleNamespace(rule_id="entry_momentum", triggered=True, confidence=0.9)]
+
+
+def make_coordinator(timing_agent):
+    coordinator = coordinator_module.AgentCoordinator()
+    coordinator.strategy_agent = StubStrategyAgent()
+    coordinator.timing_agent = timing_agent
+    coordinator.rule_agent = StubRuleAgent()
+    coordinator.record_decisions = False
+    coordinator.active_watchlist = ["AAA", "BBB"]
+    return coordinator
+
+
+def test_cycle_with_stub_agents_produces_decisions():
+    coordinator = make_coordinator(StubTimingAgent())
+
+    decisions = coordinator_module.asyncio.run(coordinator.coordinate_symbols(
+        ["AAA", "BBB"], {}, {"deferred": [], "timeouts": {}, "errors": {}, "symbol_seconds": {}},
+        {"AAA", "BBB"}, float("inf")
+    ))
+
+    assert {decision.symbol for decision in decisions} == {"AAA", "BBB"}
+    assert all("timing" in decision.contributing_agents for decision in decisions)
+    assert all(decision.action == "buy" for decision in decisions)
+
+
+def test_timing_failure_is_isolated_to_its_phase():
+    coordinator = make_coordinator(SimpleNamespace())  # no analyze_optimal_entry
+
+    decision = coordinator_module.asyncio.run(coordinator.coordinate_trading_decision("AAA", {}))
+
+    assert decision is not None
+    assert "timing" not in decision.contributing_agents
@@ -0,0 +1,26 @@
+import importlib
+
+import numpy as np
+import pandas as pd
+
+# The package re-exports instances under the module names
+backtest_engine = importlib.import_module("Gremlin_Trade_Core.Gremlin_Trader_Strategies.backtest_engine")
+
+RULES = {
+    "signal_rules": {"price_under": 10.0, "volume_over": 1000000, "rotation_over": 2.0, "volume_spike": 2000000},
+    "recursive_scanner": {"rotation_min": 2.0, "volume_min": 1000000, "price_under": 10.0, "ema_cross": True,
+                          "vwap_break": True, "volume_spike": True, "min_volume_ratio": 2.0,
+                          "pattern_confirmation": True},
+}
+
+
+def test_recursive_scanner_enters_only_on_bars_with_a_volume_spike():
+    frame = pd.DataFrame({
+        "close": [5.0, 5.0, 5.0], "cum_volume": [3e6, 3e6, 3e6], "rotation": [3.0, 3.0, 3.0],
+        "ema_5": [5.1, 5.1, 5.1], "ema_20": [5.0, 5.0, 5.0], "vwap": [4.9, 4.9, 4.9],
+        "volume_ratio": [1.2, 2.5, np.nan],
+    })
+
+    mask, _, _ = backtest_engine.entry_signals(frame, "recursive_scanner", RULES)
+
+    assert mask.tolist() == [False, True, False]
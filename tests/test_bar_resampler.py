@@ -0,0 +1,49 @@
+import pandas as pd
+
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.bar_resampler import BarResampler
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.bar_store import BarStore
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.market_data_bus import MarketDataBus, EVENT_BAR
+
+SESSION_OPEN = int(pd.Timestamp("2025-03-10 09:30", tz="America/New_York").timestamp())
+BUCKET_END = SESSION_OPEN + 300
+
+
+def minute(offset, close=5.0):
+    return {"ts": SESSION_OPEN + 60 * offset, "open": close, "high": close + 0.01,
+            "low": close - 0.01, "close": close, "volume": 1000.0}
+
+
+def make_resampler(tmp_path, bus=None):
+    config = {"timeframes": ["5min"], "session": "regular", "flush_grace_seconds": 120}
+    return BarResampler(config, store=BarStore(tmp_path), bus=bus or MarketDataBus())
+
+
+def test_bucket_missing_its_closing_minute_is_flushed_after_the_grace(tmp_path):
+    bus = MarketDataBus()
+    resampler = make_resampler(tmp_path, bus)
+    for offset in range(4):
+        resampler.on_minute("AAA", minute(offset))
+
+    assert not resampler.get_bars("AAA", "5min")["complete"].iloc[-1]
+    assert resampler.flush(now=BUCKET_END + 60) == 0
+    assert resampler.flush(now=BUCKET_END + 120) == 1
+
+    bars = resampler.get_bars("AAA", "5min")
+    assert len(bars) == 1
+    assert bool(bars["complete"].iloc[0]) and bars["volume"].iloc[0] == 4000
+    assert bus.get_latest(EVENT_BAR, "AAA", timeframe="5min").data["complete"]
+
+
+def test_late_closing_minute_is_folded_into_the_flushed_bar(tmp_path):
+    resampler = make_resampler(tmp_path)
+    for offset in range(4):
+        resampler.on_minute("AAA", minute(offset))
+    resampler.flush(now=BUCKET_END + 120)
+
+    resampler.on_minute("AAA", minute(4, close=5.5))
+    resampler.on_minute("AAA", minute(5))
+
+    bars = resampler.get_bars("AAA", "5min", include_partial=False)
+    assert len(bars) == 1
+    assert bars["volume"].iloc[0] == 5000 and bars["close"].iloc[0] == 5.5
+    assert resampler.get_bars("AAA", "5min")["ts"].iloc[-1] == BUCKET_END
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.bar_store import BarStore, BAR_COLUMNS
+
+DAY = 86400
+START = 1_760_000_000 - 1_760_000_000 % DAY  # a UTC midnight
+
+
+def minute_bars(first_ts, count, price=2.0):
+    ts = first_ts + 60 * np.arange(count)
+    close = price + 0.01 * np.arange(count)
+    return pd.DataFrame({"ts": ts, "open": close, "high": close, "low": close, "close": close,
+                         "volume": np.full(count, 1000.0)})[BAR_COLUMNS]
+
+
+def test_append_only_touches_the_new_day(tmp_path):
+    store = BarStore(tmp_path)
+    store.write("aaa", minute_bars(START, 100))
+    first_day = next(store.partition_dir("AAA").iterdir())
+    before = first_day.stat().st_mtime_ns
+
+    store.write("AAA", minute_bars(START + DAY, 50))
+
+    assert first_day.stat().st_mtime_ns == before
+    assert len(list(store.partition_dir("AAA").iterdir())) == 2
+    assert len(store.read("AAA")) == 150
+    assert store.read("AAA")["ts"].is_monotonic_increasing
+
+
+def test_overlapping_write_merges_within_its_partition(tmp_path):
+    store = BarStore(tmp_path)
+    store.write("AAA", minute_bars(START, 100))
+    store.write("AAA", minute_bars(START + 60 * 90, 20, price=5.0))
+
+    bars = store.read("AAA")
+    assert len(bars) == 110
+    assert bars.loc[bars["ts"] == START + 60 * 95, "close"].item() == 5.05
+
+
+def test_range_reads_and_symbol_listing(tmp_path):
+    store = BarStore(tmp_path)
+    store.write("AAA", pd.concat([minute_bars(START, 10), minute_bars(START + 2 * DAY, 10)]))
+
+    assert len(store.read("AAA", start=START + DAY)) == 10
+    assert len(store.read("AAA", end=START + DAY)) == 10
+    assert store.list_symbols("1min") == ["AAA"]
+    assert store.has("AAA") and not store.has("BBB")
+
+
+def test_single_file_store_is_split_on_write(tmp_path):
+    store = BarStore(tmp_path)
+    legacy = store.path_for("AAA", "1min", "csv")
+    minute_bars(START, 30).to_csv(legacy, index=False)
+    assert len(store.read("AAA")) == 30
+
+    store.write("AAA", minute_bars(START + DAY, 30))
+
+    assert not legacy.exists()
+    assert len(store.read("AAA")) == 60
+    assert store.list_symbols("1min") == ["AAA"]
+
+
+def test_write_without_merge_replaces_history(tmp_path):
+    store = BarStore(tmp_path)
+    store.write("AAA", minute_bars(START, 30))
+    store.write("AAA", minute_bars(START + DAY, 5), merge=False)
+
+    assert store.read("AAA")["ts"].min() == START + DAY
+    assert len(store.read("AAA")) == 5
+
+
+def test_write_counts_only_new_or_changed_bars(tmp_path):
+    store = BarStore(tmp_path)
+    assert store.write("AAA", minute_bars(START, 100)) == 100
+    assert store.write("AAA", minute_bars(START, 100)) == 0
+
+    # 10 unchanged, 5 changed and 10 new bars
+    changed = minute_bars(START, 110).iloc[85:].copy()
+    changed.loc[changed.index[10:15], "close"] += 1.0
+    assert store.write("AAA", changed) == 15
@@ -0,0 +1,63 @@
+import asyncio
+
+import numpy as np
+import pandas as pd
+
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents import correlation_engine as ce
+
+
+class FakeSubscription:
+    async def get_batch(self, timeout=5.0):
+        await asyncio.sleep(0.01)
+        return []
+
+
+class FakeBus:
+    def subscribe(self, name, event_types=None, maxsize=None):
+        return FakeSubscription()
+
+    def unsubscribe(self, name):
+        pass
+
+
+class FakeStore:
+    def list_symbols(self, timeframe="1min"):
+        return ["AAA", "AAB", "ZZZ"]
+
+
+def stored_bars(count=200, seed=5):
+    """AAA and AAB share a factor, ZZZ is independent"""
+    rng = np.random.default_rng(seed)
+    ts = 1_760_000_000 + 300 * np.arange(count)
+    factor = rng.normal(0, 0.01, count)
+    paths = {
+        "AAA": factor + rng.normal(0, 0.002, count),
+        "AAB": factor + rng.normal(0, 0.002, count),
+        "ZZZ": rng.normal(0, 0.01, count)
+    }
+    return {symbol: pd.DataFrame({"ts": ts, "close": 10 * np.exp(np.cumsum(returns))})
+            for symbol, returns in paths.items()}
+
+
+def test_start_seeds_from_the_bar_store(monkeypatch):
+    bars = stored_bars()
+    monkeypatch.setattr(ce, "bar_store", FakeStore())
+    monkeypatch.setattr(ce, "get_resampled_bars", lambda symbol, timeframe, limit=None: bars[symbol])
+    engine = ce.CorrelationEngine({"halflife_bars": 50, "min_periods": 10}, bus=FakeBus())
+
+    async def run():
+        await engine.start()
+        for _ in range(200):
+            if engine.seeded_ts is not None:
+                break
+            await asyncio.sleep(0.01)
+        await engine.stop()
+
+    asyncio.run(run())
+
+    assert engine.seeded_ts == int(bars["AAA"]["ts"].iloc[-1])
+    assert engine.correlation("AAA", "AAB") > 0.8
+    assert engine.groupings()["clusters"] == {"AAA": ["AAA", "AAB"]}
+
+    engine.on_bar("AAA", {"ts": engine.seeded_ts, "close": 11.0})
+    assert engine.stats["late_bars"] == 1
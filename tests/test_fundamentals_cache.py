@@ -0,0 +1,44 @@
+import asyncio
+
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.fundamentals_cache import FundamentalsCache
+
+
+def make_cache(tmp_path, calls, config=None):
+    async def fetch(symbol):
+        calls.append(symbol)
+        if symbol == "GONE":
+            raise ValueError("no data")
+        return {"float_shares": 20e6, "market_cap": 5e7, "sector": "Healthcare"}
+
+    return FundamentalsCache(fetch, tmp_path / "fundamentals.db", config or {"failure_retry_hours": 4})
+
+
+def test_failed_fetches_are_not_retried_within_the_negative_ttl(tmp_path):
+    calls = []
+    cache = make_cache(tmp_path, calls)
+
+    assert asyncio.run(cache.refresh(["GPRO", "GONE"])) == 1
+    assert asyncio.run(cache.refresh(["GPRO", "GONE"])) == 0
+
+    assert calls == ["GPRO", "GONE"]
+    assert cache.get_status()["failed_symbols"] == 1
+
+
+def test_failed_fetches_are_retried_once_the_ttl_expires(tmp_path):
+    calls = []
+    cache = make_cache(tmp_path, calls, {"failure_retry_hours": 0})
+
+    asyncio.run(cache.refresh(["GONE"]))
+    asyncio.run(cache.refresh(["GONE"]))
+
+    assert calls == ["GONE", "GONE"]
+
+
+def test_force_refresh_ignores_recent_failures(tmp_path):
+    calls = []
+    cache = make_cache(tmp_path, calls)
+
+    asyncio.run(cache.refresh(["GONE"]))
+    asyncio.run(cache.refresh(["GONE"], force=True))
+
+    assert calls == ["GONE", "GONE"]
@@ -0,0 +1,52 @@
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+try:
+    from Gremlin_Trade_Memory import embedder
+except ImportError as exc:  # trading/ML dependency groups not installed
+    pytest.skip(f"embedder unavailable: {exc}", allow_module_level=True)
+
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.bar_store import BarStore
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.history_importer import HistoryImporter
+
+# Two sessions 40 days back: past every rollup and the 1min/5min retention, inside the 1h one
+SESSION_OPEN = pd.Timestamp.now(tz="UTC").normalize() - pd.Timedelta(days=40) + pd.Timedelta(hours=14, minutes=30)
+
+
+def old_minutes():
+    opens = [SESSION_OPEN, SESSION_OPEN + pd.Timedelta(days=1)]
+    ts = np.concatenate([int(start.timestamp()) + 60 * np.arange(390) for start in opens])
+    close = 2.0 + 0.001 * np.arange(len(ts))
+    return pd.DataFrame({"timestamp": pd.to_datetime(ts, unit="s", utc=True).strftime("%Y-%m-%d %H:%M:%S"),
+                         "open": close, "high": close + 0.01, "low": close - 0.01, "close": close,
+                         "volume": 1000})
+
+
+def rows(db_path, timeframe):
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute("SELECT COUNT(*), SUM(volume) FROM market_data WHERE symbol = 'GPRO' AND timeframe = ?",
+                            (timeframe,)).fetchone()
+
+
+def test_imported_minutes_are_rolled_up_before_they_are_pruned(tmp_path, monkeypatch):
+    db_path = tmp_path / "metadata.db"
+    monkeypatch.setattr(embedder, "METADATA_DB_PATH", db_path)
+    embedder.init_metadata_database()
+    # Scheduled maintenance has already moved every watermark past the imported range
+    assert "error" not in embedder.maintain_market_data(force=True)
+
+    source = tmp_path / "import"
+    source.mkdir()
+    old_minutes().to_csv(source / "GPRO_1min.csv", index=False)
+    importer = HistoryImporter(BarStore(tmp_path / "bars"), db_path, {"source_tz": "UTC", "session": "all"})
+    stats = importer.run(source, workers=1, build_index=False)
+    assert stats["rows"] == 780
+
+    embedder.maintain_market_data(force=True)
+
+    assert rows(db_path, "1min")[0] == 0
+    assert rows(db_path, "1h") == (14, 780 * 1000)
+    assert rows(db_path, "1d") == (2, 780 * 1000)
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.market_state_index import MarketStateIndex
+
+WINDOW, HORIZON = 30, 10
+
+
+def gapped_bars(seed=3):
+    """200 5-minute bars with a weekend between bar 99 and bar 100"""
+    rng = np.random.default_rng(seed)
+    ts = 1_700_000_000 + 300 * np.arange(200)
+    ts[100:] += 3 * 86400
+    close = 3.0 * np.exp(np.cumsum(rng.normal(0, 0.004, 200)))
+    return pd.DataFrame({"ts": ts, "close": close, "high": close * 1.002, "low": close * 0.998,
+                         "volume": rng.lognormal(10, 0.5, 200)})
+
+
+def make_index():
+    index = MarketStateIndex("5min", {"window": WINDOW, "horizon": HORIZON, "k": 1000})
+    index.add_bars("AAA", gapped_bars())
+    return index
+
+
+def test_outcomes_resolving_after_a_gap_are_excluded():
+    bars = gapped_bars()
+    query_bar = 105
+    summary = make_index().similar_setups("QQQ", bars.iloc[:query_bar + 1])
+
+    # States ending at bar r resolve at bar r + HORIZON; only r + HORIZON <= query_bar are known
+    assert summary["neighbors"] == query_bar - HORIZON - (WINDOW - 1) + 1
+
+
+def test_own_overlapping_windows_are_excluded_across_a_gap():
+    bars = gapped_bars()
+    query_bar = 105
+    summary = make_index().similar_setups("AAA", bars.iloc[:query_bar + 1])
+
+    # The query window starts at bar query_bar - WINDOW + 1; own states ending there or later overlap it
+    assert summary["neighbors"] == (query_bar - WINDOW + 1) - (WINDOW - 1)
+
+
+def test_save_and_load_keep_outcome_times(tmp_path):
+    index = make_index()
+    path = index.save(tmp_path / "states.npz")
+    loaded = MarketStateIndex("5min", {"window": WINDOW, "horizon": HORIZON, "k": 1000})
+
+    assert loaded.load(path) == index.get_status()["states"]
+    np.testing.assert_array_equal(loaded._resolved_ts, index._resolved_ts)
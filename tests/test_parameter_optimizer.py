@@ -0,0 +1,44 @@
+import importlib
+
+import pandas as pd
+import pytest
+
+# The package re-exports the parameter_optimizer instance under the module's name
+po = importlib.import_module("Gremlin_Trade_Core.Gremlin_Trader_Strategies.parameter_optimizer")
+
+
+def make_result(rows, base_weights):
+    return {
+        "run_id": "20260101T000000Z", "method": "grid", "objective": "sharpe", "target": "combined",
+        "folds": [], "symbols": 3, "base_weights": base_weights, "table": pd.DataFrame(rows)
+    }
+
+
+@pytest.fixture
+def saved(monkeypatch):
+    exported = []
+    monkeypatch.setattr(po, "save_strategy_params",
+                        lambda parameters, metadata: exported.append(parameters) or {"version": 1})
+    return exported
+
+
+def test_export_normalizes_swept_weights_over_the_full_set(saved):
+    base = {"momentum": 0.4, "mean_reversion": 0.3, "penny": 0.3}
+    result = make_result([{"candidate": 0, "score": 1.2, "weights.momentum": 0.6, "oos_sharpe": 1.2, "is_sharpe": 1.5}], base)
+
+    po.ParameterOptimizer().export_best(result)
+
+    weights = saved[0]["weights"]
+    assert set(weights) == set(base)
+    assert weights["momentum"] == pytest.approx(0.5)
+    assert weights["mean_reversion"] == pytest.approx(0.25)
+    assert sum(weights.values()) == pytest.approx(1.0)
+
+
+def test_export_without_swept_weights_leaves_weights_out(saved):
+    result = make_result([{"candidate": 0, "score": 0.8, "settings.stop_loss_pct": 0.05, "oos_sharpe": 0.8}],
+                         {"momentum": 1.0})
+
+    po.ParameterOptimizer().export_best(result)
+
+    assert saved[0] == {"settings": {"stop_loss_pct": 0.05}}
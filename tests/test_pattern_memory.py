@@ -0,0 +1,67 @@
+import zlib
+
+import numpy as np
+
+from Gremlin_Trade_Core.Gremlin_Trader_Strategies import pattern_memory as pm
+
+DIMENSION = 16
+
+
+def fake_embed_texts(texts, batch_size=None):
+    """Deterministic non-zero vectors so identical texts are identical"""
+    return np.stack([np.random.default_rng(zlib.crc32(text.encode())).random(DIMENSION, dtype=np.float32)
+                     for text in texts])
+
+
+def make_memory(monkeypatch, stored=()):
+    monkeypatch.setattr(pm, "embed_texts", fake_embed_texts)
+    memory = pm.PatternMemory({"top_k": 1, "refresh_seconds": 3600})
+    memory.dimension = DIMENSION
+    monkeypatch.setattr(memory, "_stored_embeddings", lambda: list(stored))
+    return memory
+
+
+def test_is_successful_recognises_learn_from_outcome_metadata():
+    assert pm.is_successful({"success": True, "profit_loss": 12.5})
+    assert pm.is_successful({"success": "True"})
+    assert pm.is_successful({"profit_loss": 3.0})
+    assert not pm.is_successful({"success": False, "profit_loss": -4.0})
+    assert not pm.is_successful({"memory_type": "learning_experience"})
+
+
+def test_load_keeps_successful_outcomes(monkeypatch):
+    candidate = {"symbol": "GPRO", "signal": ["vwap_break"], "price": 2.5}
+    vector = fake_embed_texts([pm.pattern_text(candidate)])[0].tolist()
+    stored = [{"id": "win", "metadata": {"success": True, "profit_loss": 40.0}, "vector": vector},
+              {"id": "loss", "metadata": {"success": False, "profit_loss": -10.0}, "vector": vector}]
+    memory = make_memory(monkeypatch, stored)
+
+    assert memory.load(force=True) == 1
+    scores = memory.score([pm.pattern_text(candidate)])
+    assert scores is not None and scores[0] > 0.99
+
+
+def test_profitable_outcome_populates_patterns(monkeypatch):
+    memory = make_memory(monkeypatch)
+    monkeypatch.setattr(pm, "pattern_memory", memory)
+    candidate = {"symbol": "SAVA", "signal": ["volume_spike"], "price": 7.1}
+
+    # Nothing stored yet - the scanner falls back to its heuristic
+    assert pm.score_candidates([candidate]) is None
+
+    pm.record_pattern_outcome("SAVA", success=False, profit_loss=-5.0)
+    assert memory.get_status()["patterns"] == 0
+
+    add_pattern = memory.add_pattern
+    monkeypatch.setattr(memory, "add_pattern", lambda c, meta=None: add_pattern(c, meta, persist=False))
+    pm.record_pattern_outcome("SAVA", success=True, profit_loss=25.0, price=7.1)
+    assert memory.get_status()["patterns"] == 1
+
+    scores = pm.score_candidates([candidate])
+    assert scores is not None and scores[0] > 0.99
+
+
+def test_no_model_yields_no_similarity(monkeypatch):
+    memory = pm.PatternMemory({"top_k": 1})
+    monkeypatch.setattr(pm, "embed_texts", lambda texts, batch_size=None: np.zeros((len(texts), memory.dimension), np.float32))
+    assert memory.add_pattern({"symbol": "GPRO", "signal": [], "price": 1.0}, persist=False) is None
@@ -0,0 +1,69 @@
+import asyncio
+import time
+
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents import shard_coordinator as sc
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.request_scheduler import RequestScheduler
+
+SLOW = {"on": True}
+
+
+class FakeCoordinator:
+    market_snapshot = None
+
+    async def coordinate_symbols(self, symbols, market_conditions, metrics, must_run, deadline):
+        # Blocks the worker the way CPU-bound strategy code does
+        if SLOW["on"]:
+            time.sleep(30)
+        for symbol in symbols:
+            metrics["symbol_seconds"][symbol] = 0.01
+        return [{"symbol": symbol, "action": "buy"} for symbol in symbols]
+
+    @staticmethod
+    def decision_fields(decision):
+        return decision
+
+
+def new_metrics():
+    return {"timeouts": {}, "errors": {}, "symbol_seconds": {}, "deferred": []}
+
+
+def test_timed_out_shard_does_not_block_the_next_cycle(monkeypatch):
+    # Forked workers inherit the patched pipeline and SLOW flag as they are at pool creation
+    monkeypatch.setattr(sc, "_worker_coordinator", lambda loop: FakeCoordinator())
+    monkeypatch.setattr(sc.universe_provider, "get_snapshot_nowait", lambda: None)
+    shards = sc.ShardCoordinator({"enabled": True, "workers": 2, "start_method": "fork",
+                                  "min_symbols": 4, "min_symbols_per_shard": 2, "shard_grace_seconds": 0.5})
+    symbols = ["AAA", "BBB", "CCC", "DDD"]
+
+    async def cycle():
+        metrics = new_metrics()
+        decisions = await shards.run(symbols, {}, [], 0.1, metrics)
+        return decisions, metrics
+
+    try:
+        decisions, metrics = asyncio.run(cycle())
+        assert decisions == []
+        assert sorted(metrics["deferred"]) == symbols
+
+        SLOW["on"] = False
+        started = time.perf_counter()
+        decisions, metrics = asyncio.run(cycle())
+        assert sorted(d["symbol"] for d in decisions) == symbols
+        assert metrics["deferred"] == []
+        assert time.perf_counter() - started < 5.0
+    finally:
+        SLOW["on"] = True
+        shards.close()
+
+
+def test_rate_share_scales_provider_lanes():
+    scheduler = RequestScheduler()
+    scheduler.provider_limits = {"yfinance": {"rate": 4.0, "burst": 8}}
+    lane = scheduler._lane("yfinance")
+
+    scheduler.set_rate_share(0.25)
+    assert lane.base_rate == 1.0 and lane.bucket.rate == 1.0 and lane.bucket.capacity == 2
+    assert scheduler._lane("default").bucket.rate == 2.0 * 0.25
+
+    scheduler.set_rate_share(1.0)
+    assert lane.bucket.rate == 4.0
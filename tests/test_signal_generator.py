@@ -0,0 +1,30 @@
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Strategy_Agent import signal_generator
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.incremental_state import IncrementalState
+
+
+class FakeSnapshot:
+    def get(self, symbol):
+        return {"symbol": symbol, "price": 2.0, "volume": 1_000_000}
+
+
+def test_small_limit_does_not_hide_signals_from_later_callers(monkeypatch):
+    state = IncrementalState("signal_generator", config={"ttl_seconds": 600})
+    scanned = []
+
+    def fake_recursive_scan(symbols, timeframes):
+        scanned.append(list(symbols))
+        return [{"symbol": symbol, "price": 2.0, "volume": 1_000_000, "up_pct": 6.0, "signal": ["ema_cross"],
+                 "timeframe": timeframe} for symbol in symbols for timeframe in ("1min", "5min")]
+
+    monkeypatch.setattr(signal_generator, "get_incremental_state", lambda name: state)
+    monkeypatch.setattr(signal_generator, "get_universe_snapshot_nowait", lambda: FakeSnapshot())
+    monkeypatch.setattr(signal_generator, "recursive_scan", fake_recursive_scan)
+
+    first = signal_generator.generate_signals(limit=5, embed=False)
+    second = signal_generator.generate_signals(limit=50, embed=False)
+
+    assert len(first) == 5
+    # Every symbol is served from the cache, with all of its signals
+    assert scanned == [scanned[0]]
+    assert len(second) == 2 * len(scanned[0])
+    assert {signal["symbol"] for signal in second} == set(scanned[0])
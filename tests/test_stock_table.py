@@ -0,0 +1,25 @@
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.stock_table import StockTable
+
+
+def test_unknown_nested_indicators_round_trip():
+    record = {
+        "symbol": "GPRO", "price": 2.15, "volume": 1500000,
+        "ema": {"5": 2.1, "20": 2.05, "50": 1.9},
+        "macd": {"macd": 0.02, "signal": "bullish", "histogram": 0.01},
+        "bollinger": None,
+        "sma": 2.0,
+        "data_source": "sample"
+    }
+    view = StockTable.from_records([record]).get("GPRO")
+
+    assert view.to_dict() == {key: value for key, value in record.items() if value is not None}
+    assert list(view).count("ema") == 1
+    assert list(view).count("sma") == 1
+
+
+def test_known_nested_indicators_stay_in_columns():
+    table = StockTable.from_records([{"symbol": "SAVA", "ema": {"5": 3.4, "20": 3.3}}])
+
+    assert table.column("ema_5")[0] == 3.4
+    assert table.extras[0] is None
+    assert table.get("SAVA")["ema"] == {"5": 3.4, "20": 3.3}
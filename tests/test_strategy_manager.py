@@ -0,0 +1,73 @@
+import asyncio
+import importlib
+import threading
+import time
+
+from Gremlin_Trade_Core.Gremlin_Trader_Strategies.scan_context import run_cancellable
+
+# The package re-exports instances under the module names
+strategy_manager = importlib.import_module("Gremlin_Trade_Core.Gremlin_Trader_Strategies.strategy_manager")
+
+
+def chunked_work(progress, cancel):
+    for _ in range(500):
+        if cancel.is_set():
+            break
+        time.sleep(0.01)
+        progress.append(1)
+    return len(progress)
+
+
+def test_deadline_stops_the_worker_thread_before_returning():
+    progress = []
+
+    async def run():
+        cancel = threading.Event()
+        try:
+            await asyncio.wait_for(run_cancellable(chunked_work, progress, cancel, cancel=cancel), timeout=0.1)
+        except asyncio.TimeoutError:
+            pass
+        return len(progress)
+
+    at_timeout = asyncio.run(run())
+    time.sleep(0.1)
+
+    assert 0 < at_timeout < 500
+    assert len(progress) == at_timeout
+
+
+def test_timed_out_strategy_is_reported_and_released():
+    manager = strategy_manager.StrategyManager()
+    manager.manager_config = {"timeouts": {"slow": 0.05}}
+
+    async def slow():
+        await asyncio.sleep(10)
+        return [{"symbol": "GPRO"}]
+
+    outcome = asyncio.run(manager._run_strategy("slow", slow))
+
+    assert outcome["status"] == "timeout"
+    assert outcome["results"] == []
+    assert "slow" not in manager.running
+    assert manager.latency["slow"]["timeouts"] == 1
+
+
+def test_overlapping_run_of_the_same_strategy_is_skipped():
+    manager = strategy_manager.StrategyManager()
+    manager.manager_config = {"timeouts": {"busy": 1.0}}
+    calls = []
+
+    async def busy():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return [{"symbol": "SAVA"}]
+
+    async def run():
+        return await asyncio.gather(manager._run_strategy("busy", busy), manager._run_strategy("busy", busy))
+
+    first, second = asyncio.run(run())
+
+    assert first["status"] == "ok" and len(first["results"]) == 1
+    assert second["status"] == "skipped"
+    assert calls == [1]
+    assert manager.latency["busy"]["skipped"] == 1
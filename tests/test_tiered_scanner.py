@@ -0,0 +1,42 @@
+import asyncio
+
+from Gremlin_Trade_Core.Gremlin_Trader_Tools.Service_Agents.tiered_scanner import TieredScanner
+
+SYMBOLS = [f"SYM{i}" for i in range(10)]
+CONFIG = {"tier0": {"use_fundamentals": False, "min_price": 0.10, "max_price": 10.0, "min_volume": 1000}}
+
+
+async def details(symbol):
+    return {"symbol": symbol}
+
+
+def scan(quote_fn, limit=3):
+    scanner = TieredScanner(CONFIG)
+    records = asyncio.run(scanner.scan(quote_fn, details, limit=limit, symbols=SYMBOLS))
+    return [record["symbol"] for record in records], scanner.last_scan
+
+
+def test_quotes_with_no_survivors_yield_an_empty_tier1():
+    async def quotes(batch):
+        return [{"symbol": symbol, "price": 25.0, "volume": 50000, "up_pct": 4.0} for symbol in batch]
+
+    symbols, stats = scan(quotes)
+
+    assert symbols == []
+    assert stats["quoted"] == len(SYMBOLS)
+    assert stats["tier1"] == 0
+
+
+def test_missing_quotes_fall_back_to_the_first_symbols():
+    async def no_quotes(batch):
+        return []
+
+    assert scan(no_quotes)[0] == SYMBOLS[:3]
+    assert scan(None)[0] == SYMBOLS[:3]
+
+
+def test_survivors_are_ranked_by_move_size():
+    async def quotes(batch):
+        return [{"symbol": symbol, "price": 2.0, "volume": 50000, "up_pct": float(i)} for i, symbol in enumerate(batch)]
+
+    assert scan(quotes, limit=2)[0] == ["SYM9", "SYM8"]